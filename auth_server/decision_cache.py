@@ -0,0 +1,187 @@
+"""
+Authorization decision cache for the auth server's /validate endpoint.
+
+nginx calls /validate through auth_request for every MCP JSON-RPC message, so
+a single session repeats the same token validation, group-to-scope mapping and
+tool access check many times. This module caches the final decision keyed by
+a hash of the presented bearer token plus the requested server, method and tool.
+
+Only allow decisions for tokens with a known expiry are cached, and entries
+never outlive that expiry. Denials are not cached so a scope grant takes effect
+on the next request, and session cookies are not cached because a logout must
+revoke access immediately. The whole cache is dropped when the scopes
+configuration is reloaded.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    """Response of a previous successful /validate call."""
+
+    response_data: dict[str, Any]
+
+
+def build_decision_key(
+    authorization: str | None,
+    target: tuple[str | None, ...],
+    context: tuple[str | None, ...] = (),
+) -> str | None:
+    """
+    Build a cache key from the bearer token and the requested target.
+
+    The raw token is hashed so it is never held as a dict key.
+
+    Args:
+        authorization: Authorization header value
+        target: Requested server, tool, method and tools/call tool name
+        context: Other headers that influence validation (e.g. Cognito pool/client/region)
+
+    Returns:
+        Hex digest key, or None if no bearer token was presented
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    parts = [authorization, *context, *target]
+    material = "\x00".join(p or "" for p in parts)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def token_expiry(validation_result: dict[str, Any]) -> float | None:
+    """
+    Extract the token expiry (epoch seconds) from a validation result.
+
+    Args:
+        validation_result: Result returned by a provider or the session validator
+
+    Returns:
+        Expiry timestamp, or None if the result does not carry one
+    """
+    exp = validation_result.get("expires_at")
+    if exp is None:
+        data = validation_result.get("data")
+        if isinstance(data, dict):
+            exp = data.get("exp")
+    try:
+        return float(exp) if exp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AuthDecisionCache:
+    """Bounded LRU of authorization decisions with a TTL capped at token expiry."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 60.0,
+    ):
+        """
+        Initialize the decision cache.
+
+        Args:
+            max_entries: Maximum number of cached decisions (0 disables caching)
+            ttl_seconds: Maximum seconds a decision stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, CachedDecision]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(
+        self,
+        key: str | None,
+    ) -> CachedDecision | None:
+        """
+        Return the cached decision for a key, if present and not expired.
+
+        Args:
+            key: Key from build_decision_key()
+
+        Returns:
+            Cached decision, or None on a miss
+        """
+        if key is None or self.max_entries <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        key: str | None,
+        decision: CachedDecision,
+        expires_at: float | None,
+    ) -> None:
+        """
+        Store a decision.
+
+        Args:
+            key: Key from build_decision_key()
+            decision: Decision to cache
+            expires_at: Token expiry (epoch seconds); the entry never outlives it
+                and nothing is cached when it is unknown
+        """
+        if key is None or expires_at is None or self.max_entries <= 0:
+            return
+        deadline = min(time.time() + self.ttl_seconds, expires_at)
+        if deadline <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (deadline, decision)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached decisions, e.g. after a scopes reload."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters, size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,8 +1,17 @@
 """Base authentication provider interface."""
 
+import asyncio
+import functools
 import logging
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import jwt
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,11 +21,353 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Connection pool settings for outbound identity provider calls
+HTTP_MAX_CONNECTIONS = int(os.environ.get("AUTH_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("AUTH_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("AUTH_HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_TIMEOUT = float(os.environ.get("AUTH_HTTP_TIMEOUT_SECONDS", "10"))
+
+# Worker threads for the remaining blocking calls (boto3)
+BLOCKING_POOL_SIZE = int(os.environ.get("AUTH_BLOCKING_POOL_SIZE", "16"))
+
+_http_client: Optional[httpx.AsyncClient] = None
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared, pooled async HTTP client for identity provider calls.
+
+    The client keeps connections alive across requests and negotiates HTTP/2
+    when the ``h2`` package is installed. The pool is bounded by
+    ``AUTH_HTTP_MAX_CONNECTIONS`` so a slow provider cannot exhaust sockets.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared async HTTP client."""
+    global _http_client
+    client = _http_client
+    _http_client = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    with _executor_lock:
+        if _blocking_executor is None:
+            _blocking_executor = ThreadPoolExecutor(
+                max_workers=BLOCKING_POOL_SIZE,
+                thread_name_prefix="auth-blocking",
+            )
+        return _blocking_executor
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """Run a blocking call on the bounded worker pool without blocking the event loop.
+
+    Only used for boto3, which has no async client. Identity provider HTTP
+    calls go through the shared async client from get_http_client instead.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_blocking_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_blocking_executor() -> None:
+    """Shut down the worker pool used by run_blocking."""
+    global _blocking_executor
+    with _executor_lock:
+        executor = _blocking_executor
+        _blocking_executor = None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+class JWKSManager:
+    """Shared JWKS cache with kid-indexed public keys and background refresh.
+
+    Keys are parsed once per fetch and looked up by ``kid`` in O(1). Key sets
+    are fetched with the shared async HTTP client, and concurrent callers that
+    find the cache empty or stale share a single in-flight fetch. Once
+    ``ensure_background_refresh`` has been called, a background task refreshes
+    the key set ahead of expiry so token validation never waits on the
+    identity provider. A token signed with an unknown ``kid`` (key rotation)
+    triggers one refresh, rate limited by ``min_refresh_interval``.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: int = 3600,
+        refresh_margin: int = 300,
+        min_refresh_interval: int = 30,
+        timeout: float = 10.0,
+        provider_name: str = "identity provider"
+    ):
+        """Initialize the JWKS manager.
+
+        Args:
+            jwks_url: URL of the provider's JWKS endpoint
+            ttl: Seconds a fetched key set is considered fresh
+            refresh_margin: Seconds before expiry at which the background task refreshes
+            min_refresh_interval: Minimum seconds between refreshes triggered by unknown kids
+            timeout: HTTP timeout in seconds for JWKS requests
+            provider_name: Provider name used in log and error messages
+        """
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.refresh_margin = min(refresh_margin, ttl)
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.provider_name = provider_name
+
+        # (raw jwks, kid -> parsed key, fetch time) swapped as a single reference
+        self._snapshot: Optional[tuple] = None
+        self._last_refresh_attempt: float = 0
+        self._inflight: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _install(
+        self,
+        jwks: Dict[str, Any],
+        fetched_at: float
+    ) -> None:
+        """Parse a fetched key set and make it the active snapshot."""
+        keys_by_kid: Dict[str, Any] = {}
+        for key in jwks.get('keys', []):
+            kid = key.get('kid')
+            if not kid:
+                continue
+            try:
+                keys_by_kid[kid] = jwt.PyJWK(key).key
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWKS key '{kid}' from {self.provider_name}: {e}")
+        self._snapshot = (jwks, keys_by_kid, fetched_at)
+        logger.debug(f"Loaded {len(keys_by_kid)} JWKS keys from {self.provider_name}")
+
+    def _is_fresh(self, now: float) -> bool:
+        snapshot = self._snapshot
+        return snapshot is not None and (now - snapshot[2]) < self.ttl
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Fetch the key set with the shared async HTTP client.
+
+        Returns:
+            The fetched JWKS data
+
+        Raises:
+            ValueError: If JWKS cannot be retrieved
+        """
+        now = time.time()
+        self._last_refresh_attempt = now
+        try:
+            logger.debug(f"Fetching JWKS from {self.jwks_url}")
+            response = await get_http_client().get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            logger.error(f"Failed to retrieve JWKS from {self.provider_name}: {e}")
+            raise ValueError(f"Cannot retrieve JWKS: {e}")
+
+        self._install(jwks, now)
+        return jwks
+
+    async def _refresh_once(self, needs_refresh: Callable[[], bool]) -> None:
+        """Refresh unless another caller already did, sharing one in-flight fetch.
+
+        Args:
+            needs_refresh: Callable evaluated when no fetch is already in flight
+        """
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            if not needs_refresh():
+                return
+            task = asyncio.ensure_future(self.refresh())
+            # Waiters may all be cancelled; don't leave the error unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight = task
+        await asyncio.shield(task)
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        """Get the current JWKS data, fetching it if missing or expired.
+
+        Returns:
+            Dictionary containing the JWKS data
+
+        Raises:
+            ValueError: If JWKS cannot be retrieved
+        """
+        if not self._is_fresh(time.time()):
+            # With a background task running, a stale key set is still served
+            # while the task catches up; only a missing one must be fetched inline.
+            if self._snapshot is None or not self._background_running():
+                await self._refresh_once(lambda: not self._is_fresh(time.time()))
+        return self._snapshot[0]
+
+    async def get_signing_key(self, kid: str) -> Optional[Any]:
+        """Get the parsed public key for a key ID.
+
+        An unknown kid triggers one deduplicated refresh, at most once per
+        ``min_refresh_interval``, to pick up rotated keys.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            Public key object, or None if no key matches
+
+        Raises:
+            ValueError: If JWKS cannot be retrieved
+        """
+        await self.get_jwks()
+        key = self._snapshot[1].get(kid)
+        if key is not None:
+            return key
+
+        def unknown_kid_needs_refresh() -> bool:
+            if kid in self._snapshot[1]:
+                return False
+            return (time.time() - self._last_refresh_attempt) >= self.min_refresh_interval
+
+        try:
+            await self._refresh_once(unknown_kid_needs_refresh)
+        except ValueError as e:
+            logger.warning(f"JWKS refresh for unknown kid '{kid}' failed: {e}")
+        return self._snapshot[1].get(kid)
+
+    def _background_running(self) -> bool:
+        task = self._refresh_task
+        return task is not None and not task.done() and task.get_loop().is_running()
+
+    def ensure_background_refresh(self) -> None:
+        """Start the background refresh task if an event loop is running."""
+        if self._background_running():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refresh_task = loop.create_task(self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        """Cancel the background refresh task."""
+        task = self._refresh_task
+        self._refresh_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh_loop(self) -> None:
+        """Refresh the key set ahead of expiry until cancelled."""
+        while True:
+            snapshot = self._snapshot
+            if snapshot is None:
+                delay = 0.0
+            else:
+                delay = snapshot[2] + self.ttl - self.refresh_margin - time.time()
+            # Avoid hammering the provider when refreshes keep failing
+            retry_at = self._last_refresh_attempt + self.min_refresh_interval - time.time()
+            await asyncio.sleep(max(delay, retry_at, 0.0))
+            try:
+                await self.refresh()
+            except ValueError:
+                pass
+            except Exception as e:
+                logger.error(f"Unexpected error in JWKS refresh task for {self.provider_name}: {e}")
+
+
+# JWKS managers shared by all provider instances, keyed by JWKS URL
+_jwks_managers: Dict[str, JWKSManager] = {}
+_jwks_managers_lock = threading.Lock()
+
+
+def get_jwks_manager(
+    jwks_url: str,
+    **kwargs: Any
+) -> JWKSManager:
+    """Get the shared JWKS manager for a JWKS URL, creating it on first use.
+
+    Providers are created per request by the factory, so the key cache and
+    refresh task must live outside the provider instance.
+
+    Args:
+        jwks_url: URL of the provider's JWKS endpoint
+        **kwargs: JWKSManager options used when the manager is created
+
+    Returns:
+        Shared JWKSManager instance
+    """
+    with _jwks_managers_lock:
+        manager = _jwks_managers.get(jwks_url)
+        if manager is None:
+            manager = JWKSManager(jwks_url, **kwargs)
+            _jwks_managers[jwks_url] = manager
+        return manager
+
+
+def get_all_jwks_managers() -> List[JWKSManager]:
+    """Get every JWKS manager created so far."""
+    with _jwks_managers_lock:
+        return list(_jwks_managers.values())
+
+
+def clear_jwks_managers() -> None:
+    """Forget all shared JWKS managers (used by tests and reconfiguration)."""
+    with _jwks_managers_lock:
+        _jwks_managers.clear()
+
+
 class AuthProvider(ABC):
-    """Abstract base class for authentication providers."""
+    """Abstract base class for authentication providers.
+
+    Methods that may call the identity provider are coroutines and use the
+    shared async HTTP client, so they never block the event loop.
+    """
     
     @abstractmethod
-    def validate_token(
+    async def validate_token(
         self,
         token: str,
         **kwargs: Any
@@ -44,7 +395,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def get_jwks(self) -> Dict[str, Any]:
+    async def get_jwks(self) -> Dict[str, Any]:
         """Get JSON Web Key Set for token validation.
         
         Returns:
@@ -56,7 +407,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         code: str,
         redirect_uri: str
@@ -81,7 +432,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def get_user_info(
+    async def get_user_info(
         self,
         access_token: str
     ) -> Dict[str, Any]:
@@ -137,7 +488,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def refresh_token(
+    async def refresh_token(
         self,
         refresh_token: str
     ) -> Dict[str, Any]:
@@ -155,7 +506,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def validate_m2m_token(
+    async def validate_m2m_token(
         self,
         token: str
     ) -> Dict[str, Any]:
@@ -173,7 +524,7 @@ class AuthProvider(ABC):
         pass
     
     @abstractmethod
-    def get_m2m_token(
+    async def get_m2m_token(
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
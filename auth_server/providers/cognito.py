@@ -2,15 +2,14 @@
 
 import json
 import logging
-import time
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlencode
 
+import httpx
 import jwt
-import requests
 
-from .base import AuthProvider
+from .base import AuthProvider, get_http_client, get_jwks_manager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,11 +45,6 @@ class CognitoProvider(AuthProvider):
         self.region = region
         self.domain = domain
         
-        # Cache for JWKS
-        self._jwks_cache: Optional[Dict[str, Any]] = None
-        self._jwks_cache_time: float = 0
-        self._jwks_cache_ttl: int = 3600  # 1 hour
-        
         # Cognito endpoints
         if domain:
             self.cognito_domain = f"https://{domain}.auth.{region}.amazoncognito.com"
@@ -62,13 +56,14 @@ class CognitoProvider(AuthProvider):
         self.auth_url = f"{self.cognito_domain}/oauth2/authorize"
         self.userinfo_url = f"{self.cognito_domain}/oauth2/userInfo"
         self.jwks_url = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}/.well-known/jwks.json"
+        self.jwks_manager = get_jwks_manager(self.jwks_url, ttl=3600, provider_name="Cognito")
         self.logout_url = f"{self.cognito_domain}/logout"
         self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
         
         logger.debug(f"Initialized Cognito provider for user pool '{user_pool_id}' in region '{region}'")
 
 
-    def validate_token(
+    async def validate_token(
         self,
         token: str,
         **kwargs: Any
@@ -77,23 +72,15 @@ class CognitoProvider(AuthProvider):
         try:
             logger.debug("Validating Cognito JWT token")
             
-            # Get JWKS for validation
-            jwks = self.get_jwks()
-            
             # Decode token header to get key ID
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get('kid')
             
             if not kid:
                 raise ValueError("Token missing 'kid' in header")
-            
-            # Find matching key
-            signing_key = None
-            for key in jwks.get('keys', []):
-                if key.get('kid') == kid:
-                    from jwt import PyJWK
-                    signing_key = PyJWK(key).key
-                    break
+
+            # Look up the parsed signing key by kid (refreshes once on unknown kid)
+            signing_key = await self.jwks_manager.get_signing_key(kid)
             
             if not signing_key:
                 raise ValueError(f"No matching key found for kid: {kid}")
@@ -137,33 +124,11 @@ class CognitoProvider(AuthProvider):
             raise ValueError(f"Token validation failed: {e}")
 
 
-    def get_jwks(self) -> Dict[str, Any]:
+    async def get_jwks(self) -> Dict[str, Any]:
         """Get JSON Web Key Set from Cognito with caching."""
-        current_time = time.time()
-        
-        # Check if cache is still valid
-        if (self._jwks_cache and 
-            (current_time - self._jwks_cache_time) < self._jwks_cache_ttl):
-            logger.debug("Using cached JWKS")
-            return self._jwks_cache
-        
-        try:
-            logger.debug(f"Fetching JWKS from {self.jwks_url}")
-            response = requests.get(self.jwks_url, timeout=10)
-            response.raise_for_status()
-            
-            self._jwks_cache = response.json()
-            self._jwks_cache_time = current_time
-            
-            logger.debug("JWKS fetched and cached successfully")
-            return self._jwks_cache
-            
-        except Exception as e:
-            logger.error(f"Failed to retrieve JWKS from Cognito: {e}")
-            raise ValueError(f"Cannot retrieve JWKS: {e}")
-
+        return await self.jwks_manager.get_jwks()
 
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         code: str,
         redirect_uri: str
@@ -184,7 +149,7 @@ class CognitoProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -192,12 +157,12 @@ class CognitoProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to exchange code for token: {e}")
             raise ValueError(f"Token exchange failed: {e}")
 
 
-    def get_user_info(
+    async def get_user_info(
         self,
         access_token: str
     ) -> Dict[str, Any]:
@@ -206,7 +171,7 @@ class CognitoProvider(AuthProvider):
             logger.debug("Fetching user info from Cognito")
             
             headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(self.userinfo_url, headers=headers, timeout=10)
+            response = await get_http_client().get(self.userinfo_url, headers=headers, timeout=10)
             response.raise_for_status()
             
             user_info = response.json()
@@ -214,7 +179,7 @@ class CognitoProvider(AuthProvider):
             
             return user_info
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get user info: {e}")
             raise ValueError(f"User info retrieval failed: {e}")
 
@@ -260,7 +225,7 @@ class CognitoProvider(AuthProvider):
         return logout_url
 
 
-    def refresh_token(
+    async def refresh_token(
         self,
         refresh_token: str
     ) -> Dict[str, Any]:
@@ -279,7 +244,7 @@ class CognitoProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -287,21 +252,21 @@ class CognitoProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to refresh token: {e}")
             raise ValueError(f"Token refresh failed: {e}")
 
 
-    def validate_m2m_token(
+    async def validate_m2m_token(
         self,
         token: str
     ) -> Dict[str, Any]:
         """Validate a machine-to-machine token."""
         # M2M tokens use the same validation as regular tokens in Cognito
-        return self.validate_token(token)
+        return await self.validate_token(token)
 
 
-    def get_m2m_token(
+    async def get_m2m_token(
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
@@ -324,7 +289,7 @@ class CognitoProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -332,12 +297,12 @@ class CognitoProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get M2M token: {e}")
             raise ValueError(f"M2M token generation failed: {e}")
 
 
-    def get_provider_info(self) -> Dict[str, Any]:
+    async def get_provider_info(self) -> Dict[str, Any]:
         """Get provider-specific information."""
         return {
             'provider_type': 'cognito',
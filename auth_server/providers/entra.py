@@ -1,15 +1,16 @@
 """Microsoft Entra ID (Azure AD) authentication provider implementation."""
 
+import asyncio
 import logging
 import os
 import time
 from typing import Any, Dict, Optional
 from urllib.parse import urlencode
 
+import httpx
 import jwt
-import requests
 
-from .base import AuthProvider
+from .base import AuthProvider, get_http_client, get_jwks_manager
 
 # Constants for self-signed token validation
 JWT_ISSUER = os.environ.get("JWT_ISSUER", "mcp-auth-server")
@@ -55,10 +56,6 @@ class EntraIdProvider(AuthProvider):
         self.client_id = client_id
         self.client_secret = client_secret
 
-        # JWKS cache
-        self._jwks_cache: Optional[Dict[str, Any]] = None
-        self._jwks_cache_time: float = 0
-        self._jwks_cache_ttl: int = 3600  # 1 hour
 
         # Get login base URL from environment variable or use default
         login_base_url = os.environ.get(
@@ -72,6 +69,7 @@ class EntraIdProvider(AuthProvider):
         self.token_url = f"{base_url}/oauth2/v2.0/token"
         self.userinfo_url = "https://graph.microsoft.com/oidc/userinfo"
         self.jwks_url = f"{base_url}/discovery/v2.0/keys"
+        self.jwks_manager = get_jwks_manager(self.jwks_url, ttl=3600, provider_name="Entra ID")
         self.logout_url = f"{base_url}/oauth2/v2.0/logout"
 
         # Entra ID supports two issuer formats:
@@ -83,7 +81,7 @@ class EntraIdProvider(AuthProvider):
 
         logger.debug(f"Initialized Entra ID provider for tenant '{tenant_id}'")
 
-    def validate_token(
+    async def validate_token(
         self,
         token: str,
         **kwargs: Any
@@ -123,9 +121,6 @@ class EntraIdProvider(AuthProvider):
             except Exception as e:
                 logger.debug(f"Not a self-signed token: {e}")
 
-            # Get JWKS for validation
-            jwks = self.get_jwks()
-
             # Decode token header to get key ID
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get('kid')
@@ -133,13 +128,8 @@ class EntraIdProvider(AuthProvider):
             if not kid:
                 raise ValueError("Token missing 'kid' in header")
 
-            # Find matching key
-            signing_key = None
-            for key in jwks.get('keys', []):
-                if key.get('kid') == kid:
-                    from jwt import PyJWK
-                    signing_key = PyJWK(key).key
-                    break
+            # Look up the parsed signing key by kid (refreshes once on unknown kid)
+            signing_key = await self.jwks_manager.get_signing_key(kid)
 
             if not signing_key:
                 raise ValueError(f"No matching key found for kid: {kid}")
@@ -277,7 +267,7 @@ class EntraIdProvider(AuthProvider):
             logger.error(f"Self-signed token validation error: {e}")
             raise ValueError(f"Self-signed token validation failed: {e}")
 
-    def get_jwks(self) -> Dict[str, Any]:
+    async def get_jwks(self) -> Dict[str, Any]:
         """Get JSON Web Key Set from Entra ID with caching.
 
         Returns:
@@ -286,30 +276,9 @@ class EntraIdProvider(AuthProvider):
         Raises:
             ValueError: If JWKS cannot be retrieved
         """
-        current_time = time.time()
-
-        # Check if cache is still valid
-        if (self._jwks_cache and
-            (current_time - self._jwks_cache_time) < self._jwks_cache_ttl):
-            logger.debug("Using cached JWKS")
-            return self._jwks_cache
-
-        try:
-            logger.debug(f"Fetching JWKS from {self.jwks_url}")
-            response = requests.get(self.jwks_url, timeout=10)
-            response.raise_for_status()
-
-            self._jwks_cache = response.json()
-            self._jwks_cache_time = current_time
-
-            logger.debug("JWKS fetched and cached successfully")
-            return self._jwks_cache
-
-        except Exception as e:
-            logger.error(f"Failed to retrieve JWKS from Entra ID: {e}")
-            raise ValueError(f"Cannot retrieve JWKS: {e}")
+        return await self.jwks_manager.get_jwks()
 
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         code: str,
         redirect_uri: str
@@ -346,7 +315,7 @@ class EntraIdProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
 
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
 
             token_data = response.json()
@@ -354,11 +323,11 @@ class EntraIdProvider(AuthProvider):
 
             return token_data
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to exchange code for token: {e}")
             raise ValueError(f"Token exchange failed: {e}")
 
-    def get_user_info(
+    async def get_user_info(
         self,
         access_token: str
     ) -> Dict[str, Any]:
@@ -380,7 +349,7 @@ class EntraIdProvider(AuthProvider):
             logger.debug("Fetching user info from Entra ID")
 
             headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(self.userinfo_url, headers=headers, timeout=10)
+            response = await get_http_client().get(self.userinfo_url, headers=headers, timeout=10)
             response.raise_for_status()
 
             user_info = response.json()
@@ -388,7 +357,7 @@ class EntraIdProvider(AuthProvider):
 
             return user_info
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get user info: {e}")
             raise ValueError(f"User info retrieval failed: {e}")
 
@@ -447,7 +416,7 @@ class EntraIdProvider(AuthProvider):
 
         return logout_url
 
-    def refresh_token(
+    async def refresh_token(
         self,
         refresh_token: str
     ) -> Dict[str, Any]:
@@ -476,7 +445,7 @@ class EntraIdProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
 
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
 
             token_data = response.json()
@@ -484,11 +453,11 @@ class EntraIdProvider(AuthProvider):
 
             return token_data
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to refresh token: {e}")
             raise ValueError(f"Token refresh failed: {e}")
 
-    def validate_m2m_token(
+    async def validate_m2m_token(
         self,
         token: str
     ) -> Dict[str, Any]:
@@ -503,9 +472,9 @@ class EntraIdProvider(AuthProvider):
         Raises:
             ValueError: If token validation fails
         """
-        return self.validate_token(token)
+        return await self.validate_token(token)
 
-    def get_m2m_token(
+    async def get_m2m_token(
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
@@ -548,7 +517,7 @@ class EntraIdProvider(AuthProvider):
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
 
-            response = requests.post(self.token_url, data=data, headers=headers, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, headers=headers, timeout=10)
             response.raise_for_status()
 
             token_data = response.json()
@@ -556,11 +525,11 @@ class EntraIdProvider(AuthProvider):
 
             return token_data
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get M2M token: {e}")
             raise ValueError(f"M2M token generation failed: {e}")
 
-    def initiate_device_code_flow(
+    async def initiate_device_code_flow(
         self,
         scope: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -604,7 +573,7 @@ class EntraIdProvider(AuthProvider):
             # Device code endpoint
             device_code_url = self.token_url.replace('/token', '/devicecode')
 
-            response = requests.post(
+            response = await get_http_client().post(
                 device_code_url,
                 data=data,
                 headers=headers,
@@ -617,11 +586,11 @@ class EntraIdProvider(AuthProvider):
 
             return result
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to initiate device code flow: {e}")
             raise ValueError(f"Device code flow initiation failed: {e}")
 
-    def poll_device_code_token(
+    async def poll_device_code_token(
         self,
         device_code: str,
         interval: int = 5,
@@ -661,7 +630,7 @@ class EntraIdProvider(AuthProvider):
             start_time = time.time()
 
             while (time.time() - start_time) < timeout:
-                response = requests.post(
+                response = await get_http_client().post(
                     self.token_url,
                     data=data,
                     headers=headers,
@@ -679,13 +648,13 @@ class EntraIdProvider(AuthProvider):
                 if error == 'authorization_pending':
                     # User hasn't completed auth yet, keep polling
                     logger.debug("Authorization pending, continuing to poll")
-                    time.sleep(interval)
+                    await asyncio.sleep(interval)
                     continue
                 elif error == 'slow_down':
                     # Polling too fast, increase interval
                     interval += 5
                     logger.debug(f"Slowing down, new interval: {interval}s")
-                    time.sleep(interval)
+                    await asyncio.sleep(interval)
                     continue
                 elif error == 'expired_token':
                     raise ValueError("Device code expired. Please start over.")
@@ -696,11 +665,11 @@ class EntraIdProvider(AuthProvider):
 
             raise ValueError("Device code authentication timed out")
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to poll device code token: {e}")
             raise ValueError(f"Device code token polling failed: {e}")
 
-    def get_provider_info(self) -> Dict[str, Any]:
+    async def get_provider_info(self) -> Dict[str, Any]:
         """Get provider-specific information.
 
         Returns:
@@ -3,15 +3,13 @@
 import json
 import logging
 import os
-import time
-from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlencode
 
+import httpx
 import jwt
-import requests
 
-from .base import AuthProvider
+from .base import AuthProvider, get_http_client, get_jwks_manager
 
 
 # Constants for self-signed token validation
@@ -60,10 +58,6 @@ class KeycloakProvider(AuthProvider):
         self.m2m_client_id = m2m_client_id or client_id
         self.m2m_client_secret = m2m_client_secret or client_secret
 
-        # Cache for JWKS and configuration
-        self._jwks_cache: Optional[Dict[str, Any]] = None
-        self._jwks_cache_time: float = 0
-        self._jwks_cache_ttl: int = 3600  # 1 hour
 
         # Keycloak endpoints - use internal URL for server-to-server, external for browser redirects
         self.realm_url = f"{self.keycloak_url}/realms/{realm}"
@@ -72,13 +66,15 @@ class KeycloakProvider(AuthProvider):
         self.auth_url = f"{self.external_realm_url}/protocol/openid-connect/auth"
         self.userinfo_url = f"{self.realm_url}/protocol/openid-connect/userinfo"
         self.jwks_url = f"{self.realm_url}/protocol/openid-connect/certs"
+        self.jwks_manager = get_jwks_manager(self.jwks_url, ttl=3600, provider_name="Keycloak")
         self.logout_url = f"{self.external_realm_url}/protocol/openid-connect/logout"
         self.config_url = f"{self.realm_url}/.well-known/openid_configuration"
+        self._openid_configuration: Optional[Dict[str, Any]] = None
 
         logger.debug(f"Initialized Keycloak provider for realm '{realm}' at {keycloak_url} (external: {self.keycloak_external_url})")
 
 
-    def validate_token(
+    async def validate_token(
         self,
         token: str,
         **kwargs: Any
@@ -99,23 +95,15 @@ class KeycloakProvider(AuthProvider):
             except Exception as e:
                 logger.debug(f"Not a self-signed token: {e}")
 
-            # Get JWKS for validation
-            jwks = self.get_jwks()
-
             # Decode token header to get key ID
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get('kid')
 
             if not kid:
                 raise ValueError("Token missing 'kid' in header")
-            
-            # Find matching key
-            signing_key = None
-            for key in jwks.get('keys', []):
-                if key.get('kid') == kid:
-                    from jwt import PyJWK
-                    signing_key = PyJWK(key).key
-                    break
+
+            # Look up the parsed signing key by kid (refreshes once on unknown kid)
+            signing_key = await self.jwks_manager.get_signing_key(kid)
             
             if not signing_key:
                 raise ValueError(f"No matching key found for kid: {kid}")
@@ -257,33 +245,11 @@ class KeycloakProvider(AuthProvider):
             raise ValueError(f"Self-signed token validation failed: {e}")
 
 
-    def get_jwks(self) -> Dict[str, Any]:
+    async def get_jwks(self) -> Dict[str, Any]:
         """Get JSON Web Key Set from Keycloak with caching."""
-        current_time = time.time()
-        
-        # Check if cache is still valid
-        if (self._jwks_cache and 
-            (current_time - self._jwks_cache_time) < self._jwks_cache_ttl):
-            logger.debug("Using cached JWKS")
-            return self._jwks_cache
-        
-        try:
-            logger.debug(f"Fetching JWKS from {self.jwks_url}")
-            response = requests.get(self.jwks_url, timeout=10)
-            response.raise_for_status()
-            
-            self._jwks_cache = response.json()
-            self._jwks_cache_time = current_time
-            
-            logger.debug("JWKS fetched and cached successfully")
-            return self._jwks_cache
-            
-        except Exception as e:
-            logger.error(f"Failed to retrieve JWKS from Keycloak: {e}")
-            raise ValueError(f"Cannot retrieve JWKS: {e}")
-
+        return await self.jwks_manager.get_jwks()
 
-    def exchange_code_for_token(
+    async def exchange_code_for_token(
         self,
         code: str,
         redirect_uri: str
@@ -300,7 +266,7 @@ class KeycloakProvider(AuthProvider):
                 'redirect_uri': redirect_uri
             }
             
-            response = requests.post(self.token_url, data=data, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -308,12 +274,12 @@ class KeycloakProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to exchange code for token: {e}")
             raise ValueError(f"Token exchange failed: {e}")
 
 
-    def get_user_info(
+    async def get_user_info(
         self,
         access_token: str
     ) -> Dict[str, Any]:
@@ -322,7 +288,7 @@ class KeycloakProvider(AuthProvider):
             logger.debug("Fetching user info from Keycloak")
             
             headers = {'Authorization': f'Bearer {access_token}'}
-            response = requests.get(self.userinfo_url, headers=headers, timeout=10)
+            response = await get_http_client().get(self.userinfo_url, headers=headers, timeout=10)
             response.raise_for_status()
             
             user_info = response.json()
@@ -330,7 +296,7 @@ class KeycloakProvider(AuthProvider):
             
             return user_info
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get user info: {e}")
             raise ValueError(f"User info retrieval failed: {e}")
 
@@ -376,7 +342,7 @@ class KeycloakProvider(AuthProvider):
         return logout_url
 
 
-    def refresh_token(
+    async def refresh_token(
         self,
         refresh_token: str
     ) -> Dict[str, Any]:
@@ -391,7 +357,7 @@ class KeycloakProvider(AuthProvider):
                 'client_secret': self.client_secret
             }
             
-            response = requests.post(self.token_url, data=data, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -399,21 +365,21 @@ class KeycloakProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to refresh token: {e}")
             raise ValueError(f"Token refresh failed: {e}")
 
 
-    def validate_m2m_token(
+    async def validate_m2m_token(
         self,
         token: str
     ) -> Dict[str, Any]:
         """Validate a machine-to-machine token."""
         # M2M tokens use the same validation as regular tokens
-        return self.validate_token(token)
+        return await self.validate_token(token)
 
 
-    def get_m2m_token(
+    async def get_m2m_token(
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
@@ -430,7 +396,7 @@ class KeycloakProvider(AuthProvider):
                 'scope': scope or 'openid'
             }
             
-            response = requests.post(self.token_url, data=data, timeout=10)
+            response = await get_http_client().post(self.token_url, data=data, timeout=10)
             response.raise_for_status()
             
             token_data = response.json()
@@ -438,40 +404,42 @@ class KeycloakProvider(AuthProvider):
             
             return token_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get M2M token: {e}")
             raise ValueError(f"M2M token generation failed: {e}")
 
 
-    @lru_cache(maxsize=1)
-    def _get_openid_configuration(self) -> Dict[str, Any]:
-        """Get OpenID Connect configuration from Keycloak."""
+    async def _get_openid_configuration(self) -> Dict[str, Any]:
+        """Get OpenID Connect configuration from Keycloak (fetched once per provider)."""
+        if self._openid_configuration is not None:
+            return self._openid_configuration
         try:
             logger.debug(f"Fetching OpenID configuration from {self.config_url}")
-            response = requests.get(self.config_url, timeout=10)
+            response = await get_http_client().get(self.config_url, timeout=10)
             response.raise_for_status()
             
             config = response.json()
             logger.debug("OpenID configuration retrieved successfully")
             
+            self._openid_configuration = config
             return config
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to get OpenID configuration: {e}")
             raise ValueError(f"OpenID configuration retrieval failed: {e}")
 
 
-    def _check_keycloak_health(self) -> bool:
+    async def _check_keycloak_health(self) -> bool:
         """Check if Keycloak is healthy and accessible."""
         try:
             health_url = f"{self.keycloak_url}/health/ready"
-            response = requests.get(health_url, timeout=5)
+            response = await get_http_client().get(health_url, timeout=5)
             return response.status_code == 200
         except Exception:
             return False
 
 
-    def get_provider_info(self) -> Dict[str, Any]:
+    async def get_provider_info(self) -> Dict[str, Any]:
         """Get provider-specific information."""
         return {
             'provider_type': 'keycloak',
@@ -486,5 +454,5 @@ class KeycloakProvider(AuthProvider):
                 'logout': self.logout_url,
                 'config': self.config_url
             },
-            'healthy': self._check_keycloak_health()
+            'healthy': await self._check_keycloak_health()
         }
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Compiled, in-memory scope authorization table for the auth server.
+
+The scopes configuration maps each scope to a list of server access rules
+({"server": ..., "methods": [...], "tools": [...]}). Rather than querying the
+scope repository and scanning those lists on every proxied MCP request, the
+auth server compiles the configuration once into a table keyed by scope and
+normalized server name. Lookups are then plain dict/frozenset operations.
+
+The table is immutable; a reload builds a new table and swaps the module-level
+reference, so concurrent requests always see either the old or the new rules,
+never a partially built mix.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Top-level keys in the scopes configuration that are not server access scopes
+NON_SERVER_SCOPE_KEYS = frozenset({"group_mappings", "UI-Scopes"})
+
+# Entries in a methods/tools list that grant everything
+WILDCARD_VALUES = frozenset({"all", "*"})
+
+TOOLS_CALL_METHOD = "tools/call"
+
+
+def _normalize_server_name(name: str) -> str:
+    """Normalize a server name by removing any trailing slash."""
+    return name.rstrip("/") if name else name
+
+
+@dataclass(frozen=True)
+class CompiledServerRule:
+    """Merged access rule for one (scope, server) pair."""
+
+    methods: frozenset[str]
+    tools: frozenset[str]
+    all_methods: bool
+    all_tools: bool
+
+    def allows(self, method: str, tool_name: str | None) -> bool:
+        """
+        Check whether this rule grants access to a method/tool.
+
+        Mirrors the original per-entry checks: any method other than tools/call
+        is allowed if it is listed in methods; tools/call needs the specific
+        tool in tools; without a tool name the method itself may be listed in
+        tools for backward compatibility.
+        """
+        if method != TOOLS_CALL_METHOD and (self.all_methods or method in self.methods):
+            return True
+
+        if method == TOOLS_CALL_METHOD and tool_name:
+            return self.all_tools or tool_name in self.tools
+
+        return self.all_tools or method in self.tools
+
+
+def _merge_rules(rules: list[dict[str, Any]]) -> CompiledServerRule:
+    """Union a list of raw server access rules into a single compiled rule."""
+    methods: set[str] = set()
+    tools: set[str] = set()
+    for rule in rules:
+        methods.update(rule.get("methods") or [])
+        tools.update(rule.get("tools") or [])
+
+    return CompiledServerRule(
+        methods=frozenset(methods),
+        tools=frozenset(tools),
+        all_methods=not WILDCARD_VALUES.isdisjoint(methods),
+        all_tools=not WILDCARD_VALUES.isdisjoint(tools),
+    )
+
+
+def _iter_server_rules(scope_entries: list[Any]):
+    """
+    Yield server access rules from a scope's entry list.
+
+    Handles both the direct format ({"server": ...}) and the DocumentDB
+    grouped format ({"scope_name": ..., "access_rules": [...]}). Entries that
+    are not server rules (e.g. agent permissions) are skipped.
+    """
+    for entry in scope_entries:
+        if not isinstance(entry, dict):
+            continue
+        if "access_rules" in entry:
+            for rule in entry.get("access_rules") or []:
+                if isinstance(rule, dict) and rule.get("server"):
+                    yield rule
+        elif entry.get("server"):
+            yield entry
+
+
+class CompiledScopeTable:
+    """Immutable scope -> server -> rule table built from a scopes configuration."""
+
+    def __init__(
+        self,
+        server_rules: dict[str, dict[str, CompiledServerRule]],
+        wildcard_rules: dict[str, CompiledServerRule],
+    ):
+        self._server_rules = server_rules
+        self._wildcard_rules = wildcard_rules
+
+    @classmethod
+    def from_config(cls, scopes_config: dict[str, Any]) -> "CompiledScopeTable":
+        """
+        Compile a scopes configuration as returned by reload_scopes_config().
+
+        Args:
+            scopes_config: Mapping of scope name to its list of server access rules,
+                plus the "group_mappings" and "UI-Scopes" sections which are ignored
+
+        Returns:
+            Compiled table
+        """
+        server_rules: dict[str, dict[str, CompiledServerRule]] = {}
+        wildcard_rules: dict[str, CompiledServerRule] = {}
+
+        for scope_name, scope_entries in (scopes_config or {}).items():
+            if scope_name in NON_SERVER_SCOPE_KEYS or not isinstance(scope_entries, list):
+                continue
+
+            grouped: dict[str, list[dict[str, Any]]] = {}
+            for rule in _iter_server_rules(scope_entries):
+                server = _normalize_server_name(str(rule["server"]))
+                grouped.setdefault(server, []).append(rule)
+
+            wildcard = grouped.pop("*", None)
+            if wildcard:
+                wildcard_rules[scope_name] = _merge_rules(wildcard)
+            if grouped:
+                server_rules[scope_name] = {
+                    server: _merge_rules(rules) for server, rules in grouped.items()
+                }
+
+        return cls(server_rules, wildcard_rules)
+
+    @property
+    def scope_count(self) -> int:
+        """Number of scopes with at least one server access rule."""
+        return len(self._server_rules.keys() | self._wildcard_rules.keys())
+
+    def is_allowed(
+        self,
+        server_name: str,
+        method: str,
+        tool_name: str | None,
+        user_scopes: list[str],
+    ) -> str | None:
+        """
+        Check whether any of the user's scopes grants access.
+
+        Args:
+            server_name: Name of the MCP server
+            method: MCP method being accessed
+            tool_name: Tool name for tools/call, otherwise None
+            user_scopes: Scopes from the user's token
+
+        Returns:
+            The first scope granting access, or None if access is denied
+        """
+        server = _normalize_server_name(server_name)
+        for scope in user_scopes:
+            rule = self._server_rules.get(scope, {}).get(server)
+            if rule is not None and rule.allows(method, tool_name):
+                return scope
+            rule = self._wildcard_rules.get(scope)
+            if rule is not None and rule.allows(method, tool_name):
+                return scope
+        return None
+
+
+# Active table; None until scopes have been loaded successfully
+_scope_table: CompiledScopeTable | None = None
+
+
+def get_scope_table() -> CompiledScopeTable | None:
+    """Return the active compiled scope table, or None if not loaded yet."""
+    return _scope_table
+
+
+def rebuild_scope_table(scopes_config: dict[str, Any]) -> CompiledScopeTable:
+    """
+    Compile a scopes configuration and atomically make it the active table.
+
+    Args:
+        scopes_config: Scopes configuration as returned by reload_scopes_config()
+
+    Returns:
+        The newly active table
+    """
+    global _scope_table
+    table = CompiledScopeTable.from_config(scopes_config)
+    _scope_table = table
+    logger.info(f"Compiled scope authorization table with {table.scope_count} scopes")
+    return table
+
+
+def clear_scope_table() -> None:
+    """Drop the active table so callers fall back to repository lookups."""
+    global _scope_table
+    _scope_table = None
@@ -4,6 +4,7 @@ Configuration is passed via headers instead of environment variables.
 """
 
 import argparse
+import asyncio
 import hashlib
 import json
 import logging
@@ -21,9 +22,7 @@ from string import Template
 from typing import Any
 
 import boto3
-import httpx
 import jwt
-import requests
 import uvicorn
 import yaml
 from botocore.exceptions import ClientError
@@ -36,8 +35,17 @@ from jwt.api_jwk import PyJWK
 from metrics_middleware import add_auth_metrics_middleware
 
 # Import provider factory
+from providers.base import (
+    close_http_client,
+    get_all_jwks_managers,
+    get_http_client,
+    run_blocking,
+    shutdown_blocking_executor,
+)
 from providers.factory import get_auth_provider
+from decision_cache import AuthDecisionCache, CachedDecision, build_decision_key, token_expiry
 from pydantic import BaseModel
+from scope_authorizer import clear_scope_table, get_scope_table, rebuild_scope_table
 
 sys.path.insert(0, "/app")
 from registry.common.scopes_loader import reload_scopes_config
@@ -64,6 +72,17 @@ MAX_TOKENS_PER_USER_PER_HOUR = int(os.environ.get("MAX_TOKENS_PER_USER_PER_HOUR"
 # Global scopes configuration (will be loaded during FastAPI startup)
 SCOPES_CONFIG = {}
 
+# Seconds between background reloads of the scopes configuration. Only the replica
+# that receives /internal/reload-scopes reloads at once; this lets every other
+# replica pick the change up too (0 disables)
+SCOPES_REFRESH_INTERVAL_SECONDS = float(os.environ.get("SCOPES_REFRESH_INTERVAL_SECONDS", "30"))
+
+# Cache of /validate decisions keyed by credential hash and requested server/method/tool
+auth_decision_cache = AuthDecisionCache(
+    max_entries=int(os.environ.get("AUTH_DECISION_CACHE_MAX_ENTRIES", "10000")),
+    ttl_seconds=float(os.environ.get("AUTH_DECISION_CACHE_TTL_SECONDS", "60")),
+)
+
 # Static token auth: use static API key instead of IdP JWT for Registry API
 _registry_static_token_requested: bool = (
     os.environ.get("REGISTRY_STATIC_TOKEN_AUTH_ENABLED", "false").lower() == "true"
@@ -358,6 +377,9 @@ async def validate_server_tool_access(
     """
     Validate if the user has access to the specified server method/tool based on scopes.
 
+    Uses the compiled in-memory scope table, so no repository calls are made on
+    the request path once scopes have been loaded.
+
     Args:
         server_name: Name of the MCP server
         method: Name of the method being accessed (e.g., 'initialize', 'notifications/initialized', 'tools/list')
@@ -367,6 +389,32 @@ async def validate_server_tool_access(
     Returns:
         True if access is allowed, False otherwise
     """
+    scope_table = get_scope_table()
+    if scope_table is not None:
+        granting_scope = scope_table.is_allowed(server_name, method, tool_name, user_scopes)
+        if granting_scope:
+            logger.debug(
+                f"Access granted: scope '{granting_scope}' allows access to {server_name}.{method} (tool: {tool_name})"
+            )
+            return True
+        logger.warning(
+            f"Access denied: no scope allows access to {server_name}.{method} (tool: {tool_name}) for user scopes: {user_scopes}"
+        )
+        return False
+
+    return await _validate_server_tool_access_from_repository(
+        server_name, method, tool_name, user_scopes
+    )
+
+
+async def _validate_server_tool_access_from_repository(
+    server_name: str, method: str, tool_name: str, user_scopes: list[str]
+) -> bool:
+    """
+    Validate server/tool access by querying the scope repository per scope.
+
+    Used only until the compiled scope table has been loaded.
+    """
     try:
         # Verbose logging: Print input parameters
         logger.info("=== VALIDATE_SERVER_TOOL_ACCESS START ===")
@@ -536,6 +584,61 @@ def check_rate_limit(username: str) -> bool:
     return True
 
 
+def _refresh_scope_table(scopes_config: dict) -> None:
+    """
+    Recompile the scope authorization table from a freshly loaded scopes config.
+
+    Cached /validate decisions are dropped since they may reflect the old scopes.
+    An empty config usually means the repository could not be reached, so the
+    table is dropped and access checks fall back to per-request repository lookups.
+    """
+    auth_decision_cache.clear()
+    table = rebuild_scope_table(scopes_config)
+    if table.scope_count == 0:
+        logger.warning("No server access scopes loaded; using repository lookups for access checks")
+        clear_scope_table()
+
+
+async def _reload_scopes_if_changed() -> bool:
+    """
+    Reload the scopes configuration and recompile the scope table if it changed.
+
+    With the DocumentDB backend the repository reads are served by the scope
+    collection cache, which follows remote writes through change streams or its
+    version counter (plus a max-age reload for writes that bypass the repository),
+    so an unchanged configuration costs no database round-trips.
+    A result with no scopes at all is what the loader returns when the repository
+    is unreachable; the current table is kept in that case.
+
+    Returns:
+        True if a changed configuration was applied
+    """
+    global SCOPES_CONFIG
+    config = await reload_scopes_config()
+    if config == SCOPES_CONFIG:
+        return False
+    if not config.get("group_mappings") and len(config) <= 1:
+        logger.warning("Periodic scopes reload returned no scopes; keeping the current scope table")
+        return False
+
+    SCOPES_CONFIG = config
+    _refresh_scope_table(config)
+    logger.info("Scopes configuration changed; recompiled the scope table")
+    return True
+
+
+async def _refresh_scopes_periodically() -> None:
+    """Background task that keeps this replica's scope table in sync with the repository."""
+    while True:
+        await asyncio.sleep(SCOPES_REFRESH_INTERVAL_SECONDS)
+        try:
+            await _reload_scopes_if_changed()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Periodic scopes reload failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
@@ -546,14 +649,40 @@ async def lifespan(app: FastAPI):
         logger.info(
             f"Loaded scopes configuration on startup with {len(SCOPES_CONFIG.get('group_mappings', {}))} group mappings"
         )
+        _refresh_scope_table(SCOPES_CONFIG)
     except Exception as e:
         logger.error(f"Failed to load scopes configuration on startup: {e}", exc_info=True)
         # Fall back to empty config
         SCOPES_CONFIG = {"group_mappings": {}}
+        clear_scope_table()
+        auth_decision_cache.clear()
+
+    scopes_refresh_task = None
+    if SCOPES_REFRESH_INTERVAL_SECONDS > 0:
+        scopes_refresh_task = asyncio.create_task(_refresh_scopes_periodically())
+
+    # Start refreshing the provider's JWKS in the background so key expiry
+    # and rotation never block token validation
+    try:
+        jwks_manager = getattr(get_auth_provider(), "jwks_manager", None)
+        if jwks_manager is not None:
+            jwks_manager.ensure_background_refresh()
+    except Exception as e:
+        logger.warning(f"Could not start background JWKS refresh: {e}")
 
     yield
 
-    # Shutdown: Add cleanup code here if needed in the future
+    # Shutdown: stop background refresh tasks and release pooled resources
+    if scopes_refresh_task is not None:
+        scopes_refresh_task.cancel()
+        try:
+            await scopes_refresh_task
+        except asyncio.CancelledError:
+            pass
+    for jwks_manager in get_all_jwks_managers():
+        await jwks_manager.stop_background_refresh()
+    await close_http_client()
+    shutdown_blocking_executor()
     logger.info("Shutting down auth server")
 
 
@@ -579,10 +708,13 @@ async def startup_event():
         logger.info(
             f"Loaded scopes configuration on startup with {len(SCOPES_CONFIG.get('group_mappings', {}))} group mappings"
         )
+        _refresh_scope_table(SCOPES_CONFIG)
     except Exception as e:
         logger.error(f"Failed to load scopes configuration on startup: {e}", exc_info=True)
         # Fall back to empty config
         SCOPES_CONFIG = {"group_mappings": {}}
+        clear_scope_table()
+        auth_decision_cache.clear()
 
 
 # Add metrics collection middleware
@@ -644,7 +776,7 @@ class SimplifiedCognitoValidator:
             self._cognito_clients[region] = boto3.client("cognito-idp", region_name=region)
         return self._cognito_clients[region]
 
-    def _get_jwks(self, user_pool_id: str, region: str) -> dict:
+    async def _get_jwks(self, user_pool_id: str, region: str) -> dict:
         """
         Get JSON Web Key Set (JWKS) from Cognito with caching
         """
@@ -655,7 +787,7 @@ class SimplifiedCognitoValidator:
                 issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
                 jwks_url = f"{issuer}/.well-known/jwks.json"
 
-                response = requests.get(jwks_url, timeout=10)
+                response = await get_http_client().get(jwks_url, timeout=10)
                 response.raise_for_status()
                 jwks = response.json()
 
@@ -670,7 +802,7 @@ class SimplifiedCognitoValidator:
 
         return self._jwks_cache[cache_key]
 
-    def validate_jwt_token(
+    async def validate_jwt_token(
         self, access_token: str, user_pool_id: str, client_id: str, region: str = None
     ) -> dict:
         """
@@ -700,7 +832,7 @@ class SimplifiedCognitoValidator:
                 raise ValueError("Token missing 'kid' in header")
 
             # Get JWKS and find matching key
-            jwks = self._get_jwks(user_pool_id, region)
+            jwks = await self._get_jwks(user_pool_id, region)
             signing_key = None
 
             for key in jwks.get("keys", []):
@@ -904,7 +1036,7 @@ class SimplifiedCognitoValidator:
             logger.error(error_msg)
             raise ValueError(f"Self-signed token validation failed: {e}")
 
-    def validate_token(
+    async def validate_token(
         self, access_token: str, user_pool_id: str, client_id: str, region: str = None
     ) -> dict:
         """
@@ -936,7 +1068,9 @@ class SimplifiedCognitoValidator:
 
         # Try JWT validation with Cognito
         try:
-            jwt_claims = self.validate_jwt_token(access_token, user_pool_id, client_id, region)
+            jwt_claims = await self.validate_jwt_token(
+                access_token, user_pool_id, client_id, region
+            )
 
             # Extract scopes and other info
             scopes = []
@@ -959,7 +1093,8 @@ class SimplifiedCognitoValidator:
 
             # Try boto3 validation as fallback
             try:
-                boto3_data = self.validate_with_boto3(access_token, region)
+                # boto3 has no async client, so GetUser runs on the worker pool
+                boto3_data = await run_blocking(self.validate_with_boto3, access_token, region)
 
                 return {
                     "valid": True,
@@ -1013,10 +1148,116 @@ def _is_registry_api_request(
     return False
 
 
+def _resolve_access_target(
+    original_url: str | None,
+    request_payload: Any,
+    server_name_from_url: str | None,
+    endpoint_from_url: str | None,
+) -> tuple[str | None, str | None, str | None, str | None]:
+    """
+    Determine the server, tool, method and tools/call tool name a request targets.
+
+    Args:
+        original_url: X-Original-URL header value
+        request_payload: Parsed JSON-RPC payload from the X-Body header, if any
+        server_name_from_url: First path component of the original URL
+        endpoint_from_url: Second path component of the original URL
+
+    Returns:
+        Tuple of (server_name, tool_name, method, actual_tool_name). method and
+        actual_tool_name are None when no server was requested.
+    """
+    # Parse server and tool information from original URL if available
+    server_name = server_name_from_url
+    tool_name = None
+
+    if original_url and request_payload:
+        # server_name comes from the URL path, now just get tool_name from URL parsing
+        _, tool_name = parse_server_and_tool_from_url(original_url)
+        logger.debug(f"Parsed from original URL: server='{server_name}', tool='{tool_name}'")
+
+        # Try to extract tool name from request payload if not found in URL
+        if server_name and not tool_name and request_payload:
+            try:
+                # Look for tool name in JSON-RPC 2.0 format and other MCP patterns
+                if isinstance(request_payload, dict):
+                    # JSON-RPC 2.0 format: method field contains the tool name
+                    tool_name = request_payload.get("method")
+
+                    # If not found in method, check other common patterns
+                    if not tool_name:
+                        tool_name = request_payload.get("tool") or request_payload.get("name")
+
+                    # Check for nested tool reference in params
+                    if not tool_name and "params" in request_payload:
+                        params = request_payload["params"]
+                        if isinstance(params, dict):
+                            tool_name = (
+                                params.get("name") or params.get("tool") or params.get("method")
+                            )
+
+                    logger.debug(f"Extracted tool name from JSON-RPC payload: '{tool_name}'")
+                else:
+                    logger.warning(f"Payload is not a dictionary: {type(request_payload)}")
+            except Exception as e:
+                logger.error(f"Error processing request payload for tool extraction: {e}")
+
+    if not server_name:
+        return server_name, tool_name, None, None
+
+    # Determine the method to validate:
+    # 1. If we have a tool_name from JSON-RPC payload, use that
+    # 2. If we have an endpoint from the REST API URL, use that
+    # 3. Otherwise default to "initialize"
+    method = (
+        tool_name
+        if tool_name
+        else (endpoint_from_url if endpoint_from_url else "initialize")
+    )
+    logger.debug(
+        f"Method determined for validation: '{method}' (tool_name={tool_name}, endpoint_from_url={endpoint_from_url})"
+    )
+    actual_tool_name = None
+
+    # For tools/call, extract the actual tool name from params
+    if method == "tools/call" and isinstance(request_payload, dict):
+        params = request_payload.get("params", {})
+        if isinstance(params, dict):
+            actual_tool_name = params.get("name")
+            logger.debug(f"Extracted actual tool name for tools/call: '{actual_tool_name}'")
+
+    return server_name, tool_name, method, actual_tool_name
+
+
+def _build_validation_response(response_data: dict) -> JSONResponse:
+    """
+    Create the /validate JSON response with the headers nginx reads via auth_request_set.
+
+    Args:
+        response_data: Successful validation response body
+
+    Returns:
+        JSONResponse with X-User, X-Scopes and related headers set
+    """
+    response = JSONResponse(content=response_data, status_code=200)
+    response.headers["X-User"] = response_data["username"]
+    response.headers["X-Username"] = response_data["username"]
+    response.headers["X-Client-Id"] = response_data["client_id"]
+    response.headers["X-Scopes"] = " ".join(response_data["scopes"])
+    response.headers["X-Auth-Method"] = response_data["method"]
+    response.headers["X-Server-Name"] = response_data["server_name"] or ""
+    response.headers["X-Tool-Name"] = response_data["tool_name"] or ""
+    return response
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "simplified-auth-server"}
+    return {
+        "status": "healthy",
+        "service": "simplified-auth-server",
+        "decision_cache": auth_decision_cache.get_stats(),
+    }
 
 
 @app.get("/validate")
@@ -1073,16 +1314,11 @@ async def validate_request(request: Request):
                     f"Failed to extract server_name from original_url {original_url}: {e}"
                 )
 
-        # Read request body
+        # Read request body; the payload is only logged once the caller is authenticated
         request_payload = None
         try:
             if body:
-                payload_text = body  # .decode('utf-8')
-                logger.info(
-                    f"Raw Request Payload ({len(payload_text)} chars): {payload_text[:1000]}..."
-                )
-                request_payload = json.loads(payload_text)
-                logger.info(f"JSON RPC Request Payload: {json.dumps(request_payload, indent=2)}")
+                request_payload = json.loads(body)
             else:
                 logger.info("No request body provided, skipping payload parsing")
         except UnicodeDecodeError as e:
@@ -1171,18 +1407,39 @@ async def validate_request(request: Request):
 
             return response
 
+        # Extract session cookie value if present
+        cookie_value = None
+        if "mcp_gateway_session=" in cookie_header:
+            for cookie in cookie_header.split(";"):
+                if cookie.strip().startswith("mcp_gateway_session="):
+                    cookie_value = cookie.strip().split("=", 1)[1]
+                    break
+
+        server_name, tool_name, method, actual_tool_name = _resolve_access_target(
+            original_url, request_payload, server_name_from_url, endpoint_from_url
+        )
+
+        # Repeated requests with the same bearer token and target reuse the earlier
+        # allow decision, skipping token validation, group mapping and scope checks.
+        # Session cookies are never cached: a logout must take effect immediately.
+        decision_key = None
+        if not cookie_value:
+            decision_key = build_decision_key(
+                authorization,
+                (server_name, tool_name, method, actual_tool_name),
+                (user_pool_id, client_id, region),
+            )
+        cached_decision = auth_decision_cache.get(decision_key)
+        if cached_decision is not None:
+            logger.debug(f"Decision cache hit for {server_name}.{method} (tool: {actual_tool_name})")
+            return _build_validation_response(cached_decision.response_data)
+
         # Initialize validation result
         validation_result = None
 
         # FIRST: Check for session cookie if present
         if "mcp_gateway_session=" in cookie_header:
             logger.info("Session cookie detected, attempting session validation")
-            # Extract cookie value
-            cookie_value = None
-            for cookie in cookie_header.split(";"):
-                if cookie.strip().startswith("mcp_gateway_session="):
-                    cookie_value = cookie.strip().split("=", 1)[1]
-                    break
 
             if cookie_value:
                 try:
@@ -1222,7 +1479,7 @@ async def validate_request(request: Request):
                 # Provider-specific validation
                 if hasattr(auth_provider, "validate_token"):
                     # For Keycloak, no additional headers needed
-                    validation_result = auth_provider.validate_token(access_token)
+                    validation_result = await auth_provider.validate_token(access_token)
                     logger.info(
                         f"Token validation successful using {auth_provider.__class__.__name__}"
                     )
@@ -1245,7 +1502,7 @@ async def validate_request(request: Request):
                         )
 
                     # Use old validator for backward compatibility
-                    validation_result = validator.validate_token(
+                    validation_result = await validator.validate_token(
                         access_token=access_token,
                         user_pool_id=user_pool_id,
                         client_id=client_id,
@@ -1261,41 +1518,11 @@ async def validate_request(request: Request):
                 )
 
         logger.info(f"Token validation successful using method: {validation_result['method']}")
-
-        # Parse server and tool information from original URL if available
-        server_name = server_name_from_url  # Use the server_name we extracted earlier
-        tool_name = None
-
-        if original_url and request_payload:
-            # We already extracted server_name above, now just get tool_name from URL parsing
-            _, tool_name = parse_server_and_tool_from_url(original_url)
-            logger.debug(f"Parsed from original URL: server='{server_name}', tool='{tool_name}'")
-
-            # Try to extract tool name from request payload if not found in URL
-            if server_name and not tool_name and request_payload:
-                try:
-                    # Look for tool name in JSON-RPC 2.0 format and other MCP patterns
-                    if isinstance(request_payload, dict):
-                        # JSON-RPC 2.0 format: method field contains the tool name
-                        tool_name = request_payload.get("method")
-
-                        # If not found in method, check other common patterns
-                        if not tool_name:
-                            tool_name = request_payload.get("tool") or request_payload.get("name")
-
-                        # Check for nested tool reference in params
-                        if not tool_name and "params" in request_payload:
-                            params = request_payload["params"]
-                            if isinstance(params, dict):
-                                tool_name = (
-                                    params.get("name") or params.get("tool") or params.get("method")
-                                )
-
-                        logger.info(f"Extracted tool name from JSON-RPC payload: '{tool_name}'")
-                    else:
-                        logger.warning(f"Payload is not a dictionary: {type(request_payload)}")
-                except Exception as e:
-                    logger.error(f"Error processing request payload for tool extraction: {e}")
+        if request_payload is not None:
+            logger.info(f"JSON RPC Request Payload: {json.dumps(request_payload, indent=2)}")
+        logger.info(
+            f"Access target: server='{server_name}', method='{method}', tool='{actual_tool_name}'"
+        )
 
         # Validate scope-based access if we have server/tool information
         # For providers that use groups (Keycloak, Entra ID, Cognito), map groups to scopes
@@ -1308,30 +1535,6 @@ async def validate_request(request: Request):
         else:
             user_scopes = validation_result.get("scopes", [])
         if server_name:
-            # For ANY server access, enforce scope validation (fail closed principle)
-            # This includes MCP initialization methods that may not have a specific tool
-
-            # Determine the method to validate:
-            # 1. If we have a tool_name from JSON-RPC payload, use that
-            # 2. If we have an endpoint from the REST API URL, use that
-            # 3. Otherwise default to "initialize"
-            method = (
-                tool_name
-                if tool_name
-                else (endpoint_from_url if endpoint_from_url else "initialize")
-            )
-            logger.info(
-                f"Method determined for validation: '{method}' (tool_name={tool_name}, endpoint_from_url={endpoint_from_url})"
-            )
-            actual_tool_name = None
-
-            # For tools/call, extract the actual tool name from params
-            if method == "tools/call" and isinstance(request_payload, dict):
-                params = request_payload.get("params", {})
-                if isinstance(params, dict):
-                    actual_tool_name = params.get("name")
-                    logger.info(f"Extracted actual tool name for tools/call: '{actual_tool_name}'")
-
             # Check if user has any scopes - if not, deny access (fail closed)
             if not user_scopes:
                 logger.warning(
@@ -1373,19 +1576,10 @@ async def validate_request(request: Request):
         }
         logger.info(f"Full validation result: {json.dumps(validation_result, indent=2)}")
         logger.info(f"Response data being sent: {json.dumps(response_data, indent=2)}")
-        # Create JSON response with headers that nginx can use
-        response = JSONResponse(content=response_data, status_code=200)
-
-        # Set headers for nginx auth_request_set directives
-        response.headers["X-User"] = validation_result.get("username") or ""
-        response.headers["X-Username"] = validation_result.get("username") or ""
-        response.headers["X-Client-Id"] = validation_result.get("client_id") or ""
-        response.headers["X-Scopes"] = " ".join(user_scopes)
-        response.headers["X-Auth-Method"] = validation_result.get("method") or ""
-        response.headers["X-Server-Name"] = server_name or ""
-        response.headers["X-Tool-Name"] = tool_name or ""
-
-        return response
+        auth_decision_cache.put(
+            decision_key, CachedDecision(response_data), token_expiry(validation_result)
+        )
+        return _build_validation_response(response_data)
 
     except ValueError as e:
         logger.warning(f"Token validation failed: {e}")
@@ -1421,7 +1615,7 @@ async def get_auth_config():
     """Return the authentication configuration info"""
     try:
         auth_provider = get_auth_provider()
-        provider_info = auth_provider.get_provider_info()
+        provider_info = await auth_provider.get_provider_info()
 
         if provider_info.get("provider_type") == "keycloak":
             return {
@@ -1567,7 +1761,7 @@ async def generate_user_token(request: GenerateTokenRequest):
         # Fall back to M2M token using client credentials flow
         try:
             auth_provider = get_auth_provider()
-            provider_info = auth_provider.get_provider_info()
+            provider_info = await auth_provider.get_provider_info()
             provider_type = provider_info.get("provider_type", "unknown")
 
             logger.info(
@@ -1576,10 +1770,10 @@ async def generate_user_token(request: GenerateTokenRequest):
 
             if provider_type == "keycloak":
                 # Request token from Keycloak using M2M client credentials
-                token_data = auth_provider.get_m2m_token(scope="openid email profile")
+                token_data = await auth_provider.get_m2m_token(scope="openid email profile")
             elif provider_type == "entra":
                 # Request token from Entra ID using client credentials
-                token_data = auth_provider.get_m2m_token()
+                token_data = await auth_provider.get_m2m_token()
             else:
                 raise HTTPException(
                     status_code=500,
@@ -1680,6 +1874,7 @@ async def reload_scopes(request: Request, authorization: str | None = Header(Non
     global SCOPES_CONFIG
     try:
         SCOPES_CONFIG = await reload_scopes_config()
+        _refresh_scope_table(SCOPES_CONFIG)
         logger.info(f"Successfully reloaded scopes configuration by admin '{username}'")
 
         return JSONResponse(
@@ -2076,8 +2271,11 @@ async def oauth2_callback(
                     if user_pool_id and client_id:
                         # Use our existing token validation to get groups from JWT
                         validator = SimplifiedCognitoValidator(region)
-                        token_validation = validator.validate_token(
-                            token_data["access_token"], user_pool_id, client_id, region
+                        token_validation = await validator.validate_token(
+                            token_data["access_token"],
+                            user_pool_id,
+                            client_id,
+                            region,
                         )
 
                         logger.info(f"Token validation result: {token_validation}")
@@ -2269,32 +2467,31 @@ async def exchange_code_for_token(
             os.environ.get("AUTH_SERVER_URL", "http://localhost:8888").rstrip("/") + ROOT_PATH
         )
 
-    async with httpx.AsyncClient() as client:
-        token_data = {
-            "grant_type": provider_config["grant_type"],
-            "client_id": provider_config["client_id"],
-            "client_secret": provider_config["client_secret"],
-            "code": code,
-            "redirect_uri": f"{auth_server_url}/oauth2/callback/{provider}",
-        }
+    client = get_http_client()
+    token_data = {
+        "grant_type": provider_config["grant_type"],
+        "client_id": provider_config["client_id"],
+        "client_secret": provider_config["client_secret"],
+        "code": code,
+        "redirect_uri": f"{auth_server_url}/oauth2/callback/{provider}",
+    }
 
-        headers = {"Accept": "application/json"}
-        if provider == "github":
-            headers["Accept"] = "application/json"
+    headers = {"Accept": "application/json"}
+    if provider == "github":
+        headers["Accept"] = "application/json"
 
-        response = await client.post(provider_config["token_url"], data=token_data, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await client.post(provider_config["token_url"], data=token_data, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
 async def get_user_info(access_token: str, provider_config: dict) -> dict:
     """Get user information from OAuth2 provider"""
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {access_token}"}
+    headers = {"Authorization": f"Bearer {access_token}"}
 
-        response = await client.get(provider_config["user_info_url"], headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await get_http_client().get(provider_config["user_info_url"], headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
 def map_user_info(user_info: dict, provider_config: dict) -> dict:
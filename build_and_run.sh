@@ -237,7 +237,7 @@ log "Existing services stopped"
 # Clean up FAISS index files to force registry to recreate them
 log "Checking FAISS index files..."
 MCPGATEWAY_SERVERS_DIR="${HOME}/mcp-gateway/servers"
-FAISS_FILES=("service_index.faiss" "service_index_metadata.json")
+FAISS_FILES=("service_index.faiss" "service_index_metadata.json" "tool_index.faiss" "tool_index_metadata.json")
 
 # Check if FAISS index files exist
 FAISS_EXISTS=false
@@ -263,7 +263,7 @@ if [ "$FAISS_EXISTS" = true ]; then
     echo "║                                                                            ║"
     echo "║  If you need to regenerate the FAISS index (e.g., after corruption):      ║"
     echo "║  1. Delete the existing files:                                            ║"
-    echo "║     rm $MCPGATEWAY_SERVERS_DIR/service_index*"
+    echo "║     rm $MCPGATEWAY_SERVERS_DIR/service_index* $MCPGATEWAY_SERVERS_DIR/tool_index*"
     echo "║  2. The registry will automatically rebuild the index on startup          ║"
     echo "║                                                                            ║"
     echo "╚════════════════════════════════════════════════════════════════════════════╝"
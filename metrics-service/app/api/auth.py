@@ -4,11 +4,22 @@ import logging
 from ..storage.database import MetricsStorage
 from ..utils.helpers import hash_api_key
 from ..core.rate_limiter import rate_limiter
+from ..core.api_key_cache import api_key_cache
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+async def _get_key_info(key_hash: str) -> dict | None:
+    """Look up an API key, going to the database only on a cache miss."""
+    cached, key_info = api_key_cache.lookup(key_hash)
+    if not cached:
+        storage = MetricsStorage()
+        key_info = await storage.get_api_key(key_hash)
+        api_key_cache.store(key_hash, key_info)
+    return key_info
+
+
 async def verify_api_key(request: Request) -> str:
     """Verify API key from X-API-Key header and check rate limits."""
     api_key = request.headers.get("X-API-Key")
@@ -22,9 +33,8 @@ async def verify_api_key(request: Request) -> str:
     # Hash the provided API key
     key_hash = hash_api_key(api_key)
     
-    # Verify against database
-    storage = MetricsStorage()
-    key_info = await storage.get_api_key(key_hash)
+    # Verify against cache, then database
+    key_info = await _get_key_info(key_hash)
     
     if not key_info:
         raise HTTPException(
@@ -53,8 +63,8 @@ async def verify_api_key(request: Request) -> str:
             }
         )
     
-    # Update last used timestamp
-    await storage.update_api_key_usage(key_hash)
+    # Update last used timestamp (written in batches by the usage flush task)
+    api_key_cache.record_usage(key_hash)
     
     # Add rate limit headers
     request.state.rate_limit_remaining = remaining
@@ -68,9 +78,8 @@ async def get_rate_limit_status(api_key: str) -> dict:
     """Get current rate limit status for an API key."""
     key_hash = hash_api_key(api_key)
     
-    # Get key info from database
-    storage = MetricsStorage()
-    key_info = await storage.get_api_key(key_hash)
+    # Get key info from cache or database
+    key_info = await _get_key_info(key_hash)
     
     if not key_info:
         raise HTTPException(status_code=401, detail="Invalid API key")
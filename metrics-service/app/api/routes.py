@@ -3,8 +3,9 @@ from typing import List, Dict, Any, Optional
 import uuid
 import logging
 from ..core.models import MetricRequest, MetricResponse, ErrorResponse
-from ..core.processor import MetricsProcessor
+from ..core.processor import MetricsProcessor, IngestBackpressure
 from ..core.retention import retention_manager
+from ..core.rollup import rollup_manager
 from ..api.auth import verify_api_key, get_rate_limit_status
 from ..utils.helpers import generate_request_id, generate_api_key, hash_api_key
 from ..storage.database import MetricsStorage
@@ -43,6 +44,13 @@ async def collect_metrics(
             request_id=request_id
         )
         
+    except IngestBackpressure as e:
+        logger.warning(f"Rejected metrics from {metric_request.service}: {e} (request: {request_id})")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Error processing metrics: {e}")
         raise HTTPException(
@@ -180,6 +188,42 @@ async def update_retention_policy(
         )
 
 
+@router.get("/admin/rollups")
+async def get_rollups(
+    granularity: str = "hourly",
+    service: Optional[str] = None,
+    metric_type: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+):
+    """Get hourly or daily metric rollups."""
+    if granularity not in ("hourly", "daily"):
+        raise HTTPException(
+            status_code=400,
+            detail="granularity must be 'hourly' or 'daily'"
+        )
+    try:
+        rollups = await rollup_manager.query(granularity, service, metric_type, start, end)
+        return {
+            "granularity": granularity,
+            "rollups": rollups,
+            "status": await rollup_manager.get_status()
+        }
+    except Exception as e:
+        logger.error(f"Error getting rollups: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get rollups: {str(e)}"
+        )
+
+
+@router.get("/admin/ingest")
+async def get_ingest_status(api_key: str = Depends(verify_api_key)):
+    """Get ingest buffer depth, backpressure state and spill file status."""
+    return processor.get_stats()
+
+
 @router.get("/admin/database/stats")
 async def get_database_stats(api_key: str = Depends(verify_api_key)):
     """Get database table statistics."""
@@ -9,6 +9,7 @@ class Settings:
     METRICS_RETENTION_DAYS: int = int(os.getenv("METRICS_RETENTION_DAYS", "90"))
     DB_CONNECTION_TIMEOUT: int = int(os.getenv("DB_CONNECTION_TIMEOUT", "30"))
     DB_MAX_RETRIES: int = int(os.getenv("DB_MAX_RETRIES", "5"))
+    DB_READER_POOL_SIZE: int = int(os.getenv("DB_READER_POOL_SIZE", "4"))
     
     # Service settings
     METRICS_SERVICE_PORT: int = int(os.getenv("METRICS_SERVICE_PORT", "8890"))
@@ -22,12 +23,37 @@ class Settings:
     
     # API Security
     METRICS_RATE_LIMIT: int = int(os.getenv("METRICS_RATE_LIMIT", "1000"))
+    RATE_LIMIT_MAX_BUCKETS: int = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
     API_KEY_HASH_ALGORITHM: str = os.getenv("API_KEY_HASH_ALGORITHM", "sha256")
+    API_KEY_CACHE_TTL_SECONDS: float = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+    API_KEY_NEGATIVE_CACHE_TTL_SECONDS: float = float(os.getenv("API_KEY_NEGATIVE_CACHE_TTL_SECONDS", "10"))
+    API_KEY_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "10000"))
+    API_KEY_NEGATIVE_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_NEGATIVE_CACHE_MAX_ENTRIES", "1000"))
+    API_KEY_USAGE_FLUSH_SECONDS: int = int(os.getenv("API_KEY_USAGE_FLUSH_SECONDS", "30"))
     
     # Performance
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
     FLUSH_INTERVAL_SECONDS: int = int(os.getenv("FLUSH_INTERVAL_SECONDS", "30"))
     MAX_REQUEST_SIZE: str = os.getenv("MAX_REQUEST_SIZE", "10MB")
 
+    # Ingest buffer
+    INGEST_HIGH_WATERMARK: int = int(os.getenv("INGEST_HIGH_WATERMARK", "10000"))
+    INGEST_LOW_WATERMARK: int = int(os.getenv("INGEST_LOW_WATERMARK", "5000"))
+    INGEST_STORAGE_RETRY_SECONDS: float = float(os.getenv("INGEST_STORAGE_RETRY_SECONDS", "5"))
+    INGEST_SPILL_ENABLED: bool = os.getenv("INGEST_SPILL_ENABLED", "true").lower() == "true"
+    INGEST_SPILL_PATH: Optional[str] = os.getenv("INGEST_SPILL_PATH")
+    INGEST_SPILL_MAX_BYTES: int = int(os.getenv("INGEST_SPILL_MAX_BYTES", str(512 * 1024 * 1024)))
+
+    # Rollups
+    ROLLUP_INTERVAL_SECONDS: int = int(os.getenv("ROLLUP_INTERVAL_SECONDS", "60"))
+    ROLLUP_BATCH_SIZE: int = int(os.getenv("ROLLUP_BATCH_SIZE", "5000"))
+
+    # Retention
+    RETENTION_DELETE_BATCH_SIZE: int = int(os.getenv("RETENTION_DELETE_BATCH_SIZE", "2000"))
+    RETENTION_BATCH_PAUSE_SECONDS: float = float(os.getenv("RETENTION_BATCH_PAUSE_SECONDS", "0.05"))
+    RETENTION_VACUUM_PAGES: int = int(os.getenv("RETENTION_VACUUM_PAGES", "1000"))
+    RETENTION_FULL_VACUUM: bool = os.getenv("RETENTION_FULL_VACUUM", "false").lower() == "true"
+    METRICS_PARTITION_BY_DAY: bool = os.getenv("METRICS_PARTITION_BY_DAY", "false").lower() == "true"
+
 
 settings = Settings()
\ No newline at end of file
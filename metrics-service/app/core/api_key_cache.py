@@ -0,0 +1,116 @@
+"""In-memory cache of API key lookups with batched last-used write-back."""
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from ..config import settings
+from ..storage.database import MetricsStorage
+
+logger = logging.getLogger(__name__)
+
+
+class APIKeyCache:
+    """Caches api_keys rows by key hash so request authentication needs no database work.
+
+    Unknown keys are cached too (negative caching), for a shorter time and in
+    their own smaller LRU, so requests with bad keys cannot turn into one
+    SELECT each or push valid keys out of the cache. Last-used timestamps are
+    collected in memory and written in one batch by flush_usage(), which the
+    service runs periodically and on shutdown.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        negative_ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_negative_entries: Optional[int] = None,
+    ):
+        self.ttl_seconds = settings.API_KEY_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.negative_ttl_seconds = (
+            settings.API_KEY_NEGATIVE_CACHE_TTL_SECONDS if negative_ttl_seconds is None else negative_ttl_seconds
+        )
+        self.max_entries = settings.API_KEY_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_negative_entries = (
+            settings.API_KEY_NEGATIVE_CACHE_MAX_ENTRIES if max_negative_entries is None else max_negative_entries
+        )
+        # LRUs of {key_hash: (expires_at, key_info)}, least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._negative: "OrderedDict[str, Tuple[float, None]]" = OrderedDict()
+        # {key_hash: last used time, formatted like SQLite datetime('now')}
+        self._pending_usage: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key_hash: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (cached, key_info); key_info is None for a cached unknown key."""
+        for entries in (self._entries, self._negative):
+            entry = entries.get(key_hash)
+            if entry is None:
+                continue
+            if entry[0] > time.monotonic():
+                entries.move_to_end(key_hash)
+                self.hits += 1
+                return True, entry[1]
+            del entries[key_hash]
+            break
+        self.misses += 1
+        return False, None
+
+    def store(self, key_hash: str, key_info: Optional[Dict[str, Any]]):
+        """Cache the result of a database lookup (None if the key does not exist)."""
+        if key_info is not None:
+            entries, ttl, max_entries = self._entries, self.ttl_seconds, self.max_entries
+        else:
+            entries, ttl, max_entries = self._negative, self.negative_ttl_seconds, self.max_negative_entries
+        self.invalidate(key_hash)
+        if ttl <= 0 or max_entries <= 0:
+            return
+
+        entries[key_hash] = (time.monotonic() + ttl, key_info)
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+
+    def invalidate(self, key_hash: Optional[str] = None):
+        """Forget one cached key, or all of them."""
+        if key_hash is None:
+            self._entries.clear()
+            self._negative.clear()
+        else:
+            self._entries.pop(key_hash, None)
+            self._negative.pop(key_hash, None)
+
+    def record_usage(self, key_hash: str):
+        """Note that a key was used; written to the database by the next flush_usage()."""
+        self._pending_usage[key_hash] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    async def flush_usage(self) -> int:
+        """Write pending last-used timestamps; returns the number of keys updated."""
+        if not self._pending_usage:
+            return 0
+
+        pending, self._pending_usage = self._pending_usage, {}
+        try:
+            await MetricsStorage().update_api_key_usage_batch(pending)
+        except Exception:
+            # Keep the timestamps for the next flush unless the key was used again since
+            for key_hash, used_at in pending.items():
+                self._pending_usage.setdefault(key_hash, used_at)
+            raise
+        logger.debug(f"Flushed last-used timestamps for {len(pending)} API keys")
+        return len(pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size, hit counts and pending usage writes."""
+        return {
+            "entries": len(self._entries),
+            "negative_entries": len(self._negative),
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending_usage_updates": len(self._pending_usage),
+        }
+
+
+# Global API key cache instance
+api_key_cache = APIKeyCache()
@@ -1,13 +1,31 @@
 import asyncio
+import json
 import logging
+import math
+import os
+import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Deque, Optional, Tuple
+from ..config import settings
 from ..core.models import MetricRequest, Metric, MetricType
 from ..storage.database import MetricsStorage
 from ..core.validator import validator
 
 logger = logging.getLogger(__name__)
 
+# The writer stores a partial batch at least this often
+WRITER_FLUSH_INTERVAL_SECONDS = 5.0
+
+
+class IngestBackpressure(Exception):
+    """Raised when the ingest buffer is full; carries the HTTP status to return."""
+
+    def __init__(self, status_code: int, retry_after: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 
 class ProcessingResult:
     def __init__(self):
@@ -17,12 +35,46 @@ class ProcessingResult:
 
 
 class MetricsProcessor:
-    """Core metrics processing engine."""
+    """Core metrics processing engine.
+
+    Accepted metrics go into an in-memory buffer that a dedicated writer task
+    (run_writer) stores in batches, so request handlers never wait on disk.
+    Once the buffer reaches the high watermark new requests are refused with
+    429 (or 503 while storage is failing) until it drains to the low
+    watermark. Batches that cannot be stored are appended to a spill file
+    and replayed when storage recovers. Pass spill_path="" to disable it.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        high_watermark: Optional[int] = None,
+        low_watermark: Optional[int] = None,
+        spill_path: Optional[str] = None,
+    ):
         self.storage = MetricsStorage()
-        self._buffer = []
-        self._buffer_lock = asyncio.Lock()
+        self.batch_size = max(1, settings.BATCH_SIZE)
+        self.high_watermark = max(1, settings.INGEST_HIGH_WATERMARK if high_watermark is None else high_watermark)
+        self.low_watermark = min(
+            self.high_watermark,
+            settings.INGEST_LOW_WATERMARK if low_watermark is None else low_watermark
+        )
+        self.storage_retry_seconds = settings.INGEST_STORAGE_RETRY_SECONDS
+        self.spill_max_bytes = settings.INGEST_SPILL_MAX_BYTES
+        self._spill_path = spill_path
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._in_flight = 0
+        self._wakeup = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._accepting = True
+        self._storage_healthy = True
+        self._retry_at = 0.0
+        # Spill file size and how much of it has been replayed
+        self._spill_bytes = 0
+        self._spill_offset = 0
+        self.spilled_metrics = 0
+        self.replayed_metrics = 0
+        self.rejected_requests = 0
         
         # Try to initialize OTel instruments, but don't fail if it doesn't work
         self.otel = None
@@ -39,7 +91,11 @@ class MetricsProcessor:
         request_id: str, 
         api_key: str
     ) -> ProcessingResult:
-        """Process incoming metrics request."""
+        """Process incoming metrics request.
+
+        Raises IngestBackpressure if the ingest buffer is above its high watermark.
+        """
+        self._check_capacity()
         result = ProcessingResult()
         
         # Validate the entire request first
@@ -126,41 +182,316 @@ class MetricsProcessor:
             if metric.duration_ms:
                 self.otel.health_histogram.record(metric.duration_ms / 1000, labels)
     
+    
     async def _buffer_for_storage(
         self, 
         metric: Metric, 
         request: MetricRequest, 
         request_id: str
     ):
-        """Buffer metric for batch SQLite storage."""
-        async with self._buffer_lock:
-            self._buffer.append({
-                'metric': metric,
-                'request': request,
-                'request_id': request_id
-            })
-            
-            # Flush buffer if it's full
-            if len(self._buffer) >= 100:
-                await self._flush_buffer()
-    
-    async def _flush_buffer(self):
-        """Flush buffered metrics to SQLite."""
-        if not self._buffer:
+        """Buffer metric for the writer task; never waits on storage."""
+        self._buffer.append({
+            'metric': metric,
+            'request': request,
+            'request_id': request_id
+        })
+        self._update_admission()
+
+        # Wake the writer once a full batch is waiting
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        """Metrics accepted but not yet stored or spilled."""
+        return len(self._buffer) + self._in_flight
+
+    @property
+    def spill_path(self) -> Optional[str]:
+        """Spill file location, or None when spilling is disabled."""
+        if self._spill_path is not None:
+            return self._spill_path or None
+        if not settings.INGEST_SPILL_ENABLED:
+            return None
+        return settings.INGEST_SPILL_PATH or f"{settings.SQLITE_DB_PATH}.spill.jsonl"
+
+    def _check_capacity(self):
+        """Refuse new metrics while the buffer is above its high watermark."""
+        if self._accepting:
             return
-            
-        buffer_copy = self._buffer.copy()
-        self._buffer.clear()
-        
+
+        self.rejected_requests += 1
+        if not self._storage_healthy:
+            raise IngestBackpressure(
+                503,
+                math.ceil(self.storage_retry_seconds),
+                "Metrics storage unavailable, retry later"
+            )
+        raise IngestBackpressure(429, 1, "Metrics ingest buffer full, retry later")
+
+    def _update_admission(self):
+        """Stop accepting at the high watermark and resume at the low watermark."""
+        pending = self.pending
+        if self._accepting and pending >= self.high_watermark:
+            self._accepting = False
+            logger.warning(f"Ingest buffer reached high watermark ({pending} metrics), rejecting requests")
+        elif not self._accepting and pending <= self.low_watermark:
+            self._accepting = True
+            logger.info(f"Ingest buffer drained to {pending} metrics, accepting requests")
+
+    async def run_writer(self):
+        """Write buffered metrics to storage until cancelled.
+
+        Wakes when a full batch is buffered or every WRITER_FLUSH_INTERVAL_SECONDS,
+        and keeps replaying the spill file between batches once storage is healthy.
+        """
+        self._wakeup = asyncio.Event()
+        await self._load_spill_state()
+
+        while True:
+            try:
+                if not self._spill_backlog():
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), WRITER_FLUSH_INTERVAL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wakeup.clear()
+                await self._write_pending(replay=True)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in metrics writer: {e}")
+                await asyncio.sleep(WRITER_FLUSH_INTERVAL_SECONDS)
+
+    async def _write_pending(self, replay: bool = False):
+        """Store (or spill) everything buffered, then replay one spilled batch if asked."""
+        async with self._write_lock:
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+                written = False
+                try:
+                    written = await self._write_batch(batch)
+                finally:
+                    self._in_flight = 0
+                    if not written:
+                        # Keep the batch at the front of the buffer for the next attempt
+                        self._buffer.extendleft(reversed(batch))
+                    self._update_admission()
+                if not written:
+                    break
+
+            if replay and self._spill_backlog():
+                await self._replay_spill_batch()
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """Store a batch, spilling it to disk if storage fails; False if neither worked."""
+        if self._storage_healthy or time.monotonic() >= self._retry_at:
+            try:
+                await self.storage.store_metrics_batch(batch)
+                self._mark_storage_healthy()
+                logger.debug(f"Flushed {len(batch)} metrics to storage")
+                return True
+            except Exception as e:
+                self._mark_storage_failed(e)
+
+        return await self._spill(batch)
+
+    def _mark_storage_healthy(self):
+        """Record a successful write."""
+        if not self._storage_healthy:
+            logger.info("Metrics storage recovered")
+        self._storage_healthy = True
+
+    def _mark_storage_failed(self, error: Exception):
+        """Record a failed write and hold off storage retries."""
+        logger.error(f"Failed to flush metrics buffer: {error}")
+        self._storage_healthy = False
+        # Skip straight to the spill file until the retry time
+        self._retry_at = time.monotonic() + self.storage_retry_seconds
+
+    def _spill_backlog(self) -> bool:
+        """Whether spilled metrics are waiting and storage may be written to."""
+        return (
+            self._spill_bytes > self._spill_offset
+            and (self._storage_healthy or time.monotonic() >= self._retry_at)
+        )
+
+    async def _load_spill_state(self):
+        """Pick up a spill file left by a previous run, resuming replay at its saved offset."""
+        path = self.spill_path
+        if path:
+            self._spill_bytes = await asyncio.to_thread(_file_size, path)
+            offset = await asyncio.to_thread(_read_offset, _offset_path(path))
+            if not self._spill_bytes or offset > self._spill_bytes:
+                # Stale offset from a file that has since been removed or replaced
+                await asyncio.to_thread(_remove_file, _offset_path(path))
+                offset = 0
+            self._spill_offset = offset
+            if self._spill_bytes > offset:
+                logger.info(
+                    f"Found {self._spill_bytes - offset} bytes of spilled metrics to replay "
+                    f"from offset {offset}: {path}"
+                )
+
+    async def _spill(self, batch: List[Dict[str, Any]]) -> bool:
+        """Append a batch to the spill file; False if spilling is disabled, full or fails."""
+        path = self.spill_path
+        if not path:
+            return False
+
+        data = "".join(_entry_to_json(entry) + "\n" for entry in batch).encode()
+        if self._spill_bytes + len(data) > self.spill_max_bytes:
+            logger.error(f"Spill file full ({self._spill_bytes} bytes), keeping {len(batch)} metrics in memory")
+            return False
+
         try:
-            await self.storage.store_metrics_batch(buffer_copy)
-            logger.debug(f"Flushed {len(buffer_copy)} metrics to storage")
-        except Exception as e:
-            logger.error(f"Failed to flush metrics buffer: {e}")
-            # Re-add to buffer for retry
-            self._buffer.extend(buffer_copy)
-    
+            await asyncio.to_thread(_append_file, path, data)
+        except OSError as e:
+            logger.error(f"Failed to spill metrics to {path}: {e}")
+            return False
+
+        self._spill_bytes += len(data)
+        self.spilled_metrics += len(batch)
+        logger.warning(f"Spilled {len(batch)} metrics to {path}")
+        return True
+
+    async def _replay_spill_batch(self):
+        """Store the next batch of spilled metrics, removing the file once all are stored."""
+        path = self.spill_path
+        lines, offset = await asyncio.to_thread(_read_lines, path, self._spill_offset, self.batch_size)
+
+        batch = []
+        for line in lines:
+            try:
+                batch.append(_entry_from_json(line))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable spilled metric: {e}")
+
+        if batch:
+            try:
+                await self.storage.store_metrics_batch(batch)
+            except Exception as e:
+                self._mark_storage_failed(e)
+                return
+            self._mark_storage_healthy()
+            self.replayed_metrics += len(batch)
+
+        self._spill_offset = offset
+        if not lines or offset >= self._spill_bytes:
+            # Remove the spill file first: a leftover offset file is discarded on load
+            await asyncio.to_thread(_remove_file, path)
+            await asyncio.to_thread(_remove_file, _offset_path(path))
+            logger.info(f"Replayed spilled metrics from {path}")
+            self._spill_offset = self._spill_bytes = 0
+        else:
+            # Persist progress so a restart does not store these metrics again
+            await asyncio.to_thread(_write_offset, _offset_path(path), offset)
+
     async def force_flush(self):
-        """Force flush all buffered metrics."""
-        async with self._buffer_lock:
-            await self._flush_buffer()
\ No newline at end of file
+        """Force flush all buffered metrics (spilling them if storage is down)."""
+        await self._write_pending()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer depth, watermarks, storage health and spill counters."""
+        return {
+            "pending_metrics": self.pending,
+            "high_watermark": self.high_watermark,
+            "low_watermark": self.low_watermark,
+            "accepting": self._accepting,
+            "storage_healthy": self._storage_healthy,
+            "spill_backlog_bytes": self._spill_bytes - self._spill_offset,
+            "spilled_metrics": self.spilled_metrics,
+            "replayed_metrics": self.replayed_metrics,
+            "rejected_requests": self.rejected_requests
+        }
+
+
+def _entry_to_json(entry: Dict[str, Any]) -> str:
+    """Serialize a buffered metric as one spill file line."""
+    request = entry['request']
+    return json.dumps({
+        "request_id": entry['request_id'],
+        "service": request.service,
+        "version": request.version,
+        "instance_id": request.instance_id,
+        "metric": entry['metric'].model_dump(mode="json")
+    })
+
+
+def _entry_from_json(line: bytes) -> Dict[str, Any]:
+    """Rebuild a buffered metric from a spill file line."""
+    data = json.loads(line)
+    metric = Metric.model_validate(data["metric"])
+    request = MetricRequest(
+        service=data["service"],
+        version=data["version"],
+        instance_id=data["instance_id"],
+        metrics=[metric]
+    )
+    return {'metric': metric, 'request': request, 'request_id': data["request_id"]}
+
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes, 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _append_file(path: str, data: bytes):
+    """Append data to a file and fsync it."""
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_lines(path: str, offset: int, limit: int) -> Tuple[List[bytes], int]:
+    """Read up to limit lines starting at a byte offset; returns them and the new offset."""
+    lines = []
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while len(lines) < limit:
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line)
+                offset += len(line)
+    except FileNotFoundError:
+        pass
+    return lines, offset
+
+
+def _offset_path(spill_path: str) -> str:
+    """Location of the replay offset kept next to a spill file."""
+    return f"{spill_path}.offset"
+
+
+def _read_offset(path: str) -> int:
+    """Saved replay offset, 0 if missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return max(0, int(f.read().strip() or 0))
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _write_offset(path: str, offset: int):
+    """Atomically replace the saved replay offset."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(offset))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _remove_file(path: str):
+    """Remove a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
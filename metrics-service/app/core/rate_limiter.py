@@ -1,124 +1,130 @@
 """Rate limiting implementation for API keys."""
-import asyncio
+import math
 import time
 import logging
-from typing import Dict, Tuple
-from datetime import datetime, timedelta
-from ..storage.database import MetricsStorage
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Limits are per minute, so an idle bucket is full again after this long
+REFILL_WINDOW_SECONDS = 60.0
+
+
+class _Bucket:
+    """Token bucket state for one API key."""
+
+    __slots__ = ("tokens", "updated_at", "rate_limit")
+
+    def __init__(self, tokens: float, updated_at: float, rate_limit: int):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.rate_limit = rate_limit
+
+    def refill(self, now: float, rate_limit: int):
+        """Add tokens for the time elapsed since the last update, continuously."""
+        if rate_limit != self.rate_limit:
+            # Scale existing tokens proportionally
+            self.tokens = self.tokens * rate_limit / self.rate_limit if self.rate_limit else rate_limit
+            self.rate_limit = rate_limit
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(rate_limit, self.tokens + elapsed * rate_limit / REFILL_WINDOW_SECONDS)
+        self.updated_at = now
+
 
 class RateLimiter:
-    """Token bucket rate limiter for API keys."""
-    
-    def __init__(self):
-        # In-memory token buckets: {key_hash: (tokens, last_refill, rate_limit)}
-        self._buckets: Dict[str, Tuple[int, float, int]] = {}
-        self._lock = asyncio.Lock()
-    
+    """Token bucket rate limiter for API keys.
+
+    Checks are plain arithmetic with no awaits, so they are atomic on the
+    event loop and need no lock. Buckets are kept in least-recently-used
+    order. A bucket idle for a full refill window is indistinguishable from
+    a new one and is evicted; max_buckets caps memory for bursts of
+    distinct keys.
+    """
+
+    def __init__(self, max_buckets: Optional[int] = None):
+        self.max_buckets = max(1, settings.RATE_LIMIT_MAX_BUCKETS if max_buckets is None else max_buckets)
+        # In-memory token buckets, least recently used first
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self.evicted_buckets = 0
+
     async def check_rate_limit(self, key_hash: str, rate_limit: int) -> Tuple[bool, int]:
         """
         Check if request is allowed under rate limit.
-        
+
         Args:
             key_hash: The hashed API key
             rate_limit: Requests per minute limit
-            
+
         Returns:
             Tuple of (is_allowed, remaining_tokens)
         """
-        async with self._lock:
-            now = time.time()
-            
-            # Get or create bucket
-            if key_hash not in self._buckets:
-                # New bucket starts full, consume one token for this request
-                tokens = rate_limit - 1
-                self._buckets[key_hash] = (tokens, now, rate_limit)
-                return True, tokens
-            else:
-                tokens, last_refill, limit = self._buckets[key_hash]
-                
-                # Update rate limit if it changed
-                if limit != rate_limit:
-                    # Scale existing tokens proportionally
-                    tokens = int(tokens * (rate_limit / limit))
-                    limit = rate_limit
-            
-            # Refill tokens based on elapsed time
-            time_elapsed = now - last_refill
-            minutes_elapsed = time_elapsed / 60.0
-            
-            # Add tokens for elapsed time (rate_limit tokens per minute)
-            tokens_to_add = int(minutes_elapsed * rate_limit)
-            tokens = min(tokens + tokens_to_add, rate_limit)
-            
-            # Update last refill time if we added tokens
-            if tokens_to_add > 0:
-                last_refill = now
-            
-            # Check if request is allowed
-            if tokens > 0:
-                tokens -= 1
-                self._buckets[key_hash] = (tokens, last_refill, rate_limit)
-                logger.debug(f"Rate limit check passed. Remaining: {tokens}")
-                return True, tokens
-            else:
-                self._buckets[key_hash] = (tokens, last_refill, rate_limit)
-                logger.warning(f"Rate limit exceeded for key: {key_hash[:8]}...")
-                return False, 0
-    
+        now = time.monotonic()
+        bucket = self._buckets.get(key_hash)
+
+        if bucket is None:
+            # New bucket starts full
+            bucket = _Bucket(float(rate_limit), now, rate_limit)
+            self._buckets[key_hash] = bucket
+            self._evict(now)
+        else:
+            bucket.refill(now, rate_limit)
+            self._buckets.move_to_end(key_hash)
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            remaining = int(bucket.tokens)
+            return True, remaining
+
+        logger.warning(f"Rate limit exceeded for key: {key_hash[:8]}...")
+        return False, 0
+
     async def get_bucket_status(self, key_hash: str, rate_limit: int) -> Dict[str, int]:
         """Get current bucket status without consuming a token."""
-        async with self._lock:
-            now = time.time()
-            
-            if key_hash not in self._buckets:
-                return {
-                    "available_tokens": rate_limit,
-                    "rate_limit": rate_limit,
-                    "reset_time_seconds": 0
-                }
-            
-            tokens, last_refill, limit = self._buckets[key_hash]
-            
-            # Calculate tokens after refill
-            time_elapsed = now - last_refill
-            minutes_elapsed = time_elapsed / 60.0
-            tokens_to_add = int(minutes_elapsed * rate_limit)
-            current_tokens = min(tokens + tokens_to_add, rate_limit)
-            
-            # Calculate time until bucket is full
-            if current_tokens < rate_limit:
-                tokens_needed = rate_limit - current_tokens
-                reset_time_seconds = int((tokens_needed / rate_limit) * 60)
-            else:
-                reset_time_seconds = 0
-            
+        bucket = self._buckets.get(key_hash)
+        if bucket is None:
             return {
-                "available_tokens": current_tokens,
+                "available_tokens": rate_limit,
                 "rate_limit": rate_limit,
-                "reset_time_seconds": reset_time_seconds
+                "reset_time_seconds": 0
             }
-    
-    async def cleanup_old_buckets(self, max_age_hours: int = 24):
-        """Remove buckets that haven't been used recently."""
-        async with self._lock:
-            now = time.time()
-            cutoff = now - (max_age_hours * 3600)
-            
-            old_keys = []
-            for key_hash, (_, last_refill, _) in self._buckets.items():
-                if last_refill < cutoff:
-                    old_keys.append(key_hash)
-            
-            for key in old_keys:
-                del self._buckets[key]
-            
-            if old_keys:
-                logger.info(f"Cleaned up {len(old_keys)} old rate limit buckets")
+
+        bucket.refill(time.monotonic(), rate_limit)
+        self._buckets.move_to_end(key_hash)
+
+        # Calculate time until bucket is full
+        tokens_needed = rate_limit - bucket.tokens
+        reset_time_seconds = math.ceil(tokens_needed / rate_limit * REFILL_WINDOW_SECONDS) if rate_limit else 0
+
+        return {
+            "available_tokens": int(bucket.tokens),
+            "rate_limit": rate_limit,
+            "reset_time_seconds": reset_time_seconds
+        }
+
+    def _evict(self, now: float):
+        """Drop idle buckets from the LRU end, and the oldest ones beyond max_buckets."""
+        evicted = 0
+        while self._buckets:
+            key_hash, oldest = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_buckets and now - oldest.updated_at < REFILL_WINDOW_SECONDS:
+                break
+            del self._buckets[key_hash]
+            evicted += 1
+
+        if evicted:
+            self.evicted_buckets += evicted
+            logger.debug(f"Evicted {evicted} rate limit buckets")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Number of tracked and evicted buckets."""
+        return {
+            "active_buckets": len(self._buckets),
+            "evicted_buckets": self.evicted_buckets
+        }
 
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
\ No newline at end of file
+rate_limiter = RateLimiter()
@@ -1,9 +1,10 @@
 """Data retention and cleanup policies for metrics service."""
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from ..storage.database import MetricsStorage
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+from ..storage.database import MetricsStorage, get_connection_pool
+from ..storage.partitions import PARTITIONED_TABLES, drop_partition, list_partitions, parse_partition_name
 from ..config import settings
 import aiosqlite
 
@@ -36,6 +37,21 @@ class RetentionPolicy:
         cutoff_date = f"datetime('now', '-{self.retention_days} days')"
         return f"DELETE FROM {self.table_name} WHERE {self.timestamp_column} < {cutoff_date}"
     
+    def get_batch_cleanup_query(self) -> str:
+        """Get a query deleting at most ? expired rows, so each write transaction stays short."""
+        cutoff_date = f"datetime('now', '-{self.retention_days} days')"
+        return f"""
+            DELETE FROM {self.table_name} WHERE rowid IN (
+                SELECT rowid FROM {self.table_name}
+                WHERE {self.timestamp_column} < {cutoff_date}
+                LIMIT ?
+            )
+        """
+    
+    def get_partition_cutoff(self) -> date:
+        """Day partitions strictly older than this UTC day are entirely expired."""
+        return (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).date()
+    
     def get_count_query(self) -> str:
         """Get query to count records that would be deleted."""
         cutoff_date = f"datetime('now', '-{self.retention_days} days')"
@@ -191,6 +207,9 @@ class RetentionManager:
                     cursor = await db.execute(f"SELECT COUNT(*) FROM {policy.table_name}")
                     total_records = (await cursor.fetchone())[0]
                     
+                    # Day partitions that would be dropped whole
+                    expired_partitions = await self._expired_partitions(db, policy)
+                    
                     preview[policy.table_name] = {
                         'retention_days': policy.retention_days,
                         'records_to_delete': records_to_delete,
@@ -198,7 +217,8 @@ class RetentionManager:
                         'oldest_record_to_delete': oldest_record,
                         'newest_record_to_delete': newest_record,
                         'cutoff_date': datetime.now() - timedelta(days=policy.retention_days),
-                        'percentage_to_delete': (records_to_delete / total_records * 100) if total_records > 0 else 0
+                        'percentage_to_delete': (records_to_delete / total_records * 100) if total_records > 0 else 0,
+                        'partitions_to_drop': expired_partitions
                     }
                     
             except Exception as e:
@@ -230,7 +250,10 @@ class RetentionManager:
                 count_result = await cursor.fetchone()
                 records_to_delete = count_result[0] if count_result else 0
                 
-                if records_to_delete == 0:
+                expired_partitions = await self._expired_partitions(db, policy)
+                records_to_delete += sum(expired_partitions.values())
+                
+                if records_to_delete == 0 and not expired_partitions:
                     return {
                         'table': table_name,
                         'status': 'completed',
@@ -242,34 +265,33 @@ class RetentionManager:
                     return {
                         'table': table_name,
                         'status': 'dry_run',
-                        'records_would_delete': records_to_delete
+                        'records_would_delete': records_to_delete,
+                        'partitions_would_drop': list(expired_partitions)
                     }
                 
                 # Execute cleanup
                 start_time = datetime.now()
+                records_deleted, batches = await self._delete_expired_rows(policy)
+                partitions_dropped = []
+                if expired_partitions:
+                    records_deleted += sum(expired_partitions.values())
+                    partitions_dropped = await self._drop_partitions(list(expired_partitions))
                 
-                await db.execute("BEGIN IMMEDIATE")
-                try:
-                    cursor = await db.execute(policy.get_cleanup_query())
-                    records_deleted = cursor.rowcount
-                    await db.commit()
-                    
-                    end_time = datetime.now()
-                    duration = (end_time - start_time).total_seconds()
-                    
-                    logger.info(f"Cleaned up {records_deleted} records from {table_name} in {duration:.2f}s")
-                    
-                    return {
-                        'table': table_name,
-                        'status': 'completed',
-                        'records_deleted': records_deleted,
-                        'duration_seconds': duration,
-                        'retention_days': policy.retention_days
-                    }
-                    
-                except Exception as e:
-                    await db.rollback()
-                    raise e
+                end_time = datetime.now()
+                duration = (end_time - start_time).total_seconds()
+                
+                logger.info(f"Cleaned up {records_deleted} records from {table_name} in {duration:.2f}s "
+                           f"({batches} batches, {len(partitions_dropped)} partitions dropped)")
+                
+                return {
+                    'table': table_name,
+                    'status': 'completed',
+                    'records_deleted': records_deleted,
+                    'batches': batches,
+                    'partitions_dropped': partitions_dropped,
+                    'duration_seconds': duration,
+                    'retention_days': policy.retention_days
+                }
                     
         except Exception as e:
             logger.error(f"Failed to cleanup table {table_name}: {e}")
@@ -279,6 +301,105 @@ class RetentionManager:
                 'error': str(e)
             }
     
+    async def _expired_partitions(self, db, policy: RetentionPolicy) -> Dict[str, int]:
+        """Day partitions of the policy's table that are entirely past retention, with row counts."""
+        if policy.table_name not in PARTITIONED_TABLES or policy.cleanup_query:
+            return {}
+        
+        cutoff = policy.get_partition_cutoff()
+        expired = {}
+        for partition in await list_partitions(db, policy.table_name):
+            if parse_partition_name(partition)[1] < cutoff:
+                cursor = await db.execute(f"SELECT COUNT(*) FROM {partition}")
+                expired[partition] = (await cursor.fetchone())[0]
+        return expired
+    
+    async def _delete_expired_rows(self, policy: RetentionPolicy) -> Tuple[int, int]:
+        """Delete expired rows in bounded batches; returns (records_deleted, batches).
+        
+        Each batch is its own short transaction on the shared writer connection,
+        and the pause between batches lets metric flushes take the writer, so
+        ingestion is never blocked for longer than one batch.
+        """
+        pool = get_connection_pool(self.storage.db_path)
+        
+        if policy.cleanup_query:
+            # Custom queries cannot be split into batches
+            async with pool.writer() as db:
+                cursor = await db.execute(policy.get_cleanup_query())
+                await db.commit()
+                return cursor.rowcount, 1
+        
+        batch_size = settings.RETENTION_DELETE_BATCH_SIZE
+        records_deleted = 0
+        batches = 0
+        while True:
+            async with pool.writer() as db:
+                cursor = await db.execute(policy.get_batch_cleanup_query(), (batch_size,))
+                deleted = cursor.rowcount
+                await db.commit()
+            
+            records_deleted += deleted
+            batches += 1
+            if deleted < batch_size:
+                return records_deleted, batches
+            await asyncio.sleep(settings.RETENTION_BATCH_PAUSE_SECONDS)
+    
+    async def _drop_partitions(self, partitions: List[str]) -> List[str]:
+        """Drop expired day partitions, one short transaction each."""
+        pool = get_connection_pool(self.storage.db_path)
+        dropped = []
+        for partition in partitions:
+            async with pool.writer() as db:
+                await drop_partition(db, partition)
+                await db.execute("DELETE FROM rollup_state WHERE name = ?", (partition,))
+                await db.commit()
+            pool.partitions.discard(partition)
+            dropped.append(partition)
+            await asyncio.sleep(settings.RETENTION_BATCH_PAUSE_SECONDS)
+        return dropped
+    
+    async def reclaim_space(self) -> Dict[str, Any]:
+        """Return free pages to the filesystem without blocking writers for long.
+        
+        Databases created with auto_vacuum=INCREMENTAL are shrunk a few pages at a
+        time. Otherwise freed pages are reused by new rows, and a full VACUUM (which
+        also switches the database to incremental mode) only runs when
+        RETENTION_FULL_VACUUM is set.
+        """
+        pool = get_connection_pool(self.storage.db_path)
+        async with pool.reader() as db:
+            cursor = await db.execute("PRAGMA auto_vacuum")
+            auto_vacuum = (await cursor.fetchone())[0]
+        
+        if auto_vacuum == 2:  # INCREMENTAL
+            pages_freed = 0
+            while True:
+                async with pool.writer() as db:
+                    cursor = await db.execute("PRAGMA freelist_count")
+                    free_pages = (await cursor.fetchone())[0]
+                    if free_pages == 0:
+                        break
+                    step = min(free_pages, settings.RETENTION_VACUUM_PAGES)
+                    cursor = await db.execute(f"PRAGMA incremental_vacuum({step})")
+                    await cursor.fetchall()
+                    await db.commit()
+                pages_freed += step
+                await asyncio.sleep(settings.RETENTION_BATCH_PAUSE_SECONDS)
+            logger.info(f"Incremental vacuum freed {pages_freed} pages")
+            return {'mode': 'incremental', 'pages_freed': pages_freed}
+        
+        if settings.RETENTION_FULL_VACUUM:
+            async with pool.writer() as db:
+                logger.info("Running VACUUM to reclaim disk space...")
+                await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                await db.execute("VACUUM")
+                logger.info("VACUUM completed successfully")
+            return {'mode': 'full'}
+        
+        logger.debug("Skipping VACUUM; freed pages will be reused by new rows")
+        return {'mode': 'none'}
+    
     async def cleanup_all_tables(self, dry_run: bool = False) -> Dict[str, Any]:
         """Run cleanup on all tables with active retention policies."""
         results = {}
@@ -297,15 +418,13 @@ class RetentionManager:
             if result['status'] == 'completed' and 'records_deleted' in result:
                 total_deleted += result['records_deleted']
         
-        # Run VACUUM after cleanup to reclaim space
+        # Reclaim space freed by the cleanup
+        vacuum = None
         if not dry_run and total_deleted > 0:
             try:
-                async with aiosqlite.connect(self.storage.db_path) as db:
-                    logger.info("Running VACUUM to reclaim disk space...")
-                    await db.execute("VACUUM")
-                    logger.info("VACUUM completed successfully")
+                vacuum = await self.reclaim_space()
             except Exception as e:
-                logger.error(f"Failed to run VACUUM: {e}")
+                logger.error(f"Failed to reclaim disk space: {e}")
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -317,6 +436,7 @@ class RetentionManager:
             'duration_seconds': duration,
             'started_at': start_time.isoformat(),
             'completed_at': end_time.isoformat(),
+            'vacuum': vacuum,
             'table_results': results
         }
         
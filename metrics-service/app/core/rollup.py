@@ -0,0 +1,382 @@
+"""Incremental hourly/daily rollups of raw metrics."""
+import json
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import settings
+from ..storage.database import ROLLUP_TABLES, get_connection_pool
+from ..storage.partitions import list_partitions
+
+logger = logging.getLogger(__name__)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmic bins, so two sketches merge by adding
+    bin counts and any quantile is accurate to within relative_accuracy.
+    """
+
+    MIN_POSITIVE = 1e-9
+    MAX_BINS = 2048
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """Add a non-negative value."""
+        if value <= self.MIN_POSITIVE:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + 1
+            if len(self.bins) > self.MAX_BINS:
+                self._collapse_lowest()
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's counts to this one."""
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        while len(self.bins) > self.MAX_BINS:
+            self._collapse_lowest()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+    def _collapse_lowest(self):
+        """Fold the lowest bin into the next one to bound memory."""
+        lowest, second = sorted(self.bins)[:2]
+        self.bins[second] += self.bins.pop(lowest)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "a": self.relative_accuracy,
+            "z": self.zero_count,
+            "b": {str(index): count for index, count in self.bins.items()},
+        })
+
+    @classmethod
+    def from_json(cls, data: Optional[str]) -> "QuantileSketch":
+        if not data:
+            return cls()
+        raw = json.loads(data)
+        sketch = cls(raw.get("a", 0.01))
+        sketch.zero_count = raw.get("z", 0)
+        sketch.bins = {int(index): count for index, count in raw.get("b", {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
+
+
+class RollupBucket:
+    """Aggregates of one (service, metric_type, time bucket)."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum_value = 0.0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.duration_count = 0
+        self.sum_duration_ms = 0.0
+        self.min_duration_ms: Optional[float] = None
+        self.max_duration_ms: Optional[float] = None
+        self.success_count = 0
+        self.failure_count = 0
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float, duration_ms: Optional[float], success: Optional[int]):
+        """Add one raw metric."""
+        self.count += 1
+        self.sum_value += value
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+        if duration_ms is not None:
+            self.duration_count += 1
+            self.sum_duration_ms += duration_ms
+            self.min_duration_ms = duration_ms if self.min_duration_ms is None else min(self.min_duration_ms, duration_ms)
+            self.max_duration_ms = duration_ms if self.max_duration_ms is None else max(self.max_duration_ms, duration_ms)
+            self.sketch.add(max(duration_ms, 0.0))
+
+        if success is not None:
+            if success:
+                self.success_count += 1
+            else:
+                self.failure_count += 1
+
+    def merge(self, other: "RollupBucket"):
+        """Merge another bucket for the same key into this one."""
+        self.count += other.count
+        self.sum_value += other.sum_value
+        self.min_value = _min(self.min_value, other.min_value)
+        self.max_value = _max(self.max_value, other.max_value)
+        self.duration_count += other.duration_count
+        self.sum_duration_ms += other.sum_duration_ms
+        self.min_duration_ms = _min(self.min_duration_ms, other.min_duration_ms)
+        self.max_duration_ms = _max(self.max_duration_ms, other.max_duration_ms)
+        self.success_count += other.success_count
+        self.failure_count += other.failure_count
+        self.sketch.merge(other.sketch)
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> "RollupBucket":
+        """Load a bucket from the columns selected by RollupManager._STORED_COLUMNS."""
+        bucket = cls()
+        (
+            bucket.count, bucket.sum_value, bucket.min_value, bucket.max_value,
+            bucket.duration_count, bucket.sum_duration_ms,
+            bucket.min_duration_ms, bucket.max_duration_ms,
+            bucket.success_count, bucket.failure_count, sketch,
+        ) = row
+        bucket.sketch = QuantileSketch.from_json(sketch)
+        return bucket
+
+    def to_row(self) -> Tuple:
+        """Column values in RollupManager._WRITTEN_COLUMNS order."""
+        return (
+            self.count,
+            self.sum_value,
+            self.sum_value / self.count if self.count else 0.0,
+            self.min_value,
+            self.max_value,
+            self.duration_count,
+            self.sum_duration_ms,
+            self.sum_duration_ms / self.duration_count if self.duration_count else 0.0,
+            self.min_duration_ms,
+            self.max_duration_ms,
+            self.sketch.quantile(0.50),
+            self.sketch.quantile(0.95),
+            self.sketch.quantile(0.99),
+            self.sketch.to_json(),
+            self.success_count,
+            self.failure_count,
+        )
+
+
+def _min(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _bucket_starts(timestamp: str) -> Tuple[str, str]:
+    """Hour and day bucket keys (UTC) for a stored ISO timestamp."""
+    ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    return ts.strftime("%Y-%m-%dT%H:00:00Z"), ts.strftime("%Y-%m-%d")
+
+
+class RollupManager:
+    """Rolls new raw metrics up into metrics_hourly and metrics_daily.
+
+    Raw rows are read in id order past a high-water mark stored in
+    rollup_state, one row per source table (``metrics`` and each of its day
+    partitions). The merged buckets and the new high-water mark are written
+    in one transaction, so a pass that fails or is interrupted is simply
+    repeated and no row is counted twice.
+    """
+
+    _STORED_COLUMNS = (
+        "count, sum_value, min_value, max_value, duration_count, sum_duration_ms, "
+        "min_duration_ms, max_duration_ms, success_count, failure_count, duration_sketch"
+    )
+    _WRITTEN_COLUMNS = (
+        "count", "sum_value", "avg_value", "min_value", "max_value",
+        "duration_count", "sum_duration_ms", "avg_duration_ms",
+        "min_duration_ms", "max_duration_ms",
+        "p50_duration_ms", "p95_duration_ms", "p99_duration_ms", "duration_sketch",
+        "success_count", "failure_count",
+    )
+
+    @property
+    def pool(self):
+        # Resolved per call so the manager follows the configured database path
+        return get_connection_pool()
+
+    async def run_once(self, batch_size: Optional[int] = None) -> int:
+        """Roll up the next batch of raw metrics; returns the number of rows processed."""
+        batch_size = batch_size or settings.ROLLUP_BATCH_SIZE
+
+        async with self.pool.writer() as db:
+            # Oldest source with pending rows first
+            high_water_marks = await self._high_water_marks(db)
+            for source, last_id in high_water_marks.items():
+                cursor = await db.execute(f"""
+                    SELECT id, service, metric_type, timestamp, value, duration_ms,
+                           json_extract(dimensions, '$.success')
+                    FROM {source}
+                    WHERE id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size))
+                rows = await cursor.fetchall()
+                if rows:
+                    break
+            else:
+                return 0
+
+            buckets: Dict[str, Dict[Tuple[str, str, str], RollupBucket]] = {
+                table: {} for table in ROLLUP_TABLES
+            }
+            for _, service, metric_type, timestamp, value, duration_ms, success in rows:
+                try:
+                    hour, day = _bucket_starts(timestamp)
+                except (TypeError, ValueError):
+                    logger.warning(f"Skipping metric with unparseable timestamp in rollup: {timestamp!r}")
+                    continue
+                for table, bucket_start in (("metrics_hourly", hour), ("metrics_daily", day)):
+                    key = (service, metric_type, bucket_start)
+                    bucket = buckets[table].get(key)
+                    if bucket is None:
+                        bucket = buckets[table][key] = RollupBucket()
+                    bucket.add(value, duration_ms, success)
+
+            for table, table_buckets in buckets.items():
+                await self._merge_buckets(db, table, ROLLUP_TABLES[table], table_buckets)
+
+            new_last_id = rows[-1][0]
+            await db.execute("""
+                INSERT INTO rollup_state (name, last_id, updated_at)
+                VALUES (?, ?, datetime('now'))
+                ON CONFLICT(name) DO UPDATE SET
+                    last_id = excluded.last_id,
+                    updated_at = excluded.updated_at
+            """, (source, new_last_id))
+            await db.commit()
+
+        logger.debug(f"Rolled up {len(rows)} metrics from {source} (ids {last_id + 1}-{new_last_id})")
+        return len(rows)
+
+    async def _high_water_marks(self, db) -> Dict[str, int]:
+        """Last rolled-up id per source table, oldest source first."""
+        sources = ["metrics"] + await list_partitions(db, "metrics")
+        cursor = await db.execute("SELECT name, last_id FROM rollup_state")
+        state = dict(await cursor.fetchall())
+        return {source: state.get(source, 0) for source in sources}
+
+    async def run_until_caught_up(self, batch_size: Optional[int] = None) -> int:
+        """Run passes until no raw rows are pending; returns the total rows processed."""
+        total = 0
+        while True:
+            # Each pass reads from one source table, so stop only on an empty pass
+            processed = await self.run_once(batch_size)
+            if not processed:
+                return total
+            total += processed
+
+    async def _merge_buckets(
+        self,
+        db,
+        table: str,
+        bucket_column: str,
+        buckets: Dict[Tuple[str, str, str], RollupBucket],
+    ):
+        """Merge new aggregates into existing rollup rows."""
+        set_clause = ", ".join(f"{column} = excluded.{column}" for column in self._WRITTEN_COLUMNS)
+        upsert_sql = f"""
+            INSERT INTO {table} (service, metric_type, {bucket_column}, {", ".join(self._WRITTEN_COLUMNS)}, updated_at)
+            VALUES (?, ?, ?, {", ".join("?" for _ in self._WRITTEN_COLUMNS)}, datetime('now'))
+            ON CONFLICT(service, metric_type, {bucket_column}) DO UPDATE SET
+                {set_clause},
+                updated_at = excluded.updated_at
+        """
+
+        upserts = []
+        for key, bucket in buckets.items():
+            cursor = await db.execute(f"""
+                SELECT {self._STORED_COLUMNS}
+                FROM {table}
+                WHERE service = ? AND metric_type = ? AND {bucket_column} = ?
+            """, key)
+            existing = await cursor.fetchone()
+            if existing:
+                merged = RollupBucket.from_row(existing)
+                merged.merge(bucket)
+                bucket = merged
+            upserts.append((*key, *bucket.to_row()))
+
+        if upserts:
+            await db.executemany(upsert_sql, upserts)
+
+    async def query(
+        self,
+        granularity: str = "hourly",
+        service: Optional[str] = None,
+        metric_type: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Read rollup rows, oldest first.
+
+        Args:
+            granularity: "hourly" or "daily"
+            service: Only rows for this service
+            metric_type: Only rows for this metric type
+            start: Inclusive lower bound on the bucket (same format as the bucket column)
+            end: Exclusive upper bound on the bucket
+        """
+        table = {"hourly": "metrics_hourly", "daily": "metrics_daily"}.get(granularity)
+        if table is None:
+            raise ValueError(f"Unknown rollup granularity: {granularity}")
+        bucket_column = ROLLUP_TABLES[table]
+
+        conditions, params = [], []
+        for column, op, value in (
+            ("service", "=", service),
+            ("metric_type", "=", metric_type),
+            (bucket_column, ">=", start),
+            (bucket_column, "<", end),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        columns = ("service", "metric_type", bucket_column) + tuple(
+            column for column in self._WRITTEN_COLUMNS if column != "duration_sketch"
+        )
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY {bucket_column}, service, metric_type",
+                params,
+            )
+            rows = await cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    async def get_status(self) -> Dict[str, Any]:
+        """High-water marks and number of raw rows still to roll up."""
+        async with self.pool.reader() as db:
+            high_water_marks = await self._high_water_marks(db)
+            pending = 0
+            for source, last_id in high_water_marks.items():
+                cursor = await db.execute(f"SELECT COUNT(*) FROM {source} WHERE id > ?", (last_id,))
+                pending += (await cursor.fetchone())[0]
+            cursor = await db.execute("SELECT MAX(updated_at) FROM rollup_state")
+            updated_at = (await cursor.fetchone())[0]
+        return {"high_water_marks": high_water_marks, "pending_rows": pending, "updated_at": updated_at}
+
+
+# Global rollup manager instance
+rollup_manager = RollupManager()
@@ -3,10 +3,11 @@ from contextlib import asynccontextmanager
 import logging
 import asyncio
 from .config import settings
-from .api.routes import router as api_router
-from .storage.database import init_database, wait_for_database, MetricsStorage
-from .core.rate_limiter import rate_limiter
+from .api.routes import router as api_router, processor
+from .storage.database import init_database, wait_for_database, close_database, MetricsStorage
 from .core.retention import retention_manager
+from .core.rollup import rollup_manager
+from .core.api_key_cache import api_key_cache
 from .utils.helpers import hash_api_key
 import os
 
@@ -52,38 +53,42 @@ async def lifespan(app: FastAPI):
         logger.warning(f"OpenTelemetry setup skipped: {e}")
     
     # Start background tasks
-    cleanup_task = asyncio.create_task(rate_limit_cleanup_task())
     retention_task = asyncio.create_task(retention_cleanup_task())
     flush_task = asyncio.create_task(metrics_flush_task())
+    rollup_task = asyncio.create_task(metrics_rollup_task())
+    usage_task = asyncio.create_task(api_key_usage_flush_task())
     logger.info("Background tasks started")
     
     yield
     
     # Cancel background tasks
-    cleanup_task.cancel()
     retention_task.cancel()
     flush_task.cancel()
+    rollup_task.cancel()
+    usage_task.cancel()
     try:
-        await cleanup_task
         await retention_task
         await flush_task
+        await rollup_task
+        await usage_task
     except asyncio.CancelledError:
         pass
-    
-    logger.info("Shutting down Metrics Collection Service")
 
+    # Store (or spill) metrics still in the ingest buffer
+    try:
+        await processor.force_flush()
+    except Exception as e:
+        logger.error(f"Failed to flush metrics buffer on shutdown: {e}")
 
-async def rate_limit_cleanup_task():
-    """Background task to clean up old rate limit buckets."""
-    while True:
-        try:
-            await asyncio.sleep(3600)  # Run every hour
-            await rate_limiter.cleanup_old_buckets(max_age_hours=24)
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            logger.error(f"Error in rate limit cleanup task: {e}")
-            await asyncio.sleep(60)  # Wait a minute before retry
+    # Write last-used timestamps collected since the last flush
+    try:
+        await api_key_cache.flush_usage()
+    except Exception as e:
+        logger.error(f"Failed to flush API key usage on shutdown: {e}")
+
+    await close_database()
+    
+    logger.info("Shutting down Metrics Collection Service")
 
 
 async def retention_cleanup_task():
@@ -110,20 +115,35 @@ async def retention_cleanup_task():
 
 
 async def metrics_flush_task():
-    """Background task to flush metrics buffer every 5 seconds."""
-    # Import the shared processor instance from routes
-    from .api.routes import processor
+    """Background task that writes buffered metrics to storage (or the spill file)."""
+    await processor.run_writer()
+
+
+async def metrics_rollup_task():
+    """Background task to roll new raw metrics up into hourly and daily aggregates."""
+    while True:
+        try:
+            await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)
+            processed = await rollup_manager.run_until_caught_up()
+            if processed:
+                logger.debug(f"Rolled up {processed} metrics")
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Error in metrics rollup task: {e}")
+            await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)  # Wait one interval before retry
+
 
+async def api_key_usage_flush_task():
+    """Background task to write batched API key last-used timestamps."""
     while True:
         try:
-            await asyncio.sleep(5)  # Flush every 5 seconds
-            await processor.force_flush()
-            logger.debug("Metrics buffer flushed to database")
+            await asyncio.sleep(settings.API_KEY_USAGE_FLUSH_SECONDS)
+            await api_key_cache.flush_usage()
         except asyncio.CancelledError:
             break
         except Exception as e:
-            logger.error(f"Error in metrics flush task: {e}")
-            await asyncio.sleep(5)  # Wait 5 seconds before retry
+            logger.error(f"Error in API key usage flush task: {e}")
 
 
 async def setup_preshared_api_keys():
@@ -144,6 +164,7 @@ async def setup_preshared_api_keys():
             try:
                 key_hash = hash_api_key(value)
                 success = await storage.create_api_key(key_hash, service_name, rate_limit=1000)
+                api_key_cache.invalidate(key_hash)
                 if success:
                     logger.info(f"Configured API key for service: {service_name}")
                     api_key_count += 1
@@ -2,10 +2,12 @@ import aiosqlite
 import asyncio
 import logging
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 from ..config import settings
+from .partitions import PARTITIONED_TABLES, create_partition, current_partition, refresh_view
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,82 @@ async def _migrate_schema_if_needed(db):
         logger.warning(f"Schema migration failed, will recreate tables: {e}")
 
 
+# Rollup tables and the column holding their time bucket
+ROLLUP_TABLES = {
+    "metrics_hourly": "hour_timestamp",  # YYYY-MM-DDTHH:00:00Z
+    "metrics_daily": "date",             # YYYY-MM-DD
+}
+
+
+async def _ensure_rollup_tables(db):
+    """Create the rollup tables and rollup high-water mark table.
+
+    Migrations 0002 and 0005 created metrics_hourly/metrics_daily with
+    different columns and nothing ever wrote to them, so a table without
+    the duration_sketch column is recreated with the rollup schema.
+    """
+    for table, bucket_column in ROLLUP_TABLES.items():
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        columns = [col[1] for col in await cursor.fetchall()]
+        if columns and "duration_sketch" not in columns:
+            logger.info(f"Recreating {table} with the rollup schema")
+            await db.execute(f"DROP TABLE {table}")
+
+        await db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service TEXT NOT NULL,
+                metric_type TEXT NOT NULL,
+                {bucket_column} TEXT NOT NULL,
+                count INTEGER DEFAULT 0,
+                sum_value REAL DEFAULT 0.0,
+                avg_value REAL DEFAULT 0.0,
+                min_value REAL,
+                max_value REAL,
+                duration_count INTEGER DEFAULT 0,
+                sum_duration_ms REAL DEFAULT 0.0,
+                avg_duration_ms REAL DEFAULT 0.0,
+                min_duration_ms REAL,
+                max_duration_ms REAL,
+                p50_duration_ms REAL,
+                p95_duration_ms REAL,
+                p99_duration_ms REAL,
+                duration_sketch TEXT,  -- JSON, mergeable quantile sketch
+                success_count INTEGER DEFAULT 0,
+                failure_count INTEGER DEFAULT 0,
+                created_at TEXT DEFAULT (datetime('now')),
+                updated_at TEXT DEFAULT (datetime('now')),
+                UNIQUE(service, metric_type, {bucket_column})
+            )
+        """)
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{bucket_column} ON {table}({bucket_column})"
+        )
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+
+
+async def _ensure_created_at_indexes(db):
+    """Index created_at on the raw tables so retention batches seek instead of scanning.
+
+    Day partitions created afterwards copy the index from their base table.
+    """
+    for table in PARTITIONED_TABLES:
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        )
+        if await cursor.fetchone():
+            await db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table}(created_at)"
+            )
+
+
 async def init_database():
     """Initialize database with schema migrations."""
     db_path = settings.SQLITE_DB_PATH
@@ -74,6 +152,10 @@ async def init_database():
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
     async with aiosqlite.connect(db_path) as db:
+        # Lets retention reclaim space in small steps; only takes effect
+        # on a new database (or after one full VACUUM)
+        await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
         # Enable WAL mode for better concurrency
         await db.execute("PRAGMA journal_mode=WAL")
         await db.execute("PRAGMA synchronous=NORMAL")
@@ -187,70 +269,240 @@ async def init_database():
             CREATE INDEX IF NOT EXISTS idx_api_keys_hash ON api_keys(key_hash);
             CREATE INDEX IF NOT EXISTS idx_api_keys_service ON api_keys(service_name);
         """)
+
+        await _ensure_rollup_tables(db)
+        await _ensure_created_at_indexes(db)
+
+        # Views over raw tables and their day partitions
+        for table in PARTITIONED_TABLES:
+            await refresh_view(db, table)
         
         await db.commit()
         logger.info("Database tables and indexes created successfully")
     
 
 
+# Insert statements per target table, used with executemany
+_INSERT_SQL = {
+    "metrics": """
+        INSERT INTO metrics (
+            request_id, service, service_version, instance_id,
+            metric_type, timestamp, value, duration_ms,
+            dimensions, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "auth_metrics": """
+        INSERT INTO auth_metrics (
+            request_id, timestamp, service, duration_ms,
+            success, method, server, user_hash, error_code
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "discovery_metrics": """
+        INSERT INTO discovery_metrics (
+            request_id, timestamp, service, duration_ms,
+            query, results_count, top_k_services, top_n_tools,
+            embedding_time_ms, faiss_search_time_ms
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "tool_metrics": """
+        INSERT INTO tool_metrics (
+            request_id, timestamp, service, duration_ms,
+            tool_name, server_path, server_name, success,
+            error_code, input_size_bytes, output_size_bytes,
+            client_name, client_version, method, user_hash
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+
+
+class ConnectionPool:
+    """Long-lived SQLite connections shared by all MetricsStorage instances.
+
+    SQLite allows one writer at a time, so writes go through a single
+    connection guarded by a lock. Reads use a small pool of connections,
+    which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(self, db_path: str, reader_pool_size: int = 4):
+        self.db_path = db_path
+        self.reader_pool_size = max(1, reader_pool_size)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._idle_readers: List[aiosqlite.Connection] = []
+        self._reader_count = 0
+        self._reader_available = asyncio.Condition()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Day partitions known to exist, so inserts create each one only once
+        self.partitions: Set[str] = set()
+
+    def _check_loop(self):
+        """Recreate the locks when used from a new event loop.
+
+        aiosqlite connections are not tied to a loop, but asyncio locks are;
+        this happens when the app is restarted in-process (e.g. in tests).
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._writer_lock = asyncio.Lock()
+            self._reader_available = asyncio.Condition()
+
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        """Open a connection with the pragmas used by the service."""
+        db = await aiosqlite.connect(self.db_path, timeout=settings.DB_CONNECTION_TIMEOUT)
+        try:
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA synchronous=NORMAL")
+            await db.execute(f"PRAGMA busy_timeout={int(settings.DB_CONNECTION_TIMEOUT * 1000)}")
+            if read_only:
+                await db.execute("PRAGMA query_only=ON")
+        except Exception:
+            await db.close()
+            raise
+        return db
+
+    @asynccontextmanager
+    async def writer(self):
+        """Exclusive use of the writer connection; rolls back if the block raises."""
+        self._check_loop()
+        async with self._writer_lock:
+            if self._writer is None:
+                self._writer = await self._connect()
+            try:
+                yield self._writer
+            except Exception:
+                await self._writer.rollback()
+                raise
+
+    @asynccontextmanager
+    async def reader(self):
+        """Borrow a read-only connection, opening one if the pool is not full."""
+        self._check_loop()
+        db = await self._acquire_reader()
+        try:
+            yield db
+        finally:
+            async with self._reader_available:
+                self._idle_readers.append(db)
+                self._reader_available.notify()
+
+    async def _acquire_reader(self) -> aiosqlite.Connection:
+        async with self._reader_available:
+            while not self._idle_readers and self._reader_count >= self.reader_pool_size:
+                await self._reader_available.wait()
+            if self._idle_readers:
+                return self._idle_readers.pop()
+            self._reader_count += 1
+
+        try:
+            return await self._connect(read_only=True)
+        except Exception:
+            async with self._reader_available:
+                self._reader_count -= 1
+                self._reader_available.notify()
+            raise
+
+    async def close(self):
+        """Close all connections; the pool reopens them on next use."""
+        self._check_loop()
+        async with self._writer_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        async with self._reader_available:
+            readers, self._idle_readers = self._idle_readers, []
+            self._reader_count -= len(readers)
+        for db in readers:
+            await db.close()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+
+
+def get_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Get the shared connection pool for a database file."""
+    db_path = db_path or settings.SQLITE_DB_PATH
+    pool = _pools.get(db_path)
+    if pool is None:
+        pool = ConnectionPool(db_path, settings.DB_READER_POOL_SIZE)
+        _pools[db_path] = pool
+    return pool
+
+
+async def close_database():
+    """Close all pooled database connections."""
+    for pool in list(_pools.values()):
+        try:
+            await pool.close()
+        except Exception as e:
+            logger.warning(f"Error closing database connections for {pool.db_path}: {e}")
+
+
 class MetricsStorage:
     """SQLite storage handler for containerized database."""
     
     def __init__(self):
         self.db_path = settings.SQLITE_DB_PATH
+        self.pool = get_connection_pool(self.db_path)
     
     async def store_metrics_batch(self, metrics_batch: List[Dict[str, Any]]):
         """Store a batch of metrics in the containerized database."""
         if not metrics_batch:
             return
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            try:
-                for metric_data in metrics_batch:
-                    metric = metric_data['metric']
-                    request = metric_data['request']
-                    request_id = metric_data['request_id']
-                    
-                    # Store in main metrics table
-                    await db.execute("""
-                        INSERT INTO metrics (
-                            request_id, service, service_version, instance_id,
-                            metric_type, timestamp, value, duration_ms,
-                            dimensions, metadata
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        request_id,
-                        request.service,
-                        request.version,
-                        request.instance_id,
-                        metric.type.value,
-                        metric.timestamp.isoformat(),
-                        metric.value,
-                        metric.duration_ms,
-                        json.dumps(metric.dimensions),
-                        json.dumps(metric.metadata)
-                    ))
-                    
-                    # Store in specialized table based on type
-                    await self._store_specialized_metric(db, metric, request, request_id)
-                
+
+        # Group rows by target table so each table is one executemany call
+        rows_by_table: Dict[str, List[Tuple]] = {table: [] for table in _INSERT_SQL}
+        for metric_data in metrics_batch:
+            metric = metric_data['metric']
+            request = metric_data['request']
+            request_id = metric_data['request_id']
+
+            # Store in main metrics table
+            rows_by_table["metrics"].append((
+                request_id,
+                request.service,
+                request.version,
+                request.instance_id,
+                metric.type.value,
+                metric.timestamp.isoformat(),
+                metric.value,
+                metric.duration_ms,
+                json.dumps(metric.dimensions),
+                json.dumps(metric.metadata)
+            ))
+
+            # Store in specialized table based on type
+            specialized = self._specialized_metric_row(metric, request, request_id)
+            if specialized:
+                table, row = specialized
+                rows_by_table[table].append(row)
+
+        try:
+            async with self.pool.writer() as db:
+                for table, rows in rows_by_table.items():
+                    if rows:
+                        await db.executemany(await self._insert_sql(db, table), rows)
                 await db.commit()
-                logger.debug(f"Stored batch of {len(metrics_batch)} metrics to container DB")
-                
-            except Exception as e:
-                await db.rollback()
-                logger.error(f"Failed to store metrics batch: {e}")
-                raise
+            logger.debug(f"Stored batch of {len(metrics_batch)} metrics to container DB")
+        except Exception as e:
+            logger.error(f"Failed to store metrics batch: {e}")
+            raise
     
-    async def _store_specialized_metric(self, db, metric, request, request_id):
-        """Store metric in specialized table based on type."""
+    async def _insert_sql(self, db, table: str) -> str:
+        """Insert statement for a table, targeting today's partition when partitioning is on."""
+        if not settings.METRICS_PARTITION_BY_DAY:
+            return _INSERT_SQL[table]
+
+        partition = current_partition(table)
+        if partition not in self.pool.partitions:
+            await create_partition(db, table, partition)
+            self.pool.partitions.add(partition)
+        return _INSERT_SQL[table].replace(f"INSERT INTO {table} (", f"INSERT INTO {partition} (", 1)
+
+    def _specialized_metric_row(self, metric, request, request_id) -> Optional[Tuple[str, Tuple]]:
+        """Build the specialized table row for a metric, if its type has one."""
         if metric.type.value == "auth_request":
-            await db.execute("""
-                INSERT INTO auth_metrics (
-                    request_id, timestamp, service, duration_ms,
-                    success, method, server, user_hash, error_code
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            return "auth_metrics", (
                 request_id,
                 metric.timestamp.isoformat(),
                 request.service,
@@ -260,16 +512,10 @@ class MetricsStorage:
                 metric.dimensions.get('server'),
                 metric.dimensions.get('user_hash'),
                 metric.metadata.get('error_code')
-            ))
+            )
         
         elif metric.type.value == "tool_discovery":
-            await db.execute("""
-                INSERT INTO discovery_metrics (
-                    request_id, timestamp, service, duration_ms,
-                    query, results_count, top_k_services, top_n_tools,
-                    embedding_time_ms, faiss_search_time_ms
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            return "discovery_metrics", (
                 request_id,
                 metric.timestamp.isoformat(),
                 request.service,
@@ -280,17 +526,10 @@ class MetricsStorage:
                 metric.dimensions.get('top_n_tools'),
                 metric.metadata.get('embedding_time_ms'),
                 metric.metadata.get('faiss_search_time_ms')
-            ))
+            )
         
         elif metric.type.value == "tool_execution":
-            await db.execute("""
-                INSERT INTO tool_metrics (
-                    request_id, timestamp, service, duration_ms,
-                    tool_name, server_path, server_name, success,
-                    error_code, input_size_bytes, output_size_bytes,
-                    client_name, client_version, method, user_hash
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            return "tool_metrics", (
                 request_id,
                 metric.timestamp.isoformat(),
                 request.service,
@@ -306,11 +545,13 @@ class MetricsStorage:
                 metric.dimensions.get('client_version'),
                 metric.dimensions.get('method'),
                 metric.dimensions.get('user_hash')
-            ))
+            )
+
+        return None
 
     async def get_api_key(self, key_hash: str) -> Dict[str, Any] | None:
         """Get API key details from database."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             async with db.execute("""
                 SELECT service_name, is_active, rate_limit, last_used_at
                 FROM api_keys 
@@ -328,7 +569,7 @@ class MetricsStorage:
 
     async def update_api_key_usage(self, key_hash: str):
         """Update last_used_at timestamp for API key."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.writer() as db:
             await db.execute("""
                 UPDATE api_keys 
                 SET last_used_at = datetime('now') 
@@ -336,10 +577,26 @@ class MetricsStorage:
             """, (key_hash,))
             await db.commit()
 
+    async def update_api_key_usage_batch(self, last_used: Dict[str, str]):
+        """Set last_used_at for many API keys in one transaction.
+
+        Args:
+            last_used: Mapping of key hash to last-used time ("YYYY-MM-DD HH:MM:SS", UTC)
+        """
+        if not last_used:
+            return
+        async with self.pool.writer() as db:
+            await db.executemany("""
+                UPDATE api_keys
+                SET last_used_at = ?
+                WHERE key_hash = ?
+            """, [(used_at, key_hash) for key_hash, used_at in last_used.items()])
+            await db.commit()
+
     async def create_api_key(self, key_hash: str, service_name: str, rate_limit: int = 1000) -> bool:
         """Create a new API key in the database."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 await db.execute("""
                     INSERT INTO api_keys (key_hash, service_name, created_at, is_active, rate_limit)
                     VALUES (?, ?, datetime('now'), 1, ?)
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Callable, Optional
 from pathlib import Path
 from ..config import settings
-from .database import MetricsStorage
+from .database import MetricsStorage, _ensure_created_at_indexes, _ensure_rollup_tables
 import aiosqlite
 
 logger = logging.getLogger(__name__)
@@ -360,6 +360,31 @@ class MigrationManager:
                 DROP INDEX IF EXISTS idx_retention_policies_table;
             """
         ))
+
+        # Migration 6: Rollup schema for the aggregation engine
+        self.migrations.append(Migration(
+            version=6,
+            name="rollup_tables",
+            up_sql=None,
+            python_up=_ensure_rollup_tables,
+            down_sql="""
+                DROP TABLE IF EXISTS rollup_state;
+            """
+        ))
+
+        # Migration 7: created_at indexes for batched retention deletes
+        self.migrations.append(Migration(
+            version=7,
+            name="raw_created_at_indexes",
+            up_sql=None,
+            python_up=_ensure_created_at_indexes,
+            down_sql="""
+                DROP INDEX IF EXISTS idx_metrics_created_at;
+                DROP INDEX IF EXISTS idx_auth_metrics_created_at;
+                DROP INDEX IF EXISTS idx_discovery_metrics_created_at;
+                DROP INDEX IF EXISTS idx_tool_metrics_created_at;
+            """
+        ))
     
     async def get_current_version(self) -> int:
         """Get the current schema version from the database."""
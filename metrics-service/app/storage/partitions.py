@@ -0,0 +1,121 @@
+"""Day partitions of the raw metrics tables.
+
+With METRICS_PARTITION_BY_DAY enabled, raw rows are written to one table per
+UTC day (e.g. ``metrics_p20240115``) instead of the base table, so expiring a
+day is a ``DROP TABLE``. Each partition copies the base table's schema and
+indexes. A ``<table>_all`` view unions the base table (rows written before
+partitioning was enabled) with all partitions.
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Raw tables that can be partitioned by day
+PARTITIONED_TABLES = ("metrics", "auth_metrics", "discovery_metrics", "tool_metrics")
+
+_PARTITION_RE = re.compile(r"^(?P<base>[a-z_]+)_p(?P<day>\d{8})$")
+
+
+def partition_name(base_table: str, day: date) -> str:
+    """Name of the partition of base_table holding rows written on day."""
+    return f"{base_table}_p{day.strftime('%Y%m%d')}"
+
+
+def current_partition(base_table: str) -> str:
+    """Partition that rows written now go to (partitions follow created_at, which is UTC)."""
+    return partition_name(base_table, datetime.now(timezone.utc).date())
+
+
+def parse_partition_name(table_name: str) -> Optional[Tuple[str, date]]:
+    """Split a partition name into (base_table, day), or None if it is not a partition."""
+    match = _PARTITION_RE.match(table_name)
+    if not match or match.group("base") not in PARTITIONED_TABLES:
+        return None
+    try:
+        return match.group("base"), datetime.strptime(match.group("day"), "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def view_name(base_table: str) -> str:
+    """Name of the view over the base table and all of its partitions."""
+    return f"{base_table}_all"
+
+
+async def list_partitions(db, base_table: str) -> List[str]:
+    """Partitions of base_table, oldest first."""
+    cursor = await db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+        (f"{base_table}_p%",),
+    )
+    names = [
+        name for (name,) in await cursor.fetchall()
+        if (parsed := parse_partition_name(name)) and parsed[0] == base_table
+    ]
+    return sorted(names)
+
+
+async def create_partition(db, base_table: str, table_name: str):
+    """Create a partition with the base table's columns and indexes, then refresh the view.
+
+    The caller commits.
+    """
+    cursor = await db.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (base_table,)
+    )
+    row = await cursor.fetchone()
+    if not row:
+        raise ValueError(f"Cannot partition unknown table: {base_table}")
+
+    table_sql, count = re.subn(
+        rf"^CREATE TABLE\s+(IF NOT EXISTS\s+)?[\"']?{base_table}[\"']?",
+        f"CREATE TABLE IF NOT EXISTS {table_name}",
+        row[0],
+        count=1,
+    )
+    if not count:
+        raise ValueError(f"Unexpected schema for table {base_table}")
+    await db.execute(table_sql)
+
+    suffix = table_name[len(base_table):]
+    cursor = await db.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (base_table,),
+    )
+    for index_name, index_sql in await cursor.fetchall():
+        index_sql = re.sub(
+            rf"^CREATE (UNIQUE )?INDEX\s+(IF NOT EXISTS\s+)?{index_name}\s+ON\s+{base_table}\s*\(",
+            rf"CREATE \1INDEX IF NOT EXISTS {index_name}{suffix} ON {table_name}(",
+            index_sql,
+            count=1,
+        )
+        await db.execute(index_sql)
+
+    await refresh_view(db, base_table)
+    logger.info(f"Created partition {table_name}")
+
+
+async def drop_partition(db, table_name: str):
+    """Drop a partition and refresh the view over its base table. The caller commits."""
+    parsed = parse_partition_name(table_name)
+    if not parsed:
+        raise ValueError(f"Not a partition: {table_name}")
+    await db.execute(f"DROP TABLE IF EXISTS {table_name}")
+    await refresh_view(db, parsed[0])
+    logger.info(f"Dropped partition {table_name}")
+
+
+async def refresh_view(db, base_table: str):
+    """(Re)create the view over base_table and its partitions."""
+    cursor = await db.execute(f"PRAGMA table_info({base_table})")
+    columns = ", ".join(col[1] for col in await cursor.fetchall())
+    if not columns:
+        return
+
+    selects = [f"SELECT {columns} FROM {table}"
+               for table in [base_table] + await list_partitions(db, base_table)]
+    await db.execute(f"DROP VIEW IF EXISTS {view_name(base_table)}")
+    await db.execute(f"CREATE VIEW {view_name(base_table)} AS {' UNION ALL '.join(selects)}")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark metrics ingest throughput of MetricsStorage.store_metrics_batch.
+
+Stores batches of mixed auth, discovery and tool metrics into a temporary
+database and reports metrics per second. For comparison it also runs the
+previous approach: one connection per flush and one INSERT per row.
+
+Not collected by pytest. Usage (from metrics-service/):
+    uv run python tests/benchmark_ingest.py
+    uv run python tests/benchmark_ingest.py --batches 200 --batch-size 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import Settings  # noqa: E402
+from app.core.models import Metric, MetricRequest, MetricType  # noqa: E402
+from app.storage.database import (  # noqa: E402
+    _INSERT_SQL,
+    MetricsStorage,
+    close_database,
+    init_database,
+)
+
+
+def _make_batch(
+    batch_index: int,
+    batch_size: int,
+) -> list:
+    """Build a flush buffer cycling through the metric types with specialized tables."""
+    request = MetricRequest(
+        service="benchmark",
+        version="1.0.0",
+        instance_id="bench-01",
+        metrics=[Metric(type=MetricType.AUTH_REQUEST, value=1.0)],
+    )
+    batch = []
+    for i in range(batch_size):
+        metric_type = (
+            MetricType.AUTH_REQUEST,
+            MetricType.TOOL_DISCOVERY,
+            MetricType.TOOL_EXECUTION,
+        )[i % 3]
+        metric = Metric(
+            type=metric_type,
+            value=1.0,
+            duration_ms=12.5,
+            dimensions={
+                "success": True,
+                "method": "jwt",
+                "tool_name": "calculator",
+                "query": "search tools",
+                "results_count": 5,
+            },
+            metadata={"error_code": None},
+        )
+        batch.append({
+            "metric": metric,
+            "request": request,
+            "request_id": f"req_{batch_index}_{i}",
+        })
+    return batch
+
+
+async def _store_row_by_row(
+    db_path: str,
+    metrics_batch: list,
+):
+    """Previous implementation: new connection per flush, one execute per row."""
+    storage = MetricsStorage()
+    async with aiosqlite.connect(db_path) as db:
+        for metric_data in metrics_batch:
+            metric = metric_data["metric"]
+            request = metric_data["request"]
+            request_id = metric_data["request_id"]
+            await db.execute(_INSERT_SQL["metrics"], (
+                request_id,
+                request.service,
+                request.version,
+                request.instance_id,
+                metric.type.value,
+                metric.timestamp.isoformat(),
+                metric.value,
+                metric.duration_ms,
+                json.dumps(metric.dimensions),
+                json.dumps(metric.metadata),
+            ))
+            specialized = storage._specialized_metric_row(metric, request, request_id)
+            if specialized:
+                table, row = specialized
+                await db.execute(_INSERT_SQL[table], row)
+        await db.commit()
+
+
+async def _run(
+    label: str,
+    store,
+    batches: list,
+) -> None:
+    """Time storing all batches and print throughput."""
+    total = sum(len(batch) for batch in batches)
+    start = time.perf_counter()
+    for batch in batches:
+        await store(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {total:>8} metrics  {elapsed:8.3f}s  {total / elapsed:>10.0f} metrics/s")
+
+
+async def main() -> None:
+    """Run the benchmark against fresh temporary databases."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    batches = [_make_batch(i, args.batch_size) for i in range(args.batches)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Settings.SQLITE_DB_PATH = str(Path(tmp) / "row_by_row.db")
+        await init_database()
+        row_db = Settings.SQLITE_DB_PATH
+        await _run("connection per flush", lambda batch: _store_row_by_row(row_db, batch), batches)
+
+        Settings.SQLITE_DB_PATH = str(Path(tmp) / "pooled.db")
+        await init_database()
+        storage = MetricsStorage()
+        await _run("pooled writer + executemany", storage.store_metrics_batch, batches)
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark RateLimiter.check_rate_limit throughput with many active keys.
+
+Runs checks round-robin over a set of active API keys from concurrent tasks
+and reports checks per second. For comparison it also runs the previous
+approach: one global asyncio.Lock and tuple buckets refilled in whole tokens.
+
+Not collected by pytest. Usage (from metrics-service/):
+    uv run python tests/benchmark_rate_limiter.py
+    uv run python tests/benchmark_rate_limiter.py --keys 10000 --checks 500000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.rate_limiter import RateLimiter  # noqa: E402
+
+
+class _LockedRateLimiter:
+    """Previous implementation: global lock, (tokens, last_refill, limit) tuples."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = asyncio.Lock()
+
+    async def check_rate_limit(self, key_hash: str, rate_limit: int):
+        async with self._lock:
+            now = time.time()
+            if key_hash not in self._buckets:
+                tokens = rate_limit - 1
+                self._buckets[key_hash] = (tokens, now, rate_limit)
+                return True, tokens
+            tokens, last_refill, limit = self._buckets[key_hash]
+            if limit != rate_limit:
+                tokens = int(tokens * (rate_limit / limit))
+            tokens_to_add = int((now - last_refill) / 60.0 * rate_limit)
+            tokens = min(tokens + tokens_to_add, rate_limit)
+            if tokens_to_add > 0:
+                last_refill = now
+            if tokens > 0:
+                tokens -= 1
+                self._buckets[key_hash] = (tokens, last_refill, rate_limit)
+                return True, tokens
+            self._buckets[key_hash] = (tokens, last_refill, rate_limit)
+            return False, 0
+
+
+async def _worker(limiter, keys: list, start: int, checks: int) -> None:
+    """Check keys round-robin, yielding to the loop like a request handler would."""
+    n = len(keys)
+    for i in range(checks):
+        await limiter.check_rate_limit(keys[(start + i) % n], 1_000_000)
+        if i % 64 == 0:
+            await asyncio.sleep(0)
+
+
+async def _run(label: str, limiter, keys: list, checks: int, concurrency: int) -> None:
+    """Time all checks across concurrent workers and print throughput."""
+    per_worker = checks // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(limiter, keys, w * (len(keys) // concurrency), per_worker)
+        for w in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    total = per_worker * concurrency
+    print(f"{label:<24} {len(keys):>6} keys  {total:>8} checks  {elapsed:7.3f}s  {total / elapsed:>10.0f} checks/s")
+
+
+async def main() -> None:
+    """Run both limiters over the same key set."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--checks", type=int, default=500_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    keys = [f"{i:064x}" for i in range(args.keys)]
+    await _run("global lock", _LockedRateLimiter(), keys, args.checks, args.concurrency)
+    await _run("lock-free LRU buckets", RateLimiter(), keys, args.checks, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark metric ingest latency while retention cleanup runs.
+
+Fills a temporary database with expired and live raw metrics, then flushes small
+metric batches on a fixed cadence while cleanup runs, and reports flush
+latency percentiles for:
+
+- no cleanup (baseline)
+- one unbounded DELETE (the previous behaviour)
+- batched deletes through the shared writer connection
+- dropping an expired day partition
+
+Not collected by pytest. Usage (from metrics-service/):
+    uv run python tests/benchmark_retention.py
+    uv run python tests/benchmark_retention.py --expired-rows 500000 --live-rows 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import Settings, settings  # noqa: E402
+from app.core.retention import RetentionManager  # noqa: E402
+from app.storage.database import (  # noqa: E402
+    MetricsStorage,
+    close_database,
+    get_connection_pool,
+    init_database,
+)
+from app.storage.partitions import create_partition, partition_name  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_ingest import _make_batch  # noqa: E402
+
+_EXPIRED_ROW = (
+    "req_old", "benchmark", "1.0.0", "bench-01", "auth_request",
+    "2020-01-01T00:00:00", 1.0, 12.5, '{"success": true}', "{}", "2020-01-01 00:00:00",
+)
+
+
+_INSERT = """
+    INSERT INTO {table} (
+        request_id, service, service_version, instance_id, metric_type,
+        timestamp, value, duration_ms, dimensions, metadata, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _live_row() -> tuple:
+    """A raw metric written now, which retention must keep."""
+    now = datetime.now(timezone.utc)
+    return (
+        "req_live", "benchmark", "1.0.0", "bench-01", "auth_request",
+        now.isoformat(), 1.0, 12.5, '{"success": true}', "{}", now.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+
+async def _fill(table: str, expired_rows: int, live_rows: int) -> None:
+    """Insert expired rows into a raw metrics table (or partition) and live rows into metrics.
+
+    When both go to the base table they are interleaved, as in a table that
+    has been receiving traffic for longer than the retention period.
+    """
+    live_row = _live_row()
+    async with get_connection_pool().writer() as db:
+        if table != "metrics":
+            await create_partition(db, "metrics", table)
+        total = expired_rows + live_rows
+        expired_written = live_written = 0
+        for start in range(0, total, 10_000):
+            end = min(total, start + 10_000)
+            expired_target = expired_rows * end // total
+            expired = expired_target - expired_written
+            live = (end - start) - expired
+            expired_written += expired
+            live_written += live
+            if table == "metrics":
+                rows = [_EXPIRED_ROW] * expired + [live_row] * live
+                await db.executemany(_INSERT.format(table="metrics"), rows)
+            else:
+                await db.executemany(_INSERT.format(table=table), [_EXPIRED_ROW] * expired)
+                await db.executemany(_INSERT.format(table="metrics"), [live_row] * live)
+        await db.commit()
+
+
+async def _unbounded_delete(db_path: str) -> None:
+    """Previous implementation: one DELETE on its own connection."""
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute("DELETE FROM metrics WHERE created_at < datetime('now', '-90 days')")
+        await db.commit()
+
+
+async def _measure(label: str, cleanup, flushes: int, interval: float, batch_size: int) -> None:
+    """Flush batches every interval while cleanup runs, then print latency percentiles."""
+    storage = MetricsStorage()
+    latencies = []
+    cleanup_task = asyncio.create_task(cleanup()) if cleanup else None
+    start = time.perf_counter()
+
+    i = 0
+    while i < flushes or (cleanup_task and not cleanup_task.done()):
+        flush_start = time.perf_counter()
+        await storage.store_metrics_batch(_make_batch(i, batch_size))
+        latencies.append((time.perf_counter() - flush_start) * 1000)
+        i += 1
+        await asyncio.sleep(interval)
+
+    cleanup_seconds = time.perf_counter() - start
+    if cleanup_task:
+        await cleanup_task
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<26} flushes={len(latencies):>5}  p50={p50:7.2f}ms  p99={p99:8.2f}ms  "
+          f"max={latencies[-1]:8.2f}ms  elapsed={cleanup_seconds:6.2f}s")
+
+
+async def main() -> None:
+    """Run each scenario against a fresh temporary database."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expired-rows", type=int, default=300_000)
+    parser.add_argument("--live-rows", type=int, default=300_000)
+    parser.add_argument("--flushes", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    settings.RETENTION_BATCH_PAUSE_SECONDS = 0.01
+
+    old_partition = partition_name("metrics", datetime.now(timezone.utc).date() - timedelta(days=120))
+
+    async def chunked():
+        await RetentionManager().cleanup_table("metrics")
+
+    async def drop_partition():
+        await RetentionManager().cleanup_table("metrics")
+
+    scenarios = [
+        ("no cleanup", None, None),
+        ("unbounded DELETE", "metrics", lambda: _unbounded_delete(Settings.SQLITE_DB_PATH)),
+        ("batched DELETE", "metrics", chunked),
+        ("drop day partition", old_partition, drop_partition),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, table, cleanup) in enumerate(scenarios):
+            Settings.SQLITE_DB_PATH = str(Path(tmp) / f"retention_{i}.db")
+            await init_database()
+            await _fill(table or "metrics", args.expired_rows, args.live_rows)
+            await _measure(label, cleanup, args.flushes, args.interval, args.batch_size)
+            await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,9 +11,10 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.config import Settings
-from app.storage.database import init_database, MetricsStorage
+from app.storage.database import init_database, close_database, MetricsStorage
 from app.core.models import MetricType, Metric, MetricRequest
 from app.utils.helpers import hash_api_key
+from app.core.api_key_cache import api_key_cache
 from datetime import datetime
 
 
@@ -25,6 +26,21 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+async def close_pooled_connections():
+    """Close pooled database connections opened during a test."""
+    yield
+    await close_database()
+
+
+@pytest.fixture(autouse=True)
+def reset_api_key_cache():
+    """Start each test with no cached API keys or pending usage writes."""
+    yield
+    api_key_cache.invalidate()
+    api_key_cache._pending_usage.clear()
+
+
 @pytest.fixture
 def temp_db():
     """Create a temporary database for testing."""
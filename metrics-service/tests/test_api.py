@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.core.models import MetricType, Metric, MetricRequest
+from app.core.processor import IngestBackpressure
 from app.utils.helpers import hash_api_key
 
 
@@ -211,6 +212,29 @@ class TestMetricsEndpoint:
 
         assert response.status_code == 500
         assert "Internal server error" in response.json()["detail"]
+
+    @patch('app.api.auth.MetricsStorage')
+    @patch('app.api.routes.processor')
+    def test_metrics_backpressure(self, mock_processor, mock_storage_class, client, valid_metric_request):
+        """Test a full ingest buffer is returned to the client with Retry-After."""
+        mock_storage = AsyncMock()
+        mock_storage.get_api_key.return_value = {
+            'service_name': 'test-service',
+            'is_active': True,
+            'rate_limit': 1000,
+            'last_used_at': None
+        }
+        mock_storage_class.return_value = mock_storage
+
+        mock_processor.process_metrics = AsyncMock(
+            side_effect=IngestBackpressure(503, 5, "Metrics storage unavailable, retry later")
+        )
+
+        headers = {"X-API-Key": "test_key_123"}
+        response = client.post("/metrics", json=valid_metric_request, headers=headers)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
     
     @patch('app.api.auth.MetricsStorage')
     @patch('app.api.routes.MetricsProcessor')
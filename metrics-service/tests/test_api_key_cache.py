@@ -0,0 +1,148 @@
+"""Tests for the API key cache and batched last-used write-back."""
+import pytest
+import aiosqlite
+from unittest.mock import AsyncMock, patch
+
+from app.core.api_key_cache import APIKeyCache
+
+
+KEY_INFO = {
+    'service_name': 'test-service',
+    'is_active': True,
+    'rate_limit': 1000,
+    'last_used_at': None
+}
+
+
+class TestAPIKeyCache:
+    """Test cache lookups, expiry and eviction."""
+
+    def test_miss_then_hit(self):
+        """Test stored keys are returned until they expire."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=10, max_entries=10)
+
+        assert cache.lookup("hash_a") == (False, None)
+        cache.store("hash_a", KEY_INFO)
+
+        assert cache.lookup("hash_a") == (True, KEY_INFO)
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_unknown_keys_are_cached(self):
+        """Test negative results are cached and distinguishable from misses."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=10, max_entries=10)
+
+        cache.store("unknown", None)
+
+        assert cache.lookup("unknown") == (True, None)
+
+    def test_entries_expire(self):
+        """Test entries are not returned after their TTL."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=10, max_entries=10)
+
+        with patch('app.core.api_key_cache.time.monotonic', return_value=1000.0):
+            cache.store("hash_a", KEY_INFO)
+            cache.store("unknown", None)
+
+        with patch('app.core.api_key_cache.time.monotonic', return_value=1011.0):
+            assert cache.lookup("hash_a") == (True, KEY_INFO)
+            assert cache.lookup("unknown") == (False, None)
+
+        with patch('app.core.api_key_cache.time.monotonic', return_value=1061.0):
+            assert cache.lookup("hash_a") == (False, None)
+
+    def test_zero_ttl_disables_caching(self):
+        """Test a TTL of zero turns caching off."""
+        cache = APIKeyCache(ttl_seconds=0, negative_ttl_seconds=0, max_entries=10)
+
+        cache.store("hash_a", KEY_INFO)
+
+        assert cache.lookup("hash_a") == (False, None)
+
+    def test_size_is_bounded(self):
+        """Test the least recently used keys are evicted once max_entries is reached."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=60, max_entries=3)
+
+        for i in range(3):
+            cache.store(f"hash_{i}", KEY_INFO)
+        cache.lookup("hash_0")
+        cache.store("hash_3", KEY_INFO)
+
+        assert cache.get_stats()["entries"] == 3
+        assert cache.lookup("hash_1") == (False, None)
+        assert cache.lookup("hash_0") == (True, KEY_INFO)
+        assert cache.lookup("hash_3") == (True, KEY_INFO)
+
+    def test_unknown_keys_have_their_own_bound(self):
+        """Test a flood of unknown keys cannot evict valid ones."""
+        cache = APIKeyCache(
+            ttl_seconds=60, negative_ttl_seconds=60, max_entries=3, max_negative_entries=2
+        )
+        cache.store("hash_a", KEY_INFO)
+
+        for i in range(5):
+            cache.store(f"unknown_{i}", None)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["negative_entries"] == 2
+        assert cache.lookup("hash_a") == (True, KEY_INFO)
+        assert cache.lookup("unknown_0") == (False, None)
+        assert cache.lookup("unknown_4") == (True, None)
+
+    def test_key_moves_between_valid_and_unknown(self):
+        """Test storing a result replaces the opposite kind of entry for the key."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=60, max_entries=3)
+
+        cache.store("hash_a", None)
+        cache.store("hash_a", KEY_INFO)
+
+        assert cache.lookup("hash_a") == (True, KEY_INFO)
+        assert cache.get_stats()["negative_entries"] == 0
+
+    def test_invalidate(self):
+        """Test invalidating one key or the whole cache."""
+        cache = APIKeyCache(ttl_seconds=60, negative_ttl_seconds=10, max_entries=10)
+        cache.store("hash_a", KEY_INFO)
+        cache.store("hash_b", KEY_INFO)
+
+        cache.invalidate("hash_a")
+        assert cache.lookup("hash_a") == (False, None)
+        assert cache.lookup("hash_b") == (True, KEY_INFO)
+
+        cache.invalidate()
+        assert cache.lookup("hash_b") == (False, None)
+
+
+class TestUsageWriteBack:
+    """Test batched last-used timestamps."""
+
+    async def test_flush_writes_last_used(self, storage_with_api_key):
+        """Test recorded usage reaches the database in one flush."""
+        storage, test_key = storage_with_api_key
+        cache = APIKeyCache()
+
+        cache.record_usage(test_key["hash"])
+        cache.record_usage(test_key["hash"])
+        assert cache.get_stats()["pending_usage_updates"] == 1
+
+        assert await cache.flush_usage() == 1
+        assert await cache.flush_usage() == 0
+
+        key_info = await storage.get_api_key(test_key["hash"])
+        assert key_info["last_used_at"] is not None
+
+    async def test_failed_flush_keeps_pending_usage(self):
+        """Test timestamps are retried on the next flush if a write fails."""
+        cache = APIKeyCache()
+        cache.record_usage("hash_a")
+
+        with patch('app.core.api_key_cache.MetricsStorage') as mock_storage_class:
+            mock_storage = AsyncMock()
+            mock_storage.update_api_key_usage_batch.side_effect = aiosqlite.OperationalError("locked")
+            mock_storage_class.return_value = mock_storage
+
+            with pytest.raises(aiosqlite.OperationalError):
+                await cache.flush_usage()
+
+        assert cache.get_stats()["pending_usage_updates"] == 1
@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app.api.auth import verify_api_key
+from app.core.api_key_cache import api_key_cache
 from app.utils.helpers import hash_api_key
 from app.main import app
 
@@ -35,7 +36,8 @@ class TestAPIKeyVerification:
         
         assert result == 'test-service'
         mock_storage.get_api_key.assert_called_once_with(hash_api_key("test_key_123"))
-        mock_storage.update_api_key_usage.assert_called_once()
+        # Last-used is written in batches, not per request
+        mock_storage.update_api_key_usage.assert_not_called()
     
     @patch('app.api.auth.MetricsStorage')
     async def test_verify_missing_api_key(self, mock_storage_class):
@@ -91,9 +93,10 @@ class TestAPIKeyVerification:
         assert exc_info.value.status_code == 401
         assert "API key is inactive" in str(exc_info.value.detail)
     
+    @patch('app.core.api_key_cache.MetricsStorage')
     @patch('app.api.auth.MetricsStorage')
-    async def test_verify_api_key_updates_usage(self, mock_storage_class):
-        """Test that API key verification updates usage timestamp."""
+    async def test_verify_api_key_updates_usage(self, mock_storage_class, mock_cache_storage_class):
+        """Test that API key verification records usage for the next batched write."""
         # Mock storage
         mock_storage = AsyncMock()
         mock_storage.get_api_key.return_value = {
@@ -111,9 +114,54 @@ class TestAPIKeyVerification:
         
         result = await verify_api_key(mock_request)
         
-        # Verify usage was updated with correct key hash
+        # Verify usage is written on flush with correct key hash
         expected_hash = hash_api_key("test_key_123")
-        mock_storage.update_api_key_usage.assert_called_once_with(expected_hash)
+        mock_cache_storage = AsyncMock()
+        mock_cache_storage_class.return_value = mock_cache_storage
+        
+        assert await api_key_cache.flush_usage() == 1
+        
+        last_used = mock_cache_storage.update_api_key_usage_batch.call_args[0][0]
+        assert list(last_used) == [expected_hash]
+    
+    @patch('app.api.auth.MetricsStorage')
+    async def test_verify_api_key_uses_cache(self, mock_storage_class):
+        """Test that repeated verification of a key does not query the database."""
+        mock_storage = AsyncMock()
+        mock_storage.get_api_key.return_value = {
+            'service_name': 'test-service',
+            'is_active': True,
+            'rate_limit': 1000,
+            'last_used_at': None
+        }
+        mock_storage_class.return_value = mock_storage
+        
+        from unittest.mock import MagicMock
+        mock_request = MagicMock()
+        mock_request.headers = {"X-API-Key": "cached_key"}
+        
+        for _ in range(3):
+            assert await verify_api_key(mock_request) == 'test-service'
+        
+        mock_storage.get_api_key.assert_called_once()
+    
+    @patch('app.api.auth.MetricsStorage')
+    async def test_invalid_api_key_is_negatively_cached(self, mock_storage_class):
+        """Test that repeated requests with an unknown key query the database once."""
+        mock_storage = AsyncMock()
+        mock_storage.get_api_key.return_value = None
+        mock_storage_class.return_value = mock_storage
+        
+        from unittest.mock import MagicMock
+        mock_request = MagicMock()
+        mock_request.headers = {"X-API-Key": "unknown_key"}
+        
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_api_key(mock_request)
+            assert exc_info.value.status_code == 401
+        
+        mock_storage.get_api_key.assert_called_once()
 
 
 class TestAPIKeyHashingHelpers:
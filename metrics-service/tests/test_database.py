@@ -158,4 +158,93 @@ class TestMetricsStorage:
         }]
         
         # Should store discovery metric without exceptions
-        await storage.store_metrics_batch(metrics_batch)
\ No newline at end of file
+        await storage.store_metrics_batch(metrics_batch)
+
+class TestConnectionPool:
+    """Test pooled connections and batched inserts."""
+
+    async def test_batch_rows_grouped_by_table(self, initialized_db):
+        """Test that a mixed batch lands in the main and specialized tables."""
+        storage = MetricsStorage()
+        request = MetricRequest(
+            service="pool-service",
+            metrics=[Metric(type=MetricType.AUTH_REQUEST, value=1.0)]
+        )
+        metrics_batch = [
+            {
+                'metric': Metric(type=metric_type, value=1.0, dimensions={"success": True}),
+                'request': request,
+                'request_id': f'pool_{i}'
+            }
+            for i, metric_type in enumerate([
+                MetricType.AUTH_REQUEST,
+                MetricType.AUTH_REQUEST,
+                MetricType.TOOL_EXECUTION,
+                MetricType.HEALTH_CHECK,
+            ])
+        ]
+
+        await storage.store_metrics_batch(metrics_batch)
+
+        async with storage.pool.reader() as db:
+            counts = {}
+            for table in ("metrics", "auth_metrics", "tool_metrics", "discovery_metrics"):
+                async with db.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
+                    counts[table] = (await cursor.fetchone())[0]
+
+        assert counts == {
+            "metrics": 4,
+            "auth_metrics": 2,
+            "tool_metrics": 1,
+            "discovery_metrics": 0,
+        }
+
+    async def test_storage_instances_share_writer(self, storage_with_api_key):
+        """Test that storages for one database reuse a single writer connection."""
+        storage, api_key_info = storage_with_api_key
+
+        async with storage.pool.writer() as first:
+            pass
+        await MetricsStorage().update_api_key_usage(api_key_info["hash"])
+        async with MetricsStorage().pool.writer() as second:
+            pass
+
+        assert first is second
+
+    async def test_failed_batch_is_rolled_back(self, initialized_db, sample_metric_request):
+        """Test that a failing batch leaves no partial rows behind."""
+        storage = MetricsStorage()
+        good = {
+            'metric': sample_metric_request.metrics[0],
+            'request': sample_metric_request,
+            'request_id': 'ok'
+        }
+        bad = dict(good, request_id=None)  # request_id is NOT NULL
+
+        with pytest.raises(Exception):
+            await storage.store_metrics_batch([good, bad])
+
+        async with storage.pool.reader() as db:
+            async with db.execute("SELECT COUNT(*) FROM metrics") as cursor:
+                assert (await cursor.fetchone())[0] == 0
+
+    async def test_reader_pool_is_bounded(self, initialized_db):
+        """Test that concurrent reads wait for a free connection beyond the pool size."""
+        pool = MetricsStorage().pool
+        pool.reader_pool_size = 2
+        in_use = 0
+        max_in_use = 0
+
+        async def read():
+            nonlocal in_use, max_in_use
+            async with pool.reader() as db:
+                in_use += 1
+                max_in_use = max(max_in_use, in_use)
+                await db.execute("SELECT 1")
+                await asyncio.sleep(0.01)
+                in_use -= 1
+
+        await asyncio.gather(*(read() for _ in range(6)))
+
+        assert max_in_use == 2
+        assert pool._reader_count == 2
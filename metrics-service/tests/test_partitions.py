@@ -0,0 +1,168 @@
+"""Tests for day-partitioned raw tables and partition-aware retention."""
+import pytest
+import aiosqlite
+from datetime import date, datetime, timedelta, timezone
+from app.config import settings
+from app.core.models import Metric, MetricRequest, MetricType
+from app.core.retention import RetentionManager
+from app.core.rollup import RollupManager
+from app.storage.database import MetricsStorage, get_connection_pool
+from app.storage.partitions import (
+    create_partition,
+    current_partition,
+    list_partitions,
+    parse_partition_name,
+    partition_name,
+)
+
+
+@pytest.fixture
+def partitioned(monkeypatch):
+    """Enable day partitioning without pauses between retention batches."""
+    monkeypatch.setattr(settings, "METRICS_PARTITION_BY_DAY", True)
+    monkeypatch.setattr(settings, "RETENTION_BATCH_PAUSE_SECONDS", 0)
+
+
+def _batch(count):
+    """Build a store_metrics_batch payload of auth metrics."""
+    request = MetricRequest(
+        service="auth-server",
+        version="1.0.0",
+        instance_id="auth-01",
+        metrics=[Metric(type=MetricType.AUTH_REQUEST, value=1.0)],
+    )
+    return [
+        {
+            "metric": Metric(
+                type=MetricType.AUTH_REQUEST,
+                timestamp=datetime(2024, 1, 15, 10, 30, 0),
+                value=1.0,
+                duration_ms=10.0,
+                dimensions={"method": "jwt", "success": True},
+            ),
+            "request": request,
+            "request_id": f"req_{i}",
+        }
+        for i in range(count)
+    ]
+
+
+async def _count(db_path, table):
+    async with aiosqlite.connect(db_path) as db:
+        cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
+        return (await cursor.fetchone())[0]
+
+
+class TestPartitionNames:
+    """Test partition naming helpers."""
+
+    def test_round_trip(self):
+        """Test partition names parse back to their table and day."""
+        name = partition_name("auth_metrics", date(2024, 1, 15))
+
+        assert name == "auth_metrics_p20240115"
+        assert parse_partition_name(name) == ("auth_metrics", date(2024, 1, 15))
+
+    def test_non_partitions_are_rejected(self):
+        """Test rollup tables and unknown tables are not mistaken for partitions."""
+        assert parse_partition_name("metrics_hourly") is None
+        assert parse_partition_name("metrics_daily") is None
+        assert parse_partition_name("other_p20240115") is None
+        assert parse_partition_name("metrics_p20241399") is None
+
+
+class TestPartitionedStorage:
+    """Test inserts, views and rollups with partitioning enabled."""
+
+    async def test_inserts_go_to_todays_partition(self, initialized_db, partitioned):
+        """Test raw rows land in today's partitions and are visible through the views."""
+        await MetricsStorage().store_metrics_batch(_batch(3))
+
+        assert await _count(initialized_db, "metrics") == 0
+        assert await _count(initialized_db, current_partition("metrics")) == 3
+        assert await _count(initialized_db, current_partition("auth_metrics")) == 3
+        assert await _count(initialized_db, "metrics_all") == 3
+        assert await _count(initialized_db, "auth_metrics_all") == 3
+
+    async def test_partition_copies_indexes(self, initialized_db, partitioned):
+        """Test partitions get the base table's indexes."""
+        await MetricsStorage().store_metrics_batch(_batch(1))
+
+        async with aiosqlite.connect(initialized_db) as db:
+            cursor = await db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+                (current_partition("metrics"),),
+            )
+            indexes = {name for (name,) in await cursor.fetchall()}
+
+        suffix = current_partition("metrics")[len("metrics"):]
+        assert f"idx_metrics_timestamp{suffix}" in indexes
+
+    async def test_rollup_reads_base_table_and_partitions(self, initialized_db, monkeypatch):
+        """Test rows written before and after enabling partitioning are both rolled up."""
+        storage = MetricsStorage()
+        await storage.store_metrics_batch(_batch(2))
+        monkeypatch.setattr(settings, "METRICS_PARTITION_BY_DAY", True)
+        await storage.store_metrics_batch(_batch(3))
+
+        manager = RollupManager()
+        assert await manager.run_until_caught_up() == 5
+        assert await manager.run_until_caught_up() == 0
+
+        daily = await manager.query("daily")
+        assert daily[0]["count"] == 5
+        status = await manager.get_status()
+        assert status["high_water_marks"][current_partition("metrics")] == 3
+        assert status["pending_rows"] == 0
+
+
+class TestPartitionRetention:
+    """Test retention drops expired partitions whole."""
+
+    async def test_expired_partitions_are_dropped(self, initialized_db, partitioned):
+        """Test only partitions entirely past retention are dropped."""
+        await MetricsStorage().store_metrics_batch(_batch(2))
+        old_day = datetime.now(timezone.utc).date() - timedelta(days=120)
+        old_partition = partition_name("metrics", old_day)
+        async with get_connection_pool().writer() as db:
+            await create_partition(db, "metrics", old_partition)
+            await db.execute(
+                f"INSERT INTO {old_partition} (request_id, service, metric_type, timestamp, value) "
+                "VALUES ('old', 'test', 'auth_request', '2024-01-01T00:00:00', 1.0)"
+            )
+            await db.commit()
+
+        manager = RetentionManager()
+        preview = await manager.cleanup_table("metrics", dry_run=True)
+        assert preview["partitions_would_drop"] == [old_partition]
+
+        result = await manager.cleanup_table("metrics", dry_run=False)
+
+        assert result["records_deleted"] == 1
+        assert result["partitions_dropped"] == [old_partition]
+        async with aiosqlite.connect(initialized_db) as db:
+            assert await list_partitions(db, "metrics") == [current_partition("metrics")]
+        assert await _count(initialized_db, "metrics_all") == 2
+
+    async def test_incremental_vacuum_after_cleanup(self, initialized_db, partitioned):
+        """Test new databases reclaim freed pages incrementally."""
+        rows = [
+            ("req", "test", "auth_request", "2024-01-01T00:00:00", 1.0, "x" * 2000, "2000-01-01 00:00:00")
+            for _ in range(200)
+        ]
+        async with get_connection_pool().writer() as db:
+            await db.executemany(
+                "INSERT INTO metrics (request_id, service, metric_type, timestamp, value, metadata, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            await db.commit()
+
+        result = await RetentionManager().cleanup_all_tables(dry_run=False)
+
+        assert result["table_results"]["metrics"]["records_deleted"] == 200
+        assert result["vacuum"]["mode"] == "incremental"
+        assert result["vacuum"]["pages_freed"] > 0
+        async with aiosqlite.connect(initialized_db) as db:
+            cursor = await db.execute("PRAGMA freelist_count")
+            assert (await cursor.fetchone())[0] == 0
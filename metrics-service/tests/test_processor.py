@@ -3,7 +3,7 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.core.processor import MetricsProcessor, ProcessingResult
+from app.core.processor import MetricsProcessor, ProcessingResult, IngestBackpressure
 from app.core.models import MetricType, Metric, MetricRequest
 from datetime import datetime
 
@@ -41,8 +41,9 @@ class TestMetricsProcessor:
         
         processor = MetricsProcessor()
         assert processor.storage is not None
-        assert processor._buffer == []
-        assert processor._buffer_lock is not None
+        assert len(processor._buffer) == 0
+        assert processor._write_lock is not None
+        assert processor.low_watermark <= processor.high_watermark
     
     @patch('app.core.processor.MetricsStorage')
     def test_processor_initialization_with_otel(self, mock_storage_class):
@@ -255,7 +256,7 @@ class TestMetricsProcessing:
         processor.otel.auth_histogram.record.assert_called_once()
     
     @patch('app.core.processor.MetricsStorage')
-    async def test_process_metrics_storage_error(self, mock_storage_class):
+    async def test_process_metrics_storage_error(self, mock_storage_class, tmp_path):
         """Test processing metrics when storage fails during flush.
 
         Note: Metrics are buffered and the storage error only occurs during flush.
@@ -265,7 +266,8 @@ class TestMetricsProcessing:
         mock_storage.store_metrics_batch = AsyncMock(side_effect=Exception("Storage error"))
         mock_storage_class.return_value = mock_storage
 
-        processor = MetricsProcessor()
+        spill_path = tmp_path / "metrics.spill.jsonl"
+        processor = MetricsProcessor(spill_path=str(spill_path))
         processor.otel = None
 
         metric = Metric(
@@ -288,8 +290,9 @@ class TestMetricsProcessing:
         # Force flush to trigger the storage error
         await processor.force_flush()
 
-        # After failed flush, metrics are re-added to buffer for retry
-        assert len(processor._buffer) == 1
+        # After failed flush, metrics are spilled to disk instead of held in memory
+        assert len(processor._buffer) == 0
+        assert len(spill_path.read_text().splitlines()) == 1
 
 
 class TestOTelEmission:
@@ -422,10 +425,10 @@ class TestBufferedStorage:
         # Add some metrics to buffer
         metric = Metric(type=MetricType.AUTH_REQUEST, value=1.0)
         request = MetricRequest(service="test", metrics=[metric])
-        processor._buffer = [
+        processor._buffer.extend([
             {'metric': metric, 'request': request, 'request_id': 'req_1'},
             {'metric': metric, 'request': request, 'request_id': 'req_2'}
-        ]
+        ])
         
         await processor.force_flush()
         
@@ -433,4 +436,209 @@ class TestBufferedStorage:
         assert len(processor._buffer) == 0
         
         # Storage should have been called
-        mock_storage.store_metrics_batch.assert_called_once()
\ No newline at end of file
+        mock_storage.store_metrics_batch.assert_called_once()
+
+
+def _request(count: int = 1) -> MetricRequest:
+    return MetricRequest(
+        service="test-service",
+        version="1.0.0",
+        instance_id="test-01",
+        metrics=[Metric(type=MetricType.TOOL_EXECUTION, value=1.0, dimensions={"tool_name": "calc"})
+                 for _ in range(count)]
+    )
+
+
+def _stored_request_ids(mock_storage) -> list:
+    return [
+        entry['request_id']
+        for call in mock_storage.store_metrics_batch.call_args_list
+        for entry in call.args[0]
+    ]
+
+
+class TestIngestBackpressure:
+    """Test buffer watermarks, the writer task and the spill file."""
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_high_watermark_rejects_until_low_watermark(self, mock_storage_class):
+        """Test requests get 429 from the high watermark until the buffer drains to the low one."""
+        mock_storage = AsyncMock()
+        mock_storage_class.return_value = mock_storage
+        processor = MetricsProcessor(high_watermark=10, low_watermark=4, spill_path="")
+        processor.otel = None
+
+        await processor.process_metrics(_request(10), "req_1", "test-service")
+
+        with pytest.raises(IngestBackpressure) as exc_info:
+            await processor.process_metrics(_request(), "req_2", "test-service")
+        assert exc_info.value.status_code == 429
+        assert processor.get_stats()["rejected_requests"] == 1
+
+        # Draining to just above the low watermark is not enough
+        for _ in range(5):
+            processor._buffer.pop()
+        processor._update_admission()
+        with pytest.raises(IngestBackpressure):
+            await processor.process_metrics(_request(), "req_3", "test-service")
+
+        await processor.force_flush()
+        result = await processor.process_metrics(_request(), "req_4", "test-service")
+        assert result.accepted == 1
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_storage_down_without_spill_returns_503(self, mock_storage_class):
+        """Test metrics stay buffered and requests get 503 when storage fails and spilling is off."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("database is locked")
+        mock_storage_class.return_value = mock_storage
+        processor = MetricsProcessor(high_watermark=5, low_watermark=2, spill_path="")
+        processor.otel = None
+
+        await processor.process_metrics(_request(5), "req_1", "test-service")
+        await processor.force_flush()
+
+        assert processor.pending == 5
+        with pytest.raises(IngestBackpressure) as exc_info:
+            await processor.process_metrics(_request(), "req_2", "test-service")
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.retry_after >= 1
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_failed_batches_skip_storage_until_retry(self, mock_storage_class, tmp_path):
+        """Test batches go straight to the spill file until the storage retry time."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("disk I/O error")
+        mock_storage_class.return_value = mock_storage
+        processor = MetricsProcessor(spill_path=str(tmp_path / "spill.jsonl"))
+        processor.otel = None
+
+        await processor.process_metrics(_request(), "req_1", "test-service")
+        await processor.force_flush()
+        await processor.process_metrics(_request(), "req_2", "test-service")
+        await processor.force_flush()
+
+        assert mock_storage.store_metrics_batch.call_count == 1
+        assert processor.get_stats()["spilled_metrics"] == 2
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_spill_is_replayed_after_recovery(self, mock_storage_class, tmp_path):
+        """Test spilled metrics are stored once storage recovers and the file is removed."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("disk I/O error")
+        mock_storage_class.return_value = mock_storage
+        spill_path = tmp_path / "spill.jsonl"
+        processor = MetricsProcessor(spill_path=str(spill_path))
+        processor.otel = None
+        processor.batch_size = 2
+
+        await processor.process_metrics(_request(3), "req_1", "test-service")
+        await processor.force_flush()
+        assert processor.get_stats()["spill_backlog_bytes"] > 0
+
+        mock_storage.store_metrics_batch.reset_mock(side_effect=True)
+        processor._retry_at = 0.0
+        while processor._spill_backlog():
+            await processor._write_pending(replay=True)
+
+        assert not spill_path.exists()
+        assert _stored_request_ids(mock_storage) == ["req_1"] * 3
+        replayed = mock_storage.store_metrics_batch.call_args_list[0].args[0][0]
+        assert replayed['metric'].type == MetricType.TOOL_EXECUTION
+        assert replayed['metric'].dimensions == {"tool_name": "calc"}
+        assert replayed['request'].instance_id == "test-01"
+        assert processor.get_stats()["replayed_metrics"] == 3
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_restart_mid_replay_does_not_store_metrics_twice(self, mock_storage_class, tmp_path):
+        """Test a processor restarted during replay resumes after the batches already stored."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("disk I/O error")
+        mock_storage_class.return_value = mock_storage
+        spill_path = tmp_path / "spill.jsonl"
+        processor = MetricsProcessor(spill_path=str(spill_path))
+        processor.otel = None
+        processor.batch_size = 2
+
+        for i in range(5):
+            await processor.process_metrics(_request(), f"req_{i}", "test-service")
+        await processor.force_flush()
+        assert processor.get_stats()["spilled_metrics"] == 5
+
+        # Replay one batch, then stop the processor
+        mock_storage.store_metrics_batch.reset_mock(side_effect=True)
+        processor._retry_at = 0.0
+        await processor._write_pending(replay=True)
+        assert _stored_request_ids(mock_storage) == ["req_0", "req_1"]
+
+        restarted = MetricsProcessor(spill_path=str(spill_path))
+        restarted.otel = None
+        restarted.batch_size = 2
+        await restarted._load_spill_state()
+        while restarted._spill_backlog():
+            await restarted._write_pending(replay=True)
+
+        assert _stored_request_ids(mock_storage) == [f"req_{i}" for i in range(5)]
+        assert not spill_path.exists()
+        assert not (tmp_path / "spill.jsonl.offset").exists()
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_stale_replay_offset_is_ignored(self, mock_storage_class, tmp_path):
+        """Test an offset left behind by a removed spill file does not skip a new one."""
+        mock_storage_class.return_value = AsyncMock()
+        spill_path = tmp_path / "spill.jsonl"
+        (tmp_path / "spill.jsonl.offset").write_text("4096")
+        spill_path.write_bytes(b"{}\n")
+        processor = MetricsProcessor(spill_path=str(spill_path))
+
+        await processor._load_spill_state()
+
+        assert processor._spill_offset == 0
+        assert processor.get_stats()["spill_backlog_bytes"] == 3
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_spill_full_keeps_metrics_in_memory(self, mock_storage_class, tmp_path):
+        """Test batches stay buffered once the spill file reaches its size limit."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("disk I/O error")
+        mock_storage_class.return_value = mock_storage
+        processor = MetricsProcessor(spill_path=str(tmp_path / "spill.jsonl"))
+        processor.otel = None
+        processor.spill_max_bytes = 10
+
+        await processor.process_metrics(_request(2), "req_1", "test-service")
+        await processor.force_flush()
+
+        assert processor.pending == 2
+        assert processor.get_stats()["spilled_metrics"] == 0
+
+    @patch('app.core.processor.MetricsStorage')
+    async def test_writer_stores_full_batches_and_replays_old_spill(self, mock_storage_class, tmp_path):
+        """Test the writer replays a spill file left by a previous run and wakes on a full batch."""
+        mock_storage = AsyncMock()
+        mock_storage.store_metrics_batch.side_effect = Exception("disk I/O error")
+        mock_storage_class.return_value = mock_storage
+        spill_path = tmp_path / "spill.jsonl"
+
+        previous = MetricsProcessor(spill_path=str(spill_path))
+        previous.otel = None
+        await previous.process_metrics(_request(), "req_old", "test-service")
+        await previous.force_flush()
+
+        mock_storage.store_metrics_batch.reset_mock(side_effect=True)
+        processor = MetricsProcessor(spill_path=str(spill_path))
+        processor.otel = None
+        processor.batch_size = 2
+        writer = asyncio.create_task(processor.run_writer())
+        try:
+            await processor.process_metrics(_request(2), "req_new", "test-service")
+            for _ in range(100):
+                if processor.pending == 0 and not spill_path.exists():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            writer.cancel()
+            await writer
+
+        assert sorted(_stored_request_ids(mock_storage)) == ["req_new", "req_new", "req_old"]
+        assert not spill_path.exists()
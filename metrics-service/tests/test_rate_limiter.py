@@ -24,8 +24,8 @@ class TestRateLimiter:
     @pytest.mark.asyncio
     async def test_rate_limiter_initialization(self, rate_limiter):
         """Test rate limiter initializes correctly."""
-        assert rate_limiter._buckets == {}
-        assert rate_limiter._lock is not None
+        assert len(rate_limiter._buckets) == 0
+        assert rate_limiter.max_buckets > 0
     
     @pytest.mark.asyncio
     async def test_first_request_allowed(self, rate_limiter):
@@ -75,13 +75,33 @@ class TestRateLimiter:
         
         # Simulate time passing by directly modifying the bucket
         # In real scenario, tokens would refill naturally
-        rate_limiter._buckets[key_hash] = (10, time.time() - 10, rate_limit)  # 10 seconds ago
+        rate_limiter._buckets[key_hash].updated_at -= 10  # 10 seconds ago
         
         # Should have tokens now
         allowed, remaining = await rate_limiter.check_rate_limit(key_hash, rate_limit)
         assert allowed is True
         assert remaining > 0
     
+    @pytest.mark.asyncio
+    async def test_fractional_refill(self, rate_limiter):
+        """Test low limits refill continuously rather than in whole-minute steps."""
+        key_hash = "test_key_hash"
+        rate_limit = 2  # One token every 30 seconds
+        
+        await rate_limiter.check_rate_limit(key_hash, rate_limit)
+        await rate_limiter.check_rate_limit(key_hash, rate_limit)
+        
+        # 15 seconds is half a token: still blocked
+        rate_limiter._buckets[key_hash].updated_at -= 15
+        allowed, _ = await rate_limiter.check_rate_limit(key_hash, rate_limit)
+        assert allowed is False
+        
+        # Another 15 seconds completes the token
+        rate_limiter._buckets[key_hash].updated_at -= 15
+        allowed, remaining = await rate_limiter.check_rate_limit(key_hash, rate_limit)
+        assert allowed is True
+        assert remaining == 0
+    
     @pytest.mark.asyncio
     async def test_different_keys_independent_limits(self, rate_limiter):
         """Test different API keys have independent rate limits."""
@@ -147,24 +167,36 @@ class TestRateLimiter:
         assert status["reset_time_seconds"] == 0
     
     @pytest.mark.asyncio
-    async def test_cleanup_old_buckets(self, rate_limiter):
-        """Test cleanup of old unused buckets."""
-        key_hash = "test_key_hash"
+    async def test_idle_buckets_evicted(self, rate_limiter):
+        """Test buckets idle for a full refill window are dropped when new keys arrive."""
         rate_limit = 100
         
-        # Create a bucket
-        await rate_limiter.check_rate_limit(key_hash, rate_limit)
-        assert len(rate_limiter._buckets) == 1
+        await rate_limiter.check_rate_limit("idle_key", rate_limit)
+        await rate_limiter.check_rate_limit("active_key", rate_limit)
         
-        # Simulate old bucket (25 hours ago)
-        old_time = time.time() - (25 * 3600)
-        rate_limiter._buckets[key_hash] = (50, old_time, rate_limit)
+        # Simulate idle bucket (61 seconds ago); it would be full again anyway
+        rate_limiter._buckets["idle_key"].updated_at -= 61
+        await rate_limiter.check_rate_limit("active_key", rate_limit)
+        await rate_limiter.check_rate_limit("new_key", rate_limit)
         
-        # Clean up old buckets (max age 24 hours)
-        await rate_limiter.cleanup_old_buckets(max_age_hours=24)
+        assert list(rate_limiter._buckets) == ["active_key", "new_key"]
+        assert rate_limiter.get_stats()["evicted_buckets"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted_at_capacity(self):
+        """Test the least recently used bucket is dropped when max_buckets is reached."""
+        rate_limiter = RateLimiter(max_buckets=2)
         
-        # Bucket should be removed
-        assert len(rate_limiter._buckets) == 0
+        await rate_limiter.check_rate_limit("key_1", 10)
+        await rate_limiter.check_rate_limit("key_2", 10)
+        await rate_limiter.check_rate_limit("key_1", 10)  # key_2 is now least recently used
+        await rate_limiter.check_rate_limit("key_3", 10)
+        
+        assert list(rate_limiter._buckets) == ["key_1", "key_3"]
+        
+        # key_1 keeps its consumed tokens
+        status = await rate_limiter.get_bucket_status("key_1", 10)
+        assert status["available_tokens"] == 8
 
 
 class TestRateLimitIntegration:
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from app.core.retention import RetentionPolicy, RetentionManager
 from app.storage.database import MetricsStorage
 from app.storage.migrations import MigrationManager
+from app.config import settings
 import aiosqlite
 
 
@@ -109,6 +110,16 @@ class TestRetentionPolicy:
         assert "FROM metrics" in query
         assert "created_at < datetime('now', '-30 days')" in query
 
+    def test_batch_cleanup_query(self):
+        """Test the batched delete is limited to a parameterized number of rows."""
+        policy = RetentionPolicy(table_name="metrics", retention_days=30)
+        
+        query = policy.get_batch_cleanup_query()
+        
+        assert "DELETE FROM metrics WHERE rowid IN" in query
+        assert "created_at < datetime('now', '-30 days')" in query
+        assert "LIMIT ?" in query
+
 
 class TestRetentionManager:
     """Test retention manager functionality."""
@@ -286,6 +297,36 @@ class TestRetentionManager:
         assert "custom_table" in new_manager.policies
         assert new_manager.policies["custom_table"].retention_days == 120
         assert new_manager.policies["custom_table"].is_active is True
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_deletes_in_batches(self, manager, temp_db, monkeypatch):
+        """Test expired rows are deleted in bounded batches."""
+        monkeypatch.setattr(settings, "RETENTION_DELETE_BATCH_SIZE", 1)
+        monkeypatch.setattr(settings, "RETENTION_BATCH_PAUSE_SECONDS", 0)
+        manager.policies["test_metrics"] = RetentionPolicy(
+            table_name="test_metrics",
+            retention_days=30
+        )
+        
+        result = await manager.cleanup_table("test_metrics", dry_run=False)
+        
+        assert result["records_deleted"] == 2
+        # One batch per expired row plus the final batch that finds none left
+        assert result["batches"] == 3
+        
+        async with aiosqlite.connect(temp_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM test_metrics")
+            assert (await cursor.fetchone())[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_delete_seeks_created_at_index(self, manager, temp_db):
+        """Test batched deletes on raw tables use the created_at index instead of a full scan."""
+        async with aiosqlite.connect(temp_db) as db:
+            for table in ("metrics", "auth_metrics", "discovery_metrics", "tool_metrics"):
+                query = manager.policies[table].get_batch_cleanup_query()
+                cursor = await db.execute(f"EXPLAIN QUERY PLAN {query}", (100,))
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+                assert f"idx_{table}_created_at" in plan, plan
 
 
 class TestRetentionIntegration:
@@ -0,0 +1,174 @@
+"""Tests for incremental hourly/daily rollups."""
+import random
+import pytest
+from datetime import datetime
+from app.core.models import Metric, MetricRequest, MetricType
+from app.core.rollup import QuantileSketch, RollupManager
+from app.storage.database import MetricsStorage
+
+
+def _batch(durations, timestamp=datetime(2024, 1, 15, 10, 30, 0), success=True, service="auth-server"):
+    """Build a store_metrics_batch payload of auth metrics."""
+    request = MetricRequest(
+        service=service,
+        version="1.0.0",
+        instance_id="auth-01",
+        metrics=[Metric(type=MetricType.AUTH_REQUEST, value=1.0)],
+    )
+    return [
+        {
+            "metric": Metric(
+                type=MetricType.AUTH_REQUEST,
+                timestamp=timestamp,
+                value=1.0,
+                duration_ms=duration,
+                dimensions={"method": "jwt", "success": success},
+            ),
+            "request": request,
+            "request_id": f"req_{i}",
+        }
+        for i, duration in enumerate(durations)
+    ]
+
+
+class TestQuantileSketch:
+    """Test the mergeable quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test estimated quantiles stay within the configured relative error."""
+        rng = random.Random(42)
+        values = sorted(rng.lognormvariate(3, 1) for _ in range(10000))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        """Test merging two sketches equals sketching all values at once."""
+        combined, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i in range(1, 1001):
+            combined.add(float(i))
+            (left if i % 2 else right).add(float(i))
+
+        left.merge(right)
+
+        assert left.count == combined.count
+        assert left.bins == combined.bins
+        assert left.quantile(0.95) == combined.quantile(0.95)
+
+    def test_json_round_trip_and_zero_values(self):
+        """Test serialization and handling of zero durations."""
+        sketch = QuantileSketch()
+        for value in (0.0, 0.0, 10.0):
+            sketch.add(value)
+
+        restored = QuantileSketch.from_json(sketch.to_json())
+
+        assert restored.count == 3
+        assert restored.quantile(0.5) == 0.0
+        assert restored.quantile(1.0) == pytest.approx(10.0, rel=0.01)
+        assert QuantileSketch.from_json(None).quantile(0.5) is None
+
+
+class TestRollupManager:
+    """Test incremental rollups into metrics_hourly and metrics_daily."""
+
+    async def test_rollup_populates_hourly_and_daily(self, initialized_db):
+        """Test one pass aggregates raw metrics into both tables."""
+        storage = MetricsStorage()
+        await storage.store_metrics_batch(_batch([10.0, 20.0, 30.0, 40.0]))
+        await storage.store_metrics_batch(
+            _batch([100.0], timestamp=datetime(2024, 1, 15, 11, 5, 0), success=False)
+        )
+
+        manager = RollupManager()
+        processed = await manager.run_until_caught_up()
+
+        assert processed == 5
+        hourly = await manager.query("hourly", service="auth-server")
+        assert [row["hour_timestamp"] for row in hourly] == [
+            "2024-01-15T10:00:00Z",
+            "2024-01-15T11:00:00Z",
+        ]
+        first = hourly[0]
+        assert first["count"] == 4
+        assert first["sum_value"] == 4.0
+        assert first["min_duration_ms"] == 10.0
+        assert first["max_duration_ms"] == 40.0
+        assert first["avg_duration_ms"] == 25.0
+        assert first["p50_duration_ms"] == pytest.approx(20.0, rel=0.01)
+        assert first["success_count"] == 4
+        assert hourly[1]["failure_count"] == 1
+
+        daily = await manager.query("daily")
+        assert len(daily) == 1
+        assert daily[0]["date"] == "2024-01-15"
+        assert daily[0]["count"] == 5
+        assert daily[0]["p99_duration_ms"] == pytest.approx(40.0, rel=0.01)
+
+    async def test_rerun_does_not_double_count(self, initialized_db):
+        """Test a second pass without new metrics leaves the rollups unchanged."""
+        await MetricsStorage().store_metrics_batch(_batch([10.0, 20.0]))
+        manager = RollupManager()
+
+        await manager.run_until_caught_up()
+        assert await manager.run_until_caught_up() == 0
+
+        daily = await manager.query("daily")
+        assert daily[0]["count"] == 2
+
+    async def test_incremental_rows_merge_into_existing_buckets(self, initialized_db):
+        """Test metrics arriving after a pass merge into the same bucket."""
+        storage = MetricsStorage()
+        manager = RollupManager()
+        await storage.store_metrics_batch(_batch([10.0, 20.0]))
+        await manager.run_until_caught_up()
+
+        await storage.store_metrics_batch(_batch([30.0, 40.0, 1000.0]))
+        await manager.run_until_caught_up()
+
+        hourly = await manager.query("hourly")
+        assert len(hourly) == 1
+        assert hourly[0]["count"] == 5
+        assert hourly[0]["duration_count"] == 5
+        assert hourly[0]["sum_duration_ms"] == 1100.0
+        assert hourly[0]["max_duration_ms"] == 1000.0
+        # Median of the merged sketch comes from the second batch
+        assert hourly[0]["p50_duration_ms"] == pytest.approx(30.0, rel=0.01)
+
+    async def test_high_water_mark_survives_restart(self, initialized_db):
+        """Test a new manager resumes from the stored high-water mark in small batches."""
+        storage = MetricsStorage()
+        await storage.store_metrics_batch(_batch([1.0, 2.0, 3.0]))
+
+        assert await RollupManager().run_once(batch_size=2) == 2
+
+        restarted = RollupManager()
+        status = await restarted.get_status()
+        assert status["pending_rows"] == 1
+
+        assert await restarted.run_until_caught_up(batch_size=2) == 1
+        daily = await restarted.query("daily")
+        assert daily[0]["count"] == 3
+        assert (await restarted.get_status())["pending_rows"] == 0
+
+    async def test_query_filters(self, initialized_db):
+        """Test service and time-range filters and invalid granularity."""
+        storage = MetricsStorage()
+        await storage.store_metrics_batch(_batch([1.0]))
+        await storage.store_metrics_batch(_batch([1.0], service="registry"))
+        await storage.store_metrics_batch(_batch([1.0], timestamp=datetime(2024, 1, 16, 9, 0, 0)))
+        manager = RollupManager()
+        await manager.run_until_caught_up()
+
+        registry = await manager.query("daily", service="registry")
+        assert [row["service"] for row in registry] == ["registry"]
+
+        ranged = await manager.query("daily", start="2024-01-16", end="2024-01-17")
+        assert [row["date"] for row in ranged] == ["2024-01-16"]
+
+        with pytest.raises(ValueError):
+            await manager.query("weekly")
@@ -290,3 +290,24 @@ async def semantic_search(
         total_tools=len(filtered_tools),
         total_agents=len(filtered_agents),
     )
+
+
+@router.get(
+    "/cache/stats",
+    summary="Query embedding cache statistics",
+)
+async def query_cache_stats(
+    user_context: Annotated[dict, Depends(nginx_proxied_auth)],
+    search_repo: SearchRepositoryBase = Depends(get_search_repo),
+) -> dict:
+    """
+    Return hit/miss counters and size of the query embedding cache used by semantic search.
+
+    Requires admin privileges.
+    """
+    if not user_context.get("is_admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator permissions are required for this operation",
+        )
+    return search_repo.get_query_cache_stats()
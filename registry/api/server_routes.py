@@ -100,15 +100,7 @@ async def _perform_security_scan_on_registration(
                 await search_repo.index_server(path, server_entry, is_enabled=False)
 
                 # Regenerate Nginx config to remove disabled server
-                enabled_servers = {}
-
-                for server_path in await server_service.get_enabled_services():
-
-                    server_info = await server_service.get_server_info(server_path)
-
-                    if server_info:
-
-                        enabled_servers[server_path] = server_info
+                enabled_servers = await server_service.get_enabled_servers_with_info()
                 await nginx_service.generate_config_async(enabled_servers)
         else:
             logger.info(f"Server {path} passed security scan")
@@ -467,15 +459,7 @@ async def toggle_service_route(
     await faiss_service.add_or_update_service(service_path, server_info, new_state)
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(path)
-
-        if server_info:
-
-            enabled_servers[path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     # Broadcast health status update to WebSocket clients
@@ -605,15 +589,7 @@ async def register_service(
     await faiss_service.add_or_update_service(path, server_entry, is_enabled)
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for server_path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(server_path)
-
-        if server_info:
-
-            enabled_servers[server_path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     # Broadcast health status update to WebSocket clients
@@ -890,15 +866,7 @@ async def internal_register_service(
     )  # TODO: replace with debug
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for server_path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(server_path)
-
-        if server_info:
-
-            enabled_servers[server_path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     logger.warning(
@@ -1090,15 +1058,7 @@ async def internal_remove_service(
     )  # TODO: replace with debug
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for server_path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(server_path)
-
-        if server_info:
-
-            enabled_servers[server_path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     logger.warning(
@@ -1291,15 +1251,7 @@ async def internal_toggle_service(
     await faiss_service.add_or_update_service(service_path, server_info, new_state)
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(path)
-
-        if server_info:
-
-            enabled_servers[path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     # Broadcast health status update to WebSocket clients
@@ -1561,15 +1513,7 @@ async def edit_server_submit(
     )
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(path)
-
-        if server_info:
-
-            enabled_servers[path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     logger.info(
@@ -1889,15 +1833,7 @@ async def refresh_service(
         logger.info(
             f"Regenerating Nginx config after manual refresh for {service_path}..."
         )
-        enabled_servers = {}
-
-        for path in await server_service.get_enabled_services():
-
-            path_server_info = await server_service.get_server_info(path)
-
-            if path_server_info:
-
-                enabled_servers[path] = path_server_info
+        enabled_servers = await server_service.get_enabled_servers_with_info()
         await nginx_service.generate_config_async(enabled_servers)
 
     except Exception as e:
@@ -3099,15 +3035,7 @@ async def toggle_service_api(
     await faiss_service.add_or_update_service(path, server_info, new_state)
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for server_path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(server_path)
-
-        if server_info:
-
-            enabled_servers[server_path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     # Broadcast health status update to WebSocket clients
@@ -3201,15 +3129,7 @@ async def remove_service_api(
     await faiss_service.remove_service(path)
 
     # Regenerate Nginx configuration
-    enabled_servers = {}
-
-    for server_path in await server_service.get_enabled_services():
-
-        server_info = await server_service.get_server_info(server_path)
-
-        if server_info:
-
-            enabled_servers[server_path] = server_info
+    enabled_servers = await server_service.get_enabled_servers_with_info()
     await nginx_service.generate_config_async(enabled_servers)
 
     # Broadcast health status update to WebSocket clients
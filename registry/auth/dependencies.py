@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Annotated, Any
 
@@ -5,6 +6,13 @@ from fastapi import Cookie, Depends, Header, HTTPException, Request, status
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 
 from ..core.config import settings
+from .scope_snapshot import (
+    NON_SERVER_SCOPE_KEYS,
+    ScopeSnapshot,
+    clear_scope_snapshot,
+    get_scope_snapshot,
+    publish_scope_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +134,15 @@ async def reload_scopes_from_repository():
 
         group_mappings = config.get("group_mappings", {})
         ui_scopes = config.get("UI-Scopes", {})
-        scope_defs = len([k for k in config.keys() if k not in ["group_mappings", "UI-Scopes"]])
+        scope_defs = len([k for k in config.keys() if k not in NON_SERVER_SCOPE_KEYS])
+
+        # An empty config usually means the repository was unreachable; keep
+        # querying it per request rather than denying everything from memory
+        if scope_defs or ui_scopes:
+            publish_scope_snapshot(config)
+        else:
+            clear_scope_snapshot()
+            logger.warning("Scopes configuration is empty, scope lookups will query the repository")
 
         logger.info(
             f"Loaded scopes configuration: {len(group_mappings)} group mappings, "
@@ -137,9 +153,71 @@ async def reload_scopes_from_repository():
         logger.error(f"Failed to reload scopes from repository: {e}", exc_info=True)
 
 
+# Pending background reload of the scope snapshot, if any
+_snapshot_reload_task: asyncio.Task | None = None
+# True while a follow-up reload is waiting for the running one to finish
+_snapshot_reload_queued = False
+
+
+async def _reload_scopes_after(previous: asyncio.Task) -> None:
+    """Run a scopes reload once the previous one has finished."""
+    global _snapshot_reload_queued
+
+    await asyncio.wait([previous])
+    _snapshot_reload_queued = False
+    await reload_scopes_from_repository()
+
+
+def schedule_scope_snapshot_reload() -> None:
+    """
+    Reload the scope snapshot in a background task, e.g. after a scope change.
+
+    The repository read retries with backoff, so callers must not wait on it.
+    If a reload is already running it may have read the old data, so one more
+    reload is queued behind it; further requests share that queued reload.
+    """
+    global _snapshot_reload_task, _snapshot_reload_queued
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    running = _snapshot_reload_task
+    if running is None or running.done():
+        _snapshot_reload_task = loop.create_task(reload_scopes_from_repository())
+    elif not _snapshot_reload_queued:
+        _snapshot_reload_queued = True
+        _snapshot_reload_task = loop.create_task(_reload_scopes_after(running))
+
+
+def _current_scope_snapshot() -> ScopeSnapshot | None:
+    """
+    Return the active scope snapshot, scheduling a background reload if it is stale.
+
+    The stale snapshot keeps serving requests until the reload swaps in a new
+    one, and at most one reload runs at a time.
+    """
+    global _snapshot_reload_task
+
+    snapshot = get_scope_snapshot()
+    max_age = settings.scope_snapshot_max_age_seconds
+    if snapshot is None or max_age <= 0 or snapshot.age_seconds() < max_age:
+        return snapshot
+
+    if _snapshot_reload_task is None or _snapshot_reload_task.done():
+        try:
+            _snapshot_reload_task = asyncio.get_running_loop().create_task(
+                reload_scopes_from_repository()
+            )
+        except RuntimeError:
+            pass
+    return snapshot
+
+
 async def map_cognito_groups_to_scopes(groups: list[str]) -> list[str]:
     """
-    Map Cognito groups to MCP scopes - queries repository directly.
+    Map Cognito groups to MCP scopes - uses the scope snapshot when loaded.
 
     Args:
         groups: List of Cognito group names
@@ -147,6 +225,12 @@ async def map_cognito_groups_to_scopes(groups: list[str]) -> list[str]:
     Returns:
         List of MCP scopes
     """
+    snapshot = _current_scope_snapshot()
+    if snapshot is not None:
+        unique_scopes = snapshot.scopes_for_groups(groups)
+        logger.info(f"Final mapped scopes: {unique_scopes}")
+        return unique_scopes
+
     from ..repositories.factory import get_scope_repository
 
     scopes = []
@@ -174,7 +258,7 @@ async def map_cognito_groups_to_scopes(groups: list[str]) -> list[str]:
 
 async def get_ui_permissions_for_user(user_scopes: list[str]) -> dict[str, list[str]]:
     """
-    Get UI permissions for a user based on their scopes - queries repository directly.
+    Get UI permissions for a user based on their scopes - uses the scope snapshot when loaded.
 
     Args:
         user_scopes: List of user's scopes (includes UI scope names like 'mcp-registry-admin')
@@ -183,6 +267,12 @@ async def get_ui_permissions_for_user(user_scopes: list[str]) -> dict[str, list[
         Dict mapping UI actions to lists of services they can perform the action on
         Example: {'list_service': ['mcpgw', 'auth_server'], 'toggle_service': ['mcpgw']}
     """
+    snapshot = _current_scope_snapshot()
+    if snapshot is not None:
+        result = snapshot.resolve(user_scopes).ui_permissions_dict()
+        logger.info(f"Final UI permissions for user: {result}")
+        return result
+
     from ..repositories.factory import get_scope_repository
 
     ui_permissions = {}
@@ -282,7 +372,7 @@ def get_accessible_agents_for_user(user_ui_permissions: dict[str, list[str]]) ->
 
 async def get_servers_for_scope(scope: str) -> list[str]:
     """
-    Get list of server names that a scope provides access to - queries repository directly.
+    Get list of server names that a scope provides access to - uses the scope snapshot when loaded.
 
     Args:
         scope: The scope to check (e.g., 'mcp-servers-restricted/read')
@@ -290,6 +380,10 @@ async def get_servers_for_scope(scope: str) -> list[str]:
     Returns:
         List of server names the scope grants access to
     """
+    snapshot = _current_scope_snapshot()
+    if snapshot is not None:
+        return snapshot.servers_for_scope(scope)
+
     from ..repositories.factory import get_scope_repository
 
     scope_repo = get_scope_repository()
@@ -305,7 +399,7 @@ async def get_servers_for_scope(scope: str) -> list[str]:
 
 async def user_has_wildcard_access(user_scopes: list[str]) -> bool:
     """
-    Check if user has wildcard access to all servers via their scopes - queries repository directly.
+    Check if user has wildcard access to all servers via their scopes - uses the scope snapshot when loaded.
 
     A user has wildcard access if any of their scopes includes server: '*'.
     This is determined dynamically from the scopes configuration, not hardcoded group names.
@@ -316,6 +410,10 @@ async def user_has_wildcard_access(user_scopes: list[str]) -> bool:
     Returns:
         True if user has wildcard access to all servers, False otherwise
     """
+    snapshot = _current_scope_snapshot()
+    if snapshot is not None:
+        return snapshot.resolve(user_scopes).has_wildcard_access
+
     for scope in user_scopes:
         servers = await get_servers_for_scope(scope)
         if "*" in servers:
@@ -327,7 +425,7 @@ async def user_has_wildcard_access(user_scopes: list[str]) -> bool:
 
 async def get_user_accessible_servers(user_scopes: list[str]) -> list[str]:
     """
-    Get list of all servers the user has access to based on their scopes - queries repository directly.
+    Get list of all servers the user has access to based on their scopes - uses the scope snapshot when loaded.
 
     Args:
         user_scopes: List of user's scopes
@@ -335,6 +433,12 @@ async def get_user_accessible_servers(user_scopes: list[str]) -> list[str]:
     Returns:
         List of server names the user can access
     """
+    snapshot = _current_scope_snapshot()
+    if snapshot is not None:
+        accessible = list(snapshot.resolve(user_scopes).accessible_servers)
+        logger.debug(f"User with scopes {user_scopes} has access to servers: {accessible}")
+        return accessible
+
     accessible_servers = set()
 
     logger.info(f"DEBUG: get_user_accessible_servers called with scopes: {user_scopes}")
@@ -382,7 +486,7 @@ def user_can_modify_servers(user_groups: list[str], user_scopes: list[str]) -> b
 
 async def user_can_access_server(server_name: str, user_scopes: list[str]) -> bool:
     """
-    Check if user can access a specific server - queries repository directly.
+    Check if user can access a specific server - uses the scope snapshot when loaded.
 
     Args:
         server_name: Name of the server to check
@@ -0,0 +1,251 @@
+"""
+Immutable in-memory snapshot of the scopes collection for registry auth.
+
+Every authenticated API request resolves the caller's scopes into accessible
+servers, UI permissions and an admin flag. Doing that against the scope
+repository costs several round-trips per scope on every request. Instead, the
+scopes configuration loaded at startup (and on every scope change) is indexed
+once into a ScopeSnapshot, and the per-scope-set result is memoized on it.
+
+Snapshots are never mutated after construction. A reload builds a new snapshot
+with a higher version and swaps the module-level reference, which also drops
+all memoized results computed against the old data.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Top-level keys in the scopes configuration that are not server access scopes
+NON_SERVER_SCOPE_KEYS = frozenset({"group_mappings", "UI-Scopes"})
+
+# Upper bound on memoized scope-set resolutions per snapshot
+MAX_MEMOIZED_SCOPE_SETS = 4096
+
+
+@dataclass(frozen=True)
+class ScopeAccess:
+    """Access derived from one set of scopes."""
+
+    accessible_servers: tuple[str, ...]
+    ui_permissions: Mapping[str, tuple[str, ...]]
+    has_wildcard_access: bool
+
+    def ui_permissions_dict(self) -> dict[str, list[str]]:
+        """Return the UI permissions as a fresh dict of lists for callers to own."""
+        return {permission: list(services) for permission, services in self.ui_permissions.items()}
+
+
+def _server_rules(scope_entries: Any) -> list[dict[str, Any]]:
+    """
+    Flatten a scope's entries into server access rules.
+
+    Handles both the direct format ({"server": ...}) and the grouped DocumentDB
+    format ({"scope_name": ..., "access_rules": [...]}), skipping anything else.
+    """
+    if not isinstance(scope_entries, list):
+        return []
+    rules = []
+    for entry in scope_entries:
+        if not isinstance(entry, dict):
+            continue
+        if "access_rules" in entry:
+            rules.extend(rule for rule in entry.get("access_rules") or [] if isinstance(rule, dict))
+        elif "server" in entry:
+            rules.append(entry)
+    return rules
+
+
+def _ui_permission_sets(ui_config: Any) -> dict[str, frozenset[str]]:
+    """Normalize a scope's UI permissions, collapsing any list containing "all" to {"all"}."""
+    permissions: dict[str, frozenset[str]] = {}
+    if not isinstance(ui_config, dict):
+        return permissions
+    for permission, services in ui_config.items():
+        if isinstance(services, list) and "all" in services:
+            permissions[permission] = frozenset({"all"})
+        elif isinstance(services, list):
+            permissions[permission] = frozenset(services)
+        else:
+            permissions[permission] = frozenset()
+    return permissions
+
+
+class ScopeSnapshot:
+    """Indexed, read-only view of the scopes configuration."""
+
+    def __init__(
+        self,
+        version: int,
+        group_mappings: dict[str, tuple[str, ...]],
+        servers_by_scope: dict[str, frozenset[str]],
+        ui_permissions_by_scope: dict[str, dict[str, frozenset[str]]],
+    ):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._group_mappings = group_mappings
+        self._servers_by_scope = servers_by_scope
+        self._ui_permissions_by_scope = ui_permissions_by_scope
+        self._wildcard_scopes = frozenset(
+            scope for scope, servers in servers_by_scope.items() if "*" in servers
+        )
+        self._memo: dict[frozenset[str], ScopeAccess] = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: dict[str, Any],
+        version: int,
+    ) -> "ScopeSnapshot":
+        """
+        Build a snapshot from a scopes configuration as returned by reload_scopes_config().
+
+        Args:
+            config: Scopes configuration with "group_mappings", "UI-Scopes" and
+                one key per server access scope
+            version: Monotonic version number for this snapshot
+
+        Returns:
+            New snapshot
+        """
+        group_mappings = {
+            group: tuple(scopes or [])
+            for group, scopes in (config.get("group_mappings") or {}).items()
+        }
+
+        servers_by_scope = {}
+        for scope_name, scope_entries in config.items():
+            if scope_name in NON_SERVER_SCOPE_KEYS:
+                continue
+            servers = frozenset(rule["server"] for rule in _server_rules(scope_entries))
+            if servers:
+                servers_by_scope[scope_name] = servers
+
+        ui_permissions_by_scope = {
+            scope_name: _ui_permission_sets(ui_config)
+            for scope_name, ui_config in (config.get("UI-Scopes") or {}).items()
+            if ui_config
+        }
+
+        return cls(version, group_mappings, servers_by_scope, ui_permissions_by_scope)
+
+    @property
+    def server_scope_count(self) -> int:
+        """Number of scopes granting access to at least one server."""
+        return len(self._servers_by_scope)
+
+    @property
+    def ui_scope_count(self) -> int:
+        """Number of scopes carrying UI permissions."""
+        return len(self._ui_permissions_by_scope)
+
+    def age_seconds(self) -> float:
+        """Seconds since this snapshot was built."""
+        return time.monotonic() - self.loaded_at
+
+    def scopes_for_groups(self, groups: list[str]) -> list[str]:
+        """
+        Map identity provider groups to scopes, de-duplicated in first-seen order.
+
+        Args:
+            groups: Group names from the identity provider
+
+        Returns:
+            List of scope names
+        """
+        scopes: dict[str, None] = {}
+        for group in groups:
+            for scope in self._group_mappings.get(group, ()):
+                scopes.setdefault(scope, None)
+        return list(scopes)
+
+    def servers_for_scope(self, scope: str) -> list[str]:
+        """Return the server names a single scope grants access to."""
+        return list(self._servers_by_scope.get(scope, ()))
+
+    def resolve(self, user_scopes: list[str]) -> ScopeAccess:
+        """
+        Resolve a set of scopes into servers, UI permissions and wildcard access.
+
+        Results are memoized per distinct scope set for the lifetime of the snapshot.
+
+        Args:
+            user_scopes: The caller's scopes
+
+        Returns:
+            Derived access for the scope set
+        """
+        key = frozenset(user_scopes)
+        access = self._memo.get(key)
+        if access is not None:
+            return access
+
+        servers: set[str] = set()
+        ui_permissions: dict[str, set[str]] = {}
+        for scope in key:
+            servers.update(self._servers_by_scope.get(scope, ()))
+            for permission, services in self._ui_permissions_by_scope.get(scope, {}).items():
+                ui_permissions.setdefault(permission, set()).update(services)
+
+        # "all" supersedes specific services, matching the repository-backed logic
+        access = ScopeAccess(
+            accessible_servers=tuple(servers),
+            ui_permissions=MappingProxyType(
+                {
+                    permission: ("all",) if "all" in services else tuple(services)
+                    for permission, services in ui_permissions.items()
+                }
+            ),
+            has_wildcard_access=not self._wildcard_scopes.isdisjoint(key),
+        )
+
+        with self._memo_lock:
+            if len(self._memo) >= MAX_MEMOIZED_SCOPE_SETS:
+                self._memo.clear()
+            self._memo[key] = access
+        return access
+
+
+_snapshot: ScopeSnapshot | None = None
+_version = 0
+_swap_lock = threading.Lock()
+
+
+def get_scope_snapshot() -> ScopeSnapshot | None:
+    """Return the active scope snapshot, or None if scopes have not been loaded."""
+    return _snapshot
+
+
+def publish_scope_snapshot(config: dict[str, Any]) -> ScopeSnapshot:
+    """
+    Build a snapshot from a scopes configuration and make it the active one.
+
+    Args:
+        config: Scopes configuration as returned by reload_scopes_config()
+
+    Returns:
+        The newly active snapshot
+    """
+    global _snapshot, _version
+    with _swap_lock:
+        _version += 1
+        snapshot = ScopeSnapshot.from_config(config, _version)
+        _snapshot = snapshot
+    logger.info(
+        f"Published scope snapshot v{snapshot.version}: "
+        f"{snapshot.server_scope_count} server scopes, {snapshot.ui_scope_count} UI scopes"
+    )
+    return snapshot
+
+
+def clear_scope_snapshot() -> None:
+    """Drop the active snapshot so lookups fall back to the scope repository."""
+    global _snapshot
+    _snapshot = None
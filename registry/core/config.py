@@ -26,17 +26,57 @@ class Settings(BaseSettings):
     session_cookie_domain: Optional[str] = None  # e.g., ".example.com" for cross-subdomain sharing
     auth_server_url: str = "http://localhost:8888"
     auth_server_external_url: str = "http://localhost:8888"  # External URL for OAuth redirects
-    
+
+    # In-memory scope snapshot used to build per-request user context.
+    # Rebuilt on startup and on every scope change made through this instance;
+    # snapshots older than this are reloaded in the background so changes made
+    # by other replicas are picked up. Set to 0 to never reload on age.
+    scope_snapshot_max_age_seconds: float = 60.0
+
     # Embeddings settings [Default]
     embeddings_provider: str = "sentence-transformers"  # 'sentence-transformers' or 'litellm'
     embeddings_model_name: str = "all-MiniLM-L6-v2"
     embeddings_model_dimensions: int = 384 # 384 for default and 1024 for bedrock titan v2
+    embeddings_batch_size: int = 64  # Texts per encode() call when bulk indexing
+
+    # Embedding cache keyed by (model, dimension, sha256 of text)
+    # Avoids re-embedding identical text across restarts, re-syncs and repeated queries.
+    embeddings_cache_enabled: bool = True
+    embeddings_cache_max_entries: int = 10000  # In-memory LRU size
+    embeddings_cache_max_disk_entries: int = 100000  # On-disk entries before LRU compaction
+
+    # Query embedding cache for semantic search (case/whitespace-normalized queries)
+    query_embedding_cache_max_entries: int = 1024  # 0 disables the cache
+    query_embedding_cache_ttl_seconds: float = 3600.0
 
     # HNSW vector search tuning (only used with DocumentDB backend)
     # Higher efSearch improves recall at the cost of query latency.
     # Default 40 may miss documents in small collections; 100 gives near-exact recall.
     vector_search_ef_search: int = 100
 
+    # FAISS write-behind persistence (only used with file backend)
+    # Index changes are coalesced and written to disk at most once per window.
+    # Set to 0 to save synchronously on every change.
+    faiss_save_debounce_seconds: float = 2.0
+
+    # FAISS approximate nearest neighbour search (only used with file backend)
+    # 'flat' = exact, 'hnsw' or 'ivfpq' = approximate, 'auto' = flat until the
+    # index holds faiss_ann_threshold vectors, then HNSW. The flat index stays
+    # authoritative on disk; the ANN index is built from it in the background,
+    # then kept current with incremental adds. Updated and removed vectors are
+    # tombstoned, and the index is rebuilt once tombstones exceed the given
+    # share of its vectors.
+    faiss_index_type: str = "auto"
+    faiss_ann_threshold: int = 20000
+    faiss_ann_rebuild_debounce_seconds: float = 5.0
+    faiss_ann_max_tombstone_ratio: float = 0.2
+    faiss_hnsw_m: int = 32
+    faiss_hnsw_ef_construction: int = 200
+    faiss_hnsw_ef_search: int = 128
+    faiss_ivf_nlist: int = 0  # 0 = 4 * sqrt(ntotal)
+    faiss_ivf_nprobe: int = 16
+    faiss_pq_m: int = 16  # Must divide embeddings_model_dimensions
+
     # LiteLLM-specific settings (only used when embeddings_provider='litellm')
     # For Bedrock: Set to None and configure AWS credentials via standard methods
     # (IAM roles, AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY env vars, or ~/.aws/credentials)
@@ -48,13 +88,32 @@ class Settings(BaseSettings):
     # Health check settings
     health_check_interval_seconds: int = 300  # 5 minutes for automatic background checks (configurable via env var)
     health_check_timeout_seconds: int = 2  # Very fast timeout for user-driven actions
+
+    # Pooled HTTP client reused across health check cycles and on-demand checks
+    health_check_max_connections: int = 200
+    health_check_max_keepalive_connections: int = 100
+    health_check_keepalive_expiry_seconds: float = 60.0
+    health_check_max_connections_per_host: int = 10  # Many servers may share one backend host
+    health_check_http2: bool = False  # Requires the 'h2' package (httpx[http2])
+
+    # Health check scheduling: each server is checked on its own jittered schedule
+    # (servers may override the interval with 'health_check_interval_seconds')
+    health_check_max_concurrency: int = 50  # Checks in flight at once
+    health_check_jitter_ratio: float = 0.1  # +/- fraction applied to each interval
+    health_check_backoff_max_seconds: float = 1800.0  # Cap for repeatedly unhealthy servers, 0 disables backoff
+    health_check_resync_seconds: float = 30.0  # How often the enabled server list is re-read
     
+    # Nginx reloads: the first config change reloads immediately, further changes
+    # within this window are coalesced into one reload at the end of the window
+    nginx_reload_debounce_seconds: float = 5.0
+
     # WebSocket performance settings
     max_websocket_connections: int = 100  # Reasonable limit for development/testing
     websocket_send_timeout_seconds: float = 2.0  # Allow slightly more time per connection
     websocket_broadcast_interval_ms: int = 10  # Very responsive - 10ms minimum between broadcasts
     websocket_max_batch_size: int = 20  # Smaller batches for faster updates
     websocket_cache_ttl_seconds: int = 1  # 1 second cache for near real-time user feedback
+    websocket_send_queue_size: int = 64  # Messages buffered per client; the oldest is dropped when full
 
     # Well-known discovery settings
     enable_wellknown_discovery: bool = True
@@ -94,6 +153,22 @@ class Settings(BaseSettings):
     documentdb_read_preference: str = "secondaryPreferred"
     documentdb_direct_connection: bool = False  # Set to True only for single-node MongoDB (tests)
 
+    # Client-side vector search fallback for MongoDB CE (no $vectorSearch).
+    # The embedding matrix is reloaded after local writes and at least this often.
+    documentdb_client_search_cache_ttl_seconds: float = 30.0
+
+    # Read-through cache for the server, agent and scope collections.
+    # Replicas stay coherent through change streams; where those are unavailable
+    # (DocumentDB without change streams enabled) a shared version counter is
+    # polled instead, so other replicas' writes show up within the poll interval.
+    # Writes that bypass the repositories (scripts/load-scopes.py, mongosh) do not
+    # bump the counter, so in polling mode the cache is also dropped at least
+    # every max-age seconds (0 disables).
+    documentdb_cache_enabled: bool = True
+    documentdb_cache_use_change_streams: bool = True
+    documentdb_cache_poll_interval_seconds: float = 5.0
+    documentdb_cache_max_age_seconds: float = 60.0
+
     # DocumentDB Namespace (for multi-tenancy support)
     documentdb_namespace: str = "default"
 
@@ -120,6 +195,13 @@ class Settings(BaseSettings):
             return Path.cwd() / "registry" / "models" / self.embeddings_model_name
         return self.container_registry_dir / "models" / self.embeddings_model_name
 
+    @property
+    def embeddings_cache_dir(self) -> Path:
+        """Directory for the persistent embedding cache."""
+        if self.is_local_dev:
+            return Path.cwd() / "registry" / ".cache" / "embeddings"
+        return self.container_registry_dir / ".cache" / "embeddings"
+
     @property
     def servers_dir(self) -> Path:
         if self.is_local_dev:
@@ -167,6 +249,14 @@ class Settings(BaseSettings):
     def faiss_metadata_path(self) -> Path:
         return self.servers_dir / "service_index_metadata.json"
 
+    @property
+    def faiss_tool_index_path(self) -> Path:
+        return self.servers_dir / "tool_index.faiss"
+
+    @property
+    def faiss_tool_metadata_path(self) -> Path:
+        return self.servers_dir / "tool_index_metadata.json"
+
     @property
     def dotenv_path(self) -> Path:
         if self.is_local_dev:
@@ -1,9 +1,11 @@
 import logging
 import asyncio
+import hashlib
 import httpx
 import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from time import monotonic
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from .config import settings
@@ -35,6 +37,26 @@ class NginxConfigService:
             else:
                 # Fallback for local development
                 self.nginx_template_path = Path(REGISTRY_CONSTANTS.NGINX_TEMPLATE_HTTP_ONLY_LOCAL)
+
+        # Inputs that do not change between generations, computed once
+        self._template_cache: Optional[Tuple[Any, str]] = None  # (cache key, template)
+        self._additional_server_names: Optional[str] = None
+        self._keycloak_settings: Optional[Tuple[str, Tuple[str, str, str]]] = None
+
+        # Rendered location blocks per server path: (render key, blocks)
+        self._location_block_cache: Dict[str, Tuple[Tuple, List[str]]] = {}
+
+        # sha256 of the config nginx last reloaded successfully; identical configs
+        # are not rewritten or reloaded. A config written but not yet reloaded
+        # (reload pending or failed) is tracked separately so it is retried.
+        self._config_hash: Optional[str] = None
+        self._pending_config_hash: Optional[str] = None
+
+        # Reload debouncing: at most one reload per nginx_reload_debounce_seconds
+        self._last_reload_time: Optional[float] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self.reload_count = 0
+        self.skipped_reload_count = 0
         
     async def get_additional_server_names(self) -> str:
         """Fetch or determine additional server names for nginx gateway configuration.
@@ -159,27 +181,129 @@ class NginxConfigService:
             return False
         
     async def generate_config_async(self, servers: Dict[str, Dict[str, Any]]) -> bool:
-        """Generate Nginx configuration with additional server names and dynamic location blocks."""
+        """Generate Nginx configuration with additional server names and dynamic location blocks.
+
+        The config is only written, and nginx only reloaded, when the rendered
+        bytes differ from the last generation. Reloads are debounced (see
+        _request_reload) so a burst of health status changes causes at most one
+        reload per nginx_reload_debounce_seconds.
+        """
         try:
             # Read template
             if not self.nginx_template_path.exists():
                 logger.warning(f"Nginx template not found at {self.nginx_template_path}")
                 return False
-                
-            with open(self.nginx_template_path, "r") as f:
-                template_content = f.read()
-
-            # Local-dev / Podman compatibility:
-            # The default nginx templates protect `/api/` via `auth_request /validate` (JWT validation).
-            # The React dashboard, however, uses cookie-based session auth for `/api/servers` and
-            # `/api/tokens/generate`. When auth_request is enabled but Keycloak/Cognito isn't fully
-            # configured, nginx returns 403/500 and the UI cannot load.
-            #
-            # Set NGINX_DISABLE_API_AUTH_REQUEST=true to bypass `auth_request` for `/api/` and rely
-            # on FastAPI's own auth (session cookie or bearer token validation inside the app).
-            import os
-            if os.environ.get("NGINX_DISABLE_API_AUTH_REQUEST", "false").lower() in ("1", "true", "yes", "on"):
-                protected_api_block = """    # Protected API endpoints - require authentication
+
+            template_content = self._get_template_content()
+            
+            # Get health service to check server health
+            from ..health.service import health_service
+            
+            # Generate location blocks for enabled and healthy servers with transport support
+            location_blocks = []
+            for path, server_info in servers.items():
+                proxy_pass_url = server_info.get("proxy_pass_url")
+                if proxy_pass_url:
+                    # Check if server is healthy (including auth-expired which is still reachable)
+                    health_status = health_service.server_health_status.get(path, HealthStatus.UNKNOWN)
+                    
+                    # Include servers that are healthy or just have expired auth (server is up)
+                    if HealthStatus.is_healthy(health_status):
+                        # Generate transport-aware location blocks
+                        transport_blocks = self._get_location_blocks(path, server_info)
+                        location_blocks.extend(transport_blocks)
+                        logger.debug(f"Added location blocks for healthy service: {path}")
+                    else:
+                        # Add commented out block for unhealthy services
+                        commented_block = f"""
+#    location {path}/ {{
+#        # Service currently unhealthy (status: {health_status})
+#        # Proxy to MCP server
+#        proxy_pass {proxy_pass_url};
+#        proxy_http_version 1.1;
+#        proxy_set_header Host $host;
+#        proxy_set_header X-Real-IP $remote_addr;
+#        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+#        proxy_set_header X-Forwarded-Proto $scheme;
+#    }}"""
+                        location_blocks.append(commented_block)
+                        logger.debug(f"Added commented location block for unhealthy service {path} (status: {health_status})")
+
+            # Drop cached blocks of servers that are gone
+            for path in set(self._location_block_cache) - set(servers):
+                del self._location_block_cache[path]
+            
+            # Fetch additional server names (custom domains/IPs); platform detection runs once
+            if self._additional_server_names is None:
+                self._additional_server_names = await self.get_additional_server_names()
+            additional_server_names = self._additional_server_names
+
+            # Get API version from constants
+            api_version = REGISTRY_CONSTANTS.ANTHROPIC_API_VERSION
+
+            # Parse Keycloak configuration from KEYCLOAK_URL environment variable
+            keycloak_scheme, keycloak_host, keycloak_port = self._get_keycloak_settings()
+
+            # Generate version map for multi-version servers
+            version_map = await self._generate_version_map(servers)
+
+            # Replace placeholders in template
+            config_content = template_content.replace("{{VERSION_MAP}}", version_map)
+            config_content = config_content.replace("{{LOCATION_BLOCKS}}", "\n".join(location_blocks))
+            config_content = config_content.replace("{{ADDITIONAL_SERVER_NAMES}}", additional_server_names)
+            config_content = config_content.replace("{{ANTHROPIC_API_VERSION}}", api_version)
+            config_content = config_content.replace("{{KEYCLOAK_SCHEME}}", keycloak_scheme)
+            config_content = config_content.replace("{{KEYCLOAK_HOST}}", keycloak_host)
+            config_content = config_content.replace("{{KEYCLOAK_PORT}}", keycloak_port)
+
+            config_hash = hashlib.sha256(config_content.encode("utf-8")).hexdigest()
+            if config_hash == self._config_hash and self._pending_config_hash is None:
+                self.skipped_reload_count += 1
+                logger.debug("Nginx configuration unchanged - skipping write and reload")
+                return True
+
+            # Write config file
+            with open(settings.nginx_config_path, "w") as f:
+                f.write(config_content)
+            self._pending_config_hash = config_hash
+
+            logger.info(f"Generated Nginx configuration with {len(location_blocks)} location blocks and additional server names: {additional_server_names}")
+            
+            # Automatically reload nginx after generating config
+            await self._request_reload()
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to generate Nginx configuration: {e}", exc_info=True)
+            return False
+
+    def _get_template_content(self) -> str:
+        """Return the nginx template, re-reading it only when the file changes."""
+        import os
+
+        disable_api_auth = os.environ.get("NGINX_DISABLE_API_AUTH_REQUEST", "false").lower() in ("1", "true", "yes", "on")
+        try:
+            mtime = self.nginx_template_path.stat().st_mtime
+        except Exception:
+            mtime = None
+        cache_key = (str(self.nginx_template_path), mtime, disable_api_auth)
+        if self._template_cache is not None and self._template_cache[0] == cache_key:
+            return self._template_cache[1]
+
+        with open(self.nginx_template_path, "r") as f:
+            template_content = f.read()
+
+        # Local-dev / Podman compatibility:
+        # The default nginx templates protect `/api/` via `auth_request /validate` (JWT validation).
+        # The React dashboard, however, uses cookie-based session auth for `/api/servers` and
+        # `/api/tokens/generate`. When auth_request is enabled but Keycloak/Cognito isn't fully
+        # configured, nginx returns 403/500 and the UI cannot load.
+        #
+        # Set NGINX_DISABLE_API_AUTH_REQUEST=true to bypass `auth_request` for `/api/` and rely
+        # on FastAPI's own auth (session cookie or bearer token validation inside the app).
+        if disable_api_auth:
+            protected_api_block = """    # Protected API endpoints - require authentication
     location /api/ {
         # Authenticate request via auth server (validates JWT Bearer tokens)
         auth_request /validate;
@@ -218,7 +342,7 @@ class NginxConfigService:
         proxy_read_timeout 30s;
     }"""
 
-                unprotected_api_block = """    # API endpoints - FastAPI handles authentication (session cookie / bearer)
+            unprotected_api_block = """    # API endpoints - FastAPI handles authentication (session cookie / bearer)
     location /api/ {
         # Proxy to FastAPI service
         proxy_pass http://127.0.0.1:7860/api/;
@@ -240,106 +364,151 @@ class NginxConfigService:
         proxy_read_timeout 30s;
     }"""
 
-                if protected_api_block in template_content:
-                    template_content = template_content.replace(protected_api_block, unprotected_api_block)
-                    logger.warning("NGINX_DISABLE_API_AUTH_REQUEST enabled: bypassing auth_request for /api/")
-                else:
-                    logger.warning("NGINX_DISABLE_API_AUTH_REQUEST enabled but could not find /api/ auth_request block in template")
-            
-            # Get health service to check server health
-            from ..health.service import health_service
-            
-            # Generate location blocks for enabled and healthy servers with transport support
-            location_blocks = []
-            for path, server_info in servers.items():
-                proxy_pass_url = server_info.get("proxy_pass_url")
-                if proxy_pass_url:
-                    # Check if server is healthy (including auth-expired which is still reachable)
-                    health_status = health_service.server_health_status.get(path, HealthStatus.UNKNOWN)
-                    
-                    # Include servers that are healthy or just have expired auth (server is up)
-                    if HealthStatus.is_healthy(health_status):
-                        # Generate transport-aware location blocks
-                        transport_blocks = self._generate_transport_location_blocks(path, server_info)
-                        location_blocks.extend(transport_blocks)
-                        logger.debug(f"Added location blocks for healthy service: {path}")
-                    else:
-                        # Add commented out block for unhealthy services
-                        commented_block = f"""
-#    location {path}/ {{
-#        # Service currently unhealthy (status: {health_status})
-#        # Proxy to MCP server
-#        proxy_pass {proxy_pass_url};
-#        proxy_http_version 1.1;
-#        proxy_set_header Host $host;
-#        proxy_set_header X-Real-IP $remote_addr;
-#        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
-#        proxy_set_header X-Forwarded-Proto $scheme;
-#    }}"""
-                        location_blocks.append(commented_block)
-                        logger.debug(f"Added commented location block for unhealthy service {path} (status: {health_status})")
-            
-            # Fetch additional server names (custom domains/IPs)
-            additional_server_names = await self.get_additional_server_names()
+            if protected_api_block in template_content:
+                template_content = template_content.replace(protected_api_block, unprotected_api_block)
+                logger.warning("NGINX_DISABLE_API_AUTH_REQUEST enabled: bypassing auth_request for /api/")
+            else:
+                logger.warning("NGINX_DISABLE_API_AUTH_REQUEST enabled but could not find /api/ auth_request block in template")
 
-            # Get API version from constants
-            api_version = REGISTRY_CONSTANTS.ANTHROPIC_API_VERSION
+        self._template_cache = (cache_key, template_content)
+        return template_content
 
-            # Parse Keycloak configuration from KEYCLOAK_URL environment variable
-            import os
-            keycloak_url = os.environ.get('KEYCLOAK_URL', 'http://keycloak:8080')
-            try:
-                parsed_keycloak = urlparse(keycloak_url)
-                keycloak_scheme = parsed_keycloak.scheme or 'http'
-                keycloak_host = parsed_keycloak.hostname or 'keycloak'
-                # Use default port based on scheme if not specified
-                if parsed_keycloak.port:
-                    keycloak_port = str(parsed_keycloak.port)
-                else:
-                    keycloak_port = '443' if keycloak_scheme == 'https' else '8080'
-
-                # Validate that we can actually resolve the hostname
-                if not keycloak_host or keycloak_host == 'keycloak':
-                    # If we end up with just 'keycloak', use the full URL's netloc instead
-                    keycloak_host = parsed_keycloak.netloc.split(':')[0] if parsed_keycloak.netloc else 'keycloak'
-                    logger.warning(f"Keycloak hostname is 'keycloak', using netloc instead: {keycloak_host}")
-
-                logger.info(f"Using Keycloak configuration from KEYCLOAK_URL '{keycloak_url}': {keycloak_scheme}://{keycloak_host}:{keycloak_port}")
-            except Exception as e:
-                logger.warning(f"Failed to parse KEYCLOAK_URL '{keycloak_url}': {e}. Using defaults.")
-                keycloak_scheme = 'http'
-                keycloak_host = 'keycloak'
-                keycloak_port = '8080'
+    def _get_keycloak_settings(self) -> Tuple[str, str, str]:
+        """Return (scheme, host, port) parsed from KEYCLOAK_URL, cached per URL."""
+        import os
+        keycloak_url = os.environ.get('KEYCLOAK_URL', 'http://keycloak:8080')
+        if self._keycloak_settings is not None and self._keycloak_settings[0] == keycloak_url:
+            return self._keycloak_settings[1]
 
-            # Generate version map for multi-version servers
-            version_map = await self._generate_version_map(servers)
+        try:
+            parsed_keycloak = urlparse(keycloak_url)
+            keycloak_scheme = parsed_keycloak.scheme or 'http'
+            keycloak_host = parsed_keycloak.hostname or 'keycloak'
+            # Use default port based on scheme if not specified
+            if parsed_keycloak.port:
+                keycloak_port = str(parsed_keycloak.port)
+            else:
+                keycloak_port = '443' if keycloak_scheme == 'https' else '8080'
 
-            # Replace placeholders in template
-            config_content = template_content.replace("{{VERSION_MAP}}", version_map)
-            config_content = config_content.replace("{{LOCATION_BLOCKS}}", "\n".join(location_blocks))
-            config_content = config_content.replace("{{ADDITIONAL_SERVER_NAMES}}", additional_server_names)
-            config_content = config_content.replace("{{ANTHROPIC_API_VERSION}}", api_version)
-            config_content = config_content.replace("{{KEYCLOAK_SCHEME}}", keycloak_scheme)
-            config_content = config_content.replace("{{KEYCLOAK_HOST}}", keycloak_host)
-            config_content = config_content.replace("{{KEYCLOAK_PORT}}", keycloak_port)
+            # Validate that we can actually resolve the hostname
+            if not keycloak_host or keycloak_host == 'keycloak':
+                # If we end up with just 'keycloak', use the full URL's netloc instead
+                keycloak_host = parsed_keycloak.netloc.split(':')[0] if parsed_keycloak.netloc else 'keycloak'
+                logger.warning(f"Keycloak hostname is 'keycloak', using netloc instead: {keycloak_host}")
 
-            # Write config file
-            with open(settings.nginx_config_path, "w") as f:
-                f.write(config_content)
+            logger.info(f"Using Keycloak configuration from KEYCLOAK_URL '{keycloak_url}': {keycloak_scheme}://{keycloak_host}:{keycloak_port}")
+        except Exception as e:
+            logger.warning(f"Failed to parse KEYCLOAK_URL '{keycloak_url}': {e}. Using defaults.")
+            keycloak_scheme = 'http'
+            keycloak_host = 'keycloak'
+            keycloak_port = '8080'
+
+        self._keycloak_settings = (keycloak_url, (keycloak_scheme, keycloak_host, keycloak_port))
+        return self._keycloak_settings[1]
+
+    def _get_location_blocks(self, path: str, server_info: Dict[str, Any]) -> List[str]:
+        """Return the location blocks for a server, re-rendering only when its routing fields change."""
+        render_key = (
+            server_info.get("proxy_pass_url", ""),
+            tuple(server_info.get("supported_transports", ["streamable-http"]) or ()),
+            bool(server_info.get("other_version_ids")),
+        )
+        cached = self._location_block_cache.get(path)
+        if cached is not None and cached[0] == render_key:
+            return cached[1]
+
+        blocks = self._generate_transport_location_blocks(path, server_info)
+        self._location_block_cache[path] = (render_key, blocks)
+        return blocks
 
-            logger.info(f"Generated Nginx configuration with {len(location_blocks)} location blocks and additional server names: {additional_server_names}")
-            
-            # Automatically reload nginx after generating config
-            self.reload_nginx()
-            
-            return True
-            
+    async def _request_reload(self) -> None:
+        """Reload nginx now, or once at the end of the current debounce window.
+
+        The first change after a quiet period reloads immediately; further
+        changes within nginx_reload_debounce_seconds are coalesced into a single
+        reload when the window ends. The reload always picks up the latest
+        config file, so nothing is lost by coalescing.
+        """
+        if self._reload_task is not None and not self._reload_task.done():
+            # A trailing reload is already scheduled and will see this config
+            return
+
+        window = settings.nginx_reload_debounce_seconds
+        now = monotonic()
+        if self._last_reload_time is None or now - self._last_reload_time >= window:
+            self._last_reload_time = now
+            await self._reload_written_config()
+            return
+
+        delay = self._last_reload_time + window - now
+        self._reload_task = asyncio.create_task(self._delayed_reload(delay))
+
+    async def _delayed_reload(self, delay: float) -> None:
+        """Reload nginx after the debounce window ends."""
+        await asyncio.sleep(delay)
+        self._last_reload_time = monotonic()
+        await self._reload_written_config()
+
+    async def _reload_written_config(self) -> None:
+        """Reload nginx and, only if that succeeds, record the written config as loaded."""
+        config_hash = self._pending_config_hash
+        if not await self.reload_nginx_async():
+            return
+        if config_hash is not None:
+            self._config_hash = config_hash
+        if self._pending_config_hash == config_hash:
+            self._pending_config_hash = None
+
+    async def reload_nginx_async(self) -> bool:
+        """Test and reload the Nginx configuration without blocking the event loop."""
+        try:
+            # Test the configuration first before reloading
+            returncode, stderr = await self._run_nginx_command("-t")
+            if returncode != 0:
+                logger.error(f"Nginx configuration test failed: {stderr}")
+                logger.info("Skipping Nginx reload due to configuration errors")
+                return False
+
+            returncode, stderr = await self._run_nginx_command("-s", "reload")
+            if returncode == 0:
+                self.reload_count += 1
+                logger.info("Nginx configuration reloaded successfully")
+                return True
+            else:
+                logger.error(f"Failed to reload Nginx: {stderr}")
+                return False
+        except FileNotFoundError:
+            logger.warning("Nginx not found - skipping reload")
+            return False
         except Exception as e:
-            logger.error(f"Failed to generate Nginx configuration: {e}", exc_info=True)
+            logger.error(f"Error reloading Nginx: {e}")
             return False
+
+    async def _run_nginx_command(self, *args: str) -> Tuple[int, str]:
+        """Run an nginx command and return (returncode, stderr)."""
+        process = await asyncio.create_subprocess_exec(
+            "nginx",
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        return process.returncode, stderr.decode(errors="replace")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get config generation and reload statistics."""
+        return {
+            "reloads": self.reload_count,
+            "skipped_unchanged": self.skipped_reload_count,
+            "cached_location_blocks": len(self._location_block_cache),
+            "reload_pending": self._reload_task is not None and not self._reload_task.done(),
+        }
             
     def reload_nginx(self) -> bool:
-        """Reload Nginx configuration (if running in appropriate environment)."""
+        """Reload Nginx configuration (if running in appropriate environment).
+
+        Blocks on the nginx subprocesses; async code should use reload_nginx_async.
+        """
         try:
             import subprocess
 
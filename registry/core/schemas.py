@@ -67,6 +67,10 @@ class ServerInfo(BaseModel):
         default_factory=dict,
         description="Additional custom metadata for organization, compliance, or integration purposes",
     )
+    health_check_interval_seconds: Optional[int] = Field(
+        default=None,
+        description="Overrides the global health check interval for this server (e.g. shorter for critical servers). None uses the global setting."
+    )
     # Version routing fields
     version: Optional[str] = Field(
         default=None,
@@ -6,10 +6,13 @@ from .client import (
     LiteLLMClient,
     create_embeddings_client,
 )
+from .cache import CachedEmbeddingsClient, QueryEmbeddingCache
 
 __all__ = [
     "EmbeddingsClient",
     "SentenceTransformersClient",
     "LiteLLMClient",
+    "CachedEmbeddingsClient",
+    "QueryEmbeddingCache",
     "create_embeddings_client",
 ]
@@ -0,0 +1,588 @@
+"""
+Content-hash embedding cache for any EmbeddingsClient.
+
+Embeddings are keyed by (model name, dimension, sha256 of text). Lookups go
+through an in-memory LRU first and then a memory-mapped float32 store on disk,
+so restarts, re-syncs and repeated queries never re-embed identical text.
+
+QueryEmbeddingCache is a small TTL'd LRU for search query embeddings, keyed by
+the case- and whitespace-folded query so near-identical queries share an entry.
+
+Only document embeddings are persisted. Search queries go through
+encode_query, which skips the content-hash cache so user traffic does not
+grow the disk store; QueryEmbeddingCache keeps them in memory instead.
+
+On-disk layout, one set of files per (model, dimension):
+    <model>-<dim>.f32   float32 vectors, one row per entry
+    <model>-<dim>.keys  sha256 hex digests, line N describes row N
+    <model>-<dim>.lock  Lock file serializing writers across processes
+
+Both data files are appended to until the store exceeds its entry limit, then
+rewritten with the most recently used entries.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+from .client import EmbeddingsClient
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fraction of max_entries kept when the on-disk store is compacted
+COMPACT_RATIO = 0.75
+
+
+def normalize_query(
+    query: str,
+) -> str:
+    """Fold case and collapse whitespace so equivalent queries share a cache key."""
+    return " ".join(query.casefold().split())
+
+
+def _text_hash(
+    text: str,
+) -> str:
+    """Return the sha256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheStore:
+    """Bounded, memory-mapped float32 store of embeddings keyed by hash.
+
+    Several worker processes may share the files: writers serialize on an
+    exclusive lock file and reload the key index whenever another process
+    has appended to or compacted the store.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        model_name: str,
+        dimension: int,
+        max_entries: int = 100000,
+    ):
+        """
+        Initialize the on-disk store.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            model_name: Embedding model name, part of the file name
+            dimension: Embedding dimension, part of the file name
+            max_entries: Entries kept on disk; beyond it the store is compacted
+                down to the most recently used COMPACT_RATIO of them
+        """
+        self.dimension = dimension
+        self.max_entries = max_entries
+        safe_model = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = cache_dir / f"{safe_model}-{dimension}.f32"
+        self.keys_path = cache_dir / f"{safe_model}-{dimension}.keys"
+        self.lock_path = cache_dir / f"{safe_model}-{dimension}.lock"
+        # Key -> row, ordered from least to most recently used
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._mmap: Optional[np.memmap] = None
+        self._file_state: Optional[tuple] = None
+        self.compactions = 0
+        with self._locked():
+            self._load()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the cross-process lock on the store files."""
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _current_file_state(self) -> Optional[tuple]:
+        """Identity and size of the key file, to notice writes by other processes."""
+        try:
+            stat = self.keys_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size)
+
+    def _load(self) -> None:
+        """Load the key index, discarding any partially written tail. Call with the lock held."""
+        row_bytes = self.dimension * 4
+        vector_rows = (
+            self.vectors_path.stat().st_size // row_bytes
+            if self.vectors_path.exists()
+            else 0
+        )
+        keys: List[str] = []
+        if self.keys_path.exists():
+            keys = self.keys_path.read_text().split()
+
+        valid_rows = min(vector_rows, len(keys))
+        if valid_rows != vector_rows or valid_rows != len(keys):
+            logger.warning(
+                f"Embedding cache {self.vectors_path.name} is inconsistent "
+                f"({vector_rows} vectors, {len(keys)} keys). Truncating to {valid_rows}."
+            )
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(valid_rows * row_bytes)
+            self.keys_path.write_text("".join(f"{key}\n" for key in keys[:valid_rows]))
+
+        # Rows are stored oldest first, so file order seeds the recency order
+        self._rows = OrderedDict((key, row) for row, key in enumerate(keys[:valid_rows]))
+        self._mmap = None
+        self._file_state = self._current_file_state()
+        logger.info(f"Loaded {len(self._rows)} cached embeddings from {self.vectors_path}")
+
+    def _reload_if_changed(self) -> None:
+        """Reload the key index if another process changed the files. Call with the lock held."""
+        if self._current_file_state() != self._file_state:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[np.ndarray]:
+        """Return a copy of the cached vector for a key, if present."""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        if self._mmap is None or self._mmap.shape[0] <= row:
+            with self._locked():
+                # Row numbers are only valid for the files they were loaded from
+                self._reload_if_changed()
+                row = self._rows.get(key)
+                if row is None:
+                    return None
+                self._mmap = np.memmap(
+                    self.vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(len(self._rows), self.dimension),
+                )
+        self._rows.move_to_end(key)
+        return np.array(self._mmap[row])
+
+    def put_many(
+        self,
+        keys: List[str],
+        vectors: np.ndarray,
+    ) -> None:
+        """Append vectors for keys not already stored, compacting past max_entries."""
+        with self._locked():
+            self._reload_if_changed()
+
+            new_keys: List[str] = []
+            new_rows: List[np.ndarray] = []
+            seen = set()
+            for key, vector in zip(keys, vectors):
+                if key in self._rows or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(vector)
+            if not new_keys:
+                return
+
+            start = len(self._rows)
+            try:
+                # Vectors are written before keys so a key never points at a missing row
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.asarray(new_rows, dtype=np.float32).tobytes())
+                with open(self.keys_path, "a") as f:
+                    f.write("".join(f"{key}\n" for key in new_keys))
+            except Exception:
+                # Roll back so row numbers stay aligned with the key file
+                with open(self.vectors_path, "ab") as f:
+                    f.truncate(start * self.dimension * 4)
+                self.keys_path.write_text("".join(f"{key}\n" for key in self._rows))
+                self._file_state = self._current_file_state()
+                raise
+
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = start + offset
+            self._file_state = self._current_file_state()
+
+            if len(self._rows) > self.max_entries:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the store with its most recently used entries. Call with the lock held."""
+        keep = max(0, int(self.max_entries * COMPACT_RATIO))
+        kept_keys = list(self._rows)[len(self._rows) - keep:] if keep else []
+        source = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self._rows), self.dimension),
+        )
+        kept_vectors = np.asarray(
+            source[[self._rows[key] for key in kept_keys]], dtype=np.float32
+        ).reshape(len(kept_keys), self.dimension)
+        del source
+
+        vectors_tmp = self.vectors_path.with_name(self.vectors_path.name + ".tmp")
+        keys_tmp = self.keys_path.with_name(self.keys_path.name + ".tmp")
+        _write_synced(vectors_tmp, kept_vectors.tobytes())
+        _write_synced(keys_tmp, "".join(f"{key}\n" for key in kept_keys).encode("utf-8"))
+
+        # Empty the key file first: a crash between the two renames then
+        # leaves an empty (but consistent) store rather than mismatched rows
+        _write_synced(self.keys_path, b"")
+        os.replace(vectors_tmp, self.vectors_path)
+        os.replace(keys_tmp, self.keys_path)
+
+        dropped = len(self._rows) - len(kept_keys)
+        self._rows = OrderedDict((key, row) for row, key in enumerate(kept_keys))
+        self._mmap = None
+        self._file_state = self._current_file_state()
+        self.compactions += 1
+        logger.info(
+            f"Compacted embedding cache {self.vectors_path.name}: "
+            f"dropped {dropped} least recently used entries, kept {len(kept_keys)}"
+        )
+
+
+def _write_synced(
+    path: Path,
+    data: bytes,
+) -> None:
+    """Write a file and fsync it."""
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class CachedEmbeddingsClient(EmbeddingsClient):
+    """EmbeddingsClient wrapper that caches embeddings by text content hash."""
+
+    def __init__(
+        self,
+        client: EmbeddingsClient,
+        model_name: str,
+        dimension: int,
+        cache_dir: Optional[Path] = None,
+        max_memory_entries: int = 10000,
+        max_disk_entries: int = 100000,
+    ):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            client: Underlying embeddings client
+            model_name: Model name used in cache keys
+            dimension: Expected embedding dimension used in cache keys
+            cache_dir: Optional directory for the persistent store (memory-only if None)
+            max_memory_entries: Capacity of the in-memory LRU
+            max_disk_entries: Capacity of the persistent store
+        """
+        self.client = client
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._store: Optional[EmbeddingCacheStore] = None
+        if cache_dir is not None:
+            try:
+                self._store = EmbeddingCacheStore(
+                    cache_dir, model_name, dimension, max_entries=max_disk_entries
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Persistent embedding cache unavailable at {cache_dir}, "
+                    f"using memory only: {e}"
+                )
+
+    def _cache_key(
+        self,
+        text: str,
+    ) -> str:
+        """Build the cache key for a text."""
+        return _text_hash(f"{self.model_name}\x00{self.dimension}\x00{text}")
+
+    def _remember(
+        self,
+        key: str,
+        vector: np.ndarray,
+    ) -> None:
+        """Insert a vector into the in-memory LRU, evicting the oldest entry."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(
+        self,
+        key: str,
+    ) -> Optional[np.ndarray]:
+        """Find a vector in memory or on disk."""
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            return vector
+        if self._store is not None:
+            vector = self._store.get(key)
+            if vector is not None:
+                self._remember(key, vector)
+        return vector
+
+    def encode(
+        self,
+        texts: List[str],
+    ) -> np.ndarray:
+        """
+        Generate embeddings, encoding only texts not already cached.
+
+        Args:
+            texts: List of text strings to encode
+
+        Returns:
+            NumPy array of embeddings with shape (len(texts), embedding_dimension)
+
+        Raises:
+            RuntimeError: If encoding fails
+        """
+        keys = [self._cache_key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, int] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._lookup(key)
+                if vector is not None:
+                    results[i] = vector
+                    self.hits += 1
+                elif key not in missing:
+                    missing[key] = i
+                    self.misses += 1
+                else:
+                    self.hits += 1
+
+        if missing:
+            miss_keys = list(missing)
+            encoded = np.asarray(
+                self.client.encode([texts[missing[key]] for key in miss_keys]),
+                dtype=np.float32,
+            )
+
+            with self._lock:
+                for key, vector in zip(miss_keys, encoded):
+                    self._remember(key, vector)
+                if self._store is not None and encoded.shape[1] == self.dimension:
+                    try:
+                        self._store.put_many(miss_keys, encoded)
+                    except Exception as e:
+                        logger.warning(f"Failed to persist embeddings to cache: {e}")
+                elif self._store is not None:
+                    logger.warning(
+                        f"Embedding dimension {encoded.shape[1]} does not match cache "
+                        f"dimension {self.dimension}. Not persisting to disk."
+                    )
+
+            encoded_by_key = dict(zip(miss_keys, encoded))
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = encoded_by_key[key]
+
+        if not results:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.array(results, dtype=np.float32)
+
+    def encode_query(
+        self,
+        texts: List[str],
+    ) -> np.ndarray:
+        """
+        Generate embeddings for search queries without touching the cache.
+
+        Query text is unbounded user input, so it is never persisted here;
+        QueryEmbeddingCache keeps recent queries in memory instead.
+
+        Args:
+            texts: List of query strings to encode
+
+        Returns:
+            NumPy array of embeddings with shape (len(texts), embedding_dimension)
+        """
+        return self.client.encode_query(texts)
+
+    def get_embedding_dimension(self) -> int:
+        """
+        Get the dimension of embeddings produced by the underlying client.
+
+        Returns:
+            Integer dimension of embedding vectors
+        """
+        return self.client.get_embedding_dimension()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and entry counts
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._store) if self._store is not None else 0,
+                "disk_compactions": self._store.compactions if self._store is not None else 0,
+            }
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query embeddings with a time-to-live per entry."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+    ):
+        """
+        Initialize the query cache.
+
+        Args:
+            max_entries: Maximum number of cached queries (0 disables caching)
+            ttl_seconds: Seconds an entry stays valid after it is stored
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(
+        self,
+        query: str,
+    ) -> Optional[np.ndarray]:
+        """
+        Return the cached embedding for a query, if present and not expired.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Read-only embedding vector, or None on a miss
+        """
+        key = normalize_query(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        query: str,
+        embedding: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Store the embedding for a query.
+
+        Args:
+            query: Raw query text
+            embedding: Embedding vector for the query
+
+        Returns:
+            Read-only float32 copy of the embedding, as returned by later hits
+        """
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        if self.max_entries <= 0:
+            return vector
+        key = normalize_query(query)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return vector
+
+    async def encode(
+        self,
+        client: EmbeddingsClient,
+        query: str,
+    ) -> np.ndarray:
+        """
+        Return the embedding for a query, encoding it with the client on a miss.
+
+        The query is stripped before encoding. Encoding is CPU/network bound and
+        runs in a worker thread; cache hits stay on the event loop.
+
+        Args:
+            client: Embeddings client used on a cache miss
+            query: Raw query text
+
+        Returns:
+            Embedding vector for the query
+        """
+        embedding = self.get(query)
+        if embedding is None:
+            encoded = await asyncio.to_thread(client.encode_query, [query.strip()])
+            embedding = self.put(query, encoded[0])
+        return embedding
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters, size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -45,6 +45,24 @@ class EmbeddingsClient(ABC):
         """
         pass
 
+    def encode_query(
+        self,
+        texts: List[str],
+    ) -> np.ndarray:
+        """
+        Generate embeddings for search queries.
+
+        Same as encode by default. Caching wrappers override it so query
+        text is not written to their persistent store.
+
+        Args:
+            texts: List of query strings to encode
+
+        Returns:
+            NumPy array of embeddings with shape (len(texts), embedding_dimension)
+        """
+        return self.encode(texts)
+
     @abstractmethod
     def get_embedding_dimension(self) -> int:
         """
@@ -350,6 +368,9 @@ def create_embeddings_client(
     api_base: Optional[str] = None,
     aws_region: Optional[str] = None,
     embedding_dimension: Optional[int] = None,
+    embeddings_cache_dir: Optional[Path] = None,
+    embeddings_cache_max_entries: Optional[int] = None,
+    embeddings_cache_max_disk_entries: Optional[int] = None,
 ) -> EmbeddingsClient:
     """
     Factory function to create an embeddings client based on provider.
@@ -363,6 +384,12 @@ def create_embeddings_client(
         api_base: Optional API base URL (litellm only)
         aws_region: Optional AWS region (litellm with Bedrock only)
         embedding_dimension: Optional embedding dimension
+        embeddings_cache_dir: Optional directory for the persistent embedding cache
+        embeddings_cache_max_entries: Optional in-memory LRU size. When this or
+            embeddings_cache_dir is set, the client is wrapped in a
+            CachedEmbeddingsClient (requires embedding_dimension)
+        embeddings_cache_max_disk_entries: Optional size limit of the persistent
+            embedding cache
 
     Returns:
         EmbeddingsClient instance
@@ -374,6 +401,48 @@ def create_embeddings_client(
         For AWS Bedrock, AWS credentials should be configured via standard AWS
         credential chain (IAM roles, environment variables, ~/.aws/credentials).
     """
+    client = _create_provider_client(
+        provider=provider,
+        model_name=model_name,
+        model_dir=model_dir,
+        cache_dir=cache_dir,
+        api_key=api_key,
+        api_base=api_base,
+        aws_region=aws_region,
+        embedding_dimension=embedding_dimension,
+    )
+
+    if embedding_dimension and (
+        embeddings_cache_dir is not None or embeddings_cache_max_entries
+    ):
+        from .cache import CachedEmbeddingsClient
+
+        logger.info(
+            f"Enabling embedding cache for {model_name} (dir: {embeddings_cache_dir})"
+        )
+        return CachedEmbeddingsClient(
+            client=client,
+            model_name=model_name,
+            dimension=embedding_dimension,
+            cache_dir=embeddings_cache_dir,
+            max_memory_entries=embeddings_cache_max_entries or 10000,
+            max_disk_entries=embeddings_cache_max_disk_entries or 100000,
+        )
+
+    return client
+
+
+def _create_provider_client(
+    provider: str,
+    model_name: str,
+    model_dir: Optional[Path],
+    cache_dir: Optional[Path],
+    api_key: Optional[str],
+    api_base: Optional[str],
+    aws_region: Optional[str],
+    embedding_dimension: Optional[int],
+) -> EmbeddingsClient:
+    """Create the uncached embeddings client for a provider."""
     provider_lower = provider.lower()
 
     if provider_lower == "sentence-transformers":
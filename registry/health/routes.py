@@ -82,10 +82,11 @@ async def websocket_endpoint(websocket: WebSocket):
         
         # Keep connection open and handle client messages
         while True:
-            # We don't expect messages from client, but keep alive
-            # Add timeout to prevent hanging on slow clients
+            # Clients only send resync requests; add timeout to keep alive
+            # and prevent hanging on slow clients
             try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                await health_service.handle_websocket_message(websocket, message)
             except asyncio.TimeoutError:
                 # Send ping to keep connection alive
                 await websocket.ping()
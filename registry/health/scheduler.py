@@ -0,0 +1,210 @@
+"""Scheduling of background health checks.
+
+Instead of checking every enabled server at once each interval, every server
+has its own next-due time in a priority queue. Due times are jittered so that
+checks spread evenly over the interval, servers that keep failing are backed
+off exponentially, and a server can override the global interval with a
+``health_check_interval_seconds`` entry in its server info.
+"""
+
+import heapq
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Key in server_info overriding the global health check interval
+SERVER_INTERVAL_KEY = "health_check_interval_seconds"
+
+
+class HealthCheckScheduler:
+    """Priority queue of per-server next-due health check times."""
+
+    def __init__(
+        self,
+        default_interval_seconds: float,
+        jitter_ratio: float = 0.1,
+        backoff_max_seconds: Optional[float] = None,
+        min_interval_seconds: float = 5.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            default_interval_seconds: Interval for servers without an override
+            jitter_ratio: Each interval is randomized by +/- this fraction
+            backoff_max_seconds: Upper bound for backed-off intervals of
+                unhealthy servers; None disables backoff
+            min_interval_seconds: Lower bound for per-server overrides
+        """
+        self.default_interval_seconds = default_interval_seconds
+        self.jitter_ratio = jitter_ratio
+        self.backoff_max_seconds = backoff_max_seconds
+        self.min_interval_seconds = min_interval_seconds
+
+        # (due_time, sequence, path); entries whose sequence no longer matches
+        # self._entry_seq[path] are stale and skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entry_seq: Dict[str, int] = {}
+        self._sequence = 0
+
+        self._intervals: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        # Paths popped by due() whose check has not completed yet
+        self._in_flight: set = set()
+
+    def sync(
+        self,
+        servers: Dict[str, Dict],
+        now: float,
+    ) -> None:
+        """
+        Bring the schedule in line with the current set of enabled servers.
+
+        New servers are due immediately (nginx only routes to servers known to
+        be healthy); jitter on later checks spreads them over the interval.
+        Removed servers are dropped. Interval overrides are refreshed for all
+        servers.
+
+        Args:
+            servers: Enabled server paths mapped to their server info
+            now: Current monotonic time
+        """
+        for path in list(self._intervals):
+            if path not in servers:
+                self.remove(path)
+
+        for path, server_info in servers.items():
+            interval = self.interval_for(server_info)
+            is_new = path not in self._intervals
+            self._intervals[path] = interval
+            if is_new and path not in self._in_flight:
+                self._push(path, now)
+
+    def remove(
+        self,
+        path: str,
+    ) -> None:
+        """Stop scheduling a server."""
+        self._intervals.pop(path, None)
+        self._failures.pop(path, None)
+        self._entry_seq.pop(path, None)
+        self._in_flight.discard(path)
+
+    def due(
+        self,
+        now: float,
+    ) -> List[str]:
+        """Pop and return the servers whose check is due, earliest first."""
+        paths = []
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, path = heapq.heappop(self._heap)
+            if self._entry_seq.get(path) != sequence:
+                continue
+            del self._entry_seq[path]
+            self._in_flight.add(path)
+            paths.append(path)
+        return paths
+
+    def record_result(
+        self,
+        path: str,
+        healthy: bool,
+        now: float,
+    ) -> float:
+        """
+        Reschedule a server after its check completed.
+
+        Args:
+            path: Server path
+            healthy: Whether the check found the server healthy
+            now: Current monotonic time
+
+        Returns:
+            Seconds until the next check of this server
+        """
+        self._in_flight.discard(path)
+        if path not in self._intervals:
+            # Disabled or removed while the check was running
+            return 0.0
+
+        if healthy:
+            self._failures.pop(path, None)
+        else:
+            self._failures[path] = self._failures.get(path, 0) + 1
+
+        delay = self._jitter(self._next_interval(path))
+        self._push(path, now + delay)
+        return delay
+
+    def seconds_until_next_due(
+        self,
+        now: float,
+    ) -> Optional[float]:
+        """Seconds until the earliest scheduled check, or None if nothing is scheduled."""
+        while self._heap and self._entry_seq.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+    def interval_for(
+        self,
+        server_info: Dict,
+    ) -> float:
+        """Return the configured check interval for a server."""
+        override = server_info.get(SERVER_INTERVAL_KEY)
+        if override is None:
+            return self.default_interval_seconds
+        try:
+            interval = float(override)
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Ignoring invalid {SERVER_INTERVAL_KEY}={override!r} for "
+                f"{server_info.get('server_name', 'unknown server')}"
+            )
+            return self.default_interval_seconds
+        return max(interval, self.min_interval_seconds)
+
+    def get_stats(self) -> Dict:
+        """Get scheduler statistics."""
+        return {
+            "scheduled_servers": len(self._intervals),
+            "in_flight": len(self._in_flight),
+            "backed_off_servers": sum(1 for count in self._failures.values() if count > 1),
+        }
+
+    def _next_interval(
+        self,
+        path: str,
+    ) -> float:
+        """Interval before the next check, backed off for repeated failures."""
+        interval = self._intervals[path]
+        failures = self._failures.get(path, 0)
+        if failures <= 1 or not self.backoff_max_seconds:
+            return interval
+        # The first failure is retried at the normal interval; each further
+        # consecutive failure doubles it
+        backed_off = interval * (2 ** min(failures - 1, 16))
+        return max(interval, min(backed_off, self.backoff_max_seconds))
+
+    def _jitter(
+        self,
+        interval: float,
+    ) -> float:
+        """Randomize an interval by +/- jitter_ratio."""
+        if self.jitter_ratio <= 0:
+            return interval
+        spread = interval * self.jitter_ratio
+        return max(0.0, interval + random.uniform(-spread, spread))
+
+    def _push(
+        self,
+        path: str,
+        due_time: float,
+    ) -> None:
+        """Schedule a server, replacing any earlier entry."""
+        self._sequence += 1
+        self._entry_seq[path] = self._sequence
+        heapq.heappush(self._heap, (due_time, self._sequence, path))
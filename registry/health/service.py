@@ -2,31 +2,65 @@ import json
 import asyncio
 import logging
 import httpx
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Dict, Set, Optional, Tuple
+from urllib.parse import urlparse
 from fastapi import WebSocket, WebSocketDisconnect
 from collections import defaultdict, deque
-from time import time
+from time import monotonic, time
 
 from ..core.config import settings
 from ..core.endpoint_utils import get_endpoint_url_from_server_info
 from registry.constants import HealthStatus
+from .scheduler import HealthCheckScheduler
 
 logger = logging.getLogger(__name__)
 
 
+class _ClientChannel:
+    """Outgoing message queue and sender task for one WebSocket connection."""
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int):
+        self.websocket = websocket
+        # Bounded: when a client cannot keep up the oldest message is dropped
+        # and the client resyncs on the resulting sequence gap
+        self.queue: deque = deque(maxlen=max(1, max_queue_size))
+        self.ready = asyncio.Event()
+        self.sender_task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
 class HighPerformanceWebSocketManager:
-    """High-performance WebSocket manager for 400-1000+ concurrent connections."""
+    """High-performance WebSocket manager for 400-1000+ concurrent connections.
+
+    Clients receive a ``snapshot`` message on connect and afterwards only
+    ``delta`` messages carrying the services that changed::
+
+        {"type": "snapshot", "seq": 41, "servers": {path: health_data, ...}}
+        {"type": "delta", "seq": 42, "updates": {path: health_data}, "removed": [path]}
+
+    Sequence numbers increase by one per delta. A client that sees a gap
+    (for example because its queue overflowed and old messages were dropped)
+    sends ``{"type": "resync"}`` and gets a fresh snapshot.
+    """
     
     def __init__(self):
         self.connections: Set[WebSocket] = set()
         self.connection_metadata: Dict[WebSocket, Dict] = {}
+        self._channels: Dict[WebSocket, _ClientChannel] = {}
         
         # Rate limiting and batching
-        self.pending_updates: Dict[str, Dict] = {}  # service_path -> latest_data
+        self.pending_updates: Dict[str, Optional[Dict]] = {}  # service_path -> latest_data, None if removed
         self.last_broadcast_time = 0
         self.min_broadcast_interval = settings.websocket_broadcast_interval_ms / 1000.0
         self.max_batch_size = settings.websocket_max_batch_size
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # State clients hold after applying every delta up to self.sequence
+        self.sequence = 0
+        self._client_state: Dict[str, Dict] = {}
+        self._client_state_loaded = False
         
         # Connection health tracking
         self.failed_connections: Set[WebSocket] = set()
@@ -35,6 +69,8 @@ class HighPerformanceWebSocketManager:
         # Performance metrics
         self.broadcast_count = 0
         self.failed_send_count = 0
+        self.dropped_message_count = 0
+        self.resync_count = 0
         
     async def add_connection(self, websocket: WebSocket) -> bool:
         """Add a new WebSocket connection with connection limits."""
@@ -52,11 +88,16 @@ class HighPerformanceWebSocketManager:
                 "last_ping": time(),
                 "client_ip": getattr(websocket.client, 'host', 'unknown') if websocket.client else 'unknown'
             }
+            # Deltas flushed while the snapshot is being sent queue up here
+            channel = _ClientChannel(websocket, settings.websocket_send_queue_size)
+            self._channels[websocket] = channel
             
             logger.debug(f"WebSocket connected: {len(self.connections)} total connections")
             
             # Send initial status efficiently
             await self._send_initial_status_optimized(websocket)
+            if websocket in self.connections:
+                channel.sender_task = asyncio.create_task(self._run_sender(channel))
             return True
             
         except Exception as e:
@@ -68,84 +109,151 @@ class HighPerformanceWebSocketManager:
         self.connections.discard(websocket)
         self.connection_metadata.pop(websocket, None)
         self.failed_connections.discard(websocket)
+
+        channel = self._channels.pop(websocket, None)
+        if channel and channel.sender_task and channel.sender_task is not asyncio.current_task():
+            channel.sender_task.cancel()
         
         logger.debug(f"WebSocket disconnected: {len(self.connections)} total connections")
+
+    async def shutdown(self):
+        """Stop the flusher and sender tasks."""
+        tasks = [self._flush_task] if self._flush_task else []
+        tasks.extend(channel.sender_task for channel in self._channels.values() if channel.sender_task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_task = None
     
     async def _send_initial_status_optimized(self, websocket: WebSocket):
-        """Send initial status using cached data to avoid blocking."""
+        """Send the initial snapshot directly, ahead of any queued deltas."""
         try:
-            # Use cached health data to avoid blocking on service calls
-            cached_data = await health_service._get_cached_health_data()
-            if cached_data:
-                await websocket.send_text(json.dumps(cached_data))
+            message = await self._build_snapshot_message()
+            await websocket.send_text(message)
         except Exception as e:
             logger.warning(f"Failed to send initial status: {e}")
             await self.remove_connection(websocket)
+
+    async def _build_snapshot_message(self) -> str:
+        """Serialize the current client state together with its sequence number."""
+        if not self._client_state_loaded:
+            # Use cached health data to avoid blocking on service calls
+            self._client_state = dict(await health_service._get_cached_health_data())
+            self._client_state_loaded = True
+        return json.dumps({
+            "type": "snapshot",
+            "seq": self.sequence,
+            "servers": self._client_state,
+        })
+
+    async def handle_client_message(self, websocket: WebSocket, message: str):
+        """Handle a message sent by a client; only resync requests are understood."""
+        try:
+            request = json.loads(message)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(request, dict) or request.get("type") != "resync":
+            return
+
+        channel = self._channels.get(websocket)
+        if channel is None:
+            return
+        self.resync_count += 1
+        snapshot = await self._build_snapshot_message()
+        # Everything queued is superseded by the snapshot
+        channel.queue.clear()
+        self._enqueue(channel, snapshot)
     
     async def broadcast_update(self, service_path: Optional[str] = None, health_data: Optional[Dict] = None):
-        """High-performance broadcasting with batching and rate limiting."""
+        """Queue an update for the background flusher.
+
+        With a service_path, health_data is that service's new state (None if
+        it was removed). Without one, the full health data is compared with
+        what clients already have and only the differences are queued.
+        Updates to the same service are coalesced until the next flush.
+        """
         if not self.connections:
             return
             
-        current_time = time()
-        
-        # Rate limiting: prevent too frequent broadcasts
-        if current_time - self.last_broadcast_time < self.min_broadcast_interval:
-            # Queue the update for later batch processing
-            if service_path and health_data:
-                self.pending_updates[service_path] = health_data
+        if service_path:
+            self.pending_updates[service_path] = health_data
+        elif self._client_state_loaded:
+            current = await health_service._get_cached_health_data()
+            for path, data in current.items():
+                if path not in self.pending_updates and self._client_state.get(path) != data:
+                    self.pending_updates[path] = data
+            for path in self._client_state:
+                if path not in current and path not in self.pending_updates:
+                    self.pending_updates[path] = None
+
+        if self.pending_updates and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._run_flusher())
+
+    async def _run_flusher(self):
+        """Flush pending updates, at most once per broadcast interval, until none are left."""
+        while self.pending_updates:
+            # Rate limiting: prevent too frequent broadcasts
+            wait = self.min_broadcast_interval - (time() - self.last_broadcast_time)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._flush_pending_updates()
+
+    async def _flush_pending_updates(self):
+        """Send up to max_batch_size pending updates as one delta message."""
+        if not self.pending_updates:
             return
-        
-        # Prepare broadcast data
-        if service_path and health_data:
-            # Single service update
-            broadcast_data = {service_path: health_data}
-        else:
-            # Batch updates or full status
-            if self.pending_updates:
-                # Send pending updates in batches
-                batch_data = dict(list(self.pending_updates.items())[:self.max_batch_size])
-                broadcast_data = batch_data
-                # Remove sent items from pending
-                for key in batch_data.keys():
-                    self.pending_updates.pop(key, None)
-            else:
-                # Full status update (avoid this when possible)
-                broadcast_data = await health_service._get_cached_health_data()
-        
-        if broadcast_data:
-            await self._send_to_connections_optimized(broadcast_data)
-            self.last_broadcast_time = current_time
+        batch = dict(list(self.pending_updates.items())[:self.max_batch_size])
+        for path in batch:
+            del self.pending_updates[path]
+
+        updates = {path: data for path, data in batch.items() if data is not None}
+        removed = [path for path, data in batch.items() if data is None]
+        self._client_state.update(updates)
+        for path in removed:
+            self._client_state.pop(path, None)
+
+        self.sequence += 1
+        await self._send_to_connections_optimized({
+            "type": "delta",
+            "seq": self.sequence,
+            "updates": updates,
+            "removed": removed,
+        })
+        self.last_broadcast_time = time()
     
     async def _send_to_connections_optimized(self, data: Dict):
-        """Optimized concurrent sending with automatic cleanup."""
+        """Serialize once and queue the message for every connection."""
         if not self.connections:
             return
             
         message = json.dumps(data)
-        connections_list = list(self.connections)  # Snapshot for safe iteration
-        
-        # Split into chunks for better memory management with many connections
-        chunk_size = 100  # Process 100 connections at a time
-        
-        for i in range(0, len(connections_list), chunk_size):
-            chunk = connections_list[i:i + chunk_size]
-            
-            # Send to chunk concurrently
-            tasks = [self._safe_send_message(conn, message) for conn in chunk]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Track failed connections
-            for conn, result in zip(chunk, results):
-                if isinstance(result, Exception):
-                    self.failed_connections.add(conn)
-                    self.failed_send_count += 1
-        
-        # Cleanup failed connections in batch (non-blocking)
-        if self.failed_connections:
-            asyncio.create_task(self._cleanup_failed_connections())
+        for channel in list(self._channels.values()):
+            self._enqueue(channel, message)
             
         self.broadcast_count += 1
+
+    def _enqueue(self, channel: _ClientChannel, message: str):
+        """Queue a message for one client, dropping its oldest message when full."""
+        if len(channel.queue) == channel.queue.maxlen:
+            channel.dropped += 1
+            self.dropped_message_count += 1
+        channel.queue.append(message)
+        channel.ready.set()
+
+    async def _run_sender(self, channel: _ClientChannel):
+        """Drain one client's queue so a slow client never delays the others."""
+        websocket = channel.websocket
+        while True:
+            await channel.ready.wait()
+            channel.ready.clear()
+            while channel.queue:
+                result = await self._safe_send_message(websocket, channel.queue.popleft())
+                if result is not True:
+                    self.failed_connections.add(websocket)
+                    self.failed_send_count += 1
+                    await self._cleanup_failed_connections()
+                    return
     
     async def _safe_send_message(self, connection: WebSocket, message: str):
         """Send message with timeout and error handling."""
@@ -176,7 +284,11 @@ class HighPerformanceWebSocketManager:
             "pending_updates": len(self.pending_updates),
             "total_broadcasts": self.broadcast_count,
             "failed_sends": self.failed_send_count,
-            "failed_connections": len(self.failed_connections)
+            "failed_connections": len(self.failed_connections),
+            "sequence": self.sequence,
+            "dropped_messages": self.dropped_message_count,
+            "resyncs": self.resync_count,
+            "queued_messages": sum(len(channel.queue) for channel in self._channels.values()),
         }
 
 
@@ -197,6 +309,20 @@ class HealthMonitoringService:
         self._cached_health_data: Dict = {}
         self._cache_timestamp = 0
         self._cache_ttl = settings.websocket_cache_ttl_seconds
+
+        # Pooled HTTP client shared by periodic and on-demand checks
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # Per-server check schedule; the semaphore bounds checks in flight
+        self._scheduler = HealthCheckScheduler(
+            default_interval_seconds=settings.health_check_interval_seconds,
+            jitter_ratio=settings.health_check_jitter_ratio,
+            backoff_max_seconds=settings.health_check_backoff_max_seconds or None,
+        )
+        self._check_semaphore = asyncio.Semaphore(settings.health_check_max_concurrency)
+        self._scheduled_servers: Dict[str, Dict] = {}
+        self._last_schedule_sync: Optional[float] = None
         
     async def initialize(self):
         """Initialize the health monitoring service."""
@@ -217,6 +343,8 @@ class HealthMonitoringService:
             except asyncio.CancelledError:
                 pass
         
+        await self.websocket_manager.shutdown()
+
         # Close all WebSocket connections
         connections = list(self.websocket_manager.connections)
         close_tasks = []
@@ -228,8 +356,62 @@ class HealthMonitoringService:
                 
         if close_tasks:
             await asyncio.gather(*close_tasks, return_exceptions=True)
+
+        await self._close_http_client()
             
         logger.info("Health monitoring service shutdown complete")
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client used for health checks, creating it on first use.
+
+        Connections are kept alive between checks so repeated checks against the
+        same server (initialize + ping, periodic sweeps, on-demand checks) reuse
+        TCP/TLS sessions instead of reconnecting every time.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.health_check_timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=settings.health_check_max_connections,
+                    max_keepalive_connections=settings.health_check_max_keepalive_connections,
+                    keepalive_expiry=settings.health_check_keepalive_expiry_seconds,
+                ),
+                http2=self._http2_enabled(),
+            )
+        return self._http_client
+
+    @staticmethod
+    def _http2_enabled() -> bool:
+        """Return True if HTTP/2 is requested and the h2 package is available."""
+        if not settings.health_check_http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("health_check_http2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            return False
+        return True
+
+    async def _close_http_client(self):
+        """Close the pooled HTTP client and drop its connections."""
+        client = self._http_client
+        self._http_client = None
+        if client is not None and not client.is_closed:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing health check HTTP client: {e}")
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        """Limit concurrent checks against one host (many servers can share a backend)."""
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.health_check_max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+        async with semaphore:
+            yield
         
     async def add_websocket_connection(self, websocket: WebSocket):
         """Add a new WebSocket connection and send initial health status."""
@@ -261,9 +443,18 @@ class HealthMonitoringService:
             if server_info:
                 health_data = self._get_service_health_data_fast(service_path, server_info)
                 await self.websocket_manager.broadcast_update(service_path, health_data)
+            else:
+                # Deleted service - clients drop it
+                await self.websocket_manager.broadcast_update(service_path, None)
         else:
-            # Full update - use cached data
+            # Full update - rebuild the health data so the manager diffs against
+            # current state and only sends the services that changed
+            self._cache_timestamp = 0
             await self.websocket_manager.broadcast_update()
+
+    async def handle_websocket_message(self, websocket: WebSocket, message: str):
+        """Handle a message from a WebSocket client (e.g. a resync request)."""
+        await self.websocket_manager.handle_client_message(websocket, message)
             
     async def _get_cached_health_data(self) -> Dict:
         """Get cached health data to avoid expensive operations during WebSocket sends."""
@@ -290,13 +481,13 @@ class HealthMonitoringService:
         return self.websocket_manager.get_stats()
 
     async def _run_health_checks(self):
-        """Background task to run periodic health checks."""
-        logger.info("Starting periodic health checks...")
+        """Background task to run scheduled health checks."""
+        logger.info("Starting scheduled health checks...")
         
         while True:
             try:
                 await self._perform_health_checks()
-                await asyncio.sleep(settings.health_check_interval_seconds)
+                await asyncio.sleep(self._seconds_until_next_check())
             except asyncio.CancelledError:
                 logger.info("Health check task cancelled")
                 break
@@ -305,40 +496,43 @@ class HealthMonitoringService:
                 await asyncio.sleep(60)  # Wait a minute before retrying
                 
     async def _perform_health_checks(self):
-        """Perform health checks on all enabled services."""
-        from ..services.server_service import server_service
-        import httpx
-
-        enabled_services = await server_service.get_enabled_services()
-        if not enabled_services:
+        """Perform the health checks that are due on enabled services."""
+        now = monotonic()
+        if (
+            self._last_schedule_sync is None
+            or now - self._last_schedule_sync >= settings.health_check_resync_seconds
+        ):
+            await self._sync_schedule(now)
+
+        due_services = self._scheduler.due(now)
+        if not due_services:
             return
 
         # Only log if there are many services to avoid spam
-        if len(enabled_services) > 1:
-            logger.debug(f"Performing health checks on {len(enabled_services)} enabled services")
+        if len(due_services) > 1:
+            logger.debug(f"Performing health checks on {len(due_services)} due services")
 
         # Track if any status changed to minimize broadcasts
         status_changed = False
 
-        # Perform actual health checks concurrently for better performance
-        async with httpx.AsyncClient(timeout=httpx.Timeout(settings.health_check_timeout_seconds)) as client:
-            # Batch process enabled services
-            check_tasks = []
-            for service_path in enabled_services:
-                server_info = await server_service.get_server_info(service_path)
-                if server_info and server_info.get("proxy_pass_url"):
-                    check_tasks.append(self._check_single_service(client, service_path, server_info))
-            
-            # Execute all health checks concurrently
-            if check_tasks:
-                results = await asyncio.gather(*check_tasks, return_exceptions=True)
-                
-                # Check if any status changed
-                for result in results:
-                    if isinstance(result, bool) and result:  # True indicates status changed
-                        status_changed = True
-                        break
+        # Perform actual health checks concurrently over the pooled client,
+        # at most health_check_max_concurrency at a time
+        client = self._get_http_client()
+        check_tasks = [
+            self._run_scheduled_check(client, service_path, self._scheduled_servers[service_path])
+            for service_path in due_services
+        ]
+        
+        # Execute all health checks concurrently
+        if check_tasks:
+            results = await asyncio.gather(*check_tasks, return_exceptions=True)
             
+            # Check if any status changed
+            for result in results:
+                if isinstance(result, bool) and result:  # True indicates status changed
+                    status_changed = True
+                    break
+        
         # Only broadcast if something actually changed
         if status_changed:
             await self.broadcast_health_update()
@@ -346,17 +540,52 @@ class HealthMonitoringService:
             # Regenerate nginx configuration when health status changes
             try:
                 from ..core.nginx_service import nginx_service
-                # Build enabled_servers dict with proper async/await
-                enabled_servers = {}
-                for path in await server_service.get_enabled_services():
-                    server_info = await server_service.get_server_info(path)
-                    if server_info:
-                        enabled_servers[path] = server_info
+                from ..services.server_service import server_service
+                enabled_servers = await server_service.get_enabled_servers_with_info()
                 await nginx_service.generate_config_async(enabled_servers)
                 logger.info("Nginx configuration regenerated due to health status changes")
             except Exception as e:
                 logger.error(f"Failed to regenerate nginx configuration after health status change: {e}")
             
+    async def _sync_schedule(self, now: float):
+        """Refresh the set of scheduled servers from the server service."""
+        from ..services.server_service import server_service
+
+        servers = {
+            service_path: server_info
+            for service_path, server_info in (await server_service.get_enabled_servers_with_info()).items()
+            if server_info.get("proxy_pass_url")
+        }
+
+        self._scheduler.sync(servers, now)
+        self._scheduled_servers = servers
+        self._last_schedule_sync = now
+
+    def _seconds_until_next_check(self) -> float:
+        """Time to sleep before the next scheduler pass."""
+        now = monotonic()
+        wait = settings.health_check_resync_seconds
+        if self._last_schedule_sync is not None:
+            wait -= now - self._last_schedule_sync
+        next_due = self._scheduler.seconds_until_next_due(now)
+        if next_due is not None:
+            wait = min(wait, next_due)
+        # Checks due within the same second are batched into one pass
+        return max(wait, 1.0)
+
+    async def _run_scheduled_check(self, client: httpx.AsyncClient, service_path: str, server_info: Dict) -> bool:
+        """Run one scheduled check under the concurrency limit and reschedule the server."""
+        try:
+            async with self._check_semaphore:
+                return await self._check_single_service(client, service_path, server_info)
+        finally:
+            status = self.server_health_status.get(service_path, HealthStatus.UNKNOWN)
+            self._scheduler.record_result(service_path, HealthStatus.is_healthy(status), monotonic())
+
+    def get_scheduler_stats(self) -> Dict:
+        """Get health check scheduler statistics."""
+        return self._scheduler.get_stats()
+
     async def _check_single_service(self, client: httpx.AsyncClient, service_path: str, server_info: Dict) -> bool:
         """Check a single service and return True if status changed."""
         from ..services.server_service import server_service
@@ -367,7 +596,8 @@ class HealthMonitoringService:
         
         try:
             # Try to reach the service endpoint using transport-aware checking
-            is_healthy, status_detail = await self._check_server_endpoint_transport_aware(client, proxy_pass_url, server_info)
+            async with self._host_slot(proxy_pass_url):
+                is_healthy, status_detail = await self._check_server_endpoint_transport_aware(client, proxy_pass_url, server_info)
             
             if is_healthy:
                 new_status = status_detail  # Could be "healthy" or "healthy-auth-expired"
@@ -1003,7 +1233,6 @@ class HealthMonitoringService:
     async def perform_immediate_health_check(self, service_path: str) -> tuple[str, datetime | None]:
         """Perform an immediate health check for a single service."""
         from ..services.server_service import server_service
-        import httpx
 
         server_info = await server_service.get_server_info(service_path)
         if not server_info:
@@ -1027,28 +1256,29 @@ class HealthMonitoringService:
         self.server_health_status[service_path] = HealthStatus.CHECKING
 
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(settings.health_check_timeout_seconds)) as client:
-                # Use transport-aware endpoint checking
+            client = self._get_http_client()
+            # Use transport-aware endpoint checking
+            async with self._host_slot(proxy_pass_url):
                 is_healthy, status_detail = await self._check_server_endpoint_transport_aware(client, proxy_pass_url, server_info)
+            
+            if is_healthy:
+                current_status = status_detail  # Could be "healthy" or "healthy-auth-expired"
+                logger.info(f"Health check successful for {service_path} ({proxy_pass_url}): {status_detail}")
                 
-                if is_healthy:
-                    current_status = status_detail  # Could be "healthy" or "healthy-auth-expired"
-                    logger.info(f"Health check successful for {service_path} ({proxy_pass_url}): {status_detail}")
-                    
-                    # Schedule tool list fetch in background only for fully healthy status
-                    logger.info(f"DEBUG: Health check status for {service_path}: status_detail='{status_detail}' (type: {type(status_detail)}) vs HealthStatus.HEALTHY='{HealthStatus.HEALTHY}' (type: {type(HealthStatus.HEALTHY)})")
-                    if status_detail == HealthStatus.HEALTHY:
-                        logger.info(f"DEBUG: Status detail matches HealthStatus.HEALTHY, triggering background tool update for {service_path}")
-                        asyncio.create_task(self._update_tools_background(service_path, proxy_pass_url))
-                    elif status_detail == HealthStatus.HEALTHY_AUTH_EXPIRED:
-                        logger.warning(f"Auth token expired for {service_path} but server is reachable")
-                    else:
-                        logger.info(f"DEBUG: Status detail '{status_detail}' does not match HealthStatus.HEALTHY, NOT triggering background tool update")
-                        
+                # Schedule tool list fetch in background only for fully healthy status
+                logger.info(f"DEBUG: Health check status for {service_path}: status_detail='{status_detail}' (type: {type(status_detail)}) vs HealthStatus.HEALTHY='{HealthStatus.HEALTHY}' (type: {type(HealthStatus.HEALTHY)})")
+                if status_detail == HealthStatus.HEALTHY:
+                    logger.info(f"DEBUG: Status detail matches HealthStatus.HEALTHY, triggering background tool update for {service_path}")
+                    asyncio.create_task(self._update_tools_background(service_path, proxy_pass_url))
+                elif status_detail == HealthStatus.HEALTHY_AUTH_EXPIRED:
+                    logger.warning(f"Auth token expired for {service_path} but server is reachable")
                 else:
-                    current_status = status_detail  # Detailed error from transport check
-                    logger.info(f"Health check failed for {service_path} ({proxy_pass_url}): {status_detail}")
+                    logger.info(f"DEBUG: Status detail '{status_detail}' does not match HealthStatus.HEALTHY, NOT triggering background tool update")
                     
+            else:
+                current_status = status_detail  # Detailed error from transport check
+                logger.info(f"Health check failed for {service_path} ({proxy_pass_url}): {status_detail}")
+                
         except httpx.TimeoutException:
             current_status = "unhealthy: timeout"
             logger.info(f"Health check timeout for {service_path}")
@@ -1067,12 +1297,7 @@ class HealthMonitoringService:
         if previous_status != current_status:
             try:
                 from ..core.nginx_service import nginx_service
-                # Build enabled_servers dict with proper async/await
-                enabled_servers = {}
-                for path in await server_service.get_enabled_services():
-                    server_info = await server_service.get_server_info(path)
-                    if server_info:
-                        enabled_servers[path] = server_info
+                enabled_servers = await server_service.get_enabled_servers_with_info()
                 await nginx_service.generate_config_async(enabled_servers)
                 logger.info(f"Nginx configuration regenerated due to status change for {service_path}: {previous_status} -> {current_status}")
             except Exception as e:
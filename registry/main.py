@@ -123,13 +123,18 @@ async def lifespan(app: FastAPI):
 
         logger.info(f"📊 Updating {backend_name} index with all registered services...")
         all_servers = await server_service.get_all_servers()
+        server_entities = []
         for service_path, server_info in all_servers.items():
-            is_enabled = await server_service.is_service_enabled(service_path)
-            try:
-                await search_repo.index_server(service_path, server_info, is_enabled)
-                logger.debug(f"Updated {backend_name} index for service: {service_path}")
-            except Exception as e:
-                logger.error(f"Failed to update {backend_name} index for service {service_path}: {e}", exc_info=True)
+            server_entities.append({
+                "path": service_path,
+                "entity_type": "mcp_server",
+                "info": server_info,
+                "is_enabled": await server_service.is_service_enabled(service_path),
+            })
+        try:
+            await search_repo.bulk_index(server_entities)
+        except Exception as e:
+            logger.error(f"Failed to update {backend_name} index for services: {e}", exc_info=True)
 
         logger.info(f"✅ {backend_name} index updated with {len(all_servers)} services")
 
@@ -138,13 +143,19 @@ async def lifespan(app: FastAPI):
 
         logger.info(f"📊 Updating {backend_name} index with all registered agents...")
         all_agents = agent_service.list_agents()
-        for agent_card in all_agents:
-            is_enabled = agent_service.is_agent_enabled(agent_card.path)
-            try:
-                await search_repo.index_agent(agent_card.path, agent_card, is_enabled)
-                logger.debug(f"Updated {backend_name} index for agent: {agent_card.path}")
-            except Exception as e:
-                logger.error(f"Failed to update {backend_name} index for agent {agent_card.path}: {e}", exc_info=True)
+        agent_entities = [
+            {
+                "path": agent_card.path,
+                "entity_type": "a2a_agent",
+                "info": agent_card,
+                "is_enabled": agent_service.is_agent_enabled(agent_card.path),
+            }
+            for agent_card in all_agents
+        ]
+        try:
+            await search_repo.bulk_index(agent_entities)
+        except Exception as e:
+            logger.error(f"Failed to update {backend_name} index for agents: {e}", exc_info=True)
 
         logger.info(f"✅ {backend_name} index updated with {len(all_agents)} agents")
 
@@ -217,12 +228,7 @@ async def lifespan(app: FastAPI):
             logger.info("Continuing without federation")
 
         logger.info("🌐 Generating initial Nginx configuration...")
-        enabled_service_paths = await server_service.get_enabled_services()
-        enabled_servers = {}
-        for path in enabled_service_paths:
-            server_info = await server_service.get_server_info(path)
-            if server_info:
-                enabled_servers[path] = server_info
+        enabled_servers = await server_service.get_enabled_servers_with_info()
         await nginx_service.generate_config_async(enabled_servers)
 
         logger.info("✅ All services initialized successfully!")
@@ -239,6 +245,15 @@ async def lifespan(app: FastAPI):
     try:
         # Shutdown services gracefully
         await health_service.shutdown()
+
+        if settings.storage_backend in ("documentdb", "mongodb-ce"):
+            # Stop the repository caches' change stream / version poll tasks
+            from registry.repositories.documentdb import stop_collection_caches
+            await stop_collection_caches()
+        else:
+            # Persist any FAISS changes still pending in the write-behind window
+            from registry.search.service import faiss_service
+            await faiss_service.flush()
         logger.info("✅ Shutdown completed successfully!")
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {e}", exc_info=True)
@@ -6,6 +6,11 @@ from .client import (
     get_collection_name,
     get_documentdb_client,
 )
+from .collection_cache import (
+    CollectionCache,
+    get_collection_cache_stats,
+    stop_collection_caches,
+)
 from .federation_config_repository import DocumentDBFederationConfigRepository
 from .scope_repository import DocumentDBScopeRepository
 from .search_repository import DocumentDBSearchRepository
@@ -13,6 +18,7 @@ from .security_scan_repository import DocumentDBSecurityScanRepository
 from .server_repository import DocumentDBServerRepository
 
 __all__ = [
+    "CollectionCache",
     "DocumentDBAgentRepository",
     "DocumentDBFederationConfigRepository",
     "DocumentDBScopeRepository",
@@ -20,6 +26,8 @@ __all__ = [
     "DocumentDBSecurityScanRepository",
     "DocumentDBServerRepository",
     "close_documentdb_client",
+    "get_collection_cache_stats",
     "get_collection_name",
     "get_documentdb_client",
+    "stop_collection_caches",
 ]
@@ -10,6 +10,7 @@ from pymongo.errors import DuplicateKeyError
 from ...schemas.agent_models import AgentCard
 from ..interfaces import AgentRepositoryBase
 from .client import get_collection_name, get_documentdb_client
+from .collection_cache import CollectionCache
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
     def __init__(self):
         self._collection: Optional[AsyncIOMotorCollection] = None
         self._collection_name = get_collection_name("mcp_agents")
+        self._cache = CollectionCache(self._collection_name)
 
 
     async def _get_collection(self) -> AsyncIOMotorCollection:
@@ -37,7 +39,8 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            count = await collection.count_documents({})
+            # Warm the read cache (and start its change stream / version poll)
+            count = len(await self._cache.get_all(collection))
             logger.info(f"Loaded {count} agents from DocumentDB")
         except Exception as e:
             logger.error(f"Error loading agents from DocumentDB: {e}", exc_info=True)
@@ -51,7 +54,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            agent_doc = await collection.find_one({"_id": path})
+            agent_doc = await self._cache.get(collection, path)
             if not agent_doc:
                 return None
 
@@ -67,9 +70,8 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            cursor = collection.find({})
             agents = []
-            async for doc in cursor:
+            for doc in (await self._cache.get_all(collection)).values():
                 path = doc.pop("_id")
                 doc["path"] = path
                 try:
@@ -105,6 +107,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
             doc.pop("path", None)
 
             await collection.insert_one(doc)
+            await self._cache.record_write(path)
             logger.info(f"Created agent '{agent.name}' at '{path}'")
             return agent
         except DuplicateKeyError:
@@ -146,6 +149,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
                 {"_id": path},
                 {"$set": update_dict}
             )
+            await self._cache.record_write(path)
 
             if result.matched_count == 0:
                 raise ValueError(f"Agent at '{path}' not found in DocumentDB")
@@ -173,6 +177,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
             agent_name = agent_doc.get("name", "Unknown")
 
             result = await collection.delete_one({"_id": path})
+            await self._cache.record_write(path)
 
             if result.deleted_count == 0:
                 logger.error(f"Failed to delete agent at '{path}'")
@@ -194,9 +199,8 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
             collection = await self._get_collection()
 
             try:
-                cursor = collection.find({})
                 state = {"enabled": [], "disabled": []}
-                async for doc in cursor:
+                for doc in (await self._cache.get_all(collection)).values():
                     agent_path = doc.get("_id")
                     if agent_path:
                         if doc.get("is_enabled", False):
@@ -239,6 +243,7 @@ class DocumentDBAgentRepository(AgentRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(path)
 
             if result.matched_count == 0:
                 logger.error(f"Agent at '{path}' not found")
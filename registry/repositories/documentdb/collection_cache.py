@@ -0,0 +1,409 @@
+"""Read-through in-memory cache of a whole DocumentDB collection.
+
+The server, agent and scope collections are small and read on nearly every
+request (listings, health cycles, nginx regeneration, auth), so each
+repository keeps the full collection in memory and answers reads from it.
+
+Coherence across registry replicas:
+
+- Change streams (MongoDB, DocumentDB with change streams enabled): a
+  background task watches the collection and marks changed documents stale;
+  the next read re-fetches only those documents.
+- Version polling (fallback): every write increments a per-collection counter
+  in a shared ``cache_versions`` collection. A background task polls it and
+  drops the cache when another replica has written, so remote writes become
+  visible within ``documentdb_cache_poll_interval_seconds``. Writes that
+  bypass the repositories never bump the counter, so the cache is also
+  dropped once it is older than ``documentdb_cache_max_age_seconds``.
+
+Local writes always invalidate immediately, so a replica reads its own writes.
+Reads return deep copies; callers may mutate what they get back.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+
+from ...core.config import settings
+from .client import get_collection_name, get_documentdb_client
+
+
+logger = logging.getLogger(__name__)
+
+# Shared collection holding one write counter per cached collection
+VERSION_COLLECTION_BASE_NAME = "cache_versions"
+
+MODE_CHANGE_STREAM = "change_stream"
+MODE_POLLING = "polling"
+
+
+class CollectionCache:
+    """Full-collection cache keyed by document _id."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        enabled: Optional[bool] = None,
+        use_change_streams: Optional[bool] = None,
+        poll_interval_seconds: Optional[float] = None,
+        max_age_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            collection_name: Full (namespaced) name of the cached collection
+            enabled: Cache reads; defaults to settings.documentdb_cache_enabled
+            use_change_streams: Try change streams before falling back to polling
+            poll_interval_seconds: Version counter poll interval in polling mode
+            max_age_seconds: Drop the cache at least this often in polling mode
+                (0 disables)
+        """
+        self.collection_name = collection_name
+        self.enabled = settings.documentdb_cache_enabled if enabled is None else enabled
+        self.use_change_streams = (
+            settings.documentdb_cache_use_change_streams
+            if use_change_streams is None
+            else use_change_streams
+        )
+        self.poll_interval_seconds = (
+            settings.documentdb_cache_poll_interval_seconds
+            if poll_interval_seconds is None
+            else poll_interval_seconds
+        )
+        self.max_age_seconds = (
+            settings.documentdb_cache_max_age_seconds
+            if max_age_seconds is None
+            else max_age_seconds
+        )
+
+        self.mode: Optional[str] = None
+        self._docs: Dict[Any, Dict[str, Any]] = {}
+        self._loaded = False
+        self._epoch = 0
+        self._stale_ids: set = set()
+        self._load_lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._seen_version: Optional[int] = None
+        self._dropped_at = time.monotonic()
+        self._version_collection: Optional[AsyncIOMotorCollection] = None
+
+        self.hits = 0
+        self.full_loads = 0
+        self.partial_loads = 0
+        self.invalidations = 0
+
+        _caches.append(self)
+
+
+    async def get_all(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Return copies of all documents keyed by _id."""
+        if not self.enabled:
+            return {doc["_id"]: doc async for doc in collection.find({})}
+
+        docs = await self._current(collection)
+        return {doc_id: copy.deepcopy(doc) for doc_id, doc in docs.items()}
+
+
+    async def get(
+        self,
+        collection: AsyncIOMotorCollection,
+        doc_id: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a copy of one document, or None if it does not exist."""
+        if not self.enabled:
+            return await collection.find_one({"_id": doc_id})
+
+        docs = await self._current(collection)
+        doc = docs.get(doc_id)
+        return copy.deepcopy(doc) if doc is not None else None
+
+
+    async def find(
+        self,
+        collection: AsyncIOMotorCollection,
+        predicate: Callable[[Dict[str, Any]], bool],
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Return copies of the documents matching a predicate, keyed by _id."""
+        if not self.enabled:
+            return {doc["_id"]: doc async for doc in collection.find({}) if predicate(doc)}
+
+        docs = await self._current(collection)
+        return {
+            doc_id: copy.deepcopy(doc) for doc_id, doc in docs.items() if predicate(doc)
+        }
+
+
+    def invalidate(
+        self,
+        doc_id: Any = None,
+    ) -> None:
+        """Mark one document (or, with no id, the whole collection) as stale."""
+        self.invalidations += 1
+        if doc_id is None or not self._loaded:
+            self._loaded = False
+            self._epoch += 1
+            self._stale_ids.clear()
+        else:
+            self._stale_ids.add(doc_id)
+
+
+    async def record_write(
+        self,
+        doc_id: Any = None,
+    ) -> None:
+        """
+        Invalidate after a local write and notify polling replicas.
+
+        Args:
+            doc_id: _id of the written document, or None if the write may have
+                touched several documents (update_many, replace by filter, ...)
+        """
+        self.invalidate(doc_id)
+        if not self.enabled or self.mode == MODE_CHANGE_STREAM:
+            return
+
+        try:
+            versions = await self._get_version_collection()
+            doc = await versions.find_one_and_update(
+                {"_id": self.collection_name},
+                {"$inc": {"version": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            # Our own bump need not trigger a full reload on the next poll,
+            # unless other replicas wrote in between
+            version = doc.get("version") if doc else None
+            if self._seen_version is not None and version == self._seen_version + 1:
+                self._seen_version = version
+        except Exception as e:
+            logger.warning(f"Failed to bump cache version for '{self.collection_name}': {e}")
+
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "collection": self.collection_name,
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "documents": len(self._docs) if self._loaded else 0,
+            "hits": self.hits,
+            "full_loads": self.full_loads,
+            "partial_loads": self.partial_loads,
+            "invalidations": self.invalidations,
+        }
+
+
+    async def stop(self) -> None:
+        """Stop the background coherence task."""
+        task = self._sync_task
+        self._sync_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+    async def _current(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Return the up-to-date document map, loading what is missing or stale."""
+        self._ensure_sync_task(collection)
+
+        if self._loaded and not self._stale_ids:
+            self.hits += 1
+            return self._docs
+
+        async with self._load_lock:
+            if not self._loaded:
+                await self._load_all(collection)
+            elif self._stale_ids:
+                await self._load_stale(collection)
+        return self._docs
+
+
+    async def _load_all(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> None:
+        """Load the whole collection."""
+        epoch = self._epoch
+        self._stale_ids.clear()
+        self._docs = {doc["_id"]: doc async for doc in collection.find({})}
+        # A full invalidation during the load means the result may already be
+        # stale; serve it to the waiting callers but reload on the next read
+        self._loaded = epoch == self._epoch
+        self.full_loads += 1
+        logger.debug(
+            f"Cached {len(self._docs)} documents from collection '{self.collection_name}'"
+        )
+
+
+    async def _load_stale(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> None:
+        """Re-fetch only the documents marked stale."""
+        epoch = self._epoch
+        stale_ids = list(self._stale_ids)
+        self._stale_ids.clear()
+        try:
+            found = {
+                doc["_id"]: doc
+                async for doc in collection.find({"_id": {"$in": stale_ids}})
+            }
+        except Exception:
+            self._stale_ids.update(stale_ids)
+            raise
+
+        if epoch != self._epoch:
+            return
+        for doc_id in stale_ids:
+            if doc_id in found:
+                self._docs[doc_id] = found[doc_id]
+            else:
+                self._docs.pop(doc_id, None)
+        self.partial_loads += 1
+
+
+    def _ensure_sync_task(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> None:
+        """Start the change stream / polling task on first use."""
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        self._sync_task = asyncio.get_running_loop().create_task(self._sync(collection))
+
+
+    async def _sync(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> None:
+        """Keep the cache coherent with writes made by other replicas."""
+        if self.use_change_streams:
+            try:
+                await self._watch(collection)
+            except OperationFailure as e:
+                logger.warning(
+                    f"Change streams unavailable for '{self.collection_name}' ({e}); "
+                    f"polling version counter every {self.poll_interval_seconds}s"
+                )
+        await self._poll_version()
+
+
+    async def _watch(
+        self,
+        collection: AsyncIOMotorCollection,
+    ) -> None:
+        """Apply change stream events; reconnect (and drop the cache) on errors."""
+        while True:
+            try:
+                async with collection.watch() as stream:
+                    # Changes made before the stream opened were not observed
+                    self.invalidate()
+                    self.mode = MODE_CHANGE_STREAM
+                    logger.info(f"Watching change stream for '{self.collection_name}'")
+                    async for change in stream:
+                        self._apply_change(change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure:
+                # Never worked: change streams are not enabled for this collection
+                if self.mode != MODE_CHANGE_STREAM:
+                    raise
+                logger.warning(f"Change stream for '{self.collection_name}' failed, reopening")
+            except Exception as e:
+                logger.warning(f"Change stream for '{self.collection_name}' interrupted: {e}")
+
+            self.invalidate()
+            await asyncio.sleep(self.poll_interval_seconds)
+
+
+    def _apply_change(
+        self,
+        change: Dict[str, Any],
+    ) -> None:
+        """Invalidate what a change stream event touched."""
+        operation = change.get("operationType")
+        doc_id = (change.get("documentKey") or {}).get("_id")
+        if operation in ("insert", "update", "replace", "delete") and doc_id is not None:
+            self.invalidate(doc_id)
+        else:
+            # drop, rename, invalidate, ...
+            self.invalidate()
+
+
+    async def _poll_version(self) -> None:
+        """Drop the cache whenever the shared version counter moves or it gets too old."""
+        self.mode = MODE_POLLING
+        self._dropped_at = time.monotonic()
+        while True:
+            # Out-of-band writes (scripts, mongosh) do not bump the counter
+            if (
+                self.max_age_seconds > 0
+                and time.monotonic() - self._dropped_at >= self.max_age_seconds
+            ):
+                logger.debug(
+                    f"Cache for '{self.collection_name}' reached max age "
+                    f"{self.max_age_seconds}s, reloading"
+                )
+                self.invalidate()
+                self._dropped_at = time.monotonic()
+
+            try:
+                versions = await self._get_version_collection()
+                doc = await versions.find_one({"_id": self.collection_name})
+                version = doc.get("version", 0) if doc else 0
+                if version != self._seen_version:
+                    # On the first poll we cannot tell what was written since
+                    # the cache was loaded, so drop it once
+                    if self._seen_version is not None:
+                        logger.debug(
+                            f"Collection '{self.collection_name}' changed remotely "
+                            f"(version {self._seen_version} -> {version})"
+                        )
+                    self.invalidate()
+                    self._dropped_at = time.monotonic()
+                self._seen_version = version
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to poll cache version for '{self.collection_name}': {e}")
+
+            await asyncio.sleep(self.poll_interval_seconds)
+
+
+    async def _get_version_collection(self) -> AsyncIOMotorCollection:
+        """Get the shared version counter collection."""
+        if self._version_collection is None:
+            db = await get_documentdb_client()
+            self._version_collection = db[get_collection_name(VERSION_COLLECTION_BASE_NAME)]
+        return self._version_collection
+
+
+# All caches created in this process, for stats and shutdown
+_caches: list = []
+
+
+def get_collection_cache_stats() -> list:
+    """Return statistics for every collection cache."""
+    return [cache.get_stats() for cache in _caches]
+
+
+async def stop_collection_caches() -> None:
+    """Stop the background coherence tasks of all collection caches."""
+    for cache in _caches:
+        await cache.stop()
@@ -8,6 +8,7 @@ from motor.motor_asyncio import AsyncIOMotorCollection
 
 from ..interfaces import ScopeRepositoryBase
 from .client import get_collection_name, get_documentdb_client
+from .collection_cache import CollectionCache
 
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         self._collection: Optional[AsyncIOMotorCollection] = None
         self._collection_name = get_collection_name("mcp_scopes")
         self._scopes_cache: Dict[str, Any] = {}
+        self._cache = CollectionCache(self._collection_name)
 
 
     async def _get_collection(self) -> AsyncIOMotorCollection:
@@ -36,13 +38,13 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            cursor = collection.find({})
+            docs = await self._cache.get_all(collection)
             self._scopes_cache = {
                 "UI-Scopes": {},
                 "group_mappings": {},
             }
 
-            async for doc in cursor:
+            for doc in docs.values():
                 scope_name = doc.get("_id")
 
                 # UI permissions: scope_name -> ui_permissions
@@ -71,12 +73,12 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         self,
         group_name: str,
     ) -> Dict[str, Any]:
-        """Get UI scopes for a Keycloak group - queries DocumentDB directly."""
-        logger.debug(f"DocumentDB READ: Getting UI scopes for group '{group_name}' from DB")
+        """Get UI scopes for a Keycloak group - served from the collection cache."""
+        logger.debug(f"DocumentDB READ: Getting UI scopes for group '{group_name}'")
         collection = await self._get_collection()
 
         try:
-            group_doc = await collection.find_one({"_id": group_name})
+            group_doc = await self._cache.get(collection, group_name)
             if not group_doc:
                 logger.debug(f"DocumentDB READ: Group '{group_name}' not found")
                 return {}
@@ -101,13 +103,16 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
 
         This method finds all scopes where the given group appears in group_mappings.
         """
-        logger.debug(f"DocumentDB READ: Getting group mappings for '{keycloak_group}' from DB")
+        logger.debug(f"DocumentDB READ: Getting group mappings for '{keycloak_group}'")
         collection = await self._get_collection()
 
         try:
             # Find all scope documents where group_mappings array contains this group
-            cursor = collection.find({"group_mappings": keycloak_group})
-            scope_names = [doc["_id"] async for doc in cursor]
+            matching = await self._cache.find(
+                collection,
+                lambda doc: keycloak_group in (doc.get("group_mappings") or []),
+            )
+            scope_names = list(matching)
 
             logger.debug(
                 f"DocumentDB READ: Found {len(scope_names)} scopes for group "
@@ -123,13 +128,13 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         self,
         scope_name: str,
     ) -> List[Dict[str, Any]]:
-        """Get server access rules for a scope - queries DocumentDB directly."""
-        logger.debug(f"DocumentDB READ: Getting server access rules for scope '{scope_name}' from DB")
+        """Get server access rules for a scope - served from the collection cache."""
+        logger.debug(f"DocumentDB READ: Getting server access rules for scope '{scope_name}'")
         collection = await self._get_collection()
 
         try:
             # Find the group document that contains this scope
-            group_doc = await collection.find_one({"_id": scope_name})
+            group_doc = await self._cache.get(collection, scope_name)
             if not group_doc:
                 logger.debug(f"DocumentDB READ: Scope '{scope_name}' not found")
                 return []
@@ -193,6 +198,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write()
 
             self._scopes_cache.setdefault(scope_name, []).append(server_entry)
 
@@ -227,6 +233,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write()
 
             if scope_name in self._scopes_cache:
                 self._scopes_cache[scope_name] = [
@@ -262,6 +269,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
             }
 
             await collection.insert_one(doc)
+            await self._cache.record_write(group_name)
 
             self._scopes_cache.setdefault("UI-Scopes", {})[group_name] = {}
             self._scopes_cache.setdefault("group_mappings", {})[group_name] = []
@@ -283,6 +291,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
             collection = await self._get_collection()
 
             result = await collection.delete_one({"_id": group_name})
+            await self._cache.record_write(group_name)
 
             if result.deleted_count == 0:
                 logger.error(f"Group '{group_name}' not found")
@@ -306,7 +315,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            group_doc = await collection.find_one({"_id": group_name})
+            group_doc = await self._cache.get(collection, group_name)
             if not group_doc:
                 return None
 
@@ -322,9 +331,8 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            cursor = collection.find({})
             groups = {}
-            async for doc in cursor:
+            for doc in (await self._cache.get_all(collection)).values():
                 group_name = doc.get("_id")
                 server_count = len(doc.get("server_access", []))
                 groups[group_name] = {
@@ -346,8 +354,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            count = await collection.count_documents({"_id": group_name})
-            return count > 0
+            return await self._cache.get(collection, group_name) is not None
         except Exception as e:
             logger.error(f"Error checking group existence in DocumentDB: {e}", exc_info=True)
             return False
@@ -373,6 +380,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(group_name)
 
             if result.matched_count == 0:
                 logger.error(f"Group '{group_name}' not found")
@@ -405,6 +413,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(group_name)
 
             if result.matched_count == 0:
                 logger.error(f"Group '{group_name}' not found")
@@ -437,6 +446,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(group_name)
 
             if result.matched_count == 0:
                 logger.error(f"Group '{group_name}' not found")
@@ -469,6 +479,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(group_name)
 
             if result.matched_count == 0:
                 logger.error(f"Group '{group_name}' not found")
@@ -486,9 +497,8 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            cursor = collection.find({})
             mappings = {}
-            async for doc in cursor:
+            for doc in (await self._cache.get_all(collection)).values():
                 group_name = doc.get("_id")
                 mappings[group_name] = doc.get("group_mappings", [])
             return mappings
@@ -543,6 +553,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write()
 
             for scope_name in list(self._scopes_cache.keys()):
                 if scope_name not in ["UI-Scopes", "group_mappings"]:
@@ -608,6 +619,7 @@ class DocumentDBScopeRepository(ScopeRepositoryBase):
                 group_doc,
                 upsert=True
             )
+            await self._cache.record_write(group_name)
 
             # Update in-memory cache
             self._scopes_cache.setdefault("UI-Scopes", {})[group_name] = ui_permissions
@@ -1,12 +1,17 @@
 """DocumentDB-based repository for hybrid search (text + vector)."""
 
+import asyncio
 import logging
 import re
+import time
 from typing import Any
 
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReplaceOne
 
 from ...core.config import embedding_config, settings
+from ...embeddings import QueryEmbeddingCache
 from ...schemas.agent_models import AgentCard
 from ..interfaces import SearchRepositoryBase
 from .client import get_collection_name, get_documentdb_client
@@ -62,6 +67,151 @@ def _tokens_match_text(
     return any(token in text_lower for token in tokens)
 
 
+def _calculate_text_boost(
+    doc: dict[str, Any],
+    query_tokens: list[str],
+) -> tuple[float, list[dict[str, Any]]]:
+    """Compute the keyword boost and matching tools for a search document.
+
+    Args:
+        doc: Search document
+        query_tokens: Tokens from _tokenize_query
+
+    Returns:
+        Tuple of (text boost, matching tool entries)
+    """
+    text_boost = 0.0
+    name = doc.get("name", "")
+    description = doc.get("description", "")
+    tags = doc.get("tags", [])
+    tools = doc.get("tools", [])
+    matching_tools = []
+
+    # Token-based matching for text boost
+    # Check path match first (highest priority - user explicitly named the server)
+    path = doc.get("path", "")
+    server_name_matched = False
+    if path and _tokens_match_text(query_tokens, path):
+        text_boost += 5.0
+        server_name_matched = True
+    if name and _tokens_match_text(query_tokens, name):
+        text_boost += 3.0
+        server_name_matched = True
+    if description and _tokens_match_text(query_tokens, description):
+        text_boost += 2.0
+    # Check if any token matches any tag
+    if tags and any(_tokens_match_text(query_tokens, tag) for tag in tags):
+        text_boost += 1.5
+
+    # Check if any token matches any tool name or description
+    for tool in tools:
+        tool_name = tool.get("name", "")
+        tool_desc = tool.get("description") or ""
+        tool_matched = _tokens_match_text(query_tokens, tool_name) or \
+            _tokens_match_text(query_tokens, tool_desc)
+
+        if tool_matched:
+            text_boost += 1.0
+            matching_tools.append({
+                "tool_name": tool_name,
+                "description": tool_desc,
+                "relevance_score": 1.0,
+                "match_context": tool_desc or f"Tool: {tool_name}"
+            })
+        elif server_name_matched:
+            # If server name/path matched, include all tools with base score
+            matching_tools.append({
+                "tool_name": tool_name,
+                "description": tool_desc,
+                "relevance_score": 0.8,
+                "match_context": tool_desc or f"Tool: {tool_name}"
+            })
+
+    return text_boost, matching_tools
+
+
+class _ClientSideSearchIndex:
+    """Snapshot of all search documents with their embeddings as one matrix.
+
+    Used by the MongoDB CE fallback so each query is a single matrix-vector
+    product instead of a per-document cosine computation. Documents are kept
+    without their embedding; rows for documents with a missing or
+    wrong-sized embedding are zero and score 0.0, as before.
+    """
+
+    def __init__(
+        self,
+        docs: list[dict[str, Any]],
+        dimension: int,
+        version: int,
+    ):
+        self.version = version
+        self.dimension = dimension
+        self.built_at = time.monotonic()
+        self.docs = docs
+
+        self.matrix = np.zeros((len(docs), dimension), dtype=np.float32)
+        rows = []
+        vectors = []
+        for row, doc in enumerate(docs):
+            embedding = doc.pop("embedding", None)
+            if embedding and len(embedding) == dimension:
+                rows.append(row)
+                vectors.append(embedding)
+        if rows:
+            self.matrix[rows] = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        np.divide(self.matrix, norms, out=self.matrix, where=norms > 0)
+
+        self.entity_types = np.array(
+            [doc.get("entity_type") or "" for doc in docs], dtype=object
+        )
+
+        # Lower-cased searchable fields of every document in one string, so a
+        # query's keyword matches are found with one regex scan. Tokens are
+        # word characters only, so a match never spans a separator.
+        texts = []
+        for doc in docs:
+            parts = [doc.get("path") or "", doc.get("name") or "", doc.get("description") or ""]
+            parts.extend(tag for tag in doc.get("tags") or [] if isinstance(tag, str))
+            for tool in doc.get("tools") or []:
+                parts.append(tool.get("name") or "")
+                parts.append(tool.get("description") or "")
+            texts.append("\n".join(parts).lower())
+        self._corpus = "\x00".join(texts)
+        self._offsets = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def vector_scores(
+        self,
+        query_embedding: list[float],
+    ) -> np.ndarray:
+        """Cosine similarity of the query against every document."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if query.shape != (self.dimension,) or norm == 0:
+            return np.zeros(len(self.docs), dtype=np.float32)
+        return self.matrix @ (query / norm)
+
+    def keyword_match_mask(
+        self,
+        query_tokens: list[str],
+    ) -> np.ndarray:
+        """Mark documents where any query token appears in a searchable field."""
+        mask = np.zeros(len(self.docs), dtype=bool)
+        if not query_tokens or not self.docs:
+            return mask
+        pattern = re.compile("|".join(re.escape(token) for token in query_tokens))
+        positions = np.fromiter(
+            (match.start() for match in pattern.finditer(self._corpus)), dtype=np.int64
+        )
+        if positions.size:
+            mask[np.searchsorted(self._offsets, positions, side="right") - 1] = True
+        return mask
+
+
 # Maximum possible text_boost sum for lexical scoring normalization
 # path(5.0) + name(3.0) + description(2.0) + tag(1.5) + tool(1.0) = 12.5
 MAX_LEXICAL_BOOST: float = 12.5
@@ -267,6 +417,14 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
         )
         self._embedding_model = None
         self._embedding_unavailable: bool = False
+        self._query_cache = QueryEmbeddingCache(
+            max_entries=settings.query_embedding_cache_max_entries,
+            ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+        )
+        # Client-side search snapshot, rebuilt when _search_version moves on
+        self._search_version: int = 0
+        self._client_side_index: _ClientSideSearchIndex | None = None
+        self._client_side_lock = asyncio.Lock()
 
 
     async def _get_collection(self) -> AsyncIOMotorCollection:
@@ -290,6 +448,15 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
                 api_base=settings.embeddings_api_base,
                 aws_region=settings.embeddings_aws_region,
                 embedding_dimension=settings.embeddings_model_dimensions,
+                embeddings_cache_dir=settings.embeddings_cache_dir
+                if settings.embeddings_cache_enabled
+                else None,
+                embeddings_cache_max_entries=settings.embeddings_cache_max_entries
+                if settings.embeddings_cache_enabled
+                else None,
+                embeddings_cache_max_disk_entries=settings.embeddings_cache_max_disk_entries
+                if settings.embeddings_cache_enabled
+                else None,
             )
         return self._embedding_model
 
@@ -347,15 +514,13 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             logger.error(f"Failed to initialize search indexes: {e}", exc_info=True)
 
 
-    async def index_server(
+    def _build_server_document(
         self,
         path: str,
         server_info: dict[str, Any],
-        is_enabled: bool = False,
-    ) -> None:
-        """Index a server for search."""
-        collection = await self._get_collection()
-
+        is_enabled: bool,
+    ) -> dict[str, Any]:
+        """Build the search document for a server, without its embedding."""
         text_parts = [
             server_info.get("server_name", ""),
             server_info.get("description", ""),
@@ -371,18 +536,7 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
 
         text_for_embedding = " ".join(filter(None, text_parts))
 
-        try:
-            model = await self._get_embedding_model()
-            embedding = model.encode([text_for_embedding])[0].tolist()
-        except Exception as e:
-            logger.warning(
-                "Embedding model unavailable, indexing '%s' without embeddings: %s",
-                server_info.get("server_name", path),
-                e,
-            )
-            embedding = []
-
-        doc = {
+        return {
             "_id": path,
             "entity_type": "mcp_server",
             "path": path,
@@ -391,7 +545,7 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             "tags": server_info.get("tags", []),
             "is_enabled": is_enabled,
             "text_for_embedding": text_for_embedding,
-            "embedding": embedding,
+            "embedding": [],
             "embedding_metadata": embedding_config.get_embedding_metadata(),
             "tools": [
                 {
@@ -406,26 +560,14 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             "indexed_at": server_info.get("updated_at", server_info.get("registered_at"))
         }
 
-        try:
-            await collection.replace_one(
-                {"_id": path},
-                doc,
-                upsert=True
-            )
-            logger.info(f"Indexed server '{server_info.get('server_name')}' for search")
-        except Exception as e:
-            logger.error(f"Failed to index server in search: {e}", exc_info=True)
 
-
-    async def index_agent(
+    def _build_agent_document(
         self,
         path: str,
         agent_card: AgentCard,
-        is_enabled: bool = False,
-    ) -> None:
-        """Index an agent for search."""
-        collection = await self._get_collection()
-
+        is_enabled: bool,
+    ) -> dict[str, Any]:
+        """Build the search document for an agent, without its embedding."""
         text_parts = [
             agent_card.name,
             agent_card.description or "",
@@ -448,18 +590,7 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
 
         text_for_embedding = " ".join(filter(None, text_parts))
 
-        try:
-            model = await self._get_embedding_model()
-            embedding = model.encode([text_for_embedding])[0].tolist()
-        except Exception as e:
-            logger.warning(
-                "Embedding model unavailable, indexing agent '%s' without embeddings: %s",
-                agent_card.name,
-                e,
-            )
-            embedding = []
-
-        doc = {
+        return {
             "_id": path,
             "entity_type": "a2a_agent",
             "path": path,
@@ -468,13 +599,68 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             "tags": agent_card.tags or [],
             "is_enabled": is_enabled,
             "text_for_embedding": text_for_embedding,
-            "embedding": embedding,
+            "embedding": [],
             "embedding_metadata": embedding_config.get_embedding_metadata(),
             "capabilities": agent_card.capabilities or [],
             "metadata": agent_card.model_dump(mode="json"),
             "indexed_at": agent_card.updated_at or agent_card.registered_at
         }
 
+
+    async def index_server(
+        self,
+        path: str,
+        server_info: dict[str, Any],
+        is_enabled: bool = False,
+    ) -> None:
+        """Index a server for search."""
+        collection = await self._get_collection()
+
+        doc = self._build_server_document(path, server_info, is_enabled)
+
+        try:
+            model = await self._get_embedding_model()
+            doc["embedding"] = model.encode([doc["text_for_embedding"]])[0].tolist()
+        except Exception as e:
+            logger.warning(
+                "Embedding model unavailable, indexing '%s' without embeddings: %s",
+                server_info.get("server_name", path),
+                e,
+            )
+
+        try:
+            await collection.replace_one(
+                {"_id": path},
+                doc,
+                upsert=True
+            )
+            logger.info(f"Indexed server '{server_info.get('server_name')}' for search")
+        except Exception as e:
+            logger.error(f"Failed to index server in search: {e}", exc_info=True)
+        self._invalidate_client_side_index()
+
+
+    async def index_agent(
+        self,
+        path: str,
+        agent_card: AgentCard,
+        is_enabled: bool = False,
+    ) -> None:
+        """Index an agent for search."""
+        collection = await self._get_collection()
+
+        doc = self._build_agent_document(path, agent_card, is_enabled)
+
+        try:
+            model = await self._get_embedding_model()
+            doc["embedding"] = model.encode([doc["text_for_embedding"]])[0].tolist()
+        except Exception as e:
+            logger.warning(
+                "Embedding model unavailable, indexing agent '%s' without embeddings: %s",
+                agent_card.name,
+                e,
+            )
+
         try:
             await collection.replace_one(
                 {"_id": path},
@@ -484,6 +670,103 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             logger.info(f"Indexed agent '{agent_card.name}' for search")
         except Exception as e:
             logger.error(f"Failed to index agent in search: {e}", exc_info=True)
+        self._invalidate_client_side_index()
+
+
+    async def bulk_index(
+        self,
+        entities: list[dict[str, Any]],
+    ) -> int:
+        """Index many servers and agents with batched encoding and bulk writes.
+
+        Existing embeddings are reused for documents whose embedding text is
+        unchanged. Remaining texts are encoded in batches of
+        ``embeddings_batch_size`` and each batch is upserted with a single
+        ``bulk_write``.
+
+        Args:
+            entities: List of dicts with "path", "entity_type", "info" and "is_enabled"
+
+        Returns:
+            Number of entities that were (re-)embedded
+        """
+        if not entities:
+            return 0
+
+        collection = await self._get_collection()
+
+        docs: list[dict[str, Any]] = []
+        for entity in entities:
+            path = entity["path"]
+            is_enabled = entity.get("is_enabled", False)
+            info = entity["info"]
+            if entity.get("entity_type") == "a2a_agent":
+                if not isinstance(info, AgentCard):
+                    info = AgentCard(**info)
+                docs.append(self._build_agent_document(path, info, is_enabled))
+            else:
+                docs.append(self._build_server_document(path, info, is_enabled))
+
+        # Reuse stored embeddings where the text has not changed
+        existing: dict[str, dict[str, Any]] = {}
+        try:
+            cursor = collection.find(
+                {"_id": {"$in": [doc["_id"] for doc in docs]}},
+                {"_id": 1, "text_for_embedding": 1, "embedding": 1},
+            )
+            for existing_doc in await cursor.to_list(length=None):
+                existing[existing_doc["_id"]] = existing_doc
+        except Exception as e:
+            logger.warning(f"Could not load existing embeddings for bulk index: {e}")
+
+        to_embed: list[dict[str, Any]] = []
+        for doc in docs:
+            previous = existing.get(doc["_id"])
+            if (
+                previous
+                and previous.get("embedding")
+                and previous.get("text_for_embedding") == doc["text_for_embedding"]
+            ):
+                doc["embedding"] = previous["embedding"]
+            else:
+                to_embed.append(doc)
+
+        batch_size = max(1, settings.embeddings_batch_size)
+        embedded_count = 0
+        try:
+            model = await self._get_embedding_model()
+            for start in range(0, len(to_embed), batch_size):
+                batch = to_embed[start:start + batch_size]
+                embeddings = await asyncio.to_thread(
+                    model.encode,
+                    [doc["text_for_embedding"] for doc in batch],
+                )
+                for doc, embedding in zip(batch, embeddings):
+                    doc["embedding"] = embedding.tolist()
+                embedded_count += len(batch)
+        except Exception as e:
+            logger.warning(
+                "Embedding model unavailable, bulk indexing %d entities without embeddings: %s",
+                len(to_embed) - embedded_count,
+                e,
+            )
+
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start:start + batch_size]
+            try:
+                await collection.bulk_write(
+                    [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch],
+                    ordered=False,
+                )
+            except Exception as e:
+                logger.error(f"Failed to bulk index {len(batch)} entities: {e}", exc_info=True)
+        self._invalidate_client_side_index()
+
+        logger.info(
+            f"Bulk indexed {len(docs)} entities for search "
+            f"({embedded_count} embedded, {len(docs) - len(to_embed)} unchanged)"
+        )
+        return embedded_count
 
 
     def _calculate_cosine_similarity(
@@ -525,30 +808,38 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
                 logger.warning(f"Entity '{path}' not found in search index")
         except Exception as e:
             logger.error(f"Failed to remove entity from search index: {e}", exc_info=True)
+        self._invalidate_client_side_index()
 
 
-    async def _client_side_search(
-        self,
-        query: str,
-        query_embedding: list[float],
-        entity_types: list[str] | None = None,
-        max_results: int = 10,
-    ) -> dict[str, list[dict[str, Any]]]:
-        """Fallback search using client-side cosine similarity for MongoDB CE.
+    def _invalidate_client_side_index(self) -> None:
+        """Mark the client-side search snapshot as stale after a write."""
+        self._search_version += 1
 
-        This method is used when MongoDB doesn't support native vector search.
-        It fetches all embeddings from the database and computes similarity locally.
-        """
-        collection = await self._get_collection()
 
-        try:
-            # Build query filter
-            query_filter = {}
-            if entity_types:
-                query_filter["entity_type"] = {"$in": entity_types}
+    async def _get_client_side_index(
+        self,
+        dimension: int,
+    ) -> _ClientSideSearchIndex:
+        """Return the client-side search snapshot, reloading it if stale.
 
-            # Fetch all embeddings from MongoDB
-            cursor = collection.find(query_filter, {
+        The snapshot is reloaded after local writes, when the query dimension
+        changes, and after documentdb_client_search_cache_ttl_seconds so
+        writes from other registry instances are picked up.
+        """
+        async with self._client_side_lock:
+            index = self._client_side_index
+            if (
+                index is not None
+                and index.version == self._search_version
+                and index.dimension == dimension
+                and time.monotonic() - index.built_at
+                < settings.documentdb_client_search_cache_ttl_seconds
+            ):
+                return index
+
+            version = self._search_version
+            collection = await self._get_collection()
+            cursor = collection.find({}, {
                 "_id": 1,
                 "path": 1,
                 "entity_type": 1,
@@ -560,70 +851,60 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
                 "is_enabled": 1,
                 "embedding": 1
             })
-
             all_docs = await cursor.to_list(length=None)
-            logger.info(f"Client-side search: Retrieved {len(all_docs)} documents with embeddings")
+            index = await asyncio.to_thread(_ClientSideSearchIndex, all_docs, dimension, version)
+            self._client_side_index = index
+            logger.info(f"Client-side search: Loaded {len(index)} documents into embedding matrix")
+            return index
+
+
+    async def _client_side_search(
+        self,
+        query: str,
+        query_embedding: list[float],
+        entity_types: list[str] | None = None,
+        max_results: int = 10,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Fallback search using client-side cosine similarity for MongoDB CE.
+
+        This method is used when MongoDB doesn't support native vector search.
+        All embeddings are cached as one normalized matrix, so vector scores
+        for every document come from a single matrix-vector product. Only
+        documents that match a query keyword, plus the top vector matches of
+        each entity type, are scored in full.
+        """
+        try:
+            index = await self._get_client_side_index(len(query_embedding))
 
             # Tokenize query for keyword matching
             query_tokens = _tokenize_query(query)
             logger.debug(f"Client-side search tokens: {query_tokens}")
 
-            # Calculate cosine similarity for each document
+            vector_scores = index.vector_scores(query_embedding)
+            if entity_types:
+                type_mask = np.isin(index.entity_types, entity_types)
+            else:
+                type_mask = np.ones(len(index), dtype=bool)
+
+            # Documents without a keyword match have no text boost, so only the
+            # best 3 of each type by vector score can reach the results
+            keyword_mask = index.keyword_match_mask(query_tokens) & type_mask
+            candidate_rows = [np.flatnonzero(keyword_mask)]
+            for entity_type in ("mcp_server", "a2a_agent", "mcp_tool"):
+                rows = np.flatnonzero(
+                    type_mask & ~keyword_mask & (index.entity_types == entity_type)
+                )
+                if rows.size > 3:
+                    rows = rows[np.argpartition(-vector_scores[rows], 2)[:3]]
+                candidate_rows.append(rows)
+
             scored_docs = []
-            for doc in all_docs:
-                embedding = doc.get("embedding", [])
-                if not embedding:
-                    vector_score = 0.0
-                else:
-                    vector_score = self._calculate_cosine_similarity(query_embedding, embedding)
-
-                # Add text-based boost using tokenized matching
-                text_boost = 0.0
-                name = doc.get("name", "")
-                description = doc.get("description", "")
-                tags = doc.get("tags", [])
-                tools = doc.get("tools", [])
-                matching_tools = []
-
-                # Token-based matching for text boost
-                # Check path match first (highest priority - user explicitly named the server)
-                path = doc.get("path", "")
-                server_name_matched = False
-                if path and _tokens_match_text(query_tokens, path):
-                    text_boost += 5.0
-                    server_name_matched = True
-                if name and _tokens_match_text(query_tokens, name):
-                    text_boost += 3.0
-                    server_name_matched = True
-                if description and _tokens_match_text(query_tokens, description):
-                    text_boost += 2.0
-                # Check if any token matches any tag
-                if tags and any(_tokens_match_text(query_tokens, tag) for tag in tags):
-                    text_boost += 1.5
-
-                # Check if any token matches any tool name or description
-                for tool in tools:
-                    tool_name = tool.get("name", "")
-                    tool_desc = tool.get("description") or ""
-                    tool_matched = _tokens_match_text(query_tokens, tool_name) or \
-                        _tokens_match_text(query_tokens, tool_desc)
-
-                    if tool_matched:
-                        text_boost += 1.0
-                        matching_tools.append({
-                            "tool_name": tool_name,
-                            "description": tool_desc,
-                            "relevance_score": 1.0,
-                            "match_context": tool_desc or f"Tool: {tool_name}"
-                        })
-                    elif server_name_matched:
-                        # If server name/path matched, include all tools with base score
-                        matching_tools.append({
-                            "tool_name": tool_name,
-                            "description": tool_desc,
-                            "relevance_score": 0.8,
-                            "match_context": tool_desc or f"Tool: {tool_name}"
-                        })
+            for row in np.concatenate(candidate_rows):
+                # Copy so per-query fields never leak into the cached snapshot
+                doc = dict(index.docs[row])
+                vector_score = float(vector_scores[row])
+
+                text_boost, matching_tools = _calculate_text_boost(doc, query_tokens)
 
                 # Store matching tools for later use
                 doc["_matching_tools"] = matching_tools
@@ -763,7 +1044,7 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
                 f"{len(grouped_results['servers'])} servers, "
                 f"{len(grouped_results['tools'])} tools, "
                 f"{len(grouped_results['agents'])} agents "
-                f"from {len(all_docs)} total documents (top 3 per type)"
+                f"from {len(index)} total documents (top 3 per type)"
             )
 
             return grouped_results
@@ -933,6 +1214,11 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
         return grouped_results
 
 
+    def get_query_cache_stats(self) -> dict[str, Any]:
+        """Return query embedding cache statistics."""
+        return self._query_cache.get_stats()
+
+
     async def search(
         self,
         query: str,
@@ -953,7 +1239,8 @@ class DocumentDBSearchRepository(SearchRepositoryBase):
             if not self._embedding_unavailable:
                 try:
                     model = await self._get_embedding_model()
-                    query_embedding = model.encode([query])[0].tolist()
+                    embedding = await self._query_cache.encode(model, query)
+                    query_embedding = embedding.tolist()
                 except Exception as embed_error:
                     logger.warning(
                         "Embedding model unavailable, falling back to lexical-only search: %s",
@@ -10,6 +10,7 @@ from pymongo.errors import DuplicateKeyError
 from ...core.config import settings
 from ..interfaces import ServerRepositoryBase
 from .client import get_collection_name, get_documentdb_client
+from .collection_cache import CollectionCache
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
     def __init__(self):
         self._collection: Optional[AsyncIOMotorCollection] = None
         self._collection_name = get_collection_name("mcp_servers")
+        self._cache = CollectionCache(self._collection_name)
 
 
     async def _get_collection(self) -> AsyncIOMotorCollection:
@@ -37,7 +39,8 @@ class DocumentDBServerRepository(ServerRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            count = await collection.count_documents({})
+            # Warm the read cache (and start its change stream / version poll)
+            count = len(await self._cache.get_all(collection))
             logger.info(f"Loaded {count} servers from DocumentDB")
         except Exception as e:
             logger.error(f"Error loading servers from DocumentDB: {e}", exc_info=True)
@@ -52,7 +55,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            server_info = await collection.find_one({"_id": path})
+            server_info = await self._cache.get(collection, path)
             if server_info:
                 server_info["path"] = server_info.pop("_id")
                 logger.debug(f"DocumentDB READ: Found server '{server_info.get('server_name', 'unknown')}' at '{path}'")
@@ -70,10 +73,9 @@ class DocumentDBServerRepository(ServerRepositoryBase):
         collection = await self._get_collection()
 
         try:
-            cursor = collection.find({})
             servers = {}
-            async for doc in cursor:
-                path = doc.pop("_id")
+            for path, doc in (await self._cache.get_all(collection)).items():
+                doc.pop("_id")
                 doc["path"] = path
                 servers[path] = doc
             logger.info(f"DocumentDB READ: Retrieved {len(servers)} servers from collection '{self._collection_name}'")
@@ -83,6 +85,26 @@ class DocumentDBServerRepository(ServerRepositoryBase):
             return {}
 
 
+    async def get_enabled_servers_with_info(self) -> Dict[str, Dict[str, Any]]:
+        """List enabled servers keyed by path, with their info."""
+        collection = await self._get_collection()
+
+        try:
+            servers = {}
+            enabled_docs = await self._cache.find(
+                collection, lambda doc: doc.get("is_enabled", False)
+            )
+            for path, doc in enabled_docs.items():
+                doc.pop("_id")
+                doc["path"] = path
+                servers[path] = doc
+            logger.debug(f"DocumentDB READ: Retrieved {len(servers)} enabled servers from collection '{self._collection_name}'")
+            return servers
+        except Exception as e:
+            logger.error(f"Error listing enabled servers from DocumentDB: {e}", exc_info=True)
+            return {}
+
+
     async def create(
         self,
         server_info: Dict[str, Any],
@@ -102,6 +124,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
             doc.pop("path", None)
 
             await collection.insert_one(doc)
+            await self._cache.record_write(path)
             logger.info(f"DocumentDB WRITE: Created server '{server_info['server_name']}' at '{path}'")
             return True
         except DuplicateKeyError:
@@ -131,6 +154,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
                 {"_id": path},
                 {"$set": doc}
             )
+            await self._cache.record_write(path)
 
             if result.matched_count == 0:
                 logger.error(f"Server at '{path}' not found in DocumentDB")
@@ -160,6 +184,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
             server_name = server_doc.get("server_name", "Unknown")
 
             result = await collection.delete_one({"_id": path})
+            await self._cache.record_write(path)
 
             if result.deleted_count == 0:
                 logger.error(f"Failed to delete server at '{path}'")
@@ -203,6 +228,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
             }
 
             result = await collection.delete_many(filter_query)
+            await self._cache.record_write()
             deleted_count = result.deleted_count
 
             if deleted_count == 0:
@@ -258,6 +284,7 @@ class DocumentDBServerRepository(ServerRepositoryBase):
                     }
                 }
             )
+            await self._cache.record_write(path)
 
             if result.matched_count == 0:
                 logger.error(f"Server at '{path}' not found")
@@ -32,6 +32,10 @@ class FaissSearchRepository(SearchRepositoryBase):
             is_enabled=is_enabled
         )
 
+    async def bulk_index(self, entities: List[Dict[str, Any]]) -> int:
+        """Add or update many entities in FAISS index using batched encoding."""
+        return await self.faiss_service.bulk_index(entities)
+
     async def remove_entity(self, entity_path: str) -> None:
         """Remove entity from FAISS index."""
         await self.faiss_service.remove_entity(entity_path)
@@ -58,6 +62,10 @@ class FaissSearchRepository(SearchRepositoryBase):
             max_results=max_results
         )
 
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Return query embedding cache statistics from the FAISS service."""
+        return self.faiss_service.query_cache.get_stats()
+
     async def rebuild_index(self) -> None:
         """Rebuild FAISS index from scratch."""
         await self.faiss_service.rebuild_index()
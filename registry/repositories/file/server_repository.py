@@ -157,6 +157,14 @@ class FileServerRepository(ServerRepositoryBase):
         """List all servers."""
         return self._servers.copy()
 
+    async def get_enabled_servers_with_info(self) -> Dict[str, Dict[str, Any]]:
+        """List enabled servers keyed by path, with their info."""
+        return {
+            path: server_info
+            for path, server_info in self._servers.items()
+            if await self.get_state(path)
+        }
+
     async def create(
         self,
         server_info: Dict[str, Any],
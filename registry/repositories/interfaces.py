@@ -27,6 +27,11 @@ class ServerRepositoryBase(ABC):
         """List all servers."""
         pass
 
+    @abstractmethod
+    async def get_enabled_servers_with_info(self) -> Dict[str, Dict[str, Any]]:
+        """List enabled servers keyed by path, with their info, in a single read."""
+        pass
+
     @abstractmethod
     async def create(
         self,
@@ -643,6 +648,27 @@ class SearchRepositoryBase(ABC):
         """Index an agent for search."""
         pass
 
+    @abstractmethod
+    async def bulk_index(
+        self,
+        entities: List[Dict[str, Any]],
+    ) -> int:
+        """Index many servers and agents in batches.
+
+        Entities whose embedding text is unchanged are not re-embedded.
+
+        Args:
+            entities: List of dicts with keys:
+                - path: Entity path
+                - entity_type: "mcp_server" or "a2a_agent"
+                - info: Server info dict (servers) or AgentCard (agents)
+                - is_enabled: Whether the entity is enabled
+
+        Returns:
+            Number of entities that were (re-)embedded
+        """
+        pass
+
     @abstractmethod
     async def remove_entity(
         self,
@@ -661,6 +687,11 @@ class SearchRepositoryBase(ABC):
         """Perform search."""
         pass
 
+    @abstractmethod
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Return query embedding cache statistics (hits, misses, size)."""
+        pass
+
 
 class FederationConfigRepositoryBase(ABC):
     """Abstract base class for federation configuration storage."""
@@ -0,0 +1,177 @@
+"""
+FAISS index factory for exact and approximate nearest-neighbour search.
+
+The authoritative index is always ``IndexIDMap(IndexFlatIP)``: it supports
+``remove_ids`` and is the on-disk format mcpgw reads. Approximate indexes
+(HNSW, IVF-PQ) are derived from it and used only to serve searches.
+
+Index types:
+    flat   Exact brute-force inner product search
+    hnsw   Graph-based search, no training, high recall
+    ivfpq  Inverted lists with product quantization, smallest memory footprint
+    auto   flat below a vector-count threshold, hnsw at or above it
+"""
+
+import logging
+import math
+from typing import Tuple
+
+import faiss
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq", "auto")
+
+# FAISS warns when training k-means with fewer than ~39 points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+# 8-bit PQ codebooks have 256 centroids per sub-quantizer
+_PQ_CODEBOOK_SIZE = 256
+
+
+def resolve_index_type(
+    configured_type: str,
+    ntotal: int,
+    ann_threshold: int,
+) -> str:
+    """
+    Resolve the configured index type to a concrete one for the current size.
+
+    Args:
+        configured_type: One of INDEX_TYPES
+        ntotal: Number of vectors in the index
+        ann_threshold: Vector count at which "auto" switches to HNSW
+
+    Returns:
+        "flat", "hnsw" or "ivfpq"
+
+    Raises:
+        ValueError: If configured_type is not supported
+    """
+    index_type = configured_type.lower()
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported FAISS index type: {configured_type}. "
+            f"Supported types: {', '.join(INDEX_TYPES)}"
+        )
+    if index_type == "auto":
+        return "hnsw" if ntotal >= ann_threshold else "flat"
+    if index_type == "ivfpq" and ntotal < _PQ_CODEBOOK_SIZE:
+        # Not enough vectors to train PQ codebooks yet
+        return "flat"
+    return index_type
+
+
+def extract_vectors(
+    index: "faiss.IndexIDMap",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copy the ids and vectors out of an ``IndexIDMap`` over a flat index.
+
+    Args:
+        index: ID-mapped flat index
+
+    Returns:
+        Tuple of (ids as int64 array, vectors as float32 matrix)
+    """
+    if index.ntotal == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, index.d), dtype=np.float32)
+    ids = faiss.vector_to_array(index.id_map).astype(np.int64)
+    vectors = index.index.reconstruct_n(0, index.ntotal)
+    return ids, np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def build_index(
+    vectors: np.ndarray,
+    ids: np.ndarray,
+    index_type: str,
+    hnsw_m: int = 32,
+    hnsw_ef_construction: int = 200,
+    hnsw_ef_search: int = 128,
+    ivf_nlist: int = 0,
+    ivf_nprobe: int = 16,
+    pq_m: int = 16,
+) -> "faiss.Index":
+    """
+    Build an ID-mapped inner-product index over normalized vectors.
+
+    This is CPU-bound and may take seconds for large inputs; call it from a
+    worker thread in async code.
+
+    Args:
+        vectors: Float32 matrix of shape (n, dimension)
+        ids: Int64 ids, one per row
+        index_type: "flat", "hnsw" or "ivfpq"
+        hnsw_m: HNSW graph degree
+        hnsw_ef_construction: HNSW build-time candidate list size
+        hnsw_ef_search: HNSW query-time candidate list size
+        ivf_nlist: Number of IVF lists (0 = 4 * sqrt(n), capped by training data)
+        ivf_nprobe: IVF lists visited per query
+        pq_m: PQ sub-quantizers (must divide the dimension)
+
+    Returns:
+        Populated ``IndexIDMap`` ready for search
+
+    Raises:
+        ValueError: If index_type is unknown or the parameters do not fit the data
+    """
+    n, dimension = vectors.shape
+
+    if index_type == "flat":
+        base = faiss.IndexFlatIP(dimension)
+    elif index_type == "hnsw":
+        base = faiss.IndexHNSWFlat(dimension, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        base.hnsw.efConstruction = hnsw_ef_construction
+        base.hnsw.efSearch = hnsw_ef_search
+    elif index_type == "ivfpq":
+        if dimension % pq_m != 0:
+            raise ValueError(
+                f"PQ sub-quantizers ({pq_m}) must divide the embedding dimension ({dimension})"
+            )
+        nlist = ivf_nlist or int(4 * math.sqrt(n))
+        nlist = max(1, min(nlist, n // _MIN_POINTS_PER_CENTROID))
+        quantizer = faiss.IndexFlatIP(dimension)
+        base = faiss.IndexIVFPQ(
+            quantizer, dimension, nlist, pq_m, 8, faiss.METRIC_INNER_PRODUCT
+        )
+        base.train(vectors)
+        base.nprobe = min(ivf_nprobe, nlist)
+    else:
+        raise ValueError(f"Unsupported FAISS index type: {index_type}")
+
+    index = faiss.IndexIDMap(base)
+    if n:
+        index.add_with_ids(vectors, ids)
+    logger.info(f"Built FAISS {index_type} index with {n} vectors (dimension {dimension})")
+    return index
+
+
+def make_search_params(
+    index: "faiss.Index",
+    index_type: str,
+    ids: np.ndarray,
+) -> "faiss.SearchParameters":
+    """
+    Build search parameters that restrict results to the given ids.
+
+    The index's own efSearch / nprobe settings are carried over, since
+    type-specific parameters replace them for the duration of the search.
+
+    Args:
+        index: ID-mapped index returned by build_index
+        index_type: "flat", "hnsw" or "ivfpq"
+        ids: Int64 ids that may appear in the results
+
+    Returns:
+        SearchParameters to pass as ``index.search(..., params=...)``
+    """
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(ids, dtype=np.int64))
+    if index_type == "hnsw":
+        base = faiss.downcast_index(index.index)
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=base.hnsw.efSearch)
+    if index_type == "ivfpq":
+        base = faiss.downcast_index(index.index)
+        return faiss.SearchParametersIVF(sel=selector, nprobe=base.nprobe)
+    return faiss.SearchParameters(sel=selector)
@@ -0,0 +1,227 @@
+"""
+Columnar view of the FAISS metadata store.
+
+``FaissService.metadata_store`` is keyed by path, but search results come
+back as FAISS ids. ``MetadataColumns`` keeps the id -> path reverse map and
+parallel arrays of ids, entity types and enabled flags up to date as entries
+are added and removed, so result lookup is O(1) per hit and entity/enabled
+filters are evaluated as NumPy masks instead of loops over metadata dicts.
+"""
+
+import logging
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+_INITIAL_CAPACITY = 64
+
+
+def entry_is_enabled(
+    entry: Dict[str, Any],
+) -> bool:
+    """Read the enabled flag from a server or agent metadata entry."""
+    payload = entry.get("full_server_info") or entry.get("full_agent_card") or {}
+    return bool(payload.get("is_enabled", False))
+
+
+class MetadataColumns:
+    """Reverse id -> path map with parallel id, entity type and enabled arrays."""
+
+    def __init__(self):
+        self._ids = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._type_codes = np.empty(_INITIAL_CAPACITY, dtype=np.int16)
+        self._enabled = np.empty(_INITIAL_CAPACITY, dtype=bool)
+        self._paths: List[str] = []
+        self._row_of: Dict[int, int] = {}
+        self._codes: Dict[str, int] = {}
+        # Incremented on every change so callers can cache derived selections
+        self.version: int = 0
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata_store: Dict[str, Dict[str, Any]],
+        id_to_path: Optional[Dict[Any, str]] = None,
+    ) -> "MetadataColumns":
+        """
+        Build the columns from a path-keyed metadata store.
+
+        Args:
+            metadata_store: {path: {"id", "entity_type", "full_server_info" | "full_agent_card", ...}}
+            id_to_path: Persisted id -> path map saved with the metadata, if any.
+                Used as-is when it matches the store, otherwise rebuilt from it.
+
+        Returns:
+            Populated MetadataColumns
+        """
+        if id_to_path is not None:
+            columns = cls._from_id_to_path(metadata_store, id_to_path)
+            if columns is not None:
+                return columns
+            logger.warning("Persisted id_to_path does not match the FAISS metadata. Rebuilding it.")
+
+        columns = cls()
+        for path, entry in metadata_store.items():
+            if "id" not in entry:
+                logger.warning(f"Metadata for '{path}' is missing its FAISS id. Skipping.")
+                continue
+            columns.upsert(
+                entry["id"],
+                path,
+                entry.get("entity_type", "mcp_server"),
+                entry_is_enabled(entry),
+            )
+        return columns
+
+    @classmethod
+    def _from_id_to_path(
+        cls,
+        metadata_store: Dict[str, Dict[str, Any]],
+        id_to_path: Dict[Any, str],
+    ) -> Optional["MetadataColumns"]:
+        """Build the columns from a persisted reverse map, or None if it is stale."""
+        if len(id_to_path) != len(metadata_store):
+            return None
+        columns = cls()
+        for faiss_id, path in id_to_path.items():
+            entry = metadata_store.get(path)
+            if entry is None or entry.get("id") != int(faiss_id):
+                return None
+            columns.upsert(
+                int(faiss_id),
+                path,
+                entry.get("entity_type", "mcp_server"),
+                entry_is_enabled(entry),
+            )
+        return columns
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(
+        self,
+        faiss_id: int,
+    ) -> bool:
+        return int(faiss_id) in self._row_of
+
+    def _code_for(
+        self,
+        entity_type: str,
+    ) -> int:
+        code = self._codes.get(entity_type)
+        if code is None:
+            code = len(self._codes)
+            self._codes[entity_type] = code
+        return code
+
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        self._ids = np.resize(self._ids, capacity)
+        self._type_codes = np.resize(self._type_codes, capacity)
+        self._enabled = np.resize(self._enabled, capacity)
+
+    def upsert(
+        self,
+        faiss_id: int,
+        path: str,
+        entity_type: str,
+        is_enabled: bool,
+    ) -> None:
+        """
+        Add or update the row for a FAISS id.
+
+        Args:
+            faiss_id: FAISS vector id
+            path: Server or agent path the id belongs to
+            entity_type: "mcp_server" or "a2a_agent"
+            is_enabled: Whether the entity is enabled
+        """
+        faiss_id = int(faiss_id)
+        row = self._row_of.get(faiss_id)
+        if row is None:
+            row = len(self._paths)
+            if row == len(self._ids):
+                self._grow()
+            self._row_of[faiss_id] = row
+            self._paths.append(path)
+            self._ids[row] = faiss_id
+        else:
+            self._paths[row] = path
+        self._type_codes[row] = self._code_for(entity_type)
+        self._enabled[row] = is_enabled
+        self.version += 1
+
+    def remove(
+        self,
+        faiss_id: int,
+    ) -> Optional[str]:
+        """
+        Remove the row for a FAISS id by moving the last row into its slot.
+
+        Args:
+            faiss_id: FAISS vector id
+
+        Returns:
+            The path that was mapped to the id, or None if it was not present
+        """
+        row = self._row_of.pop(int(faiss_id), None)
+        if row is None:
+            return None
+        path = self._paths[row]
+        last = len(self._paths) - 1
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._ids[row] = moved_id
+            self._type_codes[row] = self._type_codes[last]
+            self._enabled[row] = self._enabled[last]
+            self._paths[row] = self._paths[last]
+            self._row_of[moved_id] = row
+        self._paths.pop()
+        self.version += 1
+        return path
+
+    def path_for(
+        self,
+        faiss_id: int,
+    ) -> Optional[str]:
+        """Return the path for a FAISS id, or None if unknown."""
+        row = self._row_of.get(int(faiss_id))
+        return None if row is None else self._paths[row]
+
+    def select_ids(
+        self,
+        entity_types: Optional[Iterable[str]] = None,
+        enabled_only: bool = False,
+    ) -> np.ndarray:
+        """
+        Return the ids of entries matching the given filters.
+
+        Args:
+            entity_types: Entity types to keep (None keeps all)
+            enabled_only: Keep only enabled entities
+
+        Returns:
+            Int64 array of matching FAISS ids
+        """
+        size = len(self._paths)
+        mask = np.ones(size, dtype=bool)
+        if entity_types is not None:
+            codes = [self._codes[t] for t in entity_types if t in self._codes]
+            mask &= np.isin(self._type_codes[:size], codes)
+        if enabled_only:
+            mask &= self._enabled[:size]
+        return self._ids[:size][mask]
+
+    def id_to_path(self) -> Dict[int, str]:
+        """Return a copy of the id -> path reverse map."""
+        return {int(faiss_id): self._paths[row] for faiss_id, row in self._row_of.items()}
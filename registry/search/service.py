@@ -1,6 +1,8 @@
 import json
 import asyncio
 import logging
+import os
+import threading
 from datetime import datetime
 import re
 from pathlib import Path
@@ -9,6 +11,7 @@ from typing import (
     Any,
     Optional,
     List,
+    Set,
     Tuple
 )
 
@@ -21,8 +24,19 @@ from ..core.schemas import ServerInfo
 from ..schemas.agent_models import AgentCard
 from ..embeddings import (
     EmbeddingsClient,
+    QueryEmbeddingCache,
     create_embeddings_client,
 )
+from .index_factory import (
+    build_index,
+    extract_vectors,
+    make_search_params,
+    resolve_index_type,
+)
+from .metadata_columns import (
+    MetadataColumns,
+    entry_is_enabled,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +56,19 @@ class _PydanticAwareJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+def _atomic_write_bytes(
+    path: Path,
+    data: bytes,
+) -> None:
+    """Write bytes to a temporary file and rename it over the target path."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 class FaissService:
     """Service for managing FAISS vector database operations."""
 
@@ -49,12 +76,43 @@ class FaissService:
         self.embedding_model: Optional[EmbeddingsClient] = None
         self.faiss_index: Optional[faiss.IndexIDMap] = None
         self.metadata_store: Dict[str, Dict[str, Any]] = {}
+        # id -> path reverse map and filter columns, kept in sync with metadata_store
+        self.metadata_columns = MetadataColumns()
+        self._search_params_cache: Dict[Tuple[Any, ...], Any] = {}
+        self._search_params_version: Optional[Tuple[int, int]] = None
         self.next_id_counter: int = 0
+        # Per-tool index: {service_path: {tool_name: {"id", "text_for_embedding"}}}
+        self.tool_index: Optional[faiss.IndexIDMap] = None
+        self.tool_metadata_store: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.next_tool_id_counter: int = 0
+        self._dirty: bool = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock: asyncio.Lock = asyncio.Lock()
+        # Approximate search index derived from faiss_index. Its labels are slots:
+        # _ann_slot_ids maps slot -> FAISS id, _ann_slots maps FAISS id -> live slot,
+        # and _ann_tombstones holds slots of updated or removed vectors
+        self._ann_index: Optional[faiss.Index] = None
+        self._ann_index_type: str = "flat"
+        self._ann_slot_ids: List[int] = []
+        self._ann_slots: Dict[int, int] = {}
+        self._ann_tombstones: Set[int] = set()
+        self._ann_generation: int = 0
+        # Writes made while a rebuild runs, replayed onto the new index
+        self._ann_journal: Optional[List[Tuple[Any, Optional[np.ndarray]]]] = None
+        self._ann_task: Optional[asyncio.Task] = None
+        # Held while mutating faiss_index and while a rebuild copies it
+        self._index_lock = threading.Lock()
+        self.query_cache = QueryEmbeddingCache(
+            max_entries=settings.query_embedding_cache_max_entries,
+            ttl_seconds=settings.query_embedding_cache_ttl_seconds,
+        )
         
     async def initialize(self):
         """Initialize the FAISS service - load model and index."""
         await self._load_embedding_model()
         await self._load_faiss_data()
+        self._reset_ann_index()
+        self._schedule_ann_rebuild()
         
     async def _load_embedding_model(self):
         """Load the embeddings model using the configured provider."""
@@ -90,7 +148,18 @@ class FaissService:
                 if settings.embeddings_provider == "litellm"
                 else None,
                 embedding_dimension=settings.embeddings_model_dimensions,
+                embeddings_cache_dir=settings.embeddings_cache_dir
+                if settings.embeddings_cache_enabled
+                else None,
+                embeddings_cache_max_entries=settings.embeddings_cache_max_entries
+                if settings.embeddings_cache_enabled
+                else None,
+                embeddings_cache_max_disk_entries=settings.embeddings_cache_max_disk_entries
+                if settings.embeddings_cache_enabled
+                else None,
             )
+            # Cached query embeddings belong to the previous model
+            self.query_cache.clear()
 
             # Get and log the embedding dimension
             embedding_dim = self.embedding_model.get_embedding_dimension()
@@ -123,8 +192,12 @@ class FaissService:
                     loaded_metadata = json.load(f)
                     self.metadata_store = loaded_metadata.get("metadata", {})
                     self.next_id_counter = loaded_metadata.get("next_id", 0)
+                self.metadata_columns = MetadataColumns.from_metadata(
+                    self.metadata_store, loaded_metadata.get("id_to_path")
+                )
                     
                 logger.info(f"FAISS data loaded. Index size: {self.faiss_index.ntotal if self.faiss_index else 0}. Next ID: {self.next_id_counter}")
+                self._load_tool_index()
                 
                 # Check dimension compatibility
                 if self.faiss_index and self.faiss_index.d != settings.embeddings_model_dimensions:
@@ -146,33 +219,408 @@ class FaissService:
         """
         self.faiss_index = faiss.IndexIDMap(faiss.IndexFlatIP(settings.embeddings_model_dimensions))
         self.metadata_store = {}
+        self.metadata_columns = MetadataColumns()
         self.next_id_counter = 0
+        self._reset_ann_index()
         logger.info(f"Initialized FAISS IndexFlatIP with {settings.embeddings_model_dimensions} dimensions for cosine similarity")
+        self._initialize_new_tool_index()
+
+    def _initialize_new_tool_index(self):
+        """Initialize an empty per-tool index (IndexFlatIP over normalized tool embeddings)."""
+        self.tool_index = faiss.IndexIDMap(faiss.IndexFlatIP(settings.embeddings_model_dimensions))
+        self.tool_metadata_store = {}
+        self.next_tool_id_counter = 0
+
+    def _load_tool_index(self):
+        """Load the per-tool index and metadata, starting empty if missing or incompatible."""
+        if not (
+            settings.faiss_tool_index_path.exists()
+            and settings.faiss_tool_metadata_path.exists()
+        ):
+            logger.info("FAISS tool index not found. Tool embeddings will be built on the next sync.")
+            self._initialize_new_tool_index()
+            return
+
+        try:
+            tool_index = faiss.read_index(str(settings.faiss_tool_index_path))
+            with open(settings.faiss_tool_metadata_path, "r") as f:
+                loaded_metadata = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading FAISS tool index: {e}. Re-initializing.", exc_info=True)
+            self._initialize_new_tool_index()
+            return
+
+        if tool_index.d != settings.embeddings_model_dimensions:
+            logger.warning(
+                f"Loaded FAISS tool index dimension ({tool_index.d}) differs from expected "
+                f"({settings.embeddings_model_dimensions}). Re-initializing."
+            )
+            self._initialize_new_tool_index()
+            return
+
+        self.tool_index = tool_index
+        self.tool_metadata_store = loaded_metadata.get("metadata", {})
+        self.next_tool_id_counter = loaded_metadata.get("next_id", 0)
+        logger.info(f"FAISS tool index loaded. Tools: {self.tool_index.ntotal}")
         
     async def save_data(self):
-        """Save FAISS index and metadata to disk."""
+        """Save FAISS index and metadata to disk.
+
+        The index and metadata are snapshotted on the event loop and written
+        from a worker thread. Each file is written to a temporary path and
+        renamed into place so readers never observe a partially written file.
+        """
         if self.faiss_index is None:
             logger.error("FAISS index is not initialized. Cannot save.")
             return
-            
+
+        async with self._save_lock:
+            # Clear the flag before snapshotting so changes made while the
+            # write is in flight mark the index dirty again
+            self._dirty = False
+            try:
+                index_bytes = faiss.serialize_index(self.faiss_index)
+                metadata_snapshot = {
+                    "metadata": dict(self.metadata_store),
+                    "next_id": self.next_id_counter,
+                    "id_to_path": self.metadata_columns.id_to_path(),
+                }
+                tool_index_bytes = None
+                tool_metadata_snapshot = None
+                if self.tool_index is not None:
+                    tool_index_bytes = faiss.serialize_index(self.tool_index)
+                    tool_metadata_snapshot = {
+                        "metadata": dict(self.tool_metadata_store),
+                        "next_id": self.next_tool_id_counter,
+                    }
+
+                logger.info(
+                    f"Saving FAISS index to {settings.faiss_index_path} (Size: {self.faiss_index.ntotal})"
+                )
+                await asyncio.to_thread(
+                    self._write_snapshot,
+                    index_bytes,
+                    metadata_snapshot,
+                    tool_index_bytes,
+                    tool_metadata_snapshot,
+                )
+                logger.info("FAISS data saved successfully.")
+            except Exception as e:
+                self._dirty = True
+                logger.error(f"Error saving FAISS data: {e}", exc_info=True)
+
+    def _write_snapshot(
+        self,
+        index_bytes: np.ndarray,
+        metadata_snapshot: Dict[str, Any],
+        tool_index_bytes: Optional[np.ndarray] = None,
+        tool_metadata_snapshot: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Atomically write serialized indexes and metadata snapshots to disk."""
+        settings.servers_dir.mkdir(parents=True, exist_ok=True)
+
+        _atomic_write_bytes(settings.faiss_index_path, index_bytes.tobytes())
+
+        logger.info(f"Saving FAISS metadata to {settings.faiss_metadata_path}")
+        metadata_json = json.dumps(
+            metadata_snapshot,
+            indent=2,
+            cls=_PydanticAwareJSONEncoder,
+        )
+        _atomic_write_bytes(settings.faiss_metadata_path, metadata_json.encode("utf-8"))
+
+        if tool_index_bytes is not None and tool_metadata_snapshot is not None:
+            # Metadata first: readers reload both files when the index file changes
+            logger.info(f"Saving FAISS tool index to {settings.faiss_tool_index_path}")
+            _atomic_write_bytes(
+                settings.faiss_tool_metadata_path,
+                json.dumps(tool_metadata_snapshot).encode("utf-8"),
+            )
+            _atomic_write_bytes(settings.faiss_tool_index_path, tool_index_bytes.tobytes())
+
+    async def _schedule_save(self) -> None:
+        """Mark the index dirty and schedule a debounced write-behind save.
+
+        Changes arriving within ``faiss_save_debounce_seconds`` of each other
+        are coalesced into a single save.
+        """
+        self._dirty = True
+
+        if settings.faiss_save_debounce_seconds <= 0:
+            await self.save_data()
+            return
+
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._debounced_save())
+
+    async def _debounced_save(self) -> None:
+        """Background task that saves until no changes are pending."""
+        while self._dirty:
+            await asyncio.sleep(settings.faiss_save_debounce_seconds)
+            # Shield the write so a cancelled flush never aborts it mid-save
+            await asyncio.shield(self.save_data())
+
+    async def flush(self) -> None:
+        """Persist pending changes immediately. Called on shutdown."""
+        task = self._save_task
+        self._save_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        # A shielded save may still be writing and has already cleared _dirty;
+        # wait for it to finish so shutdown never leaves a torn snapshot
+        async with self._save_lock:
+            pass
+
+        if self._dirty:
+            await self.save_data()
+
+        ann_task = self._ann_task
+        self._ann_task = None
+        if ann_task is not None and not ann_task.done():
+            ann_task.cancel()
+            try:
+                await ann_task
+            except asyncio.CancelledError:
+                pass
+
+    def _reset_ann_index(self) -> None:
+        """Drop the approximate index so searches use the exact flat index."""
+        self._ann_index = None
+        self._ann_index_type = "flat"
+        self._ann_slot_ids = []
+        self._ann_slots = {}
+        self._ann_tombstones = set()
+        self._ann_generation += 1
+
+    def _resolve_ann_type(self) -> str:
+        """Resolve the configured index type for the current flat index size."""
         try:
-            # Ensure directory exists
-            settings.servers_dir.mkdir(parents=True, exist_ok=True)
-            
-            logger.info(f"Saving FAISS index to {settings.faiss_index_path} (Size: {self.faiss_index.ntotal})")
-            faiss.write_index(self.faiss_index, str(settings.faiss_index_path))
-            
-            logger.info(f"Saving FAISS metadata to {settings.faiss_metadata_path}")
-            with open(settings.faiss_metadata_path, "w") as f:
-                json.dump({
-                    "metadata": self.metadata_store,
-                    "next_id": self.next_id_counter
-                }, f, indent=2, cls=_PydanticAwareJSONEncoder)
-                
-            logger.info("FAISS data saved successfully.")
-        except Exception as e:
-            logger.error(f"Error saving FAISS data: {e}", exc_info=True)
-            
+            return resolve_index_type(
+                settings.faiss_index_type,
+                self.faiss_index.ntotal,
+                settings.faiss_ann_threshold,
+            )
+        except ValueError as e:
+            logger.error(f"{e}. Using exact flat search.")
+            return "flat"
+
+    def _ann_needs_rebuild(self) -> bool:
+        """Return True if the approximate index is missing, of the wrong type or too fragmented.
+
+        Drops the approximate index when the flat index should serve searches.
+        """
+        if self.faiss_index is None:
+            return False
+        index_type = self._resolve_ann_type()
+        if index_type == "flat":
+            if self._ann_index is not None:
+                self._reset_ann_index()
+            return False
+        if self._ann_index is None or self._ann_index_type != index_type:
+            return True
+        max_tombstones = settings.faiss_ann_max_tombstone_ratio * len(self._ann_slot_ids)
+        return len(self._ann_tombstones) > max_tombstones
+
+    def _schedule_ann_rebuild(self) -> None:
+        """Start a background rebuild of the approximate index if it needs one."""
+        if (self._ann_task is None or self._ann_task.done()) and self._ann_needs_rebuild():
+            self._ann_task = asyncio.create_task(self._rebuild_ann_index())
+
+    def _ann_add(
+        self,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+    ) -> None:
+        """Add vectors to the approximate index under fresh slots.
+
+        HNSW and IVF-PQ support incremental adds but not removal, so each write
+        gets a new slot and the id's previous slot, if any, is tombstoned.
+        """
+        first_slot = len(self._ann_slot_ids)
+        slots = np.arange(first_slot, first_slot + len(ids), dtype=np.int64)
+        self._ann_index.add_with_ids(vectors, slots)
+        for faiss_id, slot in zip(ids.tolist(), slots.tolist()):
+            previous = self._ann_slots.get(faiss_id)
+            if previous is not None:
+                self._ann_tombstones.add(previous)
+            self._ann_slots[faiss_id] = slot
+            self._ann_slot_ids.append(faiss_id)
+        self._ann_generation += 1
+
+    def _ann_remove(
+        self,
+        ids: List[int],
+    ) -> None:
+        """Tombstone the slots of removed ids in the approximate index."""
+        for faiss_id in ids:
+            slot = self._ann_slots.pop(faiss_id, None)
+            if slot is not None:
+                self._ann_tombstones.add(slot)
+        self._ann_generation += 1
+
+    def _record_vectors_added(
+        self,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+    ) -> None:
+        """Mirror vectors just written to the flat index into the approximate index."""
+        if self._ann_journal is not None:
+            self._ann_journal.append((ids, vectors))
+        if self._ann_index is not None:
+            self._ann_add(ids, vectors)
+        self._schedule_ann_rebuild()
+
+    def _record_vectors_removed(
+        self,
+        ids: List[int],
+    ) -> None:
+        """Mirror removals into the approximate index."""
+        if self._ann_journal is not None:
+            self._ann_journal.append((ids, None))
+        if self._ann_index is not None:
+            self._ann_remove(ids)
+        self._schedule_ann_rebuild()
+
+    def _build_ann_from_snapshot(
+        self,
+        flat_index: "faiss.IndexIDMap",
+        index_type: str,
+    ) -> Tuple["faiss.Index", np.ndarray]:
+        """Copy the flat index and build an approximate index over it.
+
+        Runs in a worker thread. Labels in the returned index are slots, and the
+        returned array maps each slot to its FAISS id.
+        """
+        with self._index_lock:
+            ids, vectors = extract_vectors(flat_index)
+        ann_index = build_index(
+            vectors,
+            np.arange(len(ids), dtype=np.int64),
+            index_type,
+            hnsw_m=settings.faiss_hnsw_m,
+            hnsw_ef_construction=settings.faiss_hnsw_ef_construction,
+            hnsw_ef_search=settings.faiss_hnsw_ef_search,
+            ivf_nlist=settings.faiss_ivf_nlist,
+            ivf_nprobe=settings.faiss_ivf_nprobe,
+            pq_m=settings.faiss_pq_m,
+        )
+        return ann_index, ids
+
+    async def _rebuild_ann_index(self) -> None:
+        """Background task that rebuilds the approximate index while it needs one."""
+        while self._ann_needs_rebuild():
+            await asyncio.sleep(settings.faiss_ann_rebuild_debounce_seconds)
+            flat_index = self.faiss_index
+            index_type = self._resolve_ann_type()
+            if index_type == "flat":
+                continue
+
+            # Writes made while the build runs are journaled and replayed onto it
+            self._ann_journal = []
+            try:
+                ann_index, slot_ids = await asyncio.to_thread(
+                    self._build_ann_from_snapshot, flat_index, index_type
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to build FAISS {index_type} index: {e}. Using exact flat search.",
+                    exc_info=True,
+                )
+                return
+            finally:
+                journal = self._ann_journal
+                self._ann_journal = None
+            if flat_index is not self.faiss_index:
+                continue
+
+            self._ann_index = ann_index
+            self._ann_index_type = index_type
+            self._ann_slot_ids = slot_ids.tolist()
+            self._ann_slots = {faiss_id: slot for slot, faiss_id in enumerate(self._ann_slot_ids)}
+            self._ann_tombstones = set()
+            self._ann_generation += 1
+            for ids, vectors in journal:
+                if vectors is None:
+                    self._ann_remove(ids)
+                else:
+                    self._ann_add(ids, vectors)
+            logger.info(
+                f"FAISS {index_type} index ready ({len(slot_ids)} vectors, "
+                f"{len(journal)} writes replayed)"
+            )
+
+    def _get_search_index(self) -> "faiss.Index":
+        """Return the approximate index if one is built, else the exact flat index."""
+        if self._ann_index is not None:
+            return self._ann_index
+        return self.faiss_index
+
+    def _get_filtered_search_params(
+        self,
+        search_index: "faiss.Index",
+        entity_types: frozenset,
+        enabled_only: bool,
+    ) -> Tuple[Any, int]:
+        """Return search parameters restricting results to matching entities.
+
+        On the approximate index the selection is over live slots, so tombstoned
+        vectors are excluded too. Selections are cached until the metadata columns
+        or the approximate index change.
+
+        Returns:
+            Tuple of (search parameters, number of matching ids)
+        """
+        version = (self.metadata_columns.version, self._ann_generation)
+        if self._search_params_version != version:
+            self._search_params_cache.clear()
+            self._search_params_version = version
+
+        index_type = self._ann_index_type if search_index is self._ann_index else "flat"
+        key = (entity_types, enabled_only, index_type)
+        cached = self._search_params_cache.get(key)
+        if cached is None:
+            ids = self.metadata_columns.select_ids(entity_types, enabled_only)
+            if index_type != "flat":
+                ids = np.fromiter(
+                    (self._ann_slots[i] for i in ids.tolist() if i in self._ann_slots),
+                    dtype=np.int64,
+                )
+            params = make_search_params(search_index, index_type, ids) if ids.size else None
+            cached = (params, int(ids.size))
+            self._search_params_cache[key] = cached
+        return cached
+
+    def _set_metadata_entry(
+        self,
+        path: str,
+        entry: Dict[str, Any],
+    ) -> None:
+        """Store a metadata entry and update the reverse map and filter columns."""
+        previous = self.metadata_store.get(path)
+        if previous is not None and previous.get("id") != entry["id"]:
+            self.metadata_columns.remove(previous["id"])
+        self.metadata_store[path] = entry
+        self.metadata_columns.upsert(
+            entry["id"],
+            path,
+            entry.get("entity_type", "mcp_server"),
+            entry_is_enabled(entry),
+        )
+
+    def _delete_metadata_entry(
+        self,
+        path: str,
+    ) -> None:
+        """Delete a metadata entry and its reverse map and filter column rows."""
+        entry = self.metadata_store.pop(path)
+        if "id" in entry:
+            self.metadata_columns.remove(entry["id"])
+
     def _get_text_for_embedding(self, server_info: Dict[str, Any]) -> str:
         """Prepare text string from server info (including tools and metadata) for embedding."""
         name = server_info.get("server_name", "")
@@ -215,6 +663,17 @@ class FaissService:
 
         return "\n".join(text_parts).strip()
 
+    @staticmethod
+    def _get_text_for_tool(service_name: str, tool_info: Dict[str, Any]) -> str:
+        """Prepare the text for a single tool's embedding.
+
+        Must match the text mcpgw's intelligent_tool_finder builds for the tool.
+        """
+        tool_name = tool_info.get("name", "Unknown Tool")
+        parsed_description = tool_info.get("parsed_description") or {}
+        main_description = parsed_description.get("main", "No description.")
+        return f"Service: {service_name}. Tool: {tool_name}. Description: {main_description}"
+
     def _get_text_for_agent(self, agent_card: AgentCard) -> str:
         """Prepare text string from agent card (including metadata) for embedding."""
         name = agent_card.name
@@ -300,17 +759,19 @@ class FaissService:
                 logger.debug(f"Normalized embedding for '{service_path}' (norm check: {np.linalg.norm(normalized_embedding):.4f})")
 
                 ids_to_remove = np.array([current_faiss_id])
-                if existing_entry:
-                    try:
-                        num_removed = self.faiss_index.remove_ids(ids_to_remove)
-                        if num_removed > 0:
-                            logger.info(f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({service_path}).")
-                        else:
-                            logger.info(f"No old vector found for FAISS ID {current_faiss_id} ({service_path}) during update, or ID not in index.")
-                    except Exception as e_remove:
-                        logger.warning(f"Issue removing FAISS ID {current_faiss_id} for {service_path}: {e_remove}. Proceeding to add.")
-                
-                self.faiss_index.add_with_ids(embedding_np, np.array([current_faiss_id]))
+                with self._index_lock:
+                    if existing_entry:
+                        try:
+                            num_removed = self.faiss_index.remove_ids(ids_to_remove)
+                            if num_removed > 0:
+                                logger.info(f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({service_path}).")
+                            else:
+                                logger.info(f"No old vector found for FAISS ID {current_faiss_id} ({service_path}) during update, or ID not in index.")
+                        except Exception as e_remove:
+                            logger.warning(f"Issue removing FAISS ID {current_faiss_id} for {service_path}: {e_remove}. Proceeding to add.")
+
+                    self.faiss_index.add_with_ids(embedding_np, ids_to_remove)
+                self._record_vectors_added(ids_to_remove, embedding_np)
                 logger.info(f"Added/Updated vector for '{service_path}' with FAISS ID {current_faiss_id}.")
             except Exception as e:
                 logger.error(f"Error encoding or adding embedding for '{service_path}': {e}", exc_info=True)
@@ -326,19 +787,135 @@ class FaissService:
             or existing_entry.get("full_server_info") != enriched_server_info
         ):
 
-            self.metadata_store[service_path] = {
+            self._set_metadata_entry(service_path, {
                 "id": current_faiss_id,
                 "text_for_embedding": text_to_embed,
                 "full_server_info": enriched_server_info,
                 "entity_type": server_info.get("entity_type", "mcp_server")
-            }
+            })
             logger.debug(f"Updated faiss_metadata_store for '{service_path}'.")
-            await self.save_data()
+            await self._schedule_save()
         else:
             logger.debug(
                 f"No changes to FAISS vector or enriched full_server_info for '{service_path}'. Skipping save."
             )
 
+        if await self._sync_tool_embeddings([(service_path, server_info)]):
+            await self._schedule_save()
+
+    async def _sync_tool_embeddings(
+        self,
+        services: List[Tuple[str, Dict[str, Any]]],
+    ) -> bool:
+        """Bring the per-tool index in line with the tool lists of the given services.
+
+        Tools whose text is unchanged keep their vectors. New or changed tools
+        are encoded in batches of ``embeddings_batch_size``, and tools no longer
+        listed are removed.
+
+        Args:
+            services: List of (service_path, server_info) tuples
+
+        Returns:
+            True if the tool index or its metadata changed
+        """
+        if self.embedding_model is None or self.tool_index is None:
+            return False
+
+        changed = False
+        stale_ids: List[int] = []
+        pending: List[Tuple[str, str, int, str, Optional[Dict[str, Any]]]] = []
+        updated_services: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        for service_path, server_info in services:
+            service_name = server_info.get("server_name", "Unknown Service")
+            wanted = {
+                tool_info.get("name", "Unknown Tool"): self._get_text_for_tool(service_name, tool_info)
+                for tool_info in server_info.get("tool_list") or []
+            }
+            existing = self.tool_metadata_store.get(service_path, {})
+            tools: Dict[str, Dict[str, Any]] = {}
+
+            for tool_name, text in wanted.items():
+                entry = existing.get(tool_name)
+                if entry and entry.get("text_for_embedding") == text:
+                    tools[tool_name] = entry
+                    continue
+                if entry:
+                    tool_id = entry["id"]
+                else:
+                    tool_id = self.next_tool_id_counter
+                    self.next_tool_id_counter += 1
+                pending.append((service_path, tool_name, tool_id, text, entry))
+
+            for tool_name, entry in existing.items():
+                if tool_name not in wanted:
+                    stale_ids.append(entry["id"])
+
+            if len(tools) != len(existing) or len(tools) != len(wanted):
+                changed = True
+            updated_services[service_path] = tools
+
+        if stale_ids:
+            self.tool_index.remove_ids(np.array(stale_ids, dtype=np.int64))
+
+        batch_size = max(1, settings.embeddings_batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_model.encode, [text for _, _, _, text, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"Error encoding batch of {len(batch)} tools: {e}", exc_info=True)
+                # Keep previous entries so they still point at their old vectors
+                for service_path, tool_name, _, _, entry in batch:
+                    if entry:
+                        updated_services[service_path][tool_name] = entry
+                continue
+
+            existing_ids = np.array(
+                [tool_id for _, _, tool_id, _, entry in batch if entry],
+                dtype=np.int64,
+            )
+            if existing_ids.size:
+                self.tool_index.remove_ids(existing_ids)
+            self.tool_index.add_with_ids(
+                self._normalize_embeddings(np.asarray(embeddings, dtype=np.float32)),
+                np.array([tool_id for _, _, tool_id, _, _ in batch], dtype=np.int64),
+            )
+            for service_path, tool_name, tool_id, text, _ in batch:
+                updated_services[service_path][tool_name] = {
+                    "id": tool_id,
+                    "text_for_embedding": text,
+                }
+            changed = True
+
+        for service_path, tools in updated_services.items():
+            if tools:
+                self.tool_metadata_store[service_path] = tools
+            else:
+                self.tool_metadata_store.pop(service_path, None)
+
+        if pending:
+            logger.info(f"Embedded {len(pending)} tools for {len(services)} service(s)")
+        return changed
+
+    def _remove_service_tools(self, service_path: str) -> bool:
+        """Remove a service's tools from the per-tool index.
+
+        Returns:
+            True if any tools were removed
+        """
+        tools = self.tool_metadata_store.pop(service_path, None)
+        if not tools or self.tool_index is None:
+            return False
+        self.tool_index.remove_ids(
+            np.array([entry["id"] for entry in tools.values()], dtype=np.int64)
+        )
+        logger.info(f"Removed {len(tools)} tools of '{service_path}' from FAISS tool index")
+        return True
+
 
     async def remove_service(self, service_path: str):
         """Remove a service from the FAISS index and metadata store."""
@@ -358,12 +935,16 @@ class FaissService:
                     f"Removing service '{service_path}' with FAISS ID {service_id} from index"
                 )
 
+            if service_id is not None:
+                self._record_vectors_removed([service_id])
+
             # Remove from metadata store
-            del self.metadata_store[service_path]
+            self._delete_metadata_entry(service_path)
+            self._remove_service_tools(service_path)
             logger.info(f"Removed service '{service_path}' from FAISS metadata store")
 
             # Save the updated metadata
-            await self.save_data()
+            await self._schedule_save()
 
         except Exception as e:
             logger.error(
@@ -427,26 +1008,28 @@ class FaissService:
                 logger.debug(f"Normalized embedding for '{agent_path}' (norm check: {np.linalg.norm(normalized_embedding):.4f})")
 
                 ids_to_remove = np.array([current_faiss_id])
-                if existing_entry:
-                    try:
-                        num_removed = self.faiss_index.remove_ids(ids_to_remove)
-                        if num_removed > 0:
-                            logger.info(
-                                f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({agent_path})."
+                with self._index_lock:
+                    if existing_entry:
+                        try:
+                            num_removed = self.faiss_index.remove_ids(ids_to_remove)
+                            if num_removed > 0:
+                                logger.info(
+                                    f"Removed {num_removed} old vector(s) for FAISS ID {current_faiss_id} ({agent_path})."
+                                )
+                            else:
+                                logger.info(
+                                    f"No old vector found for FAISS ID {current_faiss_id} ({agent_path}) during update, or ID not in index."
+                                )
+                        except Exception as e_remove:
+                            logger.warning(
+                                f"Issue removing FAISS ID {current_faiss_id} for {agent_path}: {e_remove}. Proceeding to add."
                             )
-                        else:
-                            logger.info(
-                                f"No old vector found for FAISS ID {current_faiss_id} ({agent_path}) during update, or ID not in index."
-                            )
-                    except Exception as e_remove:
-                        logger.warning(
-                            f"Issue removing FAISS ID {current_faiss_id} for {agent_path}: {e_remove}. Proceeding to add."
-                        )
 
-                self.faiss_index.add_with_ids(
-                    embedding_np,
-                    np.array([current_faiss_id]),
-                )
+                    self.faiss_index.add_with_ids(
+                        embedding_np,
+                        ids_to_remove,
+                    )
+                self._record_vectors_added(ids_to_remove, embedding_np)
                 logger.info(
                     f"Added/Updated vector for '{agent_path}' with FAISS ID {current_faiss_id}."
                 )
@@ -466,14 +1049,14 @@ class FaissService:
             or existing_entry.get("full_agent_card") != agent_card_dict
         ):
 
-            self.metadata_store[agent_path] = {
+            self._set_metadata_entry(agent_path, {
                 "id": current_faiss_id,
                 "entity_type": "a2a_agent",
                 "text_for_embedding": text_to_embed,
                 "full_agent_card": agent_card_dict,
-            }
+            })
             logger.debug(f"Updated faiss_metadata_store for agent '{agent_path}'.")
-            await self.save_data()
+            await self._schedule_save()
         else:
             logger.debug(
                 f"No changes to FAISS vector or agent card for '{agent_path}'. Skipping save."
@@ -496,12 +1079,15 @@ class FaissService:
                     f"Removing agent '{agent_path}' with FAISS ID {agent_id} from index"
                 )
 
+            if agent_id is not None:
+                self._record_vectors_removed([agent_id])
+
             # Remove from metadata store
-            del self.metadata_store[agent_path]
+            self._delete_metadata_entry(agent_path)
             logger.info(f"Removed agent '{agent_path}' from FAISS metadata store")
 
             # Save the updated metadata
-            await self.save_data()
+            await self._schedule_save()
 
         except Exception as e:
             logger.error(
@@ -542,6 +1128,121 @@ class FaissService:
             await self.add_or_update_service(entity_path, entity_info, is_enabled)
 
 
+    async def bulk_index(
+        self,
+        entities: List[Dict[str, Any]],
+    ) -> int:
+        """Add or update many servers and agents using batched encoding.
+
+        Entities whose embedding text is unchanged only get their metadata
+        refreshed. The rest are encoded in batches of ``embeddings_batch_size``
+        and written to the index with one ``add_with_ids`` call per batch.
+
+        Args:
+            entities: List of dicts with "path", "entity_type", "info" and "is_enabled"
+
+        Returns:
+            Number of entities that were (re-)embedded
+        """
+        if self.embedding_model is None or self.faiss_index is None:
+            logger.error("Embedding model or FAISS index not initialized. Cannot bulk index.")
+            return 0
+
+        # A repeated path would get two new ids and orphan the first vector;
+        # keep only its last occurrence
+        entities = list({entity["path"]: entity for entity in entities}.values())
+
+        metadata_changed = False
+        pending: List[Tuple[str, int, bool, Dict[str, Any]]] = []
+        tool_services: List[Tuple[str, Dict[str, Any]]] = []
+
+        for entity in entities:
+            path = entity["path"]
+            entity_type = entity.get("entity_type", "mcp_server")
+            is_enabled = entity.get("is_enabled", False)
+            info = entity["info"]
+
+            if entity_type == "a2a_agent":
+                if not isinstance(info, AgentCard):
+                    info = AgentCard(**info)
+                text_to_embed = self._get_text_for_agent(info)
+                new_entry = {
+                    "entity_type": "a2a_agent",
+                    "text_for_embedding": text_to_embed,
+                    "full_agent_card": info.model_dump(),
+                }
+                payload_key = "full_agent_card"
+            else:
+                enriched_server_info = info.copy()
+                enriched_server_info["is_enabled"] = is_enabled
+                text_to_embed = self._get_text_for_embedding(info)
+                tool_services.append((path, info))
+                new_entry = {
+                    "text_for_embedding": text_to_embed,
+                    "full_server_info": enriched_server_info,
+                    "entity_type": info.get("entity_type", "mcp_server"),
+                }
+                payload_key = "full_server_info"
+
+            existing_entry = self.metadata_store.get(path)
+            if existing_entry and existing_entry.get("text_for_embedding") == text_to_embed:
+                if existing_entry.get(payload_key) != new_entry[payload_key]:
+                    self._set_metadata_entry(path, {"id": existing_entry["id"], **new_entry})
+                    metadata_changed = True
+                continue
+
+            if existing_entry:
+                faiss_id = existing_entry["id"]
+            else:
+                faiss_id = self.next_id_counter
+                self.next_id_counter += 1
+            pending.append((path, faiss_id, existing_entry is not None, new_entry))
+
+        batch_size = max(1, settings.embeddings_batch_size)
+        embedded_count = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            texts = [entry["text_for_embedding"] for _, _, _, entry in batch]
+            try:
+                embeddings = await asyncio.to_thread(self.embedding_model.encode, texts)
+            except Exception as e:
+                logger.error(
+                    f"Error encoding batch of {len(batch)} entities: {e}",
+                    exc_info=True,
+                )
+                continue
+
+            embeddings_np = self._normalize_embeddings(np.asarray(embeddings, dtype=np.float32))
+
+            ids = np.array([faiss_id for _, faiss_id, _, _ in batch], dtype=np.int64)
+            existing_ids = np.array(
+                [faiss_id for _, faiss_id, existed, _ in batch if existed],
+                dtype=np.int64,
+            )
+            with self._index_lock:
+                if existing_ids.size:
+                    self.faiss_index.remove_ids(existing_ids)
+                self.faiss_index.add_with_ids(embeddings_np, ids)
+            self._record_vectors_added(ids, embeddings_np)
+
+            for path, faiss_id, _, entry in batch:
+                self._set_metadata_entry(path, {"id": faiss_id, **entry})
+            embedded_count += len(batch)
+            metadata_changed = True
+
+        logger.info(
+            f"Bulk indexed {len(entities)} entities "
+            f"({embedded_count} embedded, {len(entities) - len(pending)} unchanged)"
+        )
+
+        if await self._sync_tool_embeddings(tool_services):
+            metadata_changed = True
+
+        if metadata_changed:
+            await self._schedule_save()
+        return embedded_count
+
+
     async def remove_entity(
         self,
         entity_path: str,
@@ -559,6 +1260,9 @@ class FaissService:
             except Exception as e:
                 logger.warning(f"Could not remove entity {entity_path}: {e}")
 
+        if self._remove_service_tools(entity_path):
+            await self._schedule_save()
+
 
     async def search_entities(
         self,
@@ -579,22 +1283,17 @@ class FaissService:
             query=query,
             entity_types=entity_types,
             max_results=max_results,
+            enabled_only=enabled_only,
         )
 
         combined: List[Dict[str, Any]] = []
         requested = set(entity_types)
 
         if "agents" in results and "a2a_agent" in requested:
-            for agent in results["agents"]:
-                if enabled_only and not agent.get("is_enabled", False):
-                    continue
-                combined.append(agent)
+            combined.extend(results["agents"])
 
         if "servers" in results and "mcp_server" in requested:
-            for server in results["servers"]:
-                if enabled_only and not server.get("is_enabled", False):
-                    continue
-                combined.append(server)
+            combined.extend(results["servers"])
 
         if "tools" in results and "tool" in requested:
             combined.extend(results["tools"])
@@ -681,6 +1380,24 @@ class FaissService:
             return embedding
         return embedding / norm
 
+    @staticmethod
+    def _normalize_embeddings(
+        embeddings: np.ndarray,
+    ) -> np.ndarray:
+        """Normalize each row of an embedding matrix to unit length.
+
+        Zero-norm rows are returned unchanged.
+
+        Args:
+            embeddings: Matrix of shape (n, dimension)
+
+        Returns:
+            Row-normalized float32 matrix
+        """
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (embeddings / norms).astype(np.float32)
+
 
     def _calculate_keyword_boost(
         self,
@@ -897,6 +1614,7 @@ class FaissService:
         query: str,
         entity_types: Optional[List[str]] = None,
         max_results: int = 20,
+        enabled_only: bool = False,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Run a semantic search across MCP servers, their tools, and A2A agents.
@@ -905,6 +1623,7 @@ class FaissService:
             query: Natural language query text
             entity_types: Optional list of entity filters ("mcp_server", "tool", "a2a_agent")
             max_results: Maximum results to return per entity collection
+            enabled_only: Only match enabled servers (and their tools) and agents
 
         Returns:
             Dict with "servers", "tools", and "agents" result lists
@@ -926,24 +1645,45 @@ class FaissService:
         if total_vectors == 0:
             return {"servers": [], "tools": [], "agents": []}
 
+        # Tools are matched through their server's vector
+        vector_entity_types = set()
+        if entity_filter & {"mcp_server", "tool"}:
+            vector_entity_types.add("mcp_server")
+        if "a2a_agent" in entity_filter:
+            vector_entity_types.add("a2a_agent")
+
+        search_index = self._get_search_index()
+        on_ann_index = search_index is self._ann_index
+        search_params = None
+        if (
+            enabled_only
+            or vector_entity_types != {"mcp_server", "a2a_agent"}
+            or (on_ann_index and self._ann_tombstones)
+        ):
+            search_params, candidate_count = self._get_filtered_search_params(
+                search_index, frozenset(vector_entity_types), enabled_only
+            )
+            if candidate_count == 0:
+                return {"servers": [], "tools": [], "agents": []}
+            total_vectors = min(total_vectors, candidate_count)
+
         top_k = min(max_results, total_vectors)
-        query_embedding = await asyncio.to_thread(
-            self.embedding_model.encode, [query.strip()]
-        )
-        query_np = np.array([query_embedding[0]], dtype=np.float32)
+        query_embedding = await self.query_cache.encode(self.embedding_model, query)
+        query_np = np.array([query_embedding], dtype=np.float32)
 
         # Normalize query embedding for cosine similarity (IndexFlatIP)
         normalized_query = self._normalize_embedding(query_np[0])
         query_np = np.array([normalized_query], dtype=np.float32)
         logger.debug(f"Normalized query embedding (norm check: {np.linalg.norm(normalized_query):.4f})")
 
-        distances, indices = self.faiss_index.search(query_np, top_k)
+        if search_params is None:
+            distances, indices = search_index.search(query_np, top_k)
+        else:
+            distances, indices = search_index.search(query_np, top_k, params=search_params)
         distance_row = distances[0]
         id_row = indices[0]
-
-        id_to_path = {
-            entry.get("id"): path for path, entry in self.metadata_store.items()
-        }
+        if on_ann_index:
+            id_row = [self._ann_slot_ids[slot] if slot != -1 else -1 for slot in id_row]
 
         server_results: List[Dict[str, Any]] = []
         tool_results: List[Dict[str, Any]] = []
@@ -953,7 +1693,7 @@ class FaissService:
             if faiss_id == -1:
                 continue
 
-            path = id_to_path.get(int(faiss_id))
+            path = self.metadata_columns.path_for(faiss_id)
             if not path:
                 continue
 
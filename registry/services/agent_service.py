@@ -177,7 +177,7 @@ class AgentService:
         """
         from . import rating_service
 
-        # Query repository directly instead of using cache
+        # The repository keeps its own coherent read cache (DocumentDB) or in-memory copy (file)
         existing_agent = await self._repo.get(path)
         if not existing_agent:
             logger.error(f"Cannot update agent at path '{path}': not found")
@@ -477,7 +477,7 @@ class AgentService:
         Returns:
             List of all agent cards
         """
-        # Query repository directly instead of using cache
+        # The repository keeps its own coherent read cache (DocumentDB) or in-memory copy (file)
         return await self._repo.list_all()
 
 
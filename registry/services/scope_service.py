@@ -44,9 +44,17 @@ async def _trigger_auth_server_reload() -> bool:
     """
     Trigger the auth server to reload its scopes configuration.
 
+    Also schedules a background refresh of this registry's own in-memory scope
+    snapshot, so permission changes apply within moments instead of waiting for
+    it to age out, without holding the caller up on the repository read.
+
     Returns:
         True if successful, False otherwise
     """
+    from ..auth.dependencies import schedule_scope_snapshot_reload
+
+    schedule_scope_snapshot_reload()
+
     try:
         admin_user = os.environ.get("ADMIN_USER", "admin")
         admin_password = os.environ.get("ADMIN_PASSWORD")
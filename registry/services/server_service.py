@@ -132,12 +132,8 @@ class ServerService:
                 try:
                     from ..core.nginx_service import nginx_service
 
-                    enabled_servers = {
-                        service_path: await self.get_server_info(service_path)
-                        for service_path in await self.get_enabled_services()
-                    }
-                    nginx_service.generate_config(enabled_servers)
-                    nginx_service.reload_nginx()
+                    enabled_servers = await self.get_enabled_servers_with_info()
+                    await nginx_service.generate_config_async(enabled_servers)
                     logger.info(f"Regenerated nginx config due to server update: {path}")
                 except Exception as e:
                     logger.error(
@@ -155,12 +151,8 @@ class ServerService:
             try:
                 from ..core.nginx_service import nginx_service
 
-                enabled_servers = {
-                    service_path: await self.get_server_info(service_path)
-                    for service_path in await self.get_enabled_services()
-                }
-                nginx_service.generate_config(enabled_servers)
-                nginx_service.reload_nginx()
+                enabled_servers = await self.get_enabled_servers_with_info()
+                await nginx_service.generate_config_async(enabled_servers)
             except Exception as e:
                 logger.error(f"Failed to update nginx configuration after toggle: {e}")
 
@@ -183,7 +175,7 @@ class ServerService:
         Returns:
             Dict of all servers (local and federated if requested)
         """
-        # Query repository directly instead of using cache
+        # The repository keeps its own coherent read cache (DocumentDB) or in-memory copy (file)
         all_servers = await self._repo.list_all()
 
         # Filter out inactive servers (non-default versions) unless requested
@@ -231,7 +223,7 @@ class ServerService:
             logger.debug("User has no accessible servers, returning empty dict")
             return {}
 
-        # Query repository directly instead of using cache
+        # The repository keeps its own coherent read cache (DocumentDB) or in-memory copy (file)
         all_servers = await self._repo.list_all()
 
         # Filter out inactive servers (non-default versions) unless requested
@@ -367,23 +359,28 @@ class ServerService:
         (those with is_active=False) are skipped since health checks should
         only run on the currently active version of each server.
         """
-        all_servers = await self._repo.list_all()
-        enabled_paths = []
+        return list(await self.get_enabled_servers_with_info())
 
-        # Extract state from list_all() response instead of N+1 queries
-        for path, server_info in all_servers.items():
-            if not server_info.get("is_enabled", False):
-                continue
+    async def get_enabled_servers_with_info(self) -> dict[str, dict[str, Any]]:
+        """Get enabled servers with their info in a single repository read.
 
-            # Skip inactive versions - only health check active versions
-            # Servers without version_group are single-version (implicitly active)
-            # Servers with version_group but is_active=False are inactive versions
-            if server_info.get("version_group") and not server_info.get("is_active", True):
-                continue
+        Use this instead of get_enabled_services() followed by
+        get_server_info() per path (health checks, nginx regeneration).
+        Inactive versions are skipped, as in get_enabled_services().
 
-            enabled_paths.append(path)
+        Returns:
+            Dict mapping enabled server paths to their server info
+        """
+        enabled_servers = await self._repo.get_enabled_servers_with_info()
 
-        return enabled_paths
+        # Skip inactive versions - only health check active versions
+        # Servers without version_group are single-version (implicitly active)
+        # Servers with version_group but is_active=False are inactive versions
+        return {
+            path: server_info
+            for path, server_info in enabled_servers.items()
+            if not (server_info.get("version_group") and not server_info.get("is_active", True))
+        }
 
     async def reload_state_from_disk(self):
         """Reload service state from repository."""
@@ -394,7 +391,8 @@ class ServerService:
         # Reload from repository
         await self._repo.load_all()
 
-        current_enabled_services = set(await self.get_enabled_services())
+        enabled_servers = await self.get_enabled_servers_with_info()
+        current_enabled_services = set(enabled_servers)
 
         if previous_enabled_services != current_enabled_services:
             logger.info(
@@ -404,12 +402,7 @@ class ServerService:
             try:
                 from ..core.nginx_service import nginx_service
 
-                enabled_servers = {
-                    service_path: await self.get_server_info(service_path)
-                    for service_path in await self.get_enabled_services()
-                }
-                nginx_service.generate_config(enabled_servers)
-                nginx_service.reload_nginx()
+                await nginx_service.generate_config_async(enabled_servers)
                 logger.info("Regenerated nginx config due to state reload")
             except Exception as e:
                 logger.error(f"Failed to regenerate nginx configuration after state reload: {e}")
@@ -438,7 +431,7 @@ class ServerService:
         """
         from . import rating_service
 
-        # Query repository directly instead of using cache
+        # The repository keeps its own coherent read cache (DocumentDB) or in-memory copy (file)
         server_info = await self._repo.get(path)
         if not server_info:
             logger.error(f"Cannot update server at path '{path}': not found")
@@ -804,14 +797,8 @@ class ServerService:
         try:
             from ..core.nginx_service import nginx_service
 
-            enabled_servers = {}
-            for service_path in await self.get_enabled_services():
-                server_info = await self.get_server_info(service_path)
-                if server_info:
-                    enabled_servers[service_path] = server_info
-
+            enabled_servers = await self.get_enabled_servers_with_info()
             await nginx_service.generate_config_async(enabled_servers)
-            nginx_service.reload_nginx()
             logger.info("Regenerated nginx config after version change")
 
         except Exception as e:
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Load test the auth server's /validate endpoint against a slow identity provider.
+
+Starts a fake Keycloak realm on localhost whose JWKS endpoint answers after a
+fixed delay, then drives /validate in-process through the ASGI app with
+distinct RS256 tokens so the decision cache never short-circuits validation.
+
+Three phases are measured:
+
+- cold: every round clears the shared JWKS managers and fires a burst of
+  concurrent requests, so each round waits on one IdP fetch
+- warm: keys are cached and requests only pay for local JWT verification
+- rotate: keys are cached, but a share of tokens carry an unknown kid and
+  trigger one slow JWKS refresh; only the known-kid requests are reported,
+  to show whether they queue behind the refresh
+
+Usage:
+    uv run python scripts/benchmark_auth_validate.py
+    uv run python scripts/benchmark_auth_validate.py --idp-latency-ms 1000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REALM = "bench"
+CLIENT_ID = "bench-client"
+
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "auth_server"))
+
+
+def _generate_key():
+    """Create the RSA key the fake realm signs tokens with."""
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwks(private_key, kid: str) -> dict:
+    """Public JWKS document for the signing key."""
+    import jwt
+
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return {"keys": [jwk]}
+
+
+def _start_fake_idp(
+    port: int,
+    jwks: dict,
+    latency: float,
+) -> None:
+    """Serve the realm's JWKS endpoint from a background thread."""
+    import uvicorn
+    from fastapi import FastAPI
+
+    idp = FastAPI()
+
+    @idp.get(f"/realms/{REALM}/protocol/openid-connect/certs")
+    async def certs() -> dict:
+        await asyncio.sleep(latency)
+        return jwks
+
+    server = uvicorn.Server(uvicorn.Config(idp, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+def _token(
+    private_key,
+    kid: str,
+    issuer: str,
+) -> str:
+    """Sign a distinct access token for one request."""
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        "iss": issuer,
+        "aud": "account",
+        "azp": CLIENT_ID,
+        "sub": str(uuid.uuid4()),
+        "preferred_username": f"user-{uuid.uuid4().hex[:8]}",
+        "groups": [],
+        "scope": "openid",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _jwks_managers() -> list:
+    managers = []
+    for module_name in ("providers.base", "auth_server.providers.base"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            managers.extend(module._jwks_managers.values())
+    return managers
+
+
+def _clear_jwks_managers() -> None:
+    """Drop cached keys so the next request has to fetch the JWKS again."""
+    for module_name in ("providers.base", "auth_server.providers.base"):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            with module._jwks_managers_lock:
+                module._jwks_managers.clear()
+
+
+async def _timed_validate(
+    client,
+    token: str,
+    latencies: list,
+    statuses: dict,
+) -> None:
+    start = time.perf_counter()
+    response = await client.get("/validate", headers={"Authorization": f"Bearer {token}"})
+    latencies.append((time.perf_counter() - start) * 1000)
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+def _report(
+    phase: str,
+    latencies: list,
+    statuses: dict,
+) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{phase:<6}{len(ordered):>8}{statistics.median(ordered):>10.1f}"
+        f"{p99:>10.1f}{ordered[-1]:>10.1f}   {statuses}"
+    )
+
+
+async def _run(args: argparse.Namespace) -> None:
+    import httpx
+
+    private_key = _generate_key()
+    kid = "bench-key"
+    _start_fake_idp(args.port, _jwks(private_key, kid), args.idp_latency_ms / 1000)
+
+    import server as server_module
+
+    # Per-request logging would dominate the measurement
+    logging.disable(logging.ERROR)
+
+    issuer = f"http://127.0.0.1:{args.port}/realms/{REALM}"
+    transport = httpx.ASGITransport(app=server_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://auth") as client:
+        print(f"{'phase':<6}{'reqs':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}   statuses")
+
+        latencies, statuses = [], {}
+        for _ in range(args.cold_rounds):
+            _clear_jwks_managers()
+            tokens = [_token(private_key, kid, issuer) for _ in range(args.concurrency)]
+            await asyncio.gather(
+                *(_timed_validate(client, token, latencies, statuses) for token in tokens)
+            )
+        _report("cold", latencies, statuses)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def bounded(token: str, latencies: list, statuses: dict) -> None:
+            async with semaphore:
+                await _timed_validate(client, token, latencies, statuses)
+
+        latencies, statuses = [], {}
+        tokens = [_token(private_key, kid, issuer) for _ in range(args.warm_requests)]
+        await asyncio.gather(*(bounded(token, latencies, statuses) for token in tokens))
+        _report("warm", latencies, statuses)
+
+        # Let the next unknown kid refresh immediately, as after a key rotation
+        for manager in _jwks_managers():
+            manager._last_refresh_attempt = 0.0
+        latencies, statuses, ignored = [], {}, {}
+        every = max(1, round(1 / args.unknown_kid_ratio)) if args.unknown_kid_ratio else 0
+        requests = []
+        for i in range(args.warm_requests):
+            if every and i % every == 0:
+                token = _token(private_key, "rotated-key", issuer)
+                requests.append(bounded(token, [], ignored))
+            else:
+                token = _token(private_key, kid, issuer)
+                requests.append(bounded(token, latencies, statuses))
+        await asyncio.gather(*requests)
+        _report("rotate", latencies, statuses)
+
+
+def main() -> None:
+    """Run the load test and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=18081)
+    parser.add_argument("--idp-latency-ms", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cold-rounds", type=int, default=5)
+    parser.add_argument("--warm-requests", type=int, default=2000)
+    parser.add_argument("--unknown-kid-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "AUTH_PROVIDER": "keycloak",
+        "KEYCLOAK_URL": f"http://127.0.0.1:{args.port}",
+        "KEYCLOAK_REALM": REALM,
+        "KEYCLOAK_CLIENT_ID": CLIENT_ID,
+        "KEYCLOAK_CLIENT_SECRET": "bench-secret",
+    })
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
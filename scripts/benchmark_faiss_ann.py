@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark FAISS flat, HNSW and IVF-PQ search for the registry's search index.
+
+Builds each index type over the same synthetic, clustered, normalized vectors
+and reports build time, query latency and recall@k against exact flat search.
+
+Usage:
+    uv run python scripts/benchmark_faiss_ann.py
+    uv run python scripts/benchmark_faiss_ann.py --num-vectors 50000 --dimension 384 --queries 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from registry.search.index_factory import build_index  # noqa: E402
+
+
+def _clustered_vectors(
+    n: int,
+    dimension: int,
+    seed: int,
+) -> np.ndarray:
+    """Generate normalized vectors grouped around random centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(max(1, n // 50), dimension))
+    vectors = centroids[rng.integers(0, len(centroids), n)] + 0.3 * rng.normal(size=(n, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def _recall_at_k(
+    exact_ids: np.ndarray,
+    approx_ids: np.ndarray,
+) -> float:
+    """Fraction of exact top-k ids also returned by the approximate search."""
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact_ids, approx_ids))
+    return hits / exact_ids.size
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-vectors", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--hnsw-ef-construction", type=int, default=200)
+    parser.add_argument("--hnsw-ef-search", type=int, default=128)
+    parser.add_argument("--ivf-nprobe", type=int, default=16)
+    parser.add_argument("--pq-m", type=int, default=16)
+    args = parser.parse_args()
+
+    vectors = _clustered_vectors(args.num_vectors, args.dimension, seed=0)
+    queries = _clustered_vectors(args.queries, args.dimension, seed=1)
+    ids = np.arange(len(vectors), dtype=np.int64)
+
+    print(
+        f"vectors={args.num_vectors} dimension={args.dimension} "
+        f"queries={args.queries} k={args.k}"
+    )
+    print(f"{'index':<8}{'build s':>10}{'p50 ms':>10}{'p95 ms':>10}{'recall@k':>10}")
+
+    exact_ids = None
+    for index_type in ("flat", "hnsw", "ivfpq"):
+        start = time.perf_counter()
+        index = build_index(
+            vectors,
+            ids,
+            index_type,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construction=args.hnsw_ef_construction,
+            hnsw_ef_search=args.hnsw_ef_search,
+            ivf_nprobe=args.ivf_nprobe,
+            pq_m=args.pq_m,
+        )
+        build_seconds = time.perf_counter() - start
+
+        # One query at a time, as search_mixed issues them
+        latencies = []
+        result_ids = np.empty((len(queries), args.k), dtype=np.int64)
+        for i, query in enumerate(queries):
+            start = time.perf_counter()
+            _, found = index.search(query.reshape(1, -1), args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            result_ids[i] = found[0]
+
+        if exact_ids is None:
+            exact_ids = result_ids
+        recall = _recall_at_k(exact_ids, result_ids)
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{index_type:<8}{build_seconds:>10.2f}{p50:>10.3f}{p95:>10.3f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -104,6 +104,25 @@ async def _get_documentdb_connection_string(
     return connection_string
 
 
+async def _bump_cache_version(
+    db,
+    namespace: str,
+    collection_name: str,
+) -> None:
+    """Tell registry and auth server caches in polling mode that the collection changed.
+
+    Mirrors CollectionCache.record_write in registry/repositories/documentdb/collection_cache.py.
+    """
+    try:
+        await db[f"cache_versions_{namespace}"].update_one(
+            {"_id": collection_name},
+            {"$inc": {"version": 1}},
+            upsert=True,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to bump cache version for {collection_name}: {e}")
+
+
 async def load_scopes_from_yaml(
     scopes_file: str,
     db,
@@ -139,6 +158,7 @@ async def load_scopes_from_yaml(
         logger.info(f"Clearing existing scopes from {collection_name}")
         result = await collection.delete_many({})
         logger.info(f"Deleted {result.deleted_count} existing scope documents")
+        await _bump_cache_version(db, namespace, collection_name)
 
     # Extract group mappings and UI scopes
     group_mappings = scopes_data.get("group_mappings", {})
@@ -197,6 +217,7 @@ async def load_scopes_from_yaml(
             except Exception as e:
                 logger.error(f"Failed to insert scope {scope_doc['_id']}: {e}")
 
+        await _bump_cache_version(db, namespace, collection_name)
         logger.info(f"Successfully loaded {len(scope_groups)} scopes")
 
         # Print summary
@@ -13,11 +13,10 @@ from pathlib import Path # Added Path
 from pydantic import BaseModel, Field
 from fastmcp import FastMCP, Context  # Updated import for FastMCP 2.0
 from fastmcp.server.dependencies import get_http_request  # New dependency function for HTTP access
-from typing import Dict, Any, Optional, ClassVar, List
+from typing import Dict, Any, Optional, ClassVar, List, Tuple
 from dotenv import load_dotenv
 import os
 import numpy as np # Added
-from sklearn.metrics.pairwise import cosine_similarity # Added
 import faiss # Added
 import yaml # Added for scopes.yml parsing
 
@@ -521,9 +520,14 @@ _faiss_data_lock = asyncio.Lock()
 _embedding_model_mcpgw: Optional[EmbeddingsClient] = None
 _faiss_index_mcpgw: Optional[faiss.Index] = None
 _faiss_metadata_mcpgw: Optional[Dict[str, Any]] = None # This will store the content of service_index_metadata.json
+_id_to_service_path_mcpgw: Dict[int, str] = {} # FAISS id -> service_path, rebuilt only when the metadata file changes
 _last_faiss_index_mtime: Optional[float] = None
 _last_faiss_metadata_mtime: Optional[float] = None
 _last_faiss_check_time: Optional[float] = None  # Track when we last checked for file updates
+_tool_embeddings_mcpgw: Optional[np.ndarray] = None # Normalized (n_tools, dim) matrix from the registry's tool index
+_tool_rows_mcpgw: Dict[Tuple[str, str], Tuple[int, str]] = {} # (service_path, tool_name) -> (matrix row, embedded text)
+_last_tool_index_mtime: Optional[float] = None
+_last_tool_metadata_mtime: Optional[float] = None
 _faiss_check_interval: float = 5.0  # Only check for file updates every 5 seconds
 
 # Determine base path for mcpgw server to find registry's server data
@@ -531,14 +535,63 @@ _faiss_check_interval: float = 5.0  # Only check for file updates every 5 second
 _registry_server_data_path = Path(__file__).resolve().parent / "registry" / "servers"
 FAISS_INDEX_PATH_MCPGW = _registry_server_data_path / "service_index.faiss"
 FAISS_METADATA_PATH_MCPGW = _registry_server_data_path / "service_index_metadata.json"
+FAISS_TOOL_INDEX_PATH_MCPGW = _registry_server_data_path / "tool_index.faiss"
+FAISS_TOOL_METADATA_PATH_MCPGW = _registry_server_data_path / "tool_index_metadata.json"
 EMBEDDING_DIMENSION_MCPGW = 384 # Should match the one used in main registry
 
+def _build_id_to_service_path_mcpgw(faiss_metadata: Dict[str, Any]) -> Dict[int, str]:
+    """Returns the FAISS id -> service_path map for loaded registry metadata.
+
+    Uses the "id_to_path" map persisted by the registry when present and
+    derives it from the per-path entries for metadata written by older versions.
+    """
+    persisted = faiss_metadata.get("id_to_path")
+    if persisted is not None:
+        return {int(faiss_id): path for faiss_id, path in persisted.items()}
+
+    id_to_service_path = {}
+    for service_path, meta_item in faiss_metadata.get("metadata", {}).items():
+        if "id" in meta_item:
+            id_to_service_path[meta_item["id"]] = service_path
+        else:
+            logger.warning(f"MCPGW: Metadata for service {service_path} missing 'id' field. Skipping.")
+    return id_to_service_path
+
+
+def _read_tool_embeddings_mcpgw() -> Tuple[np.ndarray, Dict[Tuple[str, str], Tuple[int, str]]]:
+    """Reads the registry's per-tool FAISS index into a dense matrix.
+
+    Returns:
+        Tuple of (normalized tool embedding matrix, {(service_path, tool_name): (row, embedded text)})
+    """
+    tool_index = faiss.read_index(str(FAISS_TOOL_INDEX_PATH_MCPGW))
+    with open(FAISS_TOOL_METADATA_PATH_MCPGW, "r") as f:
+        tool_metadata = json.load(f)
+
+    if tool_index.ntotal:
+        faiss_ids = faiss.vector_to_array(tool_index.id_map)
+        matrix = tool_index.index.reconstruct_n(0, tool_index.ntotal)
+    else:
+        faiss_ids = np.empty(0, dtype=np.int64)
+        matrix = np.empty((0, tool_index.d), dtype=np.float32)
+    row_by_id = {int(faiss_id): row for row, faiss_id in enumerate(faiss_ids)}
+
+    tool_rows = {}
+    for service_path, tools in tool_metadata.get("metadata", {}).items():
+        for tool_name, entry in tools.items():
+            row = row_by_id.get(entry.get("id"))
+            if row is not None:
+                tool_rows[(service_path, tool_name)] = (row, entry.get("text_for_embedding"))
+    return np.ascontiguousarray(matrix, dtype=np.float32), tool_rows
+
+
 async def load_faiss_data_for_mcpgw():
     """Loads the FAISS index, metadata, and embedding model for the mcpgw server.
        Reloads data if underlying files have changed since last load.
     """
-    global _embedding_model_mcpgw, _faiss_index_mcpgw, _faiss_metadata_mcpgw
+    global _embedding_model_mcpgw, _faiss_index_mcpgw, _faiss_metadata_mcpgw, _id_to_service_path_mcpgw
     global _last_faiss_index_mtime, _last_faiss_metadata_mtime
+    global _tool_embeddings_mcpgw, _tool_rows_mcpgw, _last_tool_index_mtime, _last_tool_metadata_mtime
     
     async with _faiss_data_lock:
         # Load embedding model if not already loaded (model doesn't change on disk typically)
@@ -609,6 +662,7 @@ async def load_faiss_data_for_mcpgw():
                     with open(FAISS_METADATA_PATH_MCPGW, "r") as f:
                         content = await asyncio.to_thread(f.read)
                         _faiss_metadata_mcpgw = await asyncio.to_thread(json.loads, content)
+                    _id_to_service_path_mcpgw = _build_id_to_service_path_mcpgw(_faiss_metadata_mcpgw)
                     _last_faiss_metadata_mtime = current_metadata_mtime
                     metadata_file_changed = True
                     logger.info(f"MCPGW: FAISS metadata loaded. Paths: {len(_faiss_metadata_mcpgw.get('metadata', {})) if _faiss_metadata_mcpgw else 'N/A'}")
@@ -623,6 +677,35 @@ async def load_faiss_data_for_mcpgw():
             _faiss_metadata_mcpgw = None
             _last_faiss_metadata_mtime = None
 
+        # Check precomputed per-tool index written by the registry next to the service index
+        if FAISS_TOOL_INDEX_PATH_MCPGW.exists() and FAISS_TOOL_METADATA_PATH_MCPGW.exists():
+            try:
+                current_tool_index_mtime = await asyncio.to_thread(os.path.getmtime, FAISS_TOOL_INDEX_PATH_MCPGW)
+                current_tool_metadata_mtime = await asyncio.to_thread(os.path.getmtime, FAISS_TOOL_METADATA_PATH_MCPGW)
+                if (
+                    _tool_embeddings_mcpgw is None
+                    or _last_tool_index_mtime is None
+                    or current_tool_index_mtime > _last_tool_index_mtime
+                    or current_tool_metadata_mtime > _last_tool_metadata_mtime
+                ):
+                    logger.info(f"MCPGW: Tool index {FAISS_TOOL_INDEX_PATH_MCPGW} has changed or not loaded. Reloading...")
+                    _tool_embeddings_mcpgw, _tool_rows_mcpgw = await asyncio.to_thread(_read_tool_embeddings_mcpgw)
+                    _last_tool_index_mtime = current_tool_index_mtime
+                    _last_tool_metadata_mtime = current_tool_metadata_mtime
+                    logger.info(f"MCPGW: Tool index loaded. Tools: {len(_tool_rows_mcpgw)}")
+                else:
+                    logger.debug("MCPGW: Tool index unchanged since last load.")
+            except Exception as e:
+                logger.error(f"MCPGW: Failed to load or check tool index: {e}", exc_info=True)
+                _tool_embeddings_mcpgw = None
+                _tool_rows_mcpgw = {}
+                _last_tool_index_mtime = None
+        else:
+            logger.info(f"MCPGW: Tool index {FAISS_TOOL_INDEX_PATH_MCPGW} does not exist. Candidate tools will be encoded per query.")
+            _tool_embeddings_mcpgw = None
+            _tool_rows_mcpgw = {}
+            _last_tool_index_mtime = None
+
 # Call it once at startup, but allow lazy loading if it fails initially
 # This direct call might be problematic if server.py is imported elsewhere before app runs.
 # A better approach would be a startup event if FastMCP supports it.
@@ -1354,6 +1437,8 @@ async def intelligent_tool_finder(
         raise Exception("MCPGW: FAISS metadata is not available or in unexpected format. Cannot perform intelligent search.")
 
     registry_faiss_metadata = _faiss_metadata_mcpgw["metadata"] # This is {service_path: {id, text, full_server_info}}
+    tool_embeddings = _tool_embeddings_mcpgw
+    tool_rows = _tool_rows_mcpgw
 
     # Determine which services to process based on whether we're doing semantic search
     services_to_process = []
@@ -1378,20 +1463,15 @@ async def intelligent_tool_finder(
             logger.error(f"MCPGW: Error searching FAISS index: {e}", exc_info=True)
             raise Exception(f"MCPGW: Error searching FAISS index: {e}")
 
-        # Create a reverse map from FAISS internal ID to service_path for quick lookup
-        id_to_service_path_map = {}
-        for Svc_path, meta_item in registry_faiss_metadata.items():
-            if "id" in meta_item:
-                id_to_service_path_map[meta_item["id"]] = Svc_path
-            else:
-                logger.warning(f"MCPGW: Metadata for service {Svc_path} missing 'id' field. Skipping.")
+        # Reverse map from FAISS internal ID to service_path, maintained on metadata reload
+        id_to_service_path_map = _id_to_service_path_mcpgw
 
         # Extract service paths from FAISS results
         for i in range(len(faiss_ids[0])):
             faiss_id = faiss_ids[0][i]
             if faiss_id == -1: # FAISS uses -1 for no more results or if k > ntotal
                 continue
-            service_path = id_to_service_path_map.get(faiss_id)
+            service_path = id_to_service_path_map.get(int(faiss_id))
             if service_path:
                 services_to_process.append(service_path)
                 logger.debug(f"MCPGW: Found service_path {service_path} for FAISS ID {faiss_id}")
@@ -1479,18 +1559,39 @@ async def intelligent_tool_finder(
 
     # Apply semantic ranking if we have a natural language query
     if use_semantic_ranking:
-        # 4. Embed all candidate tool descriptions
-        logger.info(f"MCPGW: Embedding {len(candidate_tools)} candidate tools (after scope filtering) for secondary ranking.")
-        try:
-            tool_texts = [tool["text_for_embedding"] for tool in candidate_tools]
-            tool_embeddings = await asyncio.to_thread(_embedding_model_mcpgw.encode, tool_texts)
-            tool_embeddings_np = np.array(tool_embeddings, dtype=np.float32)
-        except Exception as e:
-            logger.error(f"MCPGW: Error encoding tool descriptions: {e}", exc_info=True)
-            raise Exception(f"MCPGW: Error encoding tool descriptions: {e}")
-
-        # 5. Calculate cosine similarity between query and each tool embedding
-        similarities = cosine_similarity(query_embedding_np, tool_embeddings_np)[0] # Get the first row (query vs all tools)
+        # 4. Look up precomputed tool embeddings; encode only tools missing from the tool index
+        query_vector = query_embedding_np[0]
+        query_norm = np.linalg.norm(query_vector)
+        if query_norm > 0:
+            query_vector = query_vector / query_norm
+
+        rows = np.full(len(candidate_tools), -1, dtype=np.int64)
+        if tool_embeddings is not None and tool_embeddings.shape[1] == query_vector.shape[0]:
+            for i, tool in enumerate(candidate_tools):
+                cached = tool_rows.get((tool["service_path"], tool["tool_name"]))
+                if cached and cached[1] == tool["text_for_embedding"]:
+                    rows[i] = cached[0]
+        precomputed = rows >= 0
+        missing = np.flatnonzero(~precomputed)
+
+        # 5. Cosine similarity as one matrix-vector product over normalized embeddings
+        similarities = np.zeros(len(candidate_tools), dtype=np.float32)
+        if precomputed.any():
+            similarities[precomputed] = tool_embeddings[rows[precomputed]] @ query_vector
+        if missing.size:
+            logger.info(f"MCPGW: Encoding {missing.size} of {len(candidate_tools)} candidate tools not in the precomputed tool index.")
+            try:
+                tool_texts = [candidate_tools[i]["text_for_embedding"] for i in missing]
+                tool_embeddings_np = np.array(
+                    await asyncio.to_thread(_embedding_model_mcpgw.encode, tool_texts),
+                    dtype=np.float32,
+                )
+            except Exception as e:
+                logger.error(f"MCPGW: Error encoding tool descriptions: {e}", exc_info=True)
+                raise Exception(f"MCPGW: Error encoding tool descriptions: {e}")
+            tool_norms = np.linalg.norm(tool_embeddings_np, axis=1, keepdims=True)
+            tool_norms[tool_norms == 0] = 1.0
+            similarities[missing] = (tool_embeddings_np / tool_norms) @ query_vector
 
         # 6. Add similarity score to each tool and sort
         ranked_tools = []
@@ -53,6 +53,35 @@ def _setup_auth_server_mocks() -> None:
 _setup_auth_server_mocks()
 
 
+@pytest.fixture(autouse=True)
+def _clear_auth_decision_cache():
+    """
+    Clear the /validate decision cache around each test.
+
+    Tests reuse the same bearer tokens with different mocks, so a decision
+    cached by one test must not leak into the next.
+    """
+    yield
+    server_module = sys.modules.get("auth_server.server")
+    if server_module is not None:
+        server_module.auth_decision_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_jwks_managers():
+    """
+    Reset the shared JWKS managers around each test.
+
+    Managers are shared per JWKS URL, so keys fetched with one test's mocked
+    HTTP responses must not be reused by the next test.
+    """
+    yield
+    for module_name in ("auth_server.providers.base", "providers.base"):
+        base_module = sys.modules.get(module_name)
+        if base_module is not None:
+            base_module.clear_jwks_managers()
+
+
 # =============================================================================
 # MOCK JWKS FIXTURES
 # =============================================================================
@@ -328,7 +357,7 @@ def mock_cognito_provider():
         Mock Cognito provider
     """
     provider = MagicMock()
-    provider.validate_token = MagicMock(return_value={
+    provider.validate_token = AsyncMock(return_value={
         "valid": True,
         "method": "cognito",
         "username": "testuser",
@@ -342,13 +371,13 @@ def mock_cognito_provider():
             "email": "testuser@example.com"
         }
     })
-    provider.get_provider_info = MagicMock(return_value={
+    provider.get_provider_info = AsyncMock(return_value={
         "provider_type": "cognito",
         "region": "us-east-1",
         "user_pool_id": "us-east-1_TEST12345",
         "client_id": "test-client-id"
     })
-    provider.get_jwks = MagicMock(return_value={
+    provider.get_jwks = AsyncMock(return_value={
         "keys": [{"kid": "test-key", "kty": "RSA"}]
     })
 
@@ -364,7 +393,7 @@ def mock_keycloak_provider():
         Mock Keycloak provider
     """
     provider = MagicMock()
-    provider.validate_token = MagicMock(return_value={
+    provider.validate_token = AsyncMock(return_value={
         "valid": True,
         "method": "keycloak",
         "username": "testuser",
@@ -378,13 +407,13 @@ def mock_keycloak_provider():
             "groups": ["users", "admins"]
         }
     })
-    provider.get_provider_info = MagicMock(return_value={
+    provider.get_provider_info = AsyncMock(return_value={
         "provider_type": "keycloak",
         "realm": "test-realm",
         "keycloak_url": "http://localhost:8080",
         "client_id": "test-client"
     })
-    provider.get_jwks = MagicMock(return_value={
+    provider.get_jwks = AsyncMock(return_value={
         "keys": [{"kid": "test-key", "kty": "RSA"}]
     })
 
@@ -400,7 +429,7 @@ def mock_entra_provider():
         Mock Entra ID provider
     """
     provider = MagicMock()
-    provider.validate_token = MagicMock(return_value={
+    provider.validate_token = AsyncMock(return_value={
         "valid": True,
         "method": "entra",
         "username": "testuser@example.com",
@@ -414,12 +443,12 @@ def mock_entra_provider():
             "groups": ["group-id-1", "group-id-2"]
         }
     })
-    provider.get_provider_info = MagicMock(return_value={
+    provider.get_provider_info = AsyncMock(return_value={
         "provider_type": "entra",
         "tenant_id": "test-tenant-id",
         "client_id": "test-client-id"
     })
-    provider.get_jwks = MagicMock(return_value={
+    provider.get_jwks = AsyncMock(return_value={
         "keys": [{"kid": "test-key", "kty": "RSA"}]
     })
 
@@ -92,7 +92,7 @@ class MockKeycloakProvider:
 
         raise ValueError("Invalid Keycloak token")
 
-    def get_provider_info(self) -> dict[str, Any]:
+    async def get_provider_info(self) -> dict[str, Any]:
         """
         Get provider information.
 
@@ -199,7 +199,7 @@ class MockCognitoValidator:
 
         raise ValueError("Invalid Cognito token")
 
-    def get_provider_info(self) -> dict[str, Any]:
+    async def get_provider_info(self) -> dict[str, Any]:
         """
         Get provider information.
 
@@ -1,11 +1,13 @@
 """
 Unit tests for auth_server/providers/base.py
 
-Tests the abstract base class interface for authentication providers.
+Tests the abstract base class interface for authentication providers and
+the shared JWKS manager.
 """
 
 import logging
 from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -63,7 +65,8 @@ class TestAuthProviderInterface:
 class TestConcreteImplementation:
     """Tests for concrete implementation of AuthProvider."""
 
-    def test_concrete_provider_implementation(self):
+    @pytest.mark.asyncio
+    async def test_concrete_provider_implementation(self):
         """Test that a concrete provider implements all methods."""
         from auth_server.providers.base import AuthProvider
 
@@ -71,16 +74,16 @@ class TestConcreteImplementation:
         class TestProvider(AuthProvider):
             """Test implementation of AuthProvider."""
 
-            def validate_token(self, token: str, **kwargs: Any) -> dict[str, Any]:
+            async def validate_token(self, token: str, **kwargs: Any) -> dict[str, Any]:
                 return {"valid": True, "username": "test"}
 
-            def get_jwks(self) -> dict[str, Any]:
+            async def get_jwks(self) -> dict[str, Any]:
                 return {"keys": []}
 
-            def exchange_code_for_token(self, code: str, redirect_uri: str) -> dict[str, Any]:
+            async def exchange_code_for_token(self, code: str, redirect_uri: str) -> dict[str, Any]:
                 return {"access_token": "test"}
 
-            def get_user_info(self, access_token: str) -> dict[str, Any]:
+            async def get_user_info(self, access_token: str) -> dict[str, Any]:
                 return {"username": "test"}
 
             def get_auth_url(self, redirect_uri: str, state: str, scope: str = None) -> str:
@@ -89,13 +92,13 @@ class TestConcreteImplementation:
             def get_logout_url(self, redirect_uri: str) -> str:
                 return "https://auth.example.com/logout"
 
-            def refresh_token(self, refresh_token: str) -> dict[str, Any]:
+            async def refresh_token(self, refresh_token: str) -> dict[str, Any]:
                 return {"access_token": "new_token"}
 
-            def validate_m2m_token(self, token: str) -> dict[str, Any]:
+            async def validate_m2m_token(self, token: str) -> dict[str, Any]:
                 return {"valid": True}
 
-            def get_m2m_token(
+            async def get_m2m_token(
                 self,
                 client_id: str = None,
                 client_secret: str = None,
@@ -107,15 +110,15 @@ class TestConcreteImplementation:
         provider = TestProvider()
 
         # Assert - can call all methods
-        assert provider.validate_token("token")["valid"] is True
-        assert "keys" in provider.get_jwks()
-        assert "access_token" in provider.exchange_code_for_token("code", "uri")
-        assert "username" in provider.get_user_info("token")
+        assert (await provider.validate_token("token"))["valid"] is True
+        assert "keys" in await provider.get_jwks()
+        assert "access_token" in await provider.exchange_code_for_token("code", "uri")
+        assert "username" in await provider.get_user_info("token")
         assert provider.get_auth_url("uri", "state").startswith("https://")
         assert provider.get_logout_url("uri").startswith("https://")
-        assert "access_token" in provider.refresh_token("token")
-        assert provider.validate_m2m_token("token")["valid"] is True
-        assert "access_token" in provider.get_m2m_token()
+        assert "access_token" in await provider.refresh_token("token")
+        assert (await provider.validate_m2m_token("token"))["valid"] is True
+        assert "access_token" in await provider.get_m2m_token()
 
 
 class TestAuthProviderDocstrings:
@@ -216,3 +219,174 @@ class TestAuthProviderTypeHints:
         assert 'redirect_uri' in sig.parameters
         assert sig.parameters['code'].annotation is str
         assert sig.parameters['redirect_uri'].annotation is str
+
+
+# =============================================================================
+# JWKS MANAGER TESTS
+# =============================================================================
+
+
+def _mock_jwks_http_response(jwks: dict) -> MagicMock:
+    """Create a mock HTTP response returning the given JWKS."""
+    response = MagicMock()
+    response.json.return_value = jwks
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestJWKSManager:
+    """Tests for JWKSManager key caching and refresh."""
+
+    @pytest.mark.asyncio
+    @patch('jwt.PyJWK')
+    async def test_signing_key_indexed_by_kid(self, mock_pyjwk, mock_jwks_response):
+        """Test keys are parsed once and looked up by kid."""
+        from auth_server.providers.base import JWKSManager
+
+        # Arrange
+        mock_client = AsyncMock()
+        mock_client.get.return_value = _mock_jwks_http_response(mock_jwks_response)
+        mock_pyjwk.side_effect = lambda key: MagicMock(key=f"parsed-{key['kid']}")
+        manager = JWKSManager("https://idp.example.com/jwks")
+
+        # Act
+        with patch('auth_server.providers.base.get_http_client', return_value=mock_client):
+            key1 = await manager.get_signing_key("test-key-id-1")
+            key2 = await manager.get_signing_key("test-key-id-2")
+
+        # Assert
+        assert key1 == "parsed-test-key-id-1"
+        assert key2 == "parsed-test-key-id-2"
+        assert mock_client.get.call_count == 1
+        assert mock_pyjwk.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('jwt.PyJWK')
+    async def test_unknown_kid_refreshes_once(self, mock_pyjwk, mock_jwks_response):
+        """Test an unknown kid triggers one rate-limited refresh."""
+        from auth_server.providers.base import JWKSManager
+
+        # Arrange
+        rotated = {"keys": mock_jwks_response["keys"] + [{"kid": "rotated-key", "kty": "RSA"}]}
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [
+            _mock_jwks_http_response(mock_jwks_response),
+            _mock_jwks_http_response(rotated),
+        ]
+        mock_pyjwk.side_effect = lambda key: MagicMock(key=key["kid"])
+        manager = JWKSManager("https://idp.example.com/jwks", min_refresh_interval=0)
+
+        # Act
+        with patch('auth_server.providers.base.get_http_client', return_value=mock_client):
+            await manager.get_jwks()
+            rotated_key = await manager.get_signing_key("rotated-key")
+
+        # Assert
+        assert rotated_key == "rotated-key"
+        assert mock_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('jwt.PyJWK')
+    async def test_unknown_kid_refresh_is_rate_limited(self, mock_pyjwk, mock_jwks_response):
+        """Test repeated unknown kids do not refetch within the minimum interval."""
+        from auth_server.providers.base import JWKSManager
+
+        # Arrange
+        mock_client = AsyncMock()
+        mock_client.get.return_value = _mock_jwks_http_response(mock_jwks_response)
+        manager = JWKSManager("https://idp.example.com/jwks", min_refresh_interval=60)
+
+        # Act
+        with patch('auth_server.providers.base.get_http_client', return_value=mock_client):
+            for _ in range(5):
+                assert await manager.get_signing_key("unknown-kid") is None
+
+        # Assert - only the initial fetch happened
+        assert mock_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch('jwt.PyJWK')
+    async def test_concurrent_cold_lookups_share_one_fetch(self, mock_pyjwk, mock_jwks_response):
+        """Test concurrent lookups on a cold cache wait on a single JWKS fetch."""
+        import asyncio
+
+        from auth_server.providers.base import JWKSManager
+
+        # Arrange
+        release = asyncio.Event()
+
+        async def slow_get(*args, **kwargs):
+            await release.wait()
+            return _mock_jwks_http_response(mock_jwks_response)
+
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = slow_get
+        mock_pyjwk.side_effect = lambda key: MagicMock(key=key["kid"])
+        manager = JWKSManager("https://idp.example.com/jwks")
+
+        # Act
+        with patch('auth_server.providers.base.get_http_client', return_value=mock_client):
+            lookups = [
+                asyncio.create_task(manager.get_signing_key("test-key-id-1"))
+                for _ in range(10)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            keys = await asyncio.gather(*lookups)
+
+        # Assert
+        assert keys == ["test-key-id-1"] * 10
+        assert mock_client.get.call_count == 1
+
+    def test_managers_shared_per_url(self):
+        """Test providers for the same JWKS URL share one manager."""
+        from auth_server.providers.base import get_jwks_manager
+
+        manager_a = get_jwks_manager("https://idp.example.com/jwks")
+        manager_b = get_jwks_manager("https://idp.example.com/jwks")
+        manager_c = get_jwks_manager("https://other.example.com/jwks")
+
+        assert manager_a is manager_b
+        assert manager_a is not manager_c
+
+
+# =============================================================================
+# ASYNC I/O HELPER TESTS
+# =============================================================================
+
+
+class TestAsyncIOHelpers:
+    """Tests for the pooled HTTP client and the blocking worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_run_blocking_runs_off_event_loop(self):
+        """Test run_blocking executes the callable on a worker thread."""
+        import threading
+
+        from auth_server.providers.base import run_blocking
+
+        # Act
+        thread_name, value = await run_blocking(
+            lambda x, y=0: (threading.current_thread().name, x + y), 1, y=2
+        )
+
+        # Assert
+        assert thread_name.startswith("auth-blocking")
+        assert value == 3
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_shared_until_closed(self):
+        """Test the pooled client is reused and recreated after close."""
+        from auth_server.providers.base import close_http_client, get_http_client
+
+        # Act
+        client1 = get_http_client()
+        client2 = get_http_client()
+        await close_http_client()
+        client3 = get_http_client()
+
+        # Assert
+        assert client1 is client2
+        assert client1.is_closed
+        assert client3 is not client1
+        await close_http_client()
@@ -0,0 +1,265 @@
+"""
+Unit tests for auth_server/decision_cache.py
+
+Tests the /validate authorization decision cache: key construction, TTL and
+token-expiry bounds, LRU eviction, invalidation and hit-rate statistics, and
+that denials and session cookies are never cached.
+"""
+
+import logging
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+logger = logging.getLogger(__name__)
+
+
+# Mark all tests in this file
+pytestmark = [pytest.mark.unit, pytest.mark.auth]
+
+
+# =============================================================================
+# KEY AND EXPIRY HELPERS
+# =============================================================================
+
+
+class TestDecisionKey:
+    """Tests for build_decision_key and token_expiry."""
+
+    def test_key_requires_bearer_token(self):
+        """Test that requests without a bearer token are never cached."""
+        from auth_server.decision_cache import build_decision_key
+
+        assert build_decision_key(None, ("server", None, "initialize", None)) is None
+        assert build_decision_key("Basic abc", ("server", None, "initialize", None)) is None
+
+    def test_key_depends_on_target_and_hides_token(self):
+        """Test that the key changes per target and does not contain the token."""
+        from auth_server.decision_cache import build_decision_key
+
+        key_a = build_decision_key("Bearer tok", ("srv", "tools/call", "tools/call", "a"))
+        key_b = build_decision_key("Bearer tok", ("srv", "tools/call", "tools/call", "b"))
+
+        assert key_a != key_b
+        assert "tok" not in key_a
+
+    def test_token_expiry(self):
+        """Test expiry extraction from expires_at and the raw claims."""
+        from auth_server.decision_cache import token_expiry
+
+        assert token_expiry({"expires_at": 100}) == 100.0
+        assert token_expiry({"data": {"exp": 200}}) == 200.0
+        assert token_expiry({"data": {}}) is None
+
+
+# =============================================================================
+# CACHE BEHAVIOUR TESTS
+# =============================================================================
+
+
+class TestAuthDecisionCache:
+    """Tests for AuthDecisionCache."""
+
+    def test_put_and_get(self):
+        """Test a cached decision is returned and counted as a hit."""
+        from auth_server.decision_cache import AuthDecisionCache, CachedDecision
+
+        cache = AuthDecisionCache(max_entries=10, ttl_seconds=60)
+        decision = CachedDecision({"valid": True})
+
+        assert cache.get("k") is None
+        cache.put("k", decision, expires_at=time.time() + 3600)
+
+        assert cache.get("k") == decision
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entry_never_outlives_token(self):
+        """Test that entries expire at the token's exp even within the TTL."""
+        from auth_server.decision_cache import AuthDecisionCache, CachedDecision
+
+        cache = AuthDecisionCache(max_entries=10, ttl_seconds=3600)
+        now = time.time()
+
+        cache.put("expired", CachedDecision({}), expires_at=now - 1)
+        cache.put("short", CachedDecision({}), expires_at=now + 5)
+        cache.put("unknown", CachedDecision({}), expires_at=None)
+
+        assert cache.get("expired") is None
+        assert cache.get("unknown") is None
+        with patch("auth_server.decision_cache.time.time", return_value=now + 10):
+            assert cache.get("short") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """Test the least recently used decision is evicted when full."""
+        from auth_server.decision_cache import AuthDecisionCache, CachedDecision
+
+        cache = AuthDecisionCache(max_entries=2, ttl_seconds=60)
+        exp = time.time() + 3600
+        cache.put("a", CachedDecision({}), exp)
+        cache.put("b", CachedDecision({}), exp)
+        cache.get("a")
+        cache.put("c", CachedDecision({}), exp)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_clear_and_disabled(self):
+        """Test invalidation and that max_entries=0 disables caching."""
+        from auth_server.decision_cache import AuthDecisionCache, CachedDecision
+
+        cache = AuthDecisionCache(max_entries=10, ttl_seconds=60)
+        exp = time.time() + 3600
+        cache.put("a", CachedDecision({}), exp)
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.get_stats()["invalidations"] == 1
+
+        disabled = AuthDecisionCache(max_entries=0)
+        disabled.put("a", CachedDecision({}), exp)
+        assert disabled.get("a") is None
+
+
+# =============================================================================
+# VALIDATE ENDPOINT INTEGRATION
+# =============================================================================
+
+
+class TestValidateDecisionCaching:
+    """Tests for decision caching in the /validate endpoint."""
+
+    @patch("auth_server.server.get_auth_provider")
+    def test_repeated_request_skips_validation(
+        self,
+        mock_get_provider,
+        mock_cognito_provider,
+        auth_env_vars,
+        mock_scope_repository_with_data,
+    ):
+        """Test that a repeated request is answered from the cache."""
+        mock_cognito_provider.validate_token.return_value = {
+            **mock_cognito_provider.validate_token.return_value,
+            "expires_at": time.time() + 3600,
+        }
+        mock_get_provider.return_value = mock_cognito_provider
+
+        import auth_server.server as server_module
+
+        headers = {
+            "Authorization": "Bearer cached-token",
+            "X-Original-URL": "https://example.com/test-server/initialize",
+        }
+        with patch(
+            "auth_server.server.get_scope_repository", return_value=mock_scope_repository_with_data
+        ):
+            client = TestClient(server_module.app)
+            hits_before = server_module.auth_decision_cache.get_stats()["hits"]
+
+            first = client.get("/validate", headers=headers)
+            second = client.get("/validate", headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["X-Scopes"] == first.headers["X-Scopes"]
+        assert mock_cognito_provider.validate_token.call_count == 1
+        assert server_module.auth_decision_cache.get_stats()["hits"] == hits_before + 1
+
+    def _validate_twice(
+        self,
+        headers: dict,
+        scope_repository,
+    ) -> tuple:
+        """Send the same /validate request twice and return both responses."""
+        import auth_server.server as server_module
+
+        with patch("auth_server.server.get_scope_repository", return_value=scope_repository):
+            client = TestClient(server_module.app)
+            return client.get("/validate", headers=headers), client.get("/validate", headers=headers)
+
+    @patch("auth_server.server.get_auth_provider")
+    def test_token_without_expiry_is_not_cached(
+        self,
+        mock_get_provider,
+        mock_cognito_provider,
+        auth_env_vars,
+        mock_scope_repository_with_data,
+    ):
+        """Test that a decision is not cached when the token expiry is unknown."""
+        mock_get_provider.return_value = mock_cognito_provider
+
+        first, second = self._validate_twice(
+            {
+                "Authorization": "Bearer no-expiry-token",
+                "X-Original-URL": "https://example.com/test-server/initialize",
+            },
+            mock_scope_repository_with_data,
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_cognito_provider.validate_token.call_count == 2
+
+    @patch("auth_server.server.get_auth_provider")
+    def test_denial_is_not_cached(
+        self,
+        mock_get_provider,
+        mock_cognito_provider,
+        auth_env_vars,
+        mock_scope_repository_with_data,
+    ):
+        """Test that a denied request is re-evaluated, so a scope grant applies at once."""
+        mock_cognito_provider.validate_token.return_value = {
+            **mock_cognito_provider.validate_token.return_value,
+            "expires_at": time.time() + 3600,
+        }
+        mock_get_provider.return_value = mock_cognito_provider
+
+        first, second = self._validate_twice(
+            {
+                "Authorization": "Bearer denied-token",
+                "X-Original-URL": "https://example.com/other-server/initialize",
+            },
+            mock_scope_repository_with_data,
+        )
+
+        assert first.status_code == 403
+        assert second.status_code == 403
+        assert mock_cognito_provider.validate_token.call_count == 2
+
+    def test_session_cookie_is_not_cached(
+        self,
+        auth_env_vars,
+        mock_scope_repository_with_data,
+    ):
+        """Test that session cookie requests are re-validated so a logout applies at once."""
+        session_result = {
+            "valid": True,
+            "username": "testuser",
+            "scopes": ["read:servers"],
+            "method": "session_cookie",
+            "groups": [],
+            "client_id": "",
+            "expires_at": time.time() + 3600,
+        }
+        with patch(
+            "auth_server.server.validate_session_cookie",
+            new=AsyncMock(return_value=session_result),
+        ) as mock_validate_cookie:
+            first, second = self._validate_twice(
+                {
+                    "Cookie": "mcp_gateway_session=some-session-value",
+                    "X-Original-URL": "https://example.com/test-server/initialize",
+                },
+                mock_scope_repository_with_data,
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_validate_cookie.call_count == 2
@@ -0,0 +1,224 @@
+"""
+Unit tests for auth_server/scope_authorizer.py
+
+Tests compiling the scopes configuration into the in-memory authorization
+table, the access decisions made from it, and the periodic reload that keeps
+every replica's table current.
+"""
+
+import logging
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+
+# Mark all tests in this file
+pytestmark = [pytest.mark.unit, pytest.mark.auth]
+
+
+# =============================================================================
+# COMPILED TABLE TESTS
+# =============================================================================
+
+
+class TestCompiledScopeTable:
+    """Tests for CompiledScopeTable."""
+
+    def test_from_config_skips_non_server_sections(self, mock_scopes_config):
+        """Test that group_mappings and UI-Scopes are not compiled as scopes."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        # Arrange
+        config = dict(mock_scopes_config)
+        config["UI-Scopes"] = {"admin:all": {"list_service": ["all"]}}
+
+        # Act
+        table = CompiledScopeTable.from_config(config)
+
+        # Assert
+        assert table.scope_count == 3
+
+    def test_method_allowed(self, mock_scopes_config):
+        """Test access to a listed method."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(mock_scopes_config)
+
+        assert table.is_allowed("test-server", "initialize", None, ["read:servers"]) == (
+            "read:servers"
+        )
+        assert table.is_allowed("other-server", "initialize", None, ["read:servers"]) is None
+
+    def test_trailing_slash_normalized(self):
+        """Test that server names match regardless of trailing slashes."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(
+            {"scope-a": [{"server": "currenttime/", "methods": ["initialize"], "tools": []}]}
+        )
+
+        assert table.is_allowed("currenttime", "initialize", None, ["scope-a"]) == "scope-a"
+        assert table.is_allowed("currenttime/", "initialize", None, ["scope-a"]) == "scope-a"
+
+    def test_tools_call_requires_listed_tool(self):
+        """Test that tools/call checks the tool name, not just the method."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(
+            {
+                "scope-a": [
+                    {
+                        "server": "fininfo",
+                        "methods": ["tools/call"],
+                        "tools": ["get_stock_aggregates"],
+                    }
+                ]
+            }
+        )
+
+        assert table.is_allowed("fininfo", "tools/call", "get_stock_aggregates", ["scope-a"])
+        assert table.is_allowed("fininfo", "tools/call", "print_stock_data", ["scope-a"]) is None
+
+    def test_wildcards(self, mock_scopes_config):
+        """Test wildcard server, method and tool entries."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(mock_scopes_config)
+
+        assert table.is_allowed("any-server", "initialize", None, ["admin:all"]) == "admin:all"
+        assert table.is_allowed("test-server", "tools/call", "test-tool", ["write:servers"]) == (
+            "write:servers"
+        )
+        assert table.is_allowed("test-server", "tools/call", "test-tool", ["read:servers"]) is None
+
+    def test_rules_for_same_server_are_merged(self):
+        """Test that multiple entries for one server are combined."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(
+            {
+                "scope-a": [
+                    {"server": "mcpgw", "methods": ["initialize"], "tools": []},
+                    {"server": "mcpgw/", "methods": ["tools/list"], "tools": None},
+                ]
+            }
+        )
+
+        assert table.is_allowed("mcpgw", "initialize", None, ["scope-a"]) == "scope-a"
+        assert table.is_allowed("mcpgw", "tools/list", None, ["scope-a"]) == "scope-a"
+
+    def test_documentdb_access_rules_format(self):
+        """Test the grouped access_rules format stored in DocumentDB."""
+        from auth_server.scope_authorizer import CompiledScopeTable
+
+        table = CompiledScopeTable.from_config(
+            {
+                "scope-a": [
+                    {
+                        "scope_name": "scope-a",
+                        "access_rules": [
+                            {"server": "currenttime", "methods": ["initialize"], "tools": []}
+                        ],
+                    },
+                    {"agents": {"actions": ["list_agents"]}},
+                ]
+            }
+        )
+
+        assert table.is_allowed("currenttime", "initialize", None, ["scope-a"]) == "scope-a"
+        assert table.scope_count == 1
+
+
+# =============================================================================
+# SERVER INTEGRATION TESTS
+# =============================================================================
+
+
+class TestValidateServerToolAccessWithTable:
+    """Tests for validate_server_tool_access using the compiled table."""
+
+    @pytest.mark.asyncio
+    async def test_uses_table_without_repository_calls(self, mock_scopes_config):
+        """Test that no repository lookups happen once the table is loaded."""
+        import scope_authorizer
+        from auth_server.server import validate_server_tool_access
+
+        mock_repo = AsyncMock()
+        scope_authorizer.rebuild_scope_table(mock_scopes_config)
+        try:
+            with patch("auth_server.server.get_scope_repository", return_value=mock_repo):
+                allowed = await validate_server_tool_access(
+                    "test-server", "initialize", None, ["read:servers"]
+                )
+                denied = await validate_server_tool_access(
+                    "other-server", "initialize", None, ["read:servers"]
+                )
+        finally:
+            scope_authorizer.clear_scope_table()
+
+        assert allowed is True
+        assert denied is False
+        mock_repo.get_server_scopes.assert_not_called()
+
+
+# =============================================================================
+# PERIODIC RELOAD TESTS
+# =============================================================================
+
+
+class TestPeriodicScopesReload:
+    """Tests for _reload_scopes_if_changed."""
+
+    @pytest.mark.asyncio
+    async def test_changed_config_recompiles_table(self, mock_scopes_config, monkeypatch):
+        """Test a scope change made through another replica reaches this one's table."""
+        import scope_authorizer
+        import auth_server.server as server_module
+
+        monkeypatch.setattr(server_module, "SCOPES_CONFIG", dict(mock_scopes_config))
+        scope_authorizer.rebuild_scope_table(mock_scopes_config)
+        updated = dict(mock_scopes_config)
+        updated["read:servers"] = [
+            {"server": "other-server", "methods": ["initialize"], "tools": []}
+        ]
+        try:
+            with patch(
+                "auth_server.server.reload_scopes_config", AsyncMock(return_value=updated)
+            ):
+                changed = await server_module._reload_scopes_if_changed()
+                unchanged = await server_module._reload_scopes_if_changed()
+
+            allowed = scope_authorizer.get_scope_table().is_allowed(
+                "other-server", "initialize", None, ["read:servers"]
+            )
+        finally:
+            scope_authorizer.clear_scope_table()
+
+        assert changed is True
+        assert unchanged is False
+        assert allowed
+        assert server_module.SCOPES_CONFIG == updated
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_keeps_table(self, mock_scopes_config, monkeypatch):
+        """Test the empty result of an unreachable repository does not drop the table."""
+        import scope_authorizer
+        import auth_server.server as server_module
+
+        monkeypatch.setattr(server_module, "SCOPES_CONFIG", dict(mock_scopes_config))
+        table = scope_authorizer.rebuild_scope_table(mock_scopes_config)
+        try:
+            with patch(
+                "auth_server.server.reload_scopes_config",
+                AsyncMock(return_value={"group_mappings": {}}),
+            ):
+                changed = await server_module._reload_scopes_if_changed()
+
+            current = scope_authorizer.get_scope_table()
+        finally:
+            scope_authorizer.clear_scope_table()
+
+        assert changed is False
+        assert current is table
@@ -498,8 +498,8 @@ class TestSimplifiedCognitoValidator:
         assert validator.default_region == "us-west-2"
         assert validator._jwks_cache == {}
 
-    @patch("auth_server.server.requests.get")
-    def test_get_jwks_success(self, mock_get, mock_jwks_response):
+    @pytest.mark.asyncio
+    async def test_get_jwks_success(self, mock_jwks_response):
         """Test successful JWKS retrieval."""
         from auth_server.server import SimplifiedCognitoValidator
 
@@ -507,40 +507,44 @@ class TestSimplifiedCognitoValidator:
         mock_response = MagicMock()
         mock_response.json.return_value = mock_jwks_response
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
 
         validator = SimplifiedCognitoValidator()
         user_pool_id = "us-east-1_TEST"
         region = "us-east-1"
 
         # Act
-        jwks = validator._get_jwks(user_pool_id, region)
+        with patch("auth_server.server.get_http_client", return_value=mock_client):
+            jwks = await validator._get_jwks(user_pool_id, region)
 
         # Assert
         assert "keys" in jwks
         assert len(jwks["keys"]) == 2
-        mock_get.assert_called_once()
+        mock_client.get.assert_called_once()
 
-    @patch("auth_server.server.requests.get")
-    def test_get_jwks_cached(self, mock_get, mock_jwks_response):
+    @pytest.mark.asyncio
+    async def test_get_jwks_cached(self, mock_jwks_response):
         """Test JWKS caching."""
         from auth_server.server import SimplifiedCognitoValidator
 
         # Arrange
         mock_response = MagicMock()
         mock_response.json.return_value = mock_jwks_response
-        mock_get.return_value = mock_response
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_response
 
         validator = SimplifiedCognitoValidator()
         user_pool_id = "us-east-1_TEST"
         region = "us-east-1"
 
         # Act - call twice
-        jwks1 = validator._get_jwks(user_pool_id, region)
-        jwks2 = validator._get_jwks(user_pool_id, region)
+        with patch("auth_server.server.get_http_client", return_value=mock_client):
+            jwks1 = await validator._get_jwks(user_pool_id, region)
+            jwks2 = await validator._get_jwks(user_pool_id, region)
 
         # Assert - should only call once due to caching
-        assert mock_get.call_count == 1
+        assert mock_client.get.call_count == 1
         assert jwks1 == jwks2
 
     def test_validate_self_signed_token_valid(self, auth_env_vars, self_signed_token):
@@ -747,7 +751,8 @@ class TestGenerateTokenEndpoint:
 
         # Mock Keycloak provider
         mock_provider = Mock()
-        mock_provider.get_provider_info.return_value = {"provider_type": "keycloak"}
+        mock_provider.get_provider_info = AsyncMock(return_value={"provider_type": "keycloak"})
+        mock_provider.get_m2m_token = AsyncMock()
         # M2M token uses fixed scopes for IdP compatibility, not user-requested scopes
         mock_provider.get_m2m_token.return_value = {
             "access_token": "mock_keycloak_m2m_token",
@@ -836,7 +841,8 @@ class TestGenerateTokenEndpoint:
 
         # Mock Keycloak provider for successful token generation
         mock_provider = Mock()
-        mock_provider.get_provider_info.return_value = {"provider_type": "keycloak"}
+        mock_provider.get_provider_info = AsyncMock(return_value={"provider_type": "keycloak"})
+        mock_provider.get_m2m_token = AsyncMock()
         mock_provider.get_m2m_token.return_value = {
             "access_token": "mock_keycloak_m2m_token",
             "refresh_token": None,
@@ -295,6 +295,7 @@ def mock_server_repository():
     mock = AsyncMock()
     mock.load_all.return_value = {}  # Return empty dict of servers
     mock.list_all.return_value = {}  # Return empty dict of servers, not list
+    mock.get_enabled_servers_with_info.return_value = {}
     mock.get.return_value = None
     mock.save.return_value = None
     mock.delete.return_value = None
@@ -344,6 +345,8 @@ def mock_search_repository():
     mock.hybrid_search.return_value = []
     mock.index_server.return_value = None
     mock.index_agent.return_value = None
+    mock.bulk_index.return_value = 0
+    mock.get_query_cache_stats = MagicMock(return_value={"hits": 0, "misses": 0})
     return mock
 
 
@@ -415,6 +418,25 @@ def mock_all_repositories(
         yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_scope_snapshot():
+    """
+    Start every test without an in-memory scope snapshot.
+
+    Tests that exercise app startup or scope changes publish a snapshot into
+    module state; without this, later tests would read scopes from it instead
+    of from their mocked repository.
+
+    Yields:
+        None
+    """
+    from registry.auth.scope_snapshot import clear_scope_snapshot
+
+    clear_scope_snapshot()
+    yield
+    clear_scope_snapshot()
+
+
 @pytest.fixture
 def sample_server_info() -> dict[str, Any]:
     """
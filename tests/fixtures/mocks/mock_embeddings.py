@@ -80,6 +80,21 @@ class MockEmbeddingsClient:
         logger.debug(f"Generated {len(texts)} mock embeddings, shape={result.shape}")
         return result
 
+    def encode_query(
+        self,
+        texts: list[str],
+    ) -> np.ndarray:
+        """
+        Generate mock embeddings for search queries.
+
+        Args:
+            texts: List of query strings
+
+        Returns:
+            Array of embeddings (shape: [n, dimension])
+        """
+        return self.encode(texts)
+
     def _generate_embedding(
         self,
         text: str
@@ -91,7 +91,8 @@ class MockFaissIndex:
     def search(
         self,
         query_vectors: np.ndarray,
-        k: int
+        k: int,
+        params: Any = None
     ) -> tuple[np.ndarray, np.ndarray]:
         """
         Search for nearest neighbors.
@@ -99,6 +100,7 @@ class MockFaissIndex:
         Args:
             query_vectors: Query vectors (shape: [n, d])
             k: Number of nearest neighbors to return
+            params: Optional MockSearchParameters with an id selector
 
         Returns:
             Tuple of (distances, indices) arrays
@@ -109,7 +111,11 @@ class MockFaissIndex:
             )
 
         n_queries = query_vectors.shape[0]
-        n_vectors = self.ntotal
+        candidate_ids = [
+            vid for vid in self._vectors
+            if params is None or params.sel is None or params.sel.is_member(vid)
+        ]
+        n_vectors = len(candidate_ids)
 
         if n_vectors == 0:
             # No vectors in index, return empty results
@@ -118,7 +124,7 @@ class MockFaissIndex:
             return distances, indices
 
         # Calculate distances for all vectors
-        all_ids = np.array(list(self._vectors.keys()), dtype=np.int64)
+        all_ids = np.array(candidate_ids, dtype=np.int64)
         all_vectors = np.array([self._vectors[vid] for vid in all_ids])
 
         distances_list = []
@@ -218,10 +224,11 @@ class MockIndexIDMap:
     def search(
         self,
         query_vectors: np.ndarray,
-        k: int
+        k: int,
+        params: Any = None
     ) -> tuple[np.ndarray, np.ndarray]:
         """Search for nearest neighbors."""
-        return self.index.search(query_vectors, k)
+        return self.index.search(query_vectors, k, params=params)
 
     def remove_ids(
         self,
@@ -235,6 +242,33 @@ class MockIndexIDMap:
         self.index.reset()
 
 
+class MockIDSelectorBatch:
+    """Mock implementation of FAISS IDSelectorBatch."""
+
+    def __init__(
+        self,
+        ids: np.ndarray
+    ):
+        self._ids = {int(vid) for vid in ids}
+
+    def is_member(
+        self,
+        vector_id: int
+    ) -> bool:
+        """Check whether an ID is selected."""
+        return int(vector_id) in self._ids
+
+
+class MockSearchParameters:
+    """Mock implementation of FAISS SearchParameters."""
+
+    def __init__(
+        self,
+        sel: Any = None
+    ):
+        self.sel = sel
+
+
 def create_mock_faiss_module() -> Any:
     """
     Create a mock FAISS module for testing.
@@ -266,6 +300,9 @@ def create_mock_faiss_module() -> Any:
             logger.debug("Creating MockIndexIDMap")
             return MockIndexIDMap(index)
 
+        IDSelectorBatch = MockIDSelectorBatch
+        SearchParameters = MockSearchParameters
+
         @staticmethod
         def read_index(filepath: str) -> MockFaissIndex:
             """
@@ -281,4 +318,10 @@ def create_mock_faiss_module() -> Any:
             """Mock write_index that does nothing."""
             logger.debug(f"Mock writing FAISS index to {filepath}")
 
+        @staticmethod
+        def serialize_index(index: MockFaissIndex) -> np.ndarray:
+            """Mock serialize_index that returns placeholder bytes."""
+            logger.debug("Mock serializing FAISS index")
+            return np.frombuffer(b"mock-faiss-index", dtype=np.uint8)
+
     return MockFaissModule()
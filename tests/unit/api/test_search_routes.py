@@ -25,6 +25,7 @@ from registry.api.search_routes import (
     ToolSearchResult,
     _user_can_access_agent,
     _user_can_access_server,
+    query_cache_stats,
     semantic_search,
 )
 from tests.fixtures.factories import AgentCardFactory
@@ -1588,3 +1589,44 @@ class TestSemanticSearchIntegration:
         assert response.total_servers == 1
         assert response.total_tools == 1
         assert response.total_agents == 1
+
+
+# =============================================================================
+# QUERY CACHE STATS TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.api
+@pytest.mark.search
+class TestQueryCacheStats:
+    """Tests for the query embedding cache stats endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_query_cache_stats_returns_repository_stats(
+        self,
+        mock_search_repo,
+        admin_user_context,
+    ):
+        """Test stats come straight from the search repository."""
+        stats = {"hits": 3, "misses": 1, "entries": 1, "hit_rate": 0.75}
+        mock_search_repo.get_query_cache_stats = Mock(return_value=stats)
+
+        response = await query_cache_stats(admin_user_context, mock_search_repo)
+
+        assert response == stats
+
+    @pytest.mark.asyncio
+    async def test_query_cache_stats_requires_admin(
+        self,
+        mock_search_repo,
+        regular_user_context,
+    ):
+        """Test non-admin users cannot read cache statistics."""
+        mock_search_repo.get_query_cache_stats = Mock(return_value={})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await query_cache_stats(regular_user_context, mock_search_repo)
+
+        assert exc_info.value.status_code == 403
+        mock_search_repo.get_query_cache_stats.assert_not_called()
@@ -143,6 +143,7 @@ def mock_server_service():
     mock_service.update_server = AsyncMock(return_value=True)
     mock_service.remove_server = AsyncMock(return_value=True)
     mock_service.get_enabled_services = AsyncMock(return_value=[])
+    mock_service.get_enabled_servers_with_info = AsyncMock(return_value={})
     mock_service.user_can_access_server_path = AsyncMock(return_value=True)
     return mock_service
 
@@ -0,0 +1,248 @@
+"""
+Unit tests for registry/auth/scope_snapshot.py
+
+Tests indexing the scopes configuration into an immutable snapshot, the
+per-scope-set memoization, and the dependency functions served from it.
+"""
+
+import logging
+from typing import Any
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+
+# Mark all tests in this file
+pytestmark = [pytest.mark.unit, pytest.mark.auth]
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def scopes_config() -> dict[str, Any]:
+    """Scopes configuration in the shape returned by reload_scopes_config()."""
+    return {
+        "group_mappings": {
+            "admins": ["registry-admins", "mcp-servers-unrestricted/read"],
+            "lob1": ["registry-users-lob1"],
+            "both": ["registry-users-lob1", "registry-admins"],
+        },
+        "UI-Scopes": {
+            "registry-admins": {"list_service": ["all"], "toggle_service": ["all"]},
+            "registry-users-lob1": {
+                "list_service": ["currenttime", "mcpgw"],
+                "list_agents": ["/code-reviewer"],
+            },
+        },
+        "registry-admins": [{"server": "*", "methods": ["all"], "tools": ["all"]}],
+        "mcp-servers-unrestricted/read": [
+            {"server": "*", "methods": ["initialize"], "tools": ["all"]}
+        ],
+        "registry-users-lob1": [
+            {
+                "scope_name": "registry-users-lob1",
+                "access_rules": [
+                    {"server": "currenttime", "methods": ["initialize"], "tools": []},
+                    {"server": "mcpgw", "methods": ["initialize"], "tools": []},
+                ],
+            },
+            {"agents": {"actions": ["list_agents"]}},
+        ],
+    }
+
+
+# =============================================================================
+# SNAPSHOT TESTS
+# =============================================================================
+
+
+class TestScopeSnapshot:
+    """Tests for ScopeSnapshot."""
+
+    def test_scopes_for_groups_deduplicates_in_order(self, scopes_config):
+        """Test that group mapping keeps first-seen order without duplicates."""
+        from registry.auth.scope_snapshot import ScopeSnapshot
+
+        snapshot = ScopeSnapshot.from_config(scopes_config, version=1)
+
+        assert snapshot.scopes_for_groups(["lob1", "both", "unknown"]) == [
+            "registry-users-lob1",
+            "registry-admins",
+        ]
+
+    def test_access_rules_format_is_flattened(self, scopes_config):
+        """Test that grouped DocumentDB access_rules entries are indexed."""
+        from registry.auth.scope_snapshot import ScopeSnapshot
+
+        snapshot = ScopeSnapshot.from_config(scopes_config, version=1)
+
+        assert sorted(snapshot.servers_for_scope("registry-users-lob1")) == [
+            "currenttime",
+            "mcpgw",
+        ]
+        assert snapshot.servers_for_scope("unknown") == []
+
+    def test_resolve_combines_scopes(self, scopes_config):
+        """Test servers, UI permissions and wildcard access for a scope set."""
+        from registry.auth.scope_snapshot import ScopeSnapshot
+
+        snapshot = ScopeSnapshot.from_config(scopes_config, version=1)
+
+        # Act
+        restricted = snapshot.resolve(["registry-users-lob1"])
+        combined = snapshot.resolve(["registry-users-lob1", "registry-admins"])
+
+        # Assert
+        assert sorted(restricted.accessible_servers) == ["currenttime", "mcpgw"]
+        assert restricted.has_wildcard_access is False
+        assert sorted(restricted.ui_permissions["list_service"]) == ["currenttime", "mcpgw"]
+        assert combined.has_wildcard_access is True
+        assert combined.ui_permissions["list_service"] == ("all",)
+
+    def test_resolve_is_memoized_per_scope_set(self, scopes_config):
+        """Test that the same scope set in any order reuses one resolution."""
+        from registry.auth.scope_snapshot import ScopeSnapshot
+
+        snapshot = ScopeSnapshot.from_config(scopes_config, version=1)
+
+        first = snapshot.resolve(["registry-users-lob1", "registry-admins"])
+        second = snapshot.resolve(["registry-admins", "registry-users-lob1"])
+
+        assert first is second
+
+    def test_ui_permissions_dict_returns_copies(self, scopes_config):
+        """Test that callers cannot mutate the memoized permissions."""
+        from registry.auth.scope_snapshot import ScopeSnapshot
+
+        snapshot = ScopeSnapshot.from_config(scopes_config, version=1)
+        access = snapshot.resolve(["registry-users-lob1"])
+
+        permissions = access.ui_permissions_dict()
+        permissions["list_service"].append("other")
+
+        assert "other" not in access.ui_permissions_dict()["list_service"]
+
+    def test_publish_increments_version(self, scopes_config):
+        """Test that each publish swaps in a new snapshot with a higher version."""
+        from registry.auth.scope_snapshot import get_scope_snapshot, publish_scope_snapshot
+
+        first = publish_scope_snapshot(scopes_config)
+        second = publish_scope_snapshot(scopes_config)
+
+        assert second.version > first.version
+        assert get_scope_snapshot() is second
+
+
+# =============================================================================
+# DEPENDENCY INTEGRATION TESTS
+# =============================================================================
+
+
+class TestDependenciesWithSnapshot:
+    """Tests for the auth dependency functions once a snapshot is loaded."""
+
+    @pytest.mark.asyncio
+    async def test_no_repository_lookups_with_snapshot(
+        self, scopes_config, mock_scope_repository
+    ):
+        """Test that scope lookups are served from memory."""
+        from registry.auth.dependencies import (
+            get_ui_permissions_for_user,
+            get_user_accessible_servers,
+            map_cognito_groups_to_scopes,
+            user_has_wildcard_access,
+        )
+        from registry.auth.scope_snapshot import publish_scope_snapshot
+
+        publish_scope_snapshot(scopes_config)
+
+        # Act
+        scopes = await map_cognito_groups_to_scopes(["lob1"])
+        servers = await get_user_accessible_servers(scopes)
+        permissions = await get_ui_permissions_for_user(scopes)
+        is_admin = await user_has_wildcard_access(scopes)
+
+        # Assert
+        assert scopes == ["registry-users-lob1"]
+        assert sorted(servers) == ["currenttime", "mcpgw"]
+        assert permissions["list_agents"] == ["/code-reviewer"]
+        assert is_admin is False
+        mock_scope_repository.get_group_mappings.assert_not_called()
+        mock_scope_repository.get_server_scopes.assert_not_called()
+        mock_scope_repository.get_ui_scopes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reload_publishes_snapshot(self, scopes_config, monkeypatch):
+        """Test that reloading scopes swaps in a snapshot of the new config."""
+        from unittest.mock import AsyncMock
+
+        from registry.auth import dependencies
+        from registry.auth.scope_snapshot import get_scope_snapshot
+
+        monkeypatch.setattr(dependencies, "SCOPES_CONFIG", {})
+        monkeypatch.setattr(
+            "registry.common.scopes_loader.reload_scopes_config",
+            AsyncMock(return_value=scopes_config),
+        )
+
+        await dependencies.reload_scopes_from_repository()
+
+        snapshot = get_scope_snapshot()
+        assert snapshot is not None
+        assert snapshot.resolve(["registry-admins"]).has_wildcard_access is True
+
+    @pytest.mark.asyncio
+    async def test_empty_reload_falls_back_to_repository(self, scopes_config, monkeypatch):
+        """Test that an empty config clears the snapshot instead of denying everything."""
+        from unittest.mock import AsyncMock
+
+        from registry.auth import dependencies
+        from registry.auth.scope_snapshot import get_scope_snapshot, publish_scope_snapshot
+
+        publish_scope_snapshot(scopes_config)
+        monkeypatch.setattr(dependencies, "SCOPES_CONFIG", {})
+        monkeypatch.setattr(
+            "registry.common.scopes_loader.reload_scopes_config",
+            AsyncMock(return_value={"group_mappings": {}}),
+        )
+
+        await dependencies.reload_scopes_from_repository()
+
+        assert get_scope_snapshot() is None
+
+    @pytest.mark.asyncio
+    async def test_scheduled_reloads_run_in_background_and_coalesce(
+        self, scopes_config, monkeypatch
+    ):
+        """Test scheduling returns at once and changes during a reload queue one more."""
+        import asyncio
+
+        from registry.auth import dependencies
+
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_reload():
+            calls.append(len(calls))
+            await release.wait()
+            return scopes_config
+
+        monkeypatch.setattr(dependencies, "SCOPES_CONFIG", {})
+        monkeypatch.setattr(dependencies, "_snapshot_reload_task", None)
+        monkeypatch.setattr(dependencies, "_snapshot_reload_queued", False)
+        monkeypatch.setattr("registry.common.scopes_loader.reload_scopes_config", slow_reload)
+
+        for _ in range(3):
+            dependencies.schedule_scope_snapshot_reload()
+        await asyncio.sleep(0)
+        assert calls == [0]
+
+        release.set()
+        await dependencies._snapshot_reload_task
+
+        assert calls == [0, 1]
+        assert dependencies._snapshot_reload_queued is False
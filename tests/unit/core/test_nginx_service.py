@@ -300,7 +300,7 @@ server {
                 }
 
                 with patch.object(nginx_service, "get_additional_server_names", return_value="10.0.0.1"):
-                    with patch.object(nginx_service, "reload_nginx", return_value=True):
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True):
                         with patch("os.environ.get", return_value="http://keycloak:8080"):
                             result = await nginx_service.generate_config_async(sample_servers)
 
@@ -338,7 +338,7 @@ server {
                 }
 
                 with patch.object(nginx_service, "get_additional_server_names", return_value=""):
-                    with patch.object(nginx_service, "reload_nginx", return_value=True):
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True):
                         with patch("os.environ.get", return_value="http://keycloak:8080"):
                             result = await nginx_service.generate_config_async(sample_servers)
 
@@ -431,6 +431,157 @@ def test_reload_nginx_exception(nginx_service):
         assert result is False
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reload_nginx_async_uses_subprocess_exec(nginx_service):
+    """Test that the async reload runs nginx -t and nginx -s reload without blocking."""
+    mock_process = MagicMock()
+    mock_process.returncode = 0
+    mock_process.communicate = AsyncMock(return_value=(b"", b""))
+
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=mock_process)) as mock_exec:
+        result = await nginx_service.reload_nginx_async()
+
+        assert result is True
+        assert [call.args for call in mock_exec.call_args_list] == [
+            ("nginx", "-t"),
+            ("nginx", "-s", "reload"),
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reload_nginx_async_config_test_failure(nginx_service):
+    """Test that the async reload is skipped when nginx -t fails."""
+    mock_process = MagicMock()
+    mock_process.returncode = 1
+    mock_process.communicate = AsyncMock(return_value=(b"", b"Config error"))
+
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=mock_process)) as mock_exec:
+        result = await nginx_service.reload_nginx_async()
+
+        assert result is False
+        assert mock_exec.await_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reload_nginx_async_not_found(nginx_service):
+    """Test async reload when nginx is not installed."""
+    with patch("asyncio.create_subprocess_exec", new=AsyncMock(side_effect=FileNotFoundError)):
+        result = await nginx_service.reload_nginx_async()
+
+        assert result is False
+
+
+# =============================================================================
+# INCREMENTAL GENERATION TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_config_async_skips_unchanged_config(nginx_service, sample_servers, mock_health_service):
+    """Test that an identical config is neither rewritten nor reloaded."""
+    template_content = "server {\n{{LOCATION_BLOCKS}}\n}\n"
+    mock_health_service.server_health_status = {"/test-server": HealthStatus.HEALTHY}
+
+    with patch.object(nginx_service.nginx_template_path, "exists", return_value=True):
+        with patch("builtins.open", mock_open(read_data=template_content)) as mock_file:
+            with patch("registry.health.service.health_service", mock_health_service):
+                with patch.object(nginx_service, "get_additional_server_names", return_value="") as mock_names:
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True) as mock_reload:
+                        # Act
+                        first = await nginx_service.generate_config_async(sample_servers)
+                        second = await nginx_service.generate_config_async(sample_servers)
+
+                        # Assert
+                        assert first is True and second is True
+                        mock_reload.assert_awaited_once()
+                        assert mock_file().write.call_count == 1
+                        # Template and platform detection are only done once
+                        assert mock_names.await_count == 1
+                        assert nginx_service.get_stats()["skipped_unchanged"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_config_async_retries_after_failed_reload(nginx_service, sample_servers, mock_health_service):
+    """Test that a config whose reload failed is written and reloaded again."""
+    template_content = "server {\n{{LOCATION_BLOCKS}}\n}\n"
+    mock_health_service.server_health_status = {"/test-server": HealthStatus.HEALTHY}
+
+    with patch.object(nginx_service.nginx_template_path, "exists", return_value=True):
+        with patch("builtins.open", mock_open(read_data=template_content)) as mock_file:
+            with patch("registry.health.service.health_service", mock_health_service):
+                with patch.object(nginx_service, "get_additional_server_names", return_value=""):
+                    with patch.object(
+                        nginx_service, "reload_nginx_async", side_effect=[False, True]
+                    ) as mock_reload:
+                        with patch("registry.core.nginx_service.monotonic", side_effect=[0.0, 1000.0]):
+                            # Act
+                            await nginx_service.generate_config_async(sample_servers)
+                            await nginx_service.generate_config_async(sample_servers)
+                        await nginx_service.generate_config_async(sample_servers)
+
+                        # Assert - the failed reload was retried, then the config was skipped
+                        assert mock_reload.await_count == 2
+                        assert mock_file().write.call_count == 2
+                        assert nginx_service.get_stats()["skipped_unchanged"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_config_async_memoizes_location_blocks(nginx_service, sample_servers, mock_health_service):
+    """Test that location blocks are only re-rendered when a server's routing changes."""
+    mock_health_service.server_health_status = {
+        "/test-server": HealthStatus.HEALTHY,
+        "/test-server-2": HealthStatus.HEALTHY,
+    }
+
+    with patch.object(nginx_service.nginx_template_path, "exists", return_value=True):
+        with patch("builtins.open", mock_open(read_data="{{LOCATION_BLOCKS}}")):
+            with patch("registry.health.service.health_service", mock_health_service):
+                with patch.object(nginx_service, "get_additional_server_names", return_value=""):
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True):
+                        with patch.object(
+                            nginx_service,
+                            "_generate_transport_location_blocks",
+                            wraps=nginx_service._generate_transport_location_blocks,
+                        ) as mock_render:
+                            await nginx_service.generate_config_async(sample_servers)
+                            # Only tool data changed: nothing re-rendered
+                            sample_servers["/test-server"]["tool_list"] = [{"name": "new_tool"}]
+                            await nginx_service.generate_config_async(sample_servers)
+                            assert mock_render.call_count == 2
+
+                            # Backend moved: only that server is re-rendered
+                            sample_servers["/test-server"]["proxy_pass_url"] = "http://localhost:9000/mcp"
+                            await nginx_service.generate_config_async(sample_servers)
+                            assert mock_render.call_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_request_reload_debounces_bursts(nginx_service, mock_settings):
+    """Test that changes inside the debounce window collapse into one trailing reload."""
+    mock_settings.nginx_reload_debounce_seconds = 0.05
+
+    with patch("registry.core.nginx_service.settings", mock_settings):
+        with patch.object(nginx_service, "reload_nginx_async", return_value=True) as mock_reload:
+            # Act
+            await nginx_service._request_reload()
+            await nginx_service._request_reload()
+            await nginx_service._request_reload()
+
+            # Assert - leading reload ran, the other two wait for the window
+            assert mock_reload.await_count == 1
+            assert nginx_service.get_stats()["reload_pending"] is True
+
+            await nginx_service._reload_task
+            assert mock_reload.await_count == 2
+
+
 # =============================================================================
 # TRANSPORT LOCATION BLOCKS TESTS
 # =============================================================================
@@ -589,7 +740,7 @@ server {
                 }
 
                 with patch.object(nginx_service, "get_additional_server_names", return_value=""):
-                    with patch.object(nginx_service, "reload_nginx", return_value=True):
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True):
                         with patch("os.environ.get", return_value="https://keycloak.example.com:8443"):
                             result = await nginx_service.generate_config_async(sample_servers)
 
@@ -617,7 +768,7 @@ server {
                 mock_health_service.server_health_status = {}
 
                 with patch.object(nginx_service, "get_additional_server_names", return_value=""):
-                    with patch.object(nginx_service, "reload_nginx", return_value=True):
+                    with patch.object(nginx_service, "reload_nginx_async", return_value=True):
                         with patch("os.environ.get", return_value="http://keycloak"):
                             result = await nginx_service.generate_config_async(sample_servers)
 
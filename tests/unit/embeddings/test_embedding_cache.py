@@ -0,0 +1,350 @@
+"""
+Unit tests for registry.embeddings.cache module.
+
+This module tests the content-hash embedding cache including:
+- In-memory LRU hits and eviction
+- Persistent memory-mapped store across client instances
+- Recovery from a partially written store
+- LRU compaction of the store and writes shared between processes
+- create_embeddings_client() cache wiring
+- Query embedding cache normalization, TTL and LRU eviction
+"""
+
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from registry.embeddings.cache import (
+    CachedEmbeddingsClient,
+    EmbeddingCacheStore,
+    QueryEmbeddingCache,
+    normalize_query,
+)
+from registry.embeddings.client import create_embeddings_client
+from tests.fixtures.mocks.mock_embeddings import MockEmbeddingsClient
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class CountingEmbeddingsClient(MockEmbeddingsClient):
+    """Mock client that records every text it encodes."""
+
+    def __init__(self, dimension: int = 8):
+        super().__init__(model_name="test-model", dimension=dimension)
+        self.encoded_texts: list[str] = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded_texts.extend(texts)
+        return super().encode(texts, **kwargs)
+
+    def get_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+@pytest.fixture
+def inner_client() -> CountingEmbeddingsClient:
+    """Create a counting mock embeddings client."""
+    return CountingEmbeddingsClient(dimension=8)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    """Directory for the persistent cache."""
+    return tmp_path / "embeddings"
+
+
+# =============================================================================
+# TESTS: CachedEmbeddingsClient
+# =============================================================================
+
+
+@pytest.mark.unit
+class TestCachedEmbeddingsClient:
+    """Tests for CachedEmbeddingsClient."""
+
+    def test_repeated_text_is_encoded_once(self, inner_client):
+        """Test identical text hits the cache on the second call."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 8)
+
+        first = client.encode(["hello world"])
+        second = client.encode(["hello world"])
+
+        assert inner_client.encoded_texts == ["hello world"]
+        np.testing.assert_array_equal(first, second)
+        assert client.get_stats()["hits"] == 1
+        assert client.get_stats()["misses"] == 1
+
+    def test_only_misses_are_encoded_and_order_preserved(self, inner_client):
+        """Test a mixed batch encodes only uncached, de-duplicated texts."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 8)
+        client.encode(["a"])
+
+        result = client.encode(["b", "a", "b", "c"])
+
+        assert inner_client.encoded_texts == ["a", "b", "c"]
+        expected = inner_client.encode(["b", "a", "b", "c"])
+        np.testing.assert_allclose(result, expected)
+
+    def test_lru_evicts_oldest_entry(self, inner_client):
+        """Test the in-memory LRU is bounded."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 8, max_memory_entries=2)
+
+        client.encode(["a", "b"])
+        client.encode(["a"])
+        client.encode(["c"])
+        client.encode(["a", "b"])
+
+        assert inner_client.encoded_texts == ["a", "b", "c", "b"]
+
+    def test_empty_input(self, inner_client):
+        """Test encoding an empty list returns an empty matrix."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 8)
+
+        result = client.encode([])
+
+        assert result.shape == (0, 8)
+        assert inner_client.encoded_texts == []
+
+    def test_persistent_store_survives_restart(self, inner_client, cache_dir):
+        """Test a new client reads embeddings persisted by a previous one."""
+        first_client = CachedEmbeddingsClient(inner_client, "test-model", 8, cache_dir=cache_dir)
+        original = first_client.encode(["persist me", "and me"])
+
+        fresh_inner = CountingEmbeddingsClient(dimension=8)
+        second_client = CachedEmbeddingsClient(fresh_inner, "test-model", 8, cache_dir=cache_dir)
+        restored = second_client.encode(["persist me", "and me"])
+
+        assert fresh_inner.encoded_texts == []
+        np.testing.assert_array_equal(original, restored)
+        assert second_client.get_stats()["disk_entries"] == 2
+
+    def test_cache_key_includes_model_name(self, inner_client, cache_dir):
+        """Test different models do not share cache entries."""
+        CachedEmbeddingsClient(inner_client, "model-a", 8, cache_dir=cache_dir).encode(["x"])
+
+        other_inner = CountingEmbeddingsClient(dimension=8)
+        CachedEmbeddingsClient(other_inner, "model-b", 8, cache_dir=cache_dir).encode(["x"])
+
+        assert other_inner.encoded_texts == ["x"]
+
+    def test_dimension_mismatch_is_not_persisted(self, inner_client, cache_dir):
+        """Test vectors with an unexpected dimension are kept out of the disk store."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 16, cache_dir=cache_dir)
+
+        client.encode(["x"])
+
+        assert client.get_stats()["disk_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_query_encodes_are_not_persisted(self, inner_client, cache_dir):
+        """Test search queries bypass the content-hash cache and its disk store."""
+        client = CachedEmbeddingsClient(inner_client, "test-model", 8, cache_dir=cache_dir)
+        query_cache = QueryEmbeddingCache()
+
+        await query_cache.encode(client, "find weather tools")
+
+        assert inner_client.encoded_texts == ["find weather tools"]
+        stats = client.get_stats()
+        assert stats["memory_entries"] == 0
+        assert stats["disk_entries"] == 0
+
+
+# =============================================================================
+# TESTS: EmbeddingCacheStore
+# =============================================================================
+
+
+@pytest.mark.unit
+class TestEmbeddingCacheStore:
+    """Tests for the on-disk memory-mapped store."""
+
+    def test_truncates_partially_written_tail(self, cache_dir):
+        """Test vectors without a matching key are discarded on load."""
+        store = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        store.put_many(["k1"], np.ones((1, 4), dtype=np.float32))
+
+        # Simulate a crash after writing a vector but before writing its key
+        with open(store.vectors_path, "ab") as f:
+            f.write(np.zeros(4, dtype=np.float32).tobytes())
+
+        reloaded = EmbeddingCacheStore(cache_dir, "test-model", 4)
+
+        assert len(reloaded) == 1
+        assert store.vectors_path.stat().st_size == 4 * 4
+        np.testing.assert_array_equal(reloaded.get("k1"), np.ones(4, dtype=np.float32))
+
+    def test_put_many_skips_existing_keys(self, cache_dir):
+        """Test re-adding a key does not append a duplicate row."""
+        store = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        store.put_many(["k1", "k1"], np.ones((2, 4), dtype=np.float32))
+        store.put_many(["k1", "k2"], np.full((2, 4), 2.0, dtype=np.float32))
+
+        assert len(store) == 2
+        np.testing.assert_array_equal(store.get("k1"), np.ones(4, dtype=np.float32))
+        np.testing.assert_array_equal(store.get("k2"), np.full(4, 2.0, dtype=np.float32))
+
+    def test_compaction_keeps_most_recently_used_entries(self, cache_dir):
+        """Test exceeding max_entries rewrites the store with the most recently used entries."""
+        store = EmbeddingCacheStore(cache_dir, "test-model", 4, max_entries=4)
+        for i in range(4):
+            store.put_many([f"k{i}"], np.full((1, 4), float(i), dtype=np.float32))
+        store.get("k0")
+
+        store.put_many(["k4"], np.full((1, 4), 4.0, dtype=np.float32))
+
+        # Compacted to 3 entries: k0 was used recently, k1 and k2 were not
+        assert store.compactions == 1
+        assert len(store) == 3
+        assert store.get("k1") is None
+        assert store.get("k2") is None
+        reloaded = EmbeddingCacheStore(cache_dir, "test-model", 4, max_entries=4)
+        assert len(reloaded) == 3
+        assert store.vectors_path.stat().st_size == 3 * 4 * 4
+        for key, value in (("k0", 0.0), ("k3", 3.0), ("k4", 4.0)):
+            np.testing.assert_array_equal(reloaded.get(key), np.full(4, value, dtype=np.float32))
+
+    def test_writes_from_another_process_are_picked_up(self, cache_dir):
+        """Test a store reloads its index before appending after another writer changed the files."""
+        first = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        second = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        first.put_many(["a"], np.full((1, 4), 1.0, dtype=np.float32))
+
+        second.put_many(["a", "b"], np.full((2, 4), 2.0, dtype=np.float32))
+        first.put_many(["c"], np.full((1, 4), 3.0, dtype=np.float32))
+
+        reloaded = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        assert len(reloaded) == 3
+        np.testing.assert_array_equal(reloaded.get("a"), np.full(4, 1.0, dtype=np.float32))
+        np.testing.assert_array_equal(reloaded.get("b"), np.full(4, 2.0, dtype=np.float32))
+        np.testing.assert_array_equal(reloaded.get("c"), np.full(4, 3.0, dtype=np.float32))
+        np.testing.assert_array_equal(first.get("b"), np.full(4, 2.0, dtype=np.float32))
+
+    def test_compaction_by_another_process_does_not_misalign_rows(self, cache_dir):
+        """Test row numbers are reloaded when another writer compacted the files."""
+        reader = EmbeddingCacheStore(cache_dir, "test-model", 4)
+        writer = EmbeddingCacheStore(cache_dir, "test-model", 4, max_entries=2)
+        writer.put_many(["x", "y"], np.array([[1.0] * 4, [2.0] * 4], dtype=np.float32))
+        writer.put_many(["z"], np.full((1, 4), 3.0, dtype=np.float32))
+        assert writer.compactions == 1
+
+        reader.put_many(["w"], np.full((1, 4), 4.0, dtype=np.float32))
+
+        assert reader.get("x") is None
+        np.testing.assert_array_equal(reader.get("z"), np.full(4, 3.0, dtype=np.float32))
+        np.testing.assert_array_equal(reader.get("w"), np.full(4, 4.0, dtype=np.float32))
+
+
+# =============================================================================
+# TESTS: create_embeddings_client cache wiring
+# =============================================================================
+
+
+@pytest.mark.unit
+class TestFactoryCaching:
+    """Tests for cache wrapping in create_embeddings_client."""
+
+    def test_factory_wraps_client_when_cache_configured(self, cache_dir):
+        """Test the factory returns a cached client when a cache dir is given."""
+        client = create_embeddings_client(
+            provider="sentence-transformers",
+            model_name="all-MiniLM-L6-v2",
+            embedding_dimension=384,
+            embeddings_cache_dir=cache_dir,
+        )
+
+        assert isinstance(client, CachedEmbeddingsClient)
+        assert client.dimension == 384
+
+    def test_factory_returns_plain_client_by_default(self):
+        """Test the factory does not wrap when no cache is configured."""
+        client = create_embeddings_client(
+            provider="sentence-transformers",
+            model_name="all-MiniLM-L6-v2",
+            embedding_dimension=384,
+        )
+
+        assert not isinstance(client, CachedEmbeddingsClient)
+
+
+# =============================================================================
+# TESTS: QueryEmbeddingCache
+# =============================================================================
+
+
+@pytest.mark.unit
+class TestQueryEmbeddingCache:
+    """Tests for the query embedding TTL cache."""
+
+    def test_normalize_query_folds_case_and_whitespace(self):
+        """Test equivalent queries normalize to the same key."""
+        assert normalize_query("  Find\tWeather   TOOLS \n") == "find weather tools"
+
+    @pytest.mark.asyncio
+    async def test_equivalent_queries_share_entry(self, inner_client):
+        """Test case/whitespace variants hit the same entry."""
+        cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+
+        first = await cache.encode(inner_client, "Weather Tools")
+        second = await cache.encode(inner_client, "  weather   tools ")
+
+        assert inner_client.encoded_texts == ["Weather Tools"]
+        np.testing.assert_array_equal(first, second)
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, inner_client):
+        """Test expired entries are re-encoded."""
+        cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=30)
+
+        with patch("registry.embeddings.cache.time.monotonic", return_value=100.0):
+            await cache.encode(inner_client, "query")
+        with patch("registry.embeddings.cache.time.monotonic", return_value=131.0):
+            await cache.encode(inner_client, "query")
+
+        assert inner_client.encoded_texts == ["query", "query"]
+        assert cache.get_stats()["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, inner_client):
+        """Test the least recently used query is evicted at capacity."""
+        cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+
+        await cache.encode(inner_client, "a")
+        await cache.encode(inner_client, "b")
+        await cache.encode(inner_client, "a")
+        await cache.encode(inner_client, "c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_capacity_disables_cache(self, inner_client):
+        """Test max_entries=0 never stores entries."""
+        cache = QueryEmbeddingCache(max_entries=0, ttl_seconds=60)
+
+        await cache.encode(inner_client, "q")
+        await cache.encode(inner_client, "q")
+
+        assert inner_client.encoded_texts == ["q", "q"]
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_vectors_are_read_only(self, inner_client):
+        """Test callers cannot mutate a cached embedding in place."""
+        cache = QueryEmbeddingCache(max_entries=10, ttl_seconds=60)
+        vector = await cache.encode(inner_client, "q")
+
+        with pytest.raises(ValueError):
+            vector[0] = 1.0
@@ -0,0 +1,159 @@
+"""
+Unit tests for registry/health/scheduler.py
+
+Tests the per-server health check schedule: due ordering, jitter,
+exponential backoff and per-server interval overrides.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from registry.health.scheduler import HealthCheckScheduler
+from registry.health.service import HealthMonitoringService
+
+# =============================================================================
+# TEST FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def scheduler():
+    """Create a scheduler without jitter so due times are deterministic."""
+    return HealthCheckScheduler(
+        default_interval_seconds=300,
+        jitter_ratio=0,
+        backoff_max_seconds=1800,
+    )
+
+
+@pytest.fixture
+def servers():
+    """Create enabled servers, one with an interval override."""
+    return {
+        "/critical": {"server_name": "critical", "health_check_interval_seconds": 30},
+        "/regular": {"server_name": "regular"},
+    }
+
+
+# =============================================================================
+# SCHEDULING TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.health
+class TestHealthCheckScheduler:
+    """Tests for HealthCheckScheduler."""
+
+    def test_new_servers_due_immediately(self, scheduler, servers):
+        """Test that newly enabled servers are checked on the next pass."""
+        scheduler.sync(servers, now=0)
+
+        assert sorted(scheduler.due(now=0)) == ["/critical", "/regular"]
+        assert scheduler.due(now=0) == []
+
+    def test_interval_override(self, scheduler, servers):
+        """Test that server_info overrides the default interval."""
+        scheduler.sync(servers, now=0)
+        scheduler.due(now=0)
+
+        # Act
+        critical_delay = scheduler.record_result("/critical", healthy=True, now=0)
+        regular_delay = scheduler.record_result("/regular", healthy=True, now=0)
+
+        # Assert
+        assert critical_delay == 30
+        assert regular_delay == 300
+        assert scheduler.seconds_until_next_due(now=0) == 30
+        assert scheduler.due(now=30) == ["/critical"]
+
+    def test_invalid_and_too_small_overrides(self, scheduler):
+        """Test that bad overrides fall back to the default and tiny ones are clamped."""
+        assert scheduler.interval_for({"health_check_interval_seconds": "soon"}) == 300
+        assert scheduler.interval_for({"health_check_interval_seconds": 0}) == 5.0
+
+    def test_backoff_for_repeated_failures(self, scheduler):
+        """Test that consecutive failures double the interval up to the cap."""
+        scheduler.sync({"/flaky": {}}, now=0)
+
+        delays = []
+        for _ in range(5):
+            scheduler.due(now=10_000)
+            delays.append(scheduler.record_result("/flaky", healthy=False, now=0))
+
+        assert delays == [300, 600, 1200, 1800, 1800]
+
+        # A healthy check resets the backoff
+        scheduler.due(now=10_000)
+        assert scheduler.record_result("/flaky", healthy=True, now=0) == 300
+
+    def test_jitter_stays_within_ratio(self):
+        """Test that jitter spreads intervals by at most the configured ratio."""
+        scheduler = HealthCheckScheduler(default_interval_seconds=100, jitter_ratio=0.1)
+        scheduler.sync({"/a": {}}, now=0)
+
+        delays = set()
+        for _ in range(50):
+            scheduler.due(now=10_000)
+            delays.add(scheduler.record_result("/a", healthy=True, now=0))
+
+        assert all(90 <= delay <= 110 for delay in delays)
+        assert len(delays) > 1
+
+    def test_removed_servers_are_not_rescheduled(self, scheduler, servers):
+        """Test that servers disabled mid-check drop out of the schedule."""
+        scheduler.sync(servers, now=0)
+        scheduler.due(now=0)
+
+        # Act
+        scheduler.sync({"/regular": servers["/regular"]}, now=1)
+        scheduler.record_result("/critical", healthy=True, now=1)
+        scheduler.record_result("/regular", healthy=True, now=1)
+
+        # Assert
+        assert scheduler.due(now=100_000) == ["/regular"]
+        assert scheduler.get_stats()["scheduled_servers"] == 1
+
+    def test_in_flight_servers_not_duplicated_on_sync(self, scheduler, servers):
+        """Test that a resync while a check runs does not schedule it twice."""
+        scheduler.sync(servers, now=0)
+        scheduler.due(now=0)
+
+        scheduler.sync(servers, now=1)
+
+        assert scheduler.due(now=1) == []
+        assert scheduler.get_stats()["in_flight"] == 2
+
+
+# =============================================================================
+# HEALTH SERVICE INTEGRATION TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.health
+@pytest.mark.asyncio
+async def test_perform_health_checks_only_checks_due_servers():
+    """Test that a second pass right after the first checks nothing."""
+    service = HealthMonitoringService()
+    server_info = {"server_name": "test", "proxy_pass_url": "http://localhost:8000/mcp"}
+
+    with patch("registry.services.server_service.server_service") as mock_server_service:
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(
+            return_value={"/a": server_info, "/b": server_info}
+        )
+
+        with patch.object(
+            service, "_check_single_service", new=AsyncMock(return_value=False)
+        ) as mock_check:
+            # Act
+            await service._perform_health_checks()
+            await service._perform_health_checks()
+
+            # Assert
+            assert mock_check.await_count == 2
+            # Server list is re-read only every health_check_resync_seconds
+            assert mock_server_service.get_enabled_servers_with_info.await_count == 1
+            assert service.get_scheduler_stats()["scheduled_servers"] == 2
+            assert 1.0 <= service._seconds_until_next_check() <= 30.0
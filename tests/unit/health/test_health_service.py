@@ -5,6 +5,7 @@ Tests the HealthMonitoringService and HighPerformanceWebSocketManager.
 """
 
 import asyncio
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
@@ -16,6 +17,7 @@ from registry.constants import HealthStatus
 from registry.health.service import (
     HealthMonitoringService,
     HighPerformanceWebSocketManager,
+    _ClientChannel,
 )
 
 # =============================================================================
@@ -169,7 +171,7 @@ async def test_ws_manager_safe_send_message_timeout(ws_manager, mock_websocket):
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_ws_manager_send_to_connections_optimized(ws_manager):
-    """Test optimized sending to multiple connections."""
+    """Test that a broadcast is serialized once and queued for every connection."""
     # Create mock connections
     connections = []
     for i in range(5):
@@ -177,14 +179,16 @@ async def test_ws_manager_send_to_connections_optimized(ws_manager):
         ws.client = MagicMock(host=f"127.0.0.{i}")
         connections.append(ws)
         ws_manager.connections.add(ws)
+        ws_manager._channels[ws] = _ClientChannel(ws, max_queue_size=10)
 
     data = {"test": "data"}
 
-    with patch.object(ws_manager, "_safe_send_message", return_value=True) as mock_send:
+    with patch("registry.health.service.json.dumps", return_value="{}") as mock_dumps:
         await ws_manager._send_to_connections_optimized(data)
 
-        # Should have sent to all connections
-        assert mock_send.call_count == len(connections)
+        mock_dumps.assert_called_once_with(data)
+        # Should have queued for all connections
+        assert all(list(ws_manager._channels[ws].queue) == ["{}"] for ws in connections)
 
 
 @pytest.mark.unit
@@ -527,7 +531,9 @@ async def test_health_service_perform_immediate_health_check(health_service, moc
 
     with patch("registry.services.server_service.server_service") as mock_server_service:
         mock_server_service.get_server_info = AsyncMock(return_value=mock_server_info)
-        mock_server_service.get_enabled_services = AsyncMock(return_value=[service_path])
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(
+            return_value={service_path: mock_server_info}
+        )
 
         with patch.object(
             health_service,
@@ -700,10 +706,13 @@ async def test_ws_manager_broadcast_update_single_service(ws_manager, mock_webso
 
     with patch.object(ws_manager, "_send_to_connections_optimized", new=AsyncMock()) as mock_send:
         await ws_manager.broadcast_update("test-path", {"status": "healthy"})
+        await ws_manager._flush_task
 
         mock_send.assert_awaited_once()
         call_args = mock_send.call_args[0][0]
-        assert "test-path" in call_args
+        assert call_args["type"] == "delta"
+        assert call_args["seq"] == 1
+        assert call_args["updates"] == {"test-path": {"status": "healthy"}}
 
 
 @pytest.mark.unit
@@ -723,27 +732,42 @@ async def test_ws_manager_broadcast_update_with_pending_updates(ws_manager, mock
 
         with patch.object(ws_manager, "_send_to_connections_optimized", new=AsyncMock()) as mock_send:
             await ws_manager.broadcast_update()
+            await ws_manager._flush_task
 
             mock_send.assert_awaited_once()
             # Pending updates should be sent
             call_args = mock_send.call_args[0][0]
-            assert "path1" in call_args or "path2" in call_args
+            assert set(call_args["updates"]) == {"path1", "path2"}
+            assert ws_manager.pending_updates == {}
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_ws_manager_broadcast_update_full_status(ws_manager, mock_websocket):
-    """Test broadcast update with full status when no pending updates."""
+    """Test that a full update only sends services that differ from client state."""
     ws_manager.connections.add(mock_websocket)
     ws_manager.last_broadcast_time = 0
+    ws_manager._client_state = {
+        "/a": {"status": "healthy"},
+        "/b": {"status": "healthy"},
+        "/gone": {"status": "healthy"},
+    }
+    ws_manager._client_state_loaded = True
 
     with patch("registry.health.service.health_service") as mock_health_service:
-        mock_health_service._get_cached_health_data = AsyncMock(return_value={"full": "status"})
+        mock_health_service._get_cached_health_data = AsyncMock(
+            return_value={"/a": {"status": "unhealthy"}, "/b": {"status": "healthy"}}
+        )
 
         with patch.object(ws_manager, "_send_to_connections_optimized", new=AsyncMock()) as mock_send:
             await ws_manager.broadcast_update()
+            await ws_manager._flush_task
 
             mock_send.assert_awaited_once()
+            call_args = mock_send.call_args[0][0]
+            assert call_args["updates"] == {"/a": {"status": "unhealthy"}}
+            assert call_args["removed"] == ["/gone"]
+            assert set(ws_manager._client_state) == {"/a", "/b"}
 
 
 @pytest.mark.unit
@@ -759,25 +783,34 @@ async def test_ws_manager_send_to_connections_no_connections(ws_manager):
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_ws_manager_send_to_connections_with_failures(ws_manager):
-    """Test sending to connections with some failures."""
+    """Test that a failing connection is removed without affecting the others."""
     # Create connections where some will fail
     good_ws = AsyncMock(spec=WebSocket)
     good_ws.client = MagicMock(host="127.0.0.1")
     bad_ws = AsyncMock(spec=WebSocket)
     bad_ws.client = MagicMock(host="127.0.0.2")
+    bad_ws.send_text.side_effect = Exception("Send failed")
 
-    ws_manager.connections.add(good_ws)
-    ws_manager.connections.add(bad_ws)
-
-    data = {"test": "data"}
+    channels = []
+    for ws in (good_ws, bad_ws):
+        ws_manager.connections.add(ws)
+        channel = _ClientChannel(ws, max_queue_size=10)
+        ws_manager._channels[ws] = channel
+        channels.append(channel)
 
-    with patch.object(ws_manager, "_safe_send_message") as mock_send:
-        mock_send.side_effect = [True, Exception("Send failed")]
+    await ws_manager._send_to_connections_optimized({"test": "data"})
 
-        with patch.object(ws_manager, "_cleanup_failed_connections", new=AsyncMock()):
-            await ws_manager._send_to_connections_optimized(data)
+    # Act - bad sender exits after the failure, good sender waits for more
+    await ws_manager._run_sender(channels[1])
+    good_sender = asyncio.create_task(ws_manager._run_sender(channels[0]))
+    await asyncio.sleep(0.01)
+    good_sender.cancel()
 
-            assert len(ws_manager.failed_connections) > 0
+    # Assert
+    good_ws.send_text.assert_awaited_once()
+    assert bad_ws not in ws_manager.connections
+    assert good_ws in ws_manager.connections
+    assert ws_manager.failed_send_count == 1
 
 
 @pytest.mark.unit
@@ -952,7 +985,7 @@ async def test_health_service_run_health_checks_with_exception(health_service, m
 async def test_health_service_perform_health_checks_no_services(health_service):
     """Test performing health checks when no services are enabled."""
     with patch("registry.services.server_service.server_service") as mock_server_service:
-        mock_server_service.get_enabled_services = AsyncMock(return_value=[])
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(return_value={})
 
         # Should not raise errors
         await health_service._perform_health_checks()
@@ -964,10 +997,11 @@ async def test_health_service_perform_health_checks_many_services(health_service
     """Test performing health checks on many services."""
     with patch("registry.services.server_service.server_service") as mock_server_service:
         # Multiple services to trigger debug logging
-        mock_server_service.get_enabled_services = AsyncMock(return_value=[
-            "/service1", "/service2", "/service3"
-        ])
-        mock_server_service.get_server_info = AsyncMock(return_value=mock_server_info)
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(return_value={
+            "/service1": mock_server_info,
+            "/service2": mock_server_info,
+            "/service3": mock_server_info,
+        })
 
         with patch.object(health_service, "_check_single_service", return_value=False):
             await health_service._perform_health_checks()
@@ -978,8 +1012,9 @@ async def test_health_service_perform_health_checks_many_services(health_service
 async def test_health_service_perform_health_checks_status_changed(health_service, mock_server_info):
     """Test performing health checks when status changes."""
     with patch("registry.services.server_service.server_service") as mock_server_service:
-        mock_server_service.get_enabled_services = AsyncMock(return_value=["/test-server"])
-        mock_server_service.get_server_info = AsyncMock(return_value=mock_server_info)
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(
+            return_value={"/test-server": mock_server_info}
+        )
 
         with patch.object(health_service, "_check_single_service", return_value=True):
             with patch.object(health_service, "broadcast_health_update", new=AsyncMock()) as mock_broadcast:
@@ -989,6 +1024,11 @@ async def test_health_service_perform_health_checks_status_changed(health_servic
                     await health_service._perform_health_checks()
 
                     mock_broadcast.assert_awaited_once()
+                    # Nginx is regenerated from one bulk read, without per-server lookups
+                    mock_nginx.generate_config_async.assert_awaited_once_with(
+                        {"/test-server": mock_server_info}
+                    )
+                    mock_server_service.get_server_info.assert_not_called()
 
 
 @pytest.mark.unit
@@ -996,8 +1036,9 @@ async def test_health_service_perform_health_checks_status_changed(health_servic
 async def test_health_service_perform_health_checks_nginx_error(health_service, mock_server_info):
     """Test performing health checks when nginx regeneration fails."""
     with patch("registry.services.server_service.server_service") as mock_server_service:
-        mock_server_service.get_enabled_services = AsyncMock(return_value=["/test-server"])
-        mock_server_service.get_server_info = AsyncMock(return_value=mock_server_info)
+        mock_server_service.get_enabled_servers_with_info = AsyncMock(
+            return_value={"/test-server": mock_server_info}
+        )
 
         with patch.object(health_service, "_check_single_service", return_value=True):
             with patch.object(health_service, "broadcast_health_update", new=AsyncMock()):
@@ -1334,3 +1375,177 @@ def test_health_service_get_service_health_data_legacy_method(health_service, mo
     health_data = health_service._get_service_health_data(service_path, mock_server_info)
 
     assert health_data["status"] == HealthStatus.HEALTHY
+
+
+# =============================================================================
+# POOLED HTTP CLIENT TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_health_service_http_client_reused(health_service):
+    """Test that the pooled client is created once and reused across checks."""
+    first = health_service._get_http_client()
+    second = health_service._get_http_client()
+
+    assert first is second
+
+    await health_service._close_http_client()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_health_service_shutdown_closes_http_client(health_service):
+    """Test that shutdown closes the pooled client and a new one is created afterwards."""
+    client = health_service._get_http_client()
+
+    await health_service.shutdown()
+
+    assert client.is_closed
+    assert health_service._http_client is None
+    new_client = health_service._get_http_client()
+    assert new_client is not client
+
+    await health_service._close_http_client()
+
+
+@pytest.mark.unit
+def test_health_service_http2_disabled_without_h2(health_service, monkeypatch):
+    """Test that HTTP/2 falls back to HTTP/1.1 when h2 is not installed."""
+    import builtins
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError("No module named 'h2'")
+        return real_import(name, *args, **kwargs)
+
+    with patch("registry.health.service.settings") as mock_settings:
+        mock_settings.health_check_http2 = True
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+
+        assert health_service._http2_enabled() is False
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_health_service_host_slot_limits_per_host(health_service):
+    """Test that concurrent checks against one host are capped."""
+    active = 0
+    peak = 0
+
+    async def check(url):
+        nonlocal active, peak
+        async with health_service._host_slot(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    with patch("registry.health.service.settings") as mock_settings:
+        mock_settings.health_check_max_connections_per_host = 2
+
+        await asyncio.gather(*[check(f"http://backend:8000/server{i}/mcp") for i in range(6)])
+
+    assert peak == 2
+    assert list(health_service._host_semaphores) == ["backend:8000"]
+
+
+# =============================================================================
+# DELTA BROADCAST TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ws_manager_add_connection_sends_snapshot_then_starts_sender(ws_manager, mock_websocket):
+    """Test that a new client gets a sequence-numbered snapshot before any delta."""
+    ws_manager.sequence = 7
+
+    with patch("registry.health.service.health_service") as mock_health_service:
+        mock_health_service._get_cached_health_data = AsyncMock(
+            return_value={"/a": {"status": "healthy"}}
+        )
+
+        success = await ws_manager.add_connection(mock_websocket)
+
+    assert success is True
+    snapshot = json.loads(mock_websocket.send_text.call_args[0][0])
+    assert snapshot == {"type": "snapshot", "seq": 7, "servers": {"/a": {"status": "healthy"}}}
+    assert ws_manager._channels[mock_websocket].sender_task is not None
+
+    await ws_manager.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ws_manager_coalesces_updates_within_interval(ws_manager, mock_websocket):
+    """Test that repeated updates to one service within the interval become one delta."""
+    ws_manager.connections.add(mock_websocket)
+    ws_manager.last_broadcast_time = 0
+
+    with patch.object(ws_manager, "_send_to_connections_optimized", new=AsyncMock()) as mock_send:
+        await ws_manager.broadcast_update("/a", {"status": "checking"})
+        await ws_manager.broadcast_update("/a", {"status": "healthy"})
+        await ws_manager.broadcast_update("/b", {"status": "unhealthy"})
+        await ws_manager._flush_task
+
+        mock_send.assert_awaited_once()
+        assert mock_send.call_args[0][0]["updates"] == {
+            "/a": {"status": "healthy"},
+            "/b": {"status": "unhealthy"},
+        }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ws_manager_removed_service_delta(ws_manager, mock_websocket):
+    """Test that a removed service is sent in the removed list and dropped from state."""
+    ws_manager.connections.add(mock_websocket)
+    ws_manager._client_state = {"/a": {"status": "healthy"}}
+
+    with patch.object(ws_manager, "_send_to_connections_optimized", new=AsyncMock()) as mock_send:
+        await ws_manager.broadcast_update("/a", None)
+        await ws_manager._flush_task
+
+        assert mock_send.call_args[0][0]["removed"] == ["/a"]
+        assert ws_manager._client_state == {}
+
+
+@pytest.mark.unit
+def test_ws_manager_queue_drops_oldest(ws_manager, mock_websocket):
+    """Test that a full client queue drops its oldest message."""
+    channel = _ClientChannel(mock_websocket, max_queue_size=2)
+
+    for message in ("1", "2", "3"):
+        ws_manager._enqueue(channel, message)
+
+    assert list(channel.queue) == ["2", "3"]
+    assert channel.dropped == 1
+    assert ws_manager.get_stats()["dropped_messages"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ws_manager_resync_replaces_queue_with_snapshot(ws_manager, mock_websocket):
+    """Test that a resync request discards queued deltas and queues a snapshot."""
+    channel = _ClientChannel(mock_websocket, max_queue_size=10)
+    ws_manager._channels[mock_websocket] = channel
+    ws_manager._client_state = {"/a": {"status": "healthy"}}
+    ws_manager._client_state_loaded = True
+    ws_manager.sequence = 12
+    ws_manager._enqueue(channel, "stale delta")
+
+    # Act
+    await ws_manager.handle_client_message(mock_websocket, '{"type": "resync"}')
+    await ws_manager.handle_client_message(mock_websocket, "not json")
+
+    # Assert
+    assert len(channel.queue) == 1
+    snapshot = json.loads(channel.queue[0])
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["seq"] == 12
+    assert snapshot["servers"] == {"/a": {"status": "healthy"}}
+    assert ws_manager.get_stats()["resyncs"] == 1
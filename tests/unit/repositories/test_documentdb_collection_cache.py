@@ -0,0 +1,274 @@
+"""
+Unit tests for the DocumentDB collection cache.
+
+Tests the read-through cache used by the server, agent and scope
+repositories: full and per-document reloads, local write invalidation,
+change stream events and the version-counter polling fallback.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from registry.repositories.documentdb.collection_cache import (
+    MODE_CHANGE_STREAM,
+    CollectionCache,
+)
+from registry.repositories.documentdb.server_repository import DocumentDBServerRepository
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+class _FakeCursor:
+    """Async iterator over a list of documents."""
+
+    def __init__(self, docs: list[dict[str, Any]]):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FakeCollection:
+    """Minimal Motor collection supporting find() by _id list."""
+
+    def __init__(self, docs: list[dict[str, Any]]):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.queries: list[dict[str, Any]] = []
+
+    def find(self, query: dict[str, Any]):
+        self.queries.append(query)
+        ids = (query.get("_id") or {}).get("$in")
+        return _FakeCursor(
+            [
+                copy.deepcopy(doc)
+                for doc_id, doc in self.docs.items()
+                if ids is None or doc_id in ids
+            ]
+        )
+
+
+@pytest.fixture
+def collection() -> _FakeCollection:
+    """Fake collection with two server documents."""
+    return _FakeCollection(
+        [
+            {"_id": "/weather", "server_name": "weather", "is_enabled": True},
+            {"_id": "/time", "server_name": "time", "is_enabled": False},
+        ]
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch) -> CollectionCache:
+    """Cache without a background coherence task."""
+    monkeypatch.setattr(CollectionCache, "_ensure_sync_task", lambda self, collection: None)
+    return CollectionCache(
+        "mcp_servers_test",
+        enabled=True,
+        use_change_streams=False,
+        poll_interval_seconds=0.01,
+    )
+
+
+# =============================================================================
+# READ-THROUGH TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestCollectionCacheReads:
+    """Tests for cached reads."""
+
+    @pytest.mark.asyncio
+    async def test_loads_once_and_returns_copies(self, cache, collection):
+        """Test that repeated reads hit memory and cannot corrupt the cache."""
+        # Act
+        first = await cache.get_all(collection)
+        first["/weather"]["server_name"] = "mutated"
+        second = await cache.get(collection, "/weather")
+
+        # Assert
+        assert second["server_name"] == "weather"
+        assert collection.queries == [{}]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_document_invalidation_refetches_only_that_document(
+        self, cache, collection
+    ):
+        """Test that a single stale document is re-fetched by _id."""
+        await cache.get_all(collection)
+        collection.docs["/weather"]["is_enabled"] = False
+        del collection.docs["/time"]
+
+        # Act
+        cache.invalidate("/weather")
+        cache.invalidate("/time")
+        docs = await cache.get_all(collection)
+
+        # Assert
+        assert docs["/weather"]["is_enabled"] is False
+        assert "/time" not in docs
+        assert sorted(collection.queries[-1]["_id"]["$in"]) == ["/time", "/weather"]
+
+    @pytest.mark.asyncio
+    async def test_find_filters_without_reloading(self, cache, collection):
+        """Test predicate lookups are answered from memory."""
+        await cache.get_all(collection)
+
+        enabled = await cache.find(collection, lambda doc: doc.get("is_enabled"))
+
+        assert list(enabled) == ["/weather"]
+        assert len(collection.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_reads_through(self, collection):
+        """Test that a disabled cache queries the collection every time."""
+        cache = CollectionCache("mcp_servers_test", enabled=False)
+
+        await cache.get_all(collection)
+        await cache.get_all(collection)
+
+        assert len(collection.queries) == 2
+
+
+# =============================================================================
+# COHERENCE TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestCollectionCacheCoherence:
+    """Tests for local writes, change stream events and version polling."""
+
+    @pytest.mark.asyncio
+    async def test_record_write_bumps_version_in_polling_mode(self, cache, collection):
+        """Test that local writes invalidate and notify polling replicas."""
+        versions = MagicMock()
+        versions.find_one_and_update = AsyncMock(return_value={"version": 4})
+        cache._version_collection = versions
+        cache._seen_version = 3
+        await cache.get_all(collection)
+
+        # Act
+        await cache.record_write("/weather")
+
+        # Assert
+        versions.find_one_and_update.assert_awaited_once()
+        assert cache._stale_ids == {"/weather"}
+        # Our own bump does not force a full reload on the next poll
+        assert cache._seen_version == 4
+
+    @pytest.mark.asyncio
+    async def test_record_write_skips_version_with_change_streams(self, cache, collection):
+        """Test that change stream mode needs no version counter writes."""
+        versions = MagicMock()
+        versions.find_one_and_update = AsyncMock()
+        cache._version_collection = versions
+        cache.mode = MODE_CHANGE_STREAM
+
+        await cache.record_write("/weather")
+
+        versions.find_one_and_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_change_events(self, cache, collection):
+        """Test document events mark one id stale and other events drop everything."""
+        await cache.get_all(collection)
+
+        cache._apply_change({"operationType": "update", "documentKey": {"_id": "/time"}})
+        assert cache._stale_ids == {"/time"}
+
+        cache._apply_change({"operationType": "drop"})
+        assert cache.get_stats()["documents"] == 0
+
+    @pytest.mark.asyncio
+    async def test_poll_detects_remote_writes(self, cache, collection):
+        """Test that a moved version counter drops the cache."""
+        versions = MagicMock()
+        versions.find_one = AsyncMock(return_value={"version": 7})
+        cache._version_collection = versions
+
+        task = asyncio.create_task(cache._poll_version())
+        await asyncio.sleep(0.03)
+        await cache.get_all(collection)
+        loads_before = cache.full_loads
+
+        # Act
+        versions.find_one.return_value = {"version": 8}
+        await asyncio.sleep(0.03)
+        await cache.get_all(collection)
+        task.cancel()
+
+        # Assert
+        assert cache.full_loads == loads_before + 1
+
+    @pytest.mark.asyncio
+    async def test_poll_reloads_writes_that_bypass_the_repository(self, collection):
+        """Test that writes which never bump the counter show up after max age."""
+        cache = CollectionCache(
+            "mcp_scopes_test",
+            enabled=True,
+            use_change_streams=False,
+            poll_interval_seconds=0.01,
+            max_age_seconds=0.05,
+        )
+        versions = MagicMock()
+        versions.find_one = AsyncMock(return_value={"version": 7})
+        cache._version_collection = versions
+        cache._sync_task = asyncio.create_task(cache._poll_version())
+        await asyncio.sleep(0.02)
+        await cache.get_all(collection)
+
+        # Act: a script writes the collection directly, the counter stays put
+        collection.docs["/weather"]["is_enabled"] = False
+        await asyncio.sleep(0.1)
+        docs = await cache.get_all(collection)
+        await cache.stop()
+
+        # Assert
+        assert docs["/weather"]["is_enabled"] is False
+
+
+# =============================================================================
+# REPOSITORY INTEGRATION TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestServerRepositoryCache:
+    """Tests for DocumentDBServerRepository reads through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_list_and_get_share_one_load(self, cache, collection):
+        """Test that list_all and get are served from one collection scan."""
+        repo = DocumentDBServerRepository()
+        repo._collection = collection
+        repo._cache = cache
+
+        servers = await repo.list_all()
+        server = await repo.get("/weather")
+
+        assert set(servers) == {"/weather", "/time"}
+        assert servers["/weather"]["path"] == "/weather"
+        assert server["path"] == "/weather"
+        assert collection.queries == [{}]
@@ -0,0 +1,368 @@
+"""
+Unit tests for DocumentDBSearchRepository.
+
+Tests the DocumentDB search repository with a mocked Motor collection,
+covering document building, batched bulk indexing and the client-side
+search fallback used on MongoDB CE.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from registry.repositories.documentdb.search_repository import (
+    DocumentDBSearchRepository,
+    _calculate_text_boost,
+    _ClientSideSearchIndex,
+    _tokenize_query,
+)
+from tests.fixtures.factories import AgentCardFactory
+from tests.fixtures.mocks.mock_embeddings import MockEmbeddingsClient
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def mock_collection():
+    """Create a mock Motor collection."""
+    collection = MagicMock()
+    collection.replace_one = AsyncMock()
+    collection.bulk_write = AsyncMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[])
+    collection.find = MagicMock(return_value=cursor)
+    return collection
+
+
+@pytest.fixture
+def search_repository(mock_collection):
+    """Create a DocumentDBSearchRepository with mocked collection and model."""
+    repo = DocumentDBSearchRepository()
+    repo._collection = mock_collection
+    repo._embedding_model = MockEmbeddingsClient(dimension=384)
+    return repo
+
+
+@pytest.fixture
+def sample_server_info() -> dict[str, Any]:
+    """Sample server info for indexing."""
+    return {
+        "server_name": "weather",
+        "description": "Weather forecasts",
+        "tags": ["weather"],
+        "tool_list": [{"name": "get_forecast", "description": "Get a forecast"}],
+    }
+
+
+# =============================================================================
+# BULK INDEX TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestBulkIndex:
+    """Tests for DocumentDBSearchRepository.bulk_index."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_uses_batched_encode_and_bulk_write(
+        self, search_repository, mock_collection, sample_server_info, monkeypatch
+    ):
+        """Test entities are encoded in batches and written with bulk_write."""
+        monkeypatch.setattr(
+            "registry.repositories.documentdb.search_repository.settings.embeddings_batch_size",
+            2,
+        )
+        encode_calls = []
+        original_encode = search_repository._embedding_model.encode
+
+        def counting_encode(texts, **kwargs):
+            encode_calls.append(len(texts))
+            return original_encode(texts, **kwargs)
+
+        search_repository._embedding_model.encode = counting_encode
+
+        entities = [
+            {
+                "path": f"/s{i}",
+                "entity_type": "mcp_server",
+                "info": dict(sample_server_info, server_name=f"server-{i}"),
+                "is_enabled": True,
+            }
+            for i in range(3)
+        ]
+        entities.append({
+            "path": "/agents/a",
+            "entity_type": "a2a_agent",
+            "info": AgentCardFactory(name="agent-a"),
+            "is_enabled": False,
+        })
+
+        embedded = await search_repository.bulk_index(entities)
+
+        assert embedded == 4
+        assert encode_calls == [2, 2]
+        assert mock_collection.bulk_write.await_count == 2
+        mock_collection.replace_one.assert_not_called()
+
+        written = [
+            op._doc
+            for call in mock_collection.bulk_write.await_args_list
+            for op in call.args[0]
+        ]
+        assert [doc["_id"] for doc in written] == ["/s0", "/s1", "/s2", "/agents/a"]
+        assert all(len(doc["embedding"]) == 384 for doc in written)
+        assert written[3]["entity_type"] == "a2a_agent"
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_reuses_unchanged_embeddings(
+        self, search_repository, mock_collection, sample_server_info
+    ):
+        """Test documents with unchanged text keep their stored embedding."""
+        doc = search_repository._build_server_document("/s0", sample_server_info, True)
+        stored_embedding = [0.5] * 384
+        mock_collection.find.return_value.to_list = AsyncMock(
+            return_value=[
+                {
+                    "_id": "/s0",
+                    "text_for_embedding": doc["text_for_embedding"],
+                    "embedding": stored_embedding,
+                }
+            ]
+        )
+        search_repository._embedding_model.encode = MagicMock()
+
+        embedded = await search_repository.bulk_index([
+            {"path": "/s0", "entity_type": "mcp_server", "info": sample_server_info, "is_enabled": False}
+        ])
+
+        assert embedded == 0
+        search_repository._embedding_model.encode.assert_not_called()
+        written = mock_collection.bulk_write.await_args.args[0][0]._doc
+        assert written["embedding"] == stored_embedding
+        assert written["is_enabled"] is False
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_empty(self, search_repository, mock_collection):
+        """Test bulk_index with no entities does nothing."""
+        assert await search_repository.bulk_index([]) == 0
+        mock_collection.bulk_write.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_without_model_writes_empty_embeddings(
+        self, search_repository, mock_collection, sample_server_info
+    ):
+        """Test documents are still written when the model is unavailable."""
+        search_repository._embedding_model.encode = MagicMock(side_effect=RuntimeError("down"))
+
+        embedded = await search_repository.bulk_index([
+            {"path": "/s0", "entity_type": "mcp_server", "info": sample_server_info, "is_enabled": True}
+        ])
+
+        assert embedded == 0
+        written = mock_collection.bulk_write.await_args.args[0][0]._doc
+        assert written["embedding"] == []
+
+
+# =============================================================================
+# QUERY EMBEDDING CACHE TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestQueryEmbeddingCache:
+    """Tests for query embedding reuse in DocumentDBSearchRepository.search."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_encode_once(
+        self, search_repository, mock_collection
+    ):
+        """Test case/whitespace variants of a query reuse the cached embedding."""
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_collection.aggregate = MagicMock(return_value=cursor)
+        encoded: list[list[str]] = []
+        original_encode = search_repository._embedding_model.encode
+        search_repository._embedding_model.encode = lambda texts: (
+            encoded.append(texts) or original_encode(texts)
+        )
+
+        await search_repository.search("Weather Forecast")
+        await search_repository.search("  weather   forecast")
+
+        assert encoded == [["Weather Forecast"]]
+        stats = search_repository.get_query_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_query_encoding_runs_off_event_loop(
+        self,
+        search_repository,
+        mock_collection,
+    ):
+        """Test a query embedding cache miss is encoded in a worker thread."""
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_collection.aggregate = MagicMock(return_value=cursor)
+        threads: list[int] = []
+        original_encode = search_repository._embedding_model.encode
+        search_repository._embedding_model.encode = lambda texts: (
+            threads.append(threading.get_ident()) or original_encode(texts)
+        )
+
+        await search_repository.search("weather forecast")
+
+        assert threads and threads[0] != threading.get_ident()
+
+
+# =============================================================================
+# CLIENT-SIDE SEARCH TESTS
+# =============================================================================
+
+
+def _search_docs(count: int, dimension: int = 8, seed: int = 0) -> list[dict[str, Any]]:
+    """Build search documents with random embeddings, as stored in the collection."""
+    rng = np.random.default_rng(seed)
+    docs = []
+    for i in range(count):
+        entity_type = "a2a_agent" if i % 3 == 0 else "mcp_server"
+        docs.append({
+            "_id": f"/e{i}",
+            "path": f"/e{i}",
+            "entity_type": entity_type,
+            "name": f"entity-{i}",
+            "description": "Weather forecasts" if i % 7 == 0 else f"Thing number {i}",
+            "tags": ["demo"],
+            "tools": [{"name": f"tool_{i}", "description": None}],
+            "metadata": {},
+            "is_enabled": True,
+            "embedding": rng.normal(size=dimension).tolist(),
+        })
+    return docs
+
+
+@pytest.fixture
+def client_side_repository(search_repository, mock_collection):
+    """Repository whose collection returns 40 documents from find()."""
+    docs = _search_docs(40)
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(side_effect=lambda length=None: copy.deepcopy(docs))
+    mock_collection.find = MagicMock(return_value=cursor)
+    search_repository.test_docs = docs
+    return search_repository
+
+
+@pytest.mark.unit
+@pytest.mark.repositories
+class TestClientSideSearch:
+    """Tests for the cached embedding matrix used on MongoDB CE."""
+
+    @pytest.mark.asyncio
+    async def test_matches_per_document_scoring(self, client_side_repository):
+        """Test top results equal scoring every document one by one."""
+        repo = client_side_repository
+        query_embedding = np.random.default_rng(1).normal(size=8).tolist()
+        query = "weather forecasts"
+
+        results = await repo._client_side_search(query, query_embedding)
+
+        tokens = _tokenize_query(query)
+        expected: dict[str, list[tuple[float, str]]] = {"mcp_server": [], "a2a_agent": []}
+        for doc in repo.test_docs:
+            vector = repo._calculate_cosine_similarity(query_embedding, doc["embedding"])
+            text_boost, _ = _calculate_text_boost(doc, tokens)
+            score = max(0.0, min(1.0, (vector + 1.0) / 2.0 + text_boost * 0.1))
+            expected[doc["entity_type"]].append((score, doc["path"]))
+        # Scores clamp at 1.0, so compare scores rather than tie-ordered paths
+        top = {
+            entity_type: [score for score, _ in sorted(scores, reverse=True)[:3]]
+            for entity_type, scores in expected.items()
+        }
+
+        servers = [r["relevance_score"] for r in results["servers"]]
+        agents = [r["relevance_score"] for r in results["agents"]]
+        np.testing.assert_allclose(servers, top["mcp_server"], rtol=1e-5)
+        np.testing.assert_allclose(agents, top["a2a_agent"], rtol=1e-5)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused_until_a_write(self, client_side_repository, mock_collection):
+        """Test documents are fetched once and refetched after indexing."""
+        repo = client_side_repository
+        query_embedding = [1.0] * 8
+
+        await repo._client_side_search("anything", query_embedding)
+        await repo._client_side_search("something else", query_embedding)
+        assert mock_collection.find.call_count == 1
+
+        await repo.remove_entity("/e1")
+        await repo._client_side_search("anything", query_embedding)
+        assert mock_collection.find.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_expires_after_ttl(
+        self, client_side_repository, mock_collection, monkeypatch
+    ):
+        """Test the snapshot is reloaded after the TTL for external writes."""
+        monkeypatch.setattr(
+            "registry.repositories.documentdb.search_repository."
+            "settings.documentdb_client_search_cache_ttl_seconds",
+            0,
+        )
+        repo = client_side_repository
+
+        await repo._client_side_search("anything", [1.0] * 8)
+        await repo._client_side_search("anything", [1.0] * 8)
+
+        assert mock_collection.find.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_entity_type_filter_and_cached_docs_unchanged(self, client_side_repository):
+        """Test entity filters apply and per-query fields stay out of the cache."""
+        repo = client_side_repository
+
+        results = await repo._client_side_search(
+            "weather", [1.0] * 8, entity_types=["a2a_agent"]
+        )
+
+        assert results["servers"] == []
+        assert len(results["agents"]) == 3
+        assert all("_matching_tools" not in doc for doc in repo._client_side_index.docs)
+        assert all("embedding" not in doc for doc in repo._client_side_index.docs)
+
+    def test_missing_or_mismatched_embeddings_score_zero(self):
+        """Test documents without a usable embedding get a zero vector score."""
+        docs = [
+            {"path": "/a", "embedding": [3.0, 4.0]},
+            {"path": "/b", "embedding": []},
+            {"path": "/c", "embedding": [1.0, 2.0, 3.0]},
+        ]
+        index = _ClientSideSearchIndex(docs, dimension=2, version=0)
+
+        scores = index.vector_scores([3.0, 4.0])
+
+        np.testing.assert_allclose(scores, [1.0, 0.0, 0.0], atol=1e-6)
+        assert index.vector_scores([0.0, 0.0]).tolist() == [0.0, 0.0, 0.0]
+
+    def test_keyword_match_mask(self):
+        """Test keyword matches are attributed to the right documents."""
+        docs = [
+            {"path": "/a", "name": "Weather", "tags": []},
+            {"path": "/b", "name": "stocks", "tools": [{"name": "get_forecast"}]},
+            {"path": "/c", "name": "news", "description": None},
+        ]
+        index = _ClientSideSearchIndex(docs, dimension=2, version=0)
+
+        assert index.keyword_match_mask(["weather", "forecast"]).tolist() == [True, True, False]
+        assert index.keyword_match_mask([]).tolist() == [False, False, False]
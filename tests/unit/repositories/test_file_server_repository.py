@@ -346,3 +346,22 @@ class TestFileServerRepositoryIntegration:
             assert result is True
             # Verify file was written
             m.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_get_enabled_servers_with_info_uses_state(
+        self, server_repository, sample_server_dict
+    ):
+        """Test that enabled servers are selected from the state file, with their info."""
+        # Arrange
+        disabled_server = {**sample_server_dict, "path": "/disabled", "server_name": "Disabled"}
+        server_repository._servers = {
+            "/test-server": sample_server_dict,
+            "/disabled": disabled_server,
+        }
+        server_repository._state = {"/test-server": True, "/disabled": False}
+
+        # Act
+        result = await server_repository.get_enabled_servers_with_info()
+
+        # Assert
+        assert result == {"/test-server": sample_server_dict}
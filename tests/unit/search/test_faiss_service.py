@@ -9,14 +9,18 @@ This module tests all core functionality of the FaissService including:
 - Embeddings generation and normalization
 """
 
+import asyncio
 import json
 import logging
+import threading
 from typing import Any
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 
 from registry.schemas.agent_models import AgentCard
+from registry.search.metadata_columns import MetadataColumns
 from registry.search.service import FaissService, _PydanticAwareJSONEncoder
 from tests.fixtures.factories import AgentCardFactory
 from tests.fixtures.mocks.mock_embeddings import MockEmbeddingsClient
@@ -206,6 +210,32 @@ class TestFaissServiceInitialization:
 
         assert service.metadata_store == metadata["metadata"]
         assert service.next_id_counter == 1
+        assert service.metadata_columns.path_for(0) == "test-server"
+
+    @pytest.mark.asyncio
+    async def test_load_faiss_data_restores_id_to_path(self, mock_settings):
+        """Test the persisted id_to_path map is read back on load."""
+        service = FaissService()
+        metadata = {
+            "metadata": {
+                "/servers/a": {"id": 3, "entity_type": "mcp_server", "full_server_info": {}},
+            },
+            "next_id": 4,
+            "id_to_path": {"3": "/servers/a"},
+        }
+        mock_settings.faiss_metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(mock_settings.faiss_metadata_path, "w") as f:
+            json.dump(metadata, f)
+        mock_settings.faiss_index_path.touch()
+
+        with patch(
+            "registry.search.service.MetadataColumns.from_metadata",
+            wraps=MetadataColumns.from_metadata,
+        ) as from_metadata:
+            await service._load_faiss_data()
+
+        from_metadata.assert_called_once_with(metadata["metadata"], {"3": "/servers/a"})
+        assert service.metadata_columns.id_to_path() == {3: "/servers/a"}
 
 
 # =============================================================================
@@ -598,6 +628,235 @@ class TestAddUpdateAgent:
         assert "/agents/test" not in service.metadata_store
 
 
+# =============================================================================
+# BULK INDEX TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestBulkIndex:
+    """Tests for batched bulk indexing."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_encodes_in_batches(
+        self, faiss_service, sample_server_info, sample_agent_card, monkeypatch
+    ):
+        """Test bulk_index encodes texts in batches and indexes all entities."""
+        monkeypatch.setattr("registry.search.service.settings.embeddings_batch_size", 2)
+        encode_calls = []
+        original_encode = faiss_service.embedding_model.encode
+
+        def counting_encode(texts, **kwargs):
+            encode_calls.append(len(texts))
+            return original_encode(texts, **kwargs)
+
+        monkeypatch.setattr(faiss_service.embedding_model, "encode", counting_encode)
+
+        entities = [
+            {
+                "path": f"/servers/s{i}",
+                "entity_type": "mcp_server",
+                "info": dict(sample_server_info, server_name=f"server-{i}"),
+                "is_enabled": True,
+            }
+            for i in range(4)
+        ]
+        entities.append({
+            "path": "/agents/test-agent",
+            "entity_type": "a2a_agent",
+            "info": sample_agent_card,
+            "is_enabled": False,
+        })
+
+        embedded = await faiss_service.bulk_index(entities)
+
+        assert embedded == 5
+        # 5 entity texts, then 8 tool texts (2 tools per server)
+        assert encode_calls == [2, 2, 1, 2, 2, 2, 2]
+        assert faiss_service.faiss_index.ntotal == 5
+        assert faiss_service.tool_index.ntotal == 8
+        assert faiss_service.metadata_store["/servers/s0"]["full_server_info"]["is_enabled"] is True
+        assert faiss_service.metadata_store["/agents/test-agent"]["entity_type"] == "a2a_agent"
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_skips_unchanged_text(self, faiss_service, sample_server_info):
+        """Test bulk_index does not re-embed entities whose text is unchanged."""
+        await faiss_service.add_or_update_service("/servers/s0", sample_server_info, is_enabled=False)
+        original_id = faiss_service.metadata_store["/servers/s0"]["id"]
+
+        embedded = await faiss_service.bulk_index([
+            {
+                "path": "/servers/s0",
+                "entity_type": "mcp_server",
+                "info": sample_server_info,
+                "is_enabled": True,
+            }
+        ])
+
+        assert embedded == 0
+        assert faiss_service.faiss_index.ntotal == 1
+        metadata = faiss_service.metadata_store["/servers/s0"]
+        assert metadata["id"] == original_id
+        assert metadata["full_server_info"]["is_enabled"] is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_reuses_id_on_changed_text(self, faiss_service, sample_server_info):
+        """Test bulk_index replaces the vector in place when text changes."""
+        await faiss_service.add_or_update_service("/servers/s0", sample_server_info)
+        original_id = faiss_service.metadata_store["/servers/s0"]["id"]
+
+        changed = dict(sample_server_info, description="Completely different description")
+        embedded = await faiss_service.bulk_index([
+            {"path": "/servers/s0", "entity_type": "mcp_server", "info": changed, "is_enabled": False}
+        ])
+
+        assert embedded == 1
+        assert faiss_service.faiss_index.ntotal == 1
+        assert faiss_service.metadata_store["/servers/s0"]["id"] == original_id
+        assert faiss_service.next_id_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_duplicate_path_keeps_last(self, faiss_service, sample_server_info):
+        """Test a path listed twice is indexed once, from its last occurrence."""
+        changed = dict(sample_server_info, description="Completely different description")
+
+        embedded = await faiss_service.bulk_index([
+            {"path": "/servers/s0", "entity_type": "mcp_server", "info": sample_server_info, "is_enabled": True},
+            {"path": "/servers/s0", "entity_type": "mcp_server", "info": changed, "is_enabled": False},
+        ])
+
+        assert embedded == 1
+        assert faiss_service.faiss_index.ntotal == 1
+        assert faiss_service.next_id_counter == 1
+        metadata = faiss_service.metadata_store["/servers/s0"]
+        assert metadata["id"] == 0
+        assert metadata["full_server_info"]["description"] == "Completely different description"
+        assert metadata["full_server_info"]["is_enabled"] is False
+
+    @pytest.mark.asyncio
+    async def test_bulk_index_without_model(self, mock_settings):
+        """Test bulk_index is a no-op without an embedding model."""
+        service = FaissService()
+        service._initialize_new_index()
+
+        embedded = await service.bulk_index([
+            {"path": "/servers/s0", "entity_type": "mcp_server", "info": {"server_name": "s0"}}
+        ])
+
+        assert embedded == 0
+        assert service.metadata_store == {}
+
+
+# =============================================================================
+# TOOL INDEX TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestToolIndex:
+    """Tests for the precomputed per-tool index used by mcpgw."""
+
+    @pytest.mark.asyncio
+    async def test_add_service_indexes_each_tool(self, faiss_service, sample_server_info):
+        """Test adding a service embeds one vector per tool."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", sample_server_info, is_enabled=True
+        )
+
+        tools = faiss_service.tool_metadata_store["/servers/test-server"]
+        assert set(tools) == {"get_data", "set_data"}
+        assert faiss_service.tool_index.ntotal == 2
+        assert tools["get_data"]["text_for_embedding"] == (
+            "Service: test-server. Tool: get_data. Description: Retrieve data from source"
+        )
+
+    @pytest.mark.asyncio
+    async def test_only_changed_tools_are_reembedded(
+        self, faiss_service, sample_server_info, monkeypatch
+    ):
+        """Test updating one tool description re-encodes only that tool."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", sample_server_info, is_enabled=True
+        )
+        original_ids = {
+            name: entry["id"]
+            for name, entry in faiss_service.tool_metadata_store["/servers/test-server"].items()
+        }
+        encoded_texts = []
+        original_encode = faiss_service.embedding_model.encode
+
+        def recording_encode(texts, **kwargs):
+            encoded_texts.extend(texts)
+            return original_encode(texts, **kwargs)
+
+        monkeypatch.setattr(faiss_service.embedding_model, "encode", recording_encode)
+
+        updated_info = dict(sample_server_info)
+        updated_info["tool_list"] = [
+            sample_server_info["tool_list"][0],
+            dict(
+                sample_server_info["tool_list"][1],
+                parsed_description={"main": "Write data to source"},
+            ),
+        ]
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", updated_info, is_enabled=True
+        )
+
+        tool_texts = [text for text in encoded_texts if text.startswith("Service:")]
+        assert tool_texts == [
+            "Service: test-server. Tool: set_data. Description: Write data to source"
+        ]
+        tools = faiss_service.tool_metadata_store["/servers/test-server"]
+        assert {name: entry["id"] for name, entry in tools.items()} == original_ids
+        assert faiss_service.tool_index.ntotal == 2
+
+    @pytest.mark.asyncio
+    async def test_removed_tools_leave_index(self, faiss_service, sample_server_info):
+        """Test tools dropped from a service's tool list are removed."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", sample_server_info, is_enabled=True
+        )
+
+        updated_info = dict(sample_server_info, tool_list=sample_server_info["tool_list"][:1])
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", updated_info, is_enabled=True
+        )
+
+        assert set(faiss_service.tool_metadata_store["/servers/test-server"]) == {"get_data"}
+        assert faiss_service.tool_index.ntotal == 1
+
+    @pytest.mark.asyncio
+    async def test_remove_entity_removes_tools(self, faiss_service, sample_server_info):
+        """Test removing a service removes its tools."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", sample_server_info, is_enabled=True
+        )
+
+        await faiss_service.remove_entity("/servers/test-server")
+
+        assert "/servers/test-server" not in faiss_service.tool_metadata_store
+        assert faiss_service.tool_index.ntotal == 0
+
+    @pytest.mark.asyncio
+    async def test_tool_index_is_persisted(
+        self, faiss_service, sample_server_info, mock_settings
+    ):
+        """Test save_data writes the tool index and metadata next to the service index."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server", sample_server_info, is_enabled=True
+        )
+        await faiss_service.save_data()
+
+        assert mock_settings.faiss_tool_index_path.exists()
+        with open(mock_settings.faiss_tool_metadata_path) as f:
+            saved = json.load(f)
+        assert set(saved["metadata"]["/servers/test-server"]) == {"get_data", "set_data"}
+        assert saved["next_id"] == 2
+
+
 # =============================================================================
 # REMOVE ENTITY TESTS
 # =============================================================================
@@ -622,11 +881,15 @@ class TestRemoveEntities:
 
         assert service_path in faiss_service.metadata_store
 
+        service_id = faiss_service.metadata_store[service_path]["id"]
+        assert faiss_service.metadata_columns.path_for(service_id) == service_path
+
         # Remove service
         await faiss_service.remove_service(service_path)
 
-        # Should be removed from metadata
+        # Should be removed from metadata and the reverse map
         assert service_path not in faiss_service.metadata_store
+        assert faiss_service.metadata_columns.path_for(service_id) is None
 
     @pytest.mark.asyncio
     async def test_remove_nonexistent_service(self, faiss_service):
@@ -728,6 +991,29 @@ class TestSearch:
         assert "relevance_score" in server
         assert 0 <= server["relevance_score"] <= 1
 
+    @pytest.mark.asyncio
+    async def test_search_mixed_reuses_cached_query_embedding(
+        self, faiss_service, sample_server_info
+    ):
+        """Test equivalent queries are encoded only once."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server",
+            sample_server_info,
+            is_enabled=True
+        )
+
+        with patch.object(
+            faiss_service.embedding_model,
+            "encode",
+            wraps=faiss_service.embedding_model.encode,
+        ) as mock_encode:
+            first = await faiss_service.search_mixed("Test  Server")
+            second = await faiss_service.search_mixed("  test server ")
+
+        assert mock_encode.call_count == 1
+        assert first == second
+        assert faiss_service.query_cache.get_stats()["hits"] == 1
+
     @pytest.mark.asyncio
     async def test_search_mixed_finds_agents(self, faiss_service, sample_agent_card):
         """Test search_mixed finds matching agents."""
@@ -844,6 +1130,46 @@ class TestSearch:
         # Should return list of agents
         assert isinstance(results, list)
 
+    @pytest.mark.asyncio
+    async def test_entity_filter_is_applied_before_top_k(self, faiss_service, sample_agent_card):
+        """Test an agent-only search finds agents even when servers fill the top k."""
+        for i in range(10):
+            await faiss_service.add_or_update_service(
+                f"/servers/server-{i}",
+                {"server_name": f"server-{i}", "description": f"Test server {i}"},
+                is_enabled=True,
+            )
+        await faiss_service.add_or_update_agent("/agents/test-agent", sample_agent_card)
+
+        results = await faiss_service.search_mixed(
+            "test server", entity_types=["a2a_agent"], max_results=1
+        )
+
+        assert [agent["path"] for agent in results["agents"]] == ["/agents/test-agent"]
+
+    @pytest.mark.asyncio
+    async def test_search_entities_enabled_only(self, faiss_service, sample_server_info):
+        """Test enabled_only excludes disabled servers from the vector search."""
+        await faiss_service.add_or_update_service("/servers/on", sample_server_info, is_enabled=True)
+        await faiss_service.add_or_update_service(
+            "/servers/off", dict(sample_server_info, server_name="off"), is_enabled=False
+        )
+
+        results = await faiss_service.search_entities(
+            "test server", entity_types=["mcp_server"], enabled_only=True
+        )
+
+        assert [server["path"] for server in results] == ["/servers/on"]
+
+    @pytest.mark.asyncio
+    async def test_enabled_only_with_nothing_enabled(self, faiss_service, sample_server_info):
+        """Test a filter matching no entities returns empty results."""
+        await faiss_service.add_or_update_service("/servers/off", sample_server_info)
+
+        results = await faiss_service.search_mixed("test", enabled_only=True)
+
+        assert results == {"servers": [], "tools": [], "agents": []}
+
 
 # =============================================================================
 # KEYWORD BOOST TESTS
@@ -1114,6 +1440,8 @@ class TestPersistence:
         assert "metadata" in saved_data
         assert "next_id" in saved_data
         assert "/servers/test-server" in saved_data["metadata"]
+        service_id = saved_data["metadata"]["/servers/test-server"]["id"]
+        assert saved_data["id_to_path"] == {str(service_id): "/servers/test-server"}
 
     @pytest.mark.asyncio
     async def test_save_data_without_index(self, mock_settings):
@@ -1126,6 +1454,130 @@ class TestPersistence:
         # Should not create files
         assert not mock_settings.faiss_metadata_path.exists()
 
+    @pytest.mark.asyncio
+    async def test_save_data_leaves_no_temp_files(self, faiss_service, sample_server_info, mock_settings):
+        """Test save_data writes through a temp file and renames it into place."""
+        await faiss_service.add_or_update_service(
+            "/servers/test-server",
+            sample_server_info,
+            is_enabled=True
+        )
+        await faiss_service.save_data()
+
+        assert mock_settings.faiss_index_path.exists()
+        assert mock_settings.faiss_metadata_path.exists()
+        assert list(mock_settings.servers_dir.glob("*.tmp")) == []
+        assert faiss_service._dirty is False
+
+    @pytest.mark.asyncio
+    async def test_updates_coalesce_into_single_save(
+        self, faiss_service, sample_server_info, mock_settings, monkeypatch
+    ):
+        """Test rapid updates within the debounce window trigger one save."""
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_save_debounce_seconds", 0.05
+        )
+        save_calls = 0
+        original_save = faiss_service.save_data
+
+        async def counting_save():
+            nonlocal save_calls
+            save_calls += 1
+            await original_save()
+
+        monkeypatch.setattr(faiss_service, "save_data", counting_save)
+
+        for i in range(10):
+            info = dict(sample_server_info, server_name=f"server-{i}")
+            await faiss_service.add_or_update_service(f"/servers/s{i}", info, is_enabled=True)
+
+        assert save_calls == 0
+        assert faiss_service._dirty is True
+
+        await faiss_service._save_task
+
+        assert save_calls == 1
+        assert faiss_service._dirty is False
+        with open(mock_settings.faiss_metadata_path) as f:
+            saved_data = json.load(f)
+        assert len(saved_data["metadata"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_flush_persists_pending_changes(
+        self, faiss_service, sample_server_info, mock_settings, monkeypatch
+    ):
+        """Test flush writes pending changes without waiting for the window."""
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_save_debounce_seconds", 60
+        )
+        await faiss_service.add_or_update_service(
+            "/servers/test-server",
+            sample_server_info,
+            is_enabled=True
+        )
+        assert not mock_settings.faiss_metadata_path.exists()
+
+        await faiss_service.flush()
+
+        assert mock_settings.faiss_metadata_path.exists()
+        assert faiss_service._dirty is False
+        assert faiss_service._save_task is None
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_save_in_progress(
+        self, faiss_service, sample_server_info, mock_settings, monkeypatch
+    ):
+        """Test flush does not return while a debounced save is still writing."""
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_save_debounce_seconds", 0.01
+        )
+        write_started = threading.Event()
+        release_write = threading.Event()
+        original_write = faiss_service._write_snapshot
+
+        def slow_write(*args, **kwargs):
+            write_started.set()
+            release_write.wait(5)
+            original_write(*args, **kwargs)
+
+        monkeypatch.setattr(faiss_service, "_write_snapshot", slow_write)
+        await faiss_service.add_or_update_service(
+            "/servers/test-server",
+            sample_server_info,
+            is_enabled=True
+        )
+        assert await asyncio.to_thread(write_started.wait, 5)
+        assert faiss_service._dirty is False
+
+        flush_task = asyncio.create_task(faiss_service.flush())
+        await asyncio.sleep(0.05)
+        assert not flush_task.done()
+
+        release_write.set()
+        await flush_task
+
+        assert mock_settings.faiss_index_path.exists()
+        assert list(mock_settings.servers_dir.glob("*.tmp")) == []
+        with open(mock_settings.faiss_metadata_path) as f:
+            assert len(json.load(f)["metadata"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_debounce_saves_immediately(
+        self, faiss_service, sample_server_info, mock_settings, monkeypatch
+    ):
+        """Test a zero debounce window saves synchronously on every change."""
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_save_debounce_seconds", 0
+        )
+        await faiss_service.add_or_update_service(
+            "/servers/test-server",
+            sample_server_info,
+            is_enabled=True
+        )
+
+        assert mock_settings.faiss_metadata_path.exists()
+        assert faiss_service._save_task is None
+
     def test_get_indexed_count(self, faiss_service):
         """Test getting the count of indexed items."""
         # Initially empty
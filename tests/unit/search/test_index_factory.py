@@ -0,0 +1,303 @@
+"""
+Unit tests for registry/search/index_factory.py and FaissService ANN switchover.
+
+Tests cover:
+- Index type resolution (flat/hnsw/ivfpq/auto)
+- Building HNSW and IVF-PQ indexes and their recall against flat search
+- Background ANN builds in FaissService, incremental adds, tombstones and
+  replay of writes made during a rebuild
+
+Building real indexes needs the FAISS library, which conftest replaces with a
+mock; these tests load the real module and skip if it is not installed.
+"""
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pytest
+
+from registry.search.index_factory import resolve_index_type
+from registry.search.service import FaissService
+from tests.fixtures.mocks.mock_embeddings import MockEmbeddingsClient
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@lru_cache(maxsize=1)
+def _load_real_faiss() -> Any:
+    """Import the real faiss module without disturbing the auto-mock."""
+    mock_module = sys.modules.pop("faiss")
+    try:
+        return importlib.import_module("faiss")
+    except ImportError:
+        return None
+    finally:
+        sys.modules["faiss"] = mock_module
+
+
+@pytest.fixture
+def real_faiss(monkeypatch):
+    """Use the real FAISS library in the search modules for one test."""
+    faiss_module = _load_real_faiss()
+    if faiss_module is None or not hasattr(faiss_module, "IndexHNSWFlat"):
+        pytest.skip("faiss is not installed")
+    monkeypatch.setattr("registry.search.index_factory.faiss", faiss_module)
+    monkeypatch.setattr("registry.search.service.faiss", faiss_module)
+    return faiss_module
+
+
+def _clustered_vectors(
+    n: int,
+    dimension: int,
+    seed: int = 0,
+) -> np.ndarray:
+    """Generate normalized vectors grouped around random centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(max(1, n // 50), dimension))
+    vectors = centroids[rng.integers(0, len(centroids), n)] + 0.3 * rng.normal(size=(n, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def _recall_at_k(
+    exact_ids: np.ndarray,
+    approx_ids: np.ndarray,
+) -> float:
+    """Fraction of exact top-k ids also returned by the approximate search."""
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact_ids, approx_ids))
+    return hits / exact_ids.size
+
+
+# =============================================================================
+# INDEX TYPE RESOLUTION TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestResolveIndexType:
+    """Tests for resolve_index_type."""
+
+    def test_auto_switches_at_threshold(self):
+        """Test auto mode is flat below the threshold and HNSW at or above it."""
+        assert resolve_index_type("auto", 999, 1000) == "flat"
+        assert resolve_index_type("auto", 1000, 1000) == "hnsw"
+
+    def test_explicit_types_are_kept(self):
+        """Test explicit types are used regardless of size."""
+        assert resolve_index_type("flat", 10**6, 1000) == "flat"
+        assert resolve_index_type("HNSW", 5, 1000) == "hnsw"
+        assert resolve_index_type("ivfpq", 5000, 1000) == "ivfpq"
+
+    def test_ivfpq_needs_enough_training_vectors(self):
+        """Test IVF-PQ falls back to flat until PQ codebooks can be trained."""
+        assert resolve_index_type("ivfpq", 100, 1000) == "flat"
+
+    def test_unknown_type_raises(self):
+        """Test unsupported index types are rejected."""
+        with pytest.raises(ValueError, match="Unsupported FAISS index type"):
+            resolve_index_type("lsh", 10, 1000)
+
+
+# =============================================================================
+# INDEX BUILD TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestBuildIndex:
+    """Tests for build_index and extract_vectors with real FAISS."""
+
+    @pytest.mark.parametrize(
+        "index_type,min_recall",
+        [("flat", 1.0), ("hnsw", 0.9), ("ivfpq", 0.5)],
+    )
+    def test_recall_against_flat(self, real_faiss, index_type, min_recall):
+        """Test approximate indexes return most of the exact top-k."""
+        from registry.search.index_factory import build_index
+
+        vectors = _clustered_vectors(3000, 32)
+        ids = np.arange(1000, 1000 + len(vectors), dtype=np.int64)
+        queries = _clustered_vectors(50, 32, seed=1)
+
+        exact = build_index(vectors, ids, "flat")
+        approx = build_index(vectors, ids, index_type, pq_m=8, ivf_nprobe=32)
+        _, exact_ids = exact.search(queries, 10)
+        _, approx_ids = approx.search(queries, 10)
+
+        assert approx.ntotal == len(vectors)
+        assert _recall_at_k(exact_ids, approx_ids) >= min_recall
+
+    def test_ivfpq_rejects_indivisible_dimension(self, real_faiss):
+        """Test IVF-PQ requires pq_m to divide the dimension."""
+        from registry.search.index_factory import build_index
+
+        vectors = _clustered_vectors(500, 30)
+        with pytest.raises(ValueError, match="must divide"):
+            build_index(vectors, np.arange(500, dtype=np.int64), "ivfpq", pq_m=8)
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivfpq"])
+    def test_search_params_restrict_results(self, real_faiss, index_type):
+        """Test id-selector search parameters keep results inside the selection."""
+        from registry.search.index_factory import build_index, make_search_params
+
+        vectors = _clustered_vectors(3000, 32)
+        ids = np.arange(len(vectors), dtype=np.int64)
+        index = build_index(vectors, ids, index_type, pq_m=8)
+        selected = ids[::2]
+
+        params = make_search_params(index, index_type, selected)
+        _, found = index.search(vectors[:5], 10, params=params)
+
+        returned = found[found != -1]
+        assert returned.size > 0
+        assert np.isin(returned, selected).all()
+
+    def test_extract_vectors_round_trip(self, real_faiss):
+        """Test ids and vectors survive extraction from an ID-mapped flat index."""
+        from registry.search.index_factory import build_index, extract_vectors
+
+        vectors = _clustered_vectors(20, 16)
+        ids = np.arange(100, 120, dtype=np.int64)
+        index = build_index(vectors, ids, "flat")
+        index.remove_ids(np.array([105], dtype=np.int64))
+
+        extracted_ids, extracted_vectors = extract_vectors(index)
+
+        assert 105 not in extracted_ids
+        assert len(extracted_ids) == 19
+        np.testing.assert_allclose(extracted_vectors[0], vectors[0])
+
+
+# =============================================================================
+# FAISS SERVICE SWITCHOVER TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestAnnSwitchover:
+    """Tests for FaissService background ANN rebuilds."""
+
+    @pytest.fixture
+    def ann_service(self, real_faiss, mock_settings, monkeypatch):
+        """FaissService on real FAISS configured to switch to HNSW at 10 vectors."""
+        monkeypatch.setattr("registry.search.service.settings.faiss_index_type", "auto")
+        monkeypatch.setattr("registry.search.service.settings.faiss_ann_threshold", 10)
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_ann_rebuild_debounce_seconds", 0
+        )
+        service = FaissService()
+        service.embedding_model = MockEmbeddingsClient(dimension=384)
+        service._initialize_new_index()
+        return service
+
+    @staticmethod
+    def _servers(count: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "path": f"/servers/s{i}",
+                "entity_type": "mcp_server",
+                "info": {"server_name": f"server-{i}", "description": f"Server number {i}"},
+                "is_enabled": True,
+            }
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_small_index_stays_flat(self, ann_service):
+        """Test no ANN index is built below the threshold."""
+        await ann_service.bulk_index(self._servers(5))
+
+        assert ann_service._ann_task is None
+        assert ann_service._get_search_index() is ann_service.faiss_index
+
+    @pytest.mark.asyncio
+    async def test_switches_to_hnsw_and_adds_incrementally(self, ann_service):
+        """Test the HNSW index serves searches once built and takes new vectors in place."""
+        await ann_service.bulk_index(self._servers(20))
+        await ann_service._ann_task
+
+        assert ann_service._ann_index_type == "hnsw"
+        assert ann_service._get_search_index() is ann_service._ann_index
+        results = await ann_service.search_mixed("server number 3", max_results=5)
+        assert results["servers"]
+
+        ann_index = ann_service._ann_index
+        await ann_service.add_or_update_service(
+            "/servers/new", {"server_name": "new", "description": "Brand new"}, is_enabled=True
+        )
+
+        assert ann_service._ann_task is None or ann_service._ann_task.done()
+        assert ann_service._get_search_index() is ann_index
+        assert ann_index.ntotal == 21
+        results = await ann_service.search_mixed("Brand new", max_results=50)
+        assert "/servers/new" in [r["path"] for r in results["servers"]]
+
+    @pytest.mark.asyncio
+    async def test_updates_and_removals_are_tombstoned(self, ann_service, monkeypatch):
+        """Test stale slots never surface in results and are dropped by a rebuild."""
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_ann_max_tombstone_ratio", 0.5
+        )
+        await ann_service.bulk_index(self._servers(20))
+        await ann_service._ann_task
+
+        await ann_service.add_or_update_service(
+            "/servers/s0", {"server_name": "server-0", "description": "Renamed"}, is_enabled=True
+        )
+        await ann_service.remove_service("/servers/s1")
+
+        assert len(ann_service._ann_tombstones) == 2
+        assert ann_service._ann_index.ntotal == 21
+        results = await ann_service.search_mixed("server", max_results=50)
+        paths = [r["path"] for r in results["servers"]]
+        assert paths.count("/servers/s0") == 1
+        assert "/servers/s1" not in paths
+
+        monkeypatch.setattr(
+            "registry.search.service.settings.faiss_ann_max_tombstone_ratio", 0.05
+        )
+        await ann_service.remove_service("/servers/s2")
+        await ann_service._ann_task
+
+        assert not ann_service._ann_tombstones
+        assert ann_service._ann_index.ntotal == 20
+
+    @pytest.mark.asyncio
+    async def test_writes_during_rebuild_are_replayed(self, ann_service, monkeypatch):
+        """Test vectors written while the index builds in a worker thread are not lost."""
+        await ann_service.bulk_index(self._servers(20))
+        build = ann_service._build_ann_from_snapshot
+
+        def slow_build(*args):
+            result = build(*args)
+            time.sleep(0.2)
+            return result
+
+        monkeypatch.setattr(ann_service, "_build_ann_from_snapshot", slow_build)
+        await asyncio.sleep(0.05)
+        assert ann_service._ann_journal is not None
+
+        await ann_service.add_or_update_service(
+            "/servers/late", {"server_name": "late", "description": "Written mid build"},
+            is_enabled=True,
+        )
+        await ann_service._ann_task
+
+        assert ann_service._ann_journal is None
+        results = await ann_service.search_mixed("Written mid build", max_results=50)
+        assert "/servers/late" in [r["path"] for r in results["servers"]]
+        assert ann_service._ann_index.ntotal == 21
@@ -0,0 +1,131 @@
+"""
+Unit tests for registry/search/metadata_columns.py.
+
+Tests cover:
+- Incremental id -> path reverse map maintenance
+- Vectorized entity type and enabled filters
+- Building the columns from a path-keyed metadata store and a persisted
+  id -> path map
+"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from registry.search.metadata_columns import MetadataColumns, entry_is_enabled
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# METADATA COLUMNS TESTS
+# =============================================================================
+
+
+@pytest.mark.unit
+@pytest.mark.search
+class TestMetadataColumns:
+    """Tests for MetadataColumns."""
+
+    def test_upsert_and_lookup(self):
+        """Test ids map to their paths and updates replace the row in place."""
+        columns = MetadataColumns()
+        columns.upsert(7, "/servers/a", "mcp_server", True)
+        columns.upsert(7, "/servers/a", "mcp_server", False)
+
+        assert len(columns) == 1
+        assert columns.path_for(7) == "/servers/a"
+        assert columns.path_for(8) is None
+        assert columns.select_ids(enabled_only=True).size == 0
+
+    def test_remove_moves_last_row(self):
+        """Test removing a row keeps the remaining mappings intact."""
+        columns = MetadataColumns()
+        for i in range(3):
+            columns.upsert(i, f"/servers/s{i}", "mcp_server", True)
+
+        assert columns.remove(0) == "/servers/s0"
+        assert columns.remove(0) is None
+
+        assert len(columns) == 2
+        assert columns.id_to_path() == {1: "/servers/s1", 2: "/servers/s2"}
+        assert sorted(columns.select_ids().tolist()) == [1, 2]
+
+    def test_select_ids_filters_type_and_enabled(self):
+        """Test entity type and enabled filters combine."""
+        columns = MetadataColumns()
+        columns.upsert(1, "/servers/on", "mcp_server", True)
+        columns.upsert(2, "/servers/off", "mcp_server", False)
+        columns.upsert(3, "/agents/on", "a2a_agent", True)
+
+        assert sorted(columns.select_ids(["mcp_server"]).tolist()) == [1, 2]
+        assert columns.select_ids(["a2a_agent"], enabled_only=True).tolist() == [3]
+        assert sorted(columns.select_ids(enabled_only=True).tolist()) == [1, 3]
+        assert columns.select_ids(["unknown"]).size == 0
+
+    def test_grows_past_initial_capacity(self):
+        """Test the arrays grow as rows are added."""
+        columns = MetadataColumns()
+        for i in range(500):
+            columns.upsert(i, f"/servers/s{i}", "mcp_server", i % 2 == 0)
+
+        enabled = columns.select_ids(enabled_only=True)
+        np.testing.assert_array_equal(np.sort(enabled), np.arange(0, 500, 2))
+
+    def test_version_changes_on_mutation(self):
+        """Test the version counter tracks every change."""
+        columns = MetadataColumns()
+        columns.upsert(1, "/servers/a", "mcp_server", True)
+        version = columns.version
+
+        columns.remove(1)
+
+        assert columns.version > version
+
+    def test_from_metadata(self):
+        """Test columns are built from server and agent metadata entries."""
+        metadata = {
+            "/servers/a": {
+                "id": 0,
+                "entity_type": "mcp_server",
+                "full_server_info": {"is_enabled": True},
+            },
+            "/agents/b": {
+                "id": 1,
+                "entity_type": "a2a_agent",
+                "full_agent_card": {"is_enabled": False},
+            },
+            "/servers/no-id": {"entity_type": "mcp_server"},
+        }
+
+        columns = MetadataColumns.from_metadata(metadata)
+
+        assert columns.id_to_path() == {0: "/servers/a", 1: "/agents/b"}
+        assert columns.select_ids(enabled_only=True).tolist() == [0]
+        assert entry_is_enabled(metadata["/agents/b"]) is False
+
+    def test_from_metadata_restores_persisted_id_to_path(self):
+        """Test a persisted reverse map is used when it matches the metadata."""
+        metadata = {
+            "/servers/a": {"id": 5, "full_server_info": {"is_enabled": True}},
+            "/servers/b": {"id": 2, "full_server_info": {"is_enabled": False}},
+        }
+
+        columns = MetadataColumns.from_metadata(metadata, {"2": "/servers/b", "5": "/servers/a"})
+
+        assert columns.id_to_path() == {2: "/servers/b", 5: "/servers/a"}
+        assert columns.select_ids(enabled_only=True).tolist() == [5]
+
+    def test_from_metadata_rebuilds_stale_id_to_path(self):
+        """Test a persisted reverse map that disagrees with the metadata is ignored."""
+        metadata = {
+            "/servers/a": {"id": 0, "full_server_info": {"is_enabled": True}},
+            "/servers/b": {"id": 1, "full_server_info": {"is_enabled": True}},
+        }
+
+        swapped = MetadataColumns.from_metadata(metadata, {"0": "/servers/b", "1": "/servers/a"})
+        missing = MetadataColumns.from_metadata(metadata, {"0": "/servers/a"})
+
+        assert swapped.id_to_path() == {0: "/servers/a", 1: "/servers/b"}
+        assert missing.id_to_path() == {0: "/servers/a", 1: "/servers/b"}
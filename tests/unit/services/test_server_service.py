@@ -1000,7 +1000,7 @@ class TestServiceStateManagement:
     ):
         """Test get_enabled_services returns empty list when none enabled."""
         # Arrange
-        mock_server_repository.list_all.return_value = {}
+        mock_server_repository.get_enabled_servers_with_info.return_value = {}
 
         # Act
         result = await server_service.get_enabled_services()
@@ -1016,14 +1016,17 @@ class TestServiceStateManagement:
         sample_server_dict_2: dict[str, Any],
         mock_server_repository,
     ):
-        """Test get_enabled_services returns only enabled server paths."""
+        """Test get_enabled_services returns only active enabled server paths."""
         # Arrange
         server_1 = sample_server_dict.copy()
         server_1["is_enabled"] = True
+        # Enabled, but an inactive version of a multi-version server
         server_2 = sample_server_dict_2.copy()
-        server_2["is_enabled"] = False
+        server_2["is_enabled"] = True
+        server_2["version_group"] = "group"
+        server_2["is_active"] = False
 
-        mock_server_repository.list_all.return_value = {
+        mock_server_repository.get_enabled_servers_with_info.return_value = {
             sample_server_dict["path"]: server_1,
             sample_server_dict_2["path"]: server_2,
         }
@@ -1036,6 +1039,28 @@ class TestServiceStateManagement:
         assert sample_server_dict["path"] in result
         assert sample_server_dict_2["path"] not in result
 
+    @pytest.mark.asyncio
+    async def test_get_enabled_servers_with_info_single_read(
+        self,
+        server_service: ServerService,
+        sample_server_dict: dict[str, Any],
+        mock_server_repository,
+    ):
+        """Test enabled servers come back with their info from one repository read."""
+        # Arrange
+        server = {**sample_server_dict, "is_enabled": True}
+        mock_server_repository.get_enabled_servers_with_info.return_value = {
+            sample_server_dict["path"]: server,
+        }
+
+        # Act
+        result = await server_service.get_enabled_servers_with_info()
+
+        # Assert
+        assert result == {sample_server_dict["path"]: server}
+        mock_server_repository.get_enabled_servers_with_info.assert_awaited_once()
+        mock_server_repository.get.assert_not_called()
+
 
 # =============================================================================
 # TEST: Toggle Service
@@ -1059,19 +1084,22 @@ class TestToggleService:
         # Arrange
         path = sample_server_dict["path"]
         mock_server_repository.set_state.return_value = True
-        # Mock list_all to return empty dict (no enabled servers)
-        mock_server_repository.list_all.return_value = {}
+        # Mock enabled servers lookup to return empty dict (no enabled servers)
+        mock_server_repository.get_enabled_servers_with_info.return_value = {}
 
         # Mock nginx service
         with patch("registry.core.nginx_service.nginx_service") as mock_nginx_service:
+            mock_nginx_service.generate_config_async = AsyncMock(return_value=True)
+
             # Act
             result = await server_service.toggle_service(path, True)
 
             # Assert
             assert result is True
             mock_server_repository.set_state.assert_called_once_with(path, True)
-            mock_nginx_service.generate_config.assert_called_once()
-            mock_nginx_service.reload_nginx.assert_called_once()
+            # generate_config_async reloads nginx itself when the config changed
+            mock_nginx_service.generate_config_async.assert_awaited_once_with({})
+            mock_nginx_service.reload_nginx.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_toggle_service_disable_calls_repository(
@@ -1085,18 +1113,20 @@ class TestToggleService:
         # Arrange
         path = sample_server_dict["path"]
         mock_server_repository.set_state.return_value = True
-        # Mock list_all to return empty dict (no enabled servers)
-        mock_server_repository.list_all.return_value = {}
+        # Mock enabled servers lookup to return empty dict (no enabled servers)
+        mock_server_repository.get_enabled_servers_with_info.return_value = {}
 
         # Mock nginx service
         with patch("registry.core.nginx_service.nginx_service") as mock_nginx_service:
+            mock_nginx_service.generate_config_async = AsyncMock(return_value=True)
+
             # Act
             result = await server_service.toggle_service(path, False)
 
             # Assert
             assert result is True
             mock_server_repository.set_state.assert_called_once_with(path, False)
-            mock_nginx_service.generate_config.assert_called_once()
+            mock_nginx_service.generate_config_async.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_toggle_service_nonexistent_server_fails(
@@ -1135,7 +1165,7 @@ class TestToggleService:
             assert result is False
             mock_server_repository.set_state.assert_called_once_with(path, True)
             # Nginx should not be called if repository fails
-            mock_nginx_service.generate_config.assert_not_called()
+            mock_nginx_service.generate_config_async.assert_not_called()
             mock_nginx_service.reload_nginx.assert_not_called()
 
 
@@ -1157,8 +1187,8 @@ class TestReloadStateFromDisk:
     ):
         """Test that reload_state_from_disk delegates to repository.load_all()."""
         # Arrange
-        # Mock list_all to return empty dict (no servers, no changes)
-        mock_server_repository.list_all.return_value = {}
+        # Mock enabled servers lookup to return empty dict (no servers, no changes)
+        mock_server_repository.get_enabled_servers_with_info.return_value = {}
 
         # Act
         await server_service.reload_state_from_disk()
@@ -1179,24 +1209,27 @@ class TestReloadStateFromDisk:
         # Enabled server for all calls
         enabled_server = sample_server_dict.copy()
         enabled_server["is_enabled"] = True
-        # list_all returns different results to simulate state change
+        # Different results simulate a state change
         # First call (before reload): empty, After reload: has enabled server
-        mock_server_repository.list_all.return_value = {path: enabled_server}
-        mock_server_repository.get.return_value = enabled_server
+        mock_server_repository.get_enabled_servers_with_info.side_effect = [
+            {},
+            {path: enabled_server},
+        ]
 
         # Mock nginx service to avoid integration issues
         with patch("registry.core.nginx_service.nginx_service") as mock_nginx_service:
             # Mock the nginx methods to succeed
-            mock_nginx_service.generate_config.return_value = None
-            mock_nginx_service.reload_nginx.return_value = None
+            mock_nginx_service.generate_config_async = AsyncMock(return_value=True)
 
             # Act
             await server_service.reload_state_from_disk()
 
             # Assert - verify that repository.load_all was called (the key orchestration)
             mock_server_repository.load_all.assert_called_once()
-            # Verify list_all was called multiple times (for getting enabled services)
-            assert mock_server_repository.list_all.call_count >= 2
+            # Enabled servers are read once before and once after the reload,
+            # and the post-reload read is reused for nginx
+            assert mock_server_repository.get_enabled_servers_with_info.call_count == 2
+            mock_nginx_service.generate_config_async.assert_awaited_once_with({path: enabled_server})
 
     @pytest.mark.asyncio
     async def test_reload_state_skips_nginx_when_no_changes(
@@ -1207,7 +1240,7 @@ class TestReloadStateFromDisk:
         """Test that nginx is not regenerated when no changes detected."""
         # Arrange
         # Both calls return empty dict (no changes)
-        mock_server_repository.list_all.return_value = {}
+        mock_server_repository.get_enabled_servers_with_info.return_value = {}
 
         # Mock nginx service
         with patch("registry.core.nginx_service.nginx_service") as mock_nginx_service:
@@ -1215,7 +1248,7 @@ class TestReloadStateFromDisk:
             await server_service.reload_state_from_disk()
 
             # Assert
-            mock_nginx_service.generate_config.assert_not_called()
+            mock_nginx_service.generate_config_async.assert_not_called()
             mock_nginx_service.reload_nginx.assert_not_called()
 
 